@@ -164,6 +164,134 @@ def extract_documents_bulk():
         return APIResponse.internal_error(f"Bulk extraction failed: {str(e)}")
 
 
+def _enqueue_auto_training(template_id: int) -> dict:
+    """
+    Enqueue an auto-training job for a template if its threshold is met
+
+    Args:
+        template_id: Template ID
+
+    Returns:
+        auto_training result dict (status enqueued, skipped or failed)
+    """
+    try:
+        from database.repositories.job_repository import JobRepository
+
+        db = DatabaseManager()
+        model_folder = current_app.config['MODEL_FOLDER']
+        job_repo = JobRepository(db)
+
+        # Check if model exists (first training or incremental)
+        model_path = os.path.join(model_folder, f"template_{template_id}_model.joblib")
+        is_first_training = not os.path.exists(model_path)
+
+        # ✅ PRE-CHECK: Only enqueue if conditions are met
+        min_new_docs = current_app.config.get('MIN_NEW_DOCUMENTS', 5)
+
+        # Count validated documents not yet used for training
+        rows = db.execute_query('''
+            SELECT COUNT(*) AS unused_docs
+            FROM documents
+            WHERE template_id = ? 
+              AND status = 'validated'
+              AND used_for_training = 0
+        ''', (template_id,))
+        unused_docs = rows[0]["unused_docs"]
+
+        # Check if there is already a pending/running job
+        has_active_job = job_repo.has_active_auto_training_job(template_id)
+        current_app.logger.info(f"🔍 Active job check: has_active_job={has_active_job}")
+
+        if has_active_job:
+            current_app.logger.info(
+                f"⏭️  Skipped auto-training enqueue for template {template_id} - job already active"
+            )
+            return {
+                "status": "skipped",
+                "message": "Training job already active",
+                "mode": "async"
+            }
+
+        # ✅ FIRST TRAINING: Enqueue immediately if model doesn't exist
+        # ✅ INCREMENTAL: Enqueue only if min_new_docs threshold met
+        should_enqueue = is_first_training or (unused_docs >= min_new_docs)
+        current_app.logger.info(
+            f"🔍 Enqueue decision: is_first_training={is_first_training}, "
+            f"unused_docs={unused_docs}, min_new_docs={min_new_docs}, "
+            f"should_enqueue={should_enqueue}"
+        )
+
+        if not should_enqueue:
+            current_app.logger.debug(
+                f"⏭️  Skipped enqueue for template {template_id} - only {unused_docs}/{min_new_docs} unused docs"
+            )
+            return {
+                "status": "skipped",
+                "message": f"Not enough documents ({unused_docs}/{min_new_docs})",
+                "mode": "async"
+            }
+
+        job_id = job_repo.enqueue_auto_training_job(template_id, model_folder, is_first_training)
+        training_type = "first training" if is_first_training else "incremental training"
+        current_app.logger.info(
+            f"📥 Enqueued {training_type} job {job_id} for template {template_id} ({unused_docs} unused docs)"
+        )
+        return {
+            "status": "enqueued",
+            "job_id": job_id,
+            "message": f"{training_type.capitalize()} job enqueued ({unused_docs} unused docs)",
+            "mode": "async",
+            "is_first_training": is_first_training
+        }
+    except Exception as e:
+        current_app.logger.error(f"❌ Auto-training scheduling failed: {e}")
+        current_app.logger.error(f"❌ Exception type: {type(e).__name__}")
+        import traceback
+        current_app.logger.error(f"❌ Traceback: {traceback.format_exc()}")
+        return {"status": "failed", "error": str(e), "mode": "async"}
+
+
+def _run_auto_training(template_id: int) -> dict:
+    """
+    Run auto-training for a template immediately (blocking)
+
+    Args:
+        template_id: Template ID
+
+    Returns:
+        auto_training result dict (status completed, skipped or failed)
+    """
+    try:
+        from core.learning.auto_trainer import get_auto_training_service
+
+        db = DatabaseManager()
+        model_folder = current_app.config['MODEL_FOLDER']
+        auto_trainer = get_auto_training_service(db)
+        model_path = os.path.join(model_folder, f"template_{template_id}_model.joblib")
+        is_first_training = not os.path.exists(model_path)
+        training_result = auto_trainer.check_and_train(
+            template_id=template_id,
+            model_folder=model_folder,
+            force_first_training=is_first_training
+        )
+
+        if training_result:
+            return {
+                "status": "completed",
+                "training_samples": training_result['training_samples'],
+                "accuracy": training_result['test_metrics']['accuracy'],
+                "mode": "sync"
+            }
+        return {
+            "status": "skipped",
+            "message": "Training conditions not met",
+            "mode": "sync"
+        }
+    except Exception as e:
+        current_app.logger.warning(f"Auto-training failed: {e}")
+        return {"status": "failed", "error": str(e), "mode": "sync"}
+
+
 @extraction_bp.route("/validate", methods=["POST"])
 @handle_errors
 @require_auth
@@ -229,54 +357,34 @@ def validate_corrections():
             # ========================================
             # PATTERN LEARNING (Async or Sync)
             # ========================================
+            # save_corrections published a validation event; the pipeline runs the
+            # feedback file, allow_multiline inference and adaptive learning in order
+            from core.learning.validation_pipeline import get_validation_pipeline
+            
+            pipeline = get_validation_pipeline()
+            event_id = result.get("validation_event_id")
+            
             if async_learning:
-                # ⚡ ASYNC: Run pattern learning in background thread
-                import threading
-                
-                document_id = data["document_id"]
-                all_fields = result.get("all_fields", {})
-                corrected_fields = result.get("corrected_fields", {})
-                app = current_app._get_current_object()
-                
-                def run_pattern_learning():
-                    """Background thread for pattern learning only"""
-                    with app.app_context():
-                        try:
-                            from core.learning.services import ModelService
-                            learning_service = ModelService()
-                            learning_result = learning_service.trigger_adaptive_learning(
-                                document_id=document_id,
-                                all_fields=all_fields,
-                                corrected_fields=corrected_fields,
-                            )
-                            app.logger.debug(
-                                f"✅ Pattern learning: {learning_result['summary']['triggered']} fields triggered"
-                            )
-                        except Exception as e:
-                            app.logger.warning(f"Pattern learning failed: {e}")
-                
-                thread = threading.Thread(target=run_pattern_learning, daemon=True)
-                thread.start()
-                
+                # ⚡ ASYNC: Processed by the background pipeline consumer
+                pipeline.notify()
                 result["learning"] = {
                     "status": "scheduled",
+                    "event_id": event_id,
                     "message": "Pattern learning scheduled in background",
                     "mode": "async"
                 }
             else:
-                # 🔄 SYNC: Run pattern learning immediately
+                # 🔄 SYNC: Process the event (and any earlier ones) before responding
                 try:
-                    from core.learning.services import ModelService
-                    learning_service = ModelService()
-                    learning_result = learning_service.trigger_adaptive_learning(
-                        document_id=data["document_id"],
-                        all_fields=result.get("all_fields", {}),
-                        corrected_fields=result.get("corrected_fields", {}),
-                    )
+                    event = pipeline.process_until(event_id)
+                    status = event["status"] if event else "failed"
                     result["learning"] = {
-                        **learning_result,
+                        "status": "completed" if status == "done" else status,
+                        "event_id": event_id,
                         "mode": "sync"
                     }
+                    if event and event.get("last_error"):
+                        result["learning"]["error"] = event["last_error"]
                 except Exception as e:
                     current_app.logger.warning(f"Pattern learning failed: {e}")
                     result["learning"] = {"status": "failed", "error": str(e)}
@@ -287,136 +395,19 @@ def validate_corrections():
             if async_training:
                 # ⚡ ASYNC: Enqueue training job to worker
                 current_app.logger.info("🚀 Entering ASYNC training mode - will enqueue job to worker")
-                try:
-                    from database.repositories.document_repository import DocumentRepository
-                    from database.repositories.job_repository import JobRepository
-                    from database.db_manager import DatabaseManager
-                    
-                    db = DatabaseManager()
-                    doc_repo = DocumentRepository(db)
-                    document = doc_repo.find_by_id(data["document_id"])
-                    
-                    if document:
-                        template_id = document.template_id
-                        model_folder = current_app.config['MODEL_FOLDER']
-                        job_repo = JobRepository(db)
-                        
-                        # Check if model exists (first training or incremental)
-                        import os
-                        model_path = os.path.join(model_folder, f"template_{template_id}_model.joblib")
-                        is_first_training = not os.path.exists(model_path)
-                        
-                        # ✅ PRE-CHECK: Only enqueue if conditions are met
-                        min_new_docs = current_app.config.get('MIN_NEW_DOCUMENTS', 5)
-                        
-                        # Count validated documents not yet used for training
-                        conn = db.get_connection()
-                        cursor = conn.cursor()
-                        cursor.execute('''
-                            SELECT COUNT(*)
-                            FROM documents
-                            WHERE template_id = ? 
-                              AND status = 'validated'
-                              AND used_for_training = 0
-                        ''', (template_id,))
-                        unused_docs = cursor.fetchone()[0]
-                        conn.close()
-                        
-                        # Check if there is already a pending/running job
-                        has_active_job = job_repo.has_active_auto_training_job(template_id)
-                        current_app.logger.info(f"🔍 Active job check: has_active_job={has_active_job}")
-                        
-                        if not has_active_job:
-                            # ✅ FIRST TRAINING: Enqueue immediately if model doesn't exist
-                            # ✅ INCREMENTAL: Enqueue only if min_new_docs threshold met
-                            should_enqueue = is_first_training or (unused_docs >= min_new_docs)
-                            current_app.logger.info(
-                                f"🔍 Enqueue decision: is_first_training={is_first_training}, "
-                                f"unused_docs={unused_docs}, min_new_docs={min_new_docs}, "
-                                f"should_enqueue={should_enqueue}"
-                            )
-                            
-                            if should_enqueue:
-                                job_id = job_repo.enqueue_auto_training_job(template_id, model_folder, is_first_training)
-                                training_type = "first training" if is_first_training else "incremental training"
-                                current_app.logger.info(
-                                    f"📥 Enqueued {training_type} job {job_id} for template {template_id} ({unused_docs} unused docs)"
-                                )
-                                result["auto_training"] = {
-                                    "status": "enqueued",
-                                    "job_id": job_id,
-                                    "message": f"{training_type.capitalize()} job enqueued ({unused_docs} unused docs)",
-                                    "mode": "async",
-                                    "is_first_training": is_first_training
-                                }
-                            else:
-                                current_app.logger.debug(
-                                    f"⏭️  Skipped enqueue for template {template_id} - only {unused_docs}/{min_new_docs} unused docs"
-                                )
-                                result["auto_training"] = {
-                                    "status": "skipped",
-                                    "message": f"Not enough documents ({unused_docs}/{min_new_docs})",
-                                    "mode": "async"
-                                }
-                        else:
-                            current_app.logger.info(
-                                f"⏭️  Skipped auto-training enqueue for template {template_id} - job already active"
-                            )
-                            result["auto_training"] = {
-                                "status": "skipped",
-                                "message": "Training job already active",
-                                "mode": "async"
-                            }
-                except Exception as e:
-                    current_app.logger.error(f"❌ Auto-training scheduling failed: {e}")
-                    current_app.logger.error(f"❌ Exception type: {type(e).__name__}")
-                    import traceback
-                    current_app.logger.error(f"❌ Traceback: {traceback.format_exc()}")
-                    result["auto_training"] = {"status": "failed", "error": str(e), "mode": "async"}
+                result["auto_training"] = _enqueue_auto_training(result["template_id"])
+                if result["auto_training"]["status"] == "failed":
                     # ⚠️ DO NOT FALLBACK TO SYNC - return error instead
                     return APIResponse.success(result, "Corrections saved but auto-training scheduling failed")
             else:
                 # 🔄 SYNC: Run training immediately (blocking)
                 current_app.logger.warning("⚠️  Using SYNC training mode - training will block API request!")
-                try:
-                    from core.learning.auto_trainer import get_auto_training_service
-                    from database.repositories.document_repository import DocumentRepository
-                    from database.db_manager import DatabaseManager
-                    
-                    db = DatabaseManager()
-                    doc_repo = DocumentRepository(db)
-                    document = doc_repo.find_by_id(data["document_id"])
-                    
-                    if document:
-                        template_id = document.template_id
-                        model_folder = current_app.config['MODEL_FOLDER']
-                        auto_trainer = get_auto_training_service(db)
-                        model_path = os.path.join(model_folder, f"template_{template_id}_model.joblib")
-                        is_first_training = not os.path.exists(model_path)
-                        training_result = auto_trainer.check_and_train(
-                            template_id=template_id,
-                            model_folder=model_folder,
-                            force_first_training=is_first_training
-                        )
-                        
-                        if training_result:
-                            result["auto_training"] = {
-                                "status": "completed",
-                                "training_samples": training_result['training_samples'],
-                                "accuracy": training_result['test_metrics']['accuracy'],
-                                "mode": "sync"
-                            }
-                        else:
-                            result["auto_training"] = {
-                                "status": "skipped",
-                                "message": "Training conditions not met",
-                                "mode": "sync"
-                            }
-                except Exception as e:
-                    current_app.logger.warning(f"Auto-training failed: {e}")
-                    result["auto_training"] = {"status": "failed", "error": str(e), "mode": "sync"}
+                result["auto_training"] = _run_auto_training(result["template_id"])
         else:
             current_app.logger.info("Auto-training disabled")
+            # Feedback file and allow_multiline inference still run in the pipeline
+            from core.learning.validation_pipeline import get_validation_pipeline
+            get_validation_pipeline().notify()
 
         
         return APIResponse.success(result, "Corrections saved successfully")
@@ -425,6 +416,92 @@ def validate_corrections():
         return APIResponse.not_found(str(e))
 
 
+@extraction_bp.route("/validate-batch", methods=["POST"])
+@handle_errors
+@require_auth
+def validate_corrections_batch():
+    """
+    Validate many documents at once (reviewer bulk approval)
+
+    Feedback and status updates of all documents are written in one
+    transaction; the auto-training threshold check runs once per template.
+
+    Request Body:
+    {
+        "documents": [
+            {"document_id": int, "corrections": {...}},
+            ...
+        ]
+    }
+
+    Returns:
+        200: All documents validated
+        400: Validation error
+        401: Unauthorized
+        404: One or more documents not found (nothing is saved)
+    """
+    data = request.get_json()
+
+    if not data or not isinstance(data.get("documents"), list):
+        return APIResponse.bad_request("documents (list of {document_id, corrections}) is required")
+
+    service = get_extraction_service()
+
+    try:
+        result = service.save_corrections_batch(data["documents"])
+    except NotFoundError as e:
+        return APIResponse.not_found(str(e))
+
+    from core.learning.validation_pipeline import get_validation_pipeline
+
+    pipeline = get_validation_pipeline()
+    event_ids = [doc["validation_event_id"] for doc in result["documents"]]
+
+    auto_training = current_app.config.get('AUTO_TRAINING', True)
+    async_learning = current_app.config.get('ASYNC_PATTERN_LEARNING', True)
+    async_training = current_app.config.get('ASYNC_AUTO_TRAINING', True)
+
+    # ========================================
+    # PATTERN LEARNING (one event per document, processed in order)
+    # ========================================
+    if not auto_training or async_learning:
+        pipeline.notify()
+        result["learning"] = {
+            "status": "scheduled",
+            "event_ids": event_ids,
+            "mode": "async"
+        }
+    else:
+        try:
+            statuses = [
+                (pipeline.process_until(event_id) or {}).get("status", "failed")
+                for event_id in event_ids
+            ]
+            result["learning"] = {
+                "status": "completed" if all(s == "done" for s in statuses) else "failed",
+                "event_ids": event_ids,
+                "mode": "sync"
+            }
+        except Exception as e:
+            current_app.logger.warning(f"Pattern learning failed: {e}")
+            result["learning"] = {"status": "failed", "error": str(e)}
+
+    # ========================================
+    # AUTO-TRAINING (threshold check once per affected template)
+    # ========================================
+    if auto_training:
+        schedule = _enqueue_auto_training if async_training else _run_auto_training
+        result["auto_training"] = {
+            str(template_id): schedule(template_id) for template_id in result["template_ids"]
+        }
+    else:
+        current_app.logger.info("Auto-training disabled")
+
+    return APIResponse.success(
+        result, f"{result['validated_count']} documents validated successfully"
+    )
+
+
 @extraction_bp.route("/documents", methods=["GET"])
 @handle_errors
 @require_auth
@@ -273,3 +273,143 @@ def check_validation_needed():
         'reason': reason,
         'threshold': threshold
     })
+
+
+@learning_bp.route('/model-registry/stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_model_registry_stats():
+    """
+    Get in-memory CRF model registry statistics
+    
+    Returns:
+        200: Hit/miss/eviction counters and cached models
+        401: Unauthorized
+    """
+    from core.extraction.model_registry import get_model_registry
+    
+    return APIResponse.success(
+        get_model_registry().get_stats(),
+        "Model registry statistics retrieved successfully"
+    )
+
+
+@learning_bp.route('/pattern-usage/stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_pattern_usage_stats():
+    """
+    Get write-behind pattern usage buffer statistics
+    
+    Returns:
+        200: Pending deltas and flush counters
+        401: Unauthorized
+    """
+    from core.extraction.pattern_usage import get_pattern_usage_aggregator
+    
+    return APIResponse.success(
+        get_pattern_usage_aggregator().get_stats(),
+        "Pattern usage statistics retrieved successfully"
+    )
+
+
+@learning_bp.route('/pattern-learning/stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_pattern_learning_stats():
+    """
+    Get background pattern learning executor statistics of this process
+    
+    Returns:
+        200: Queue depth, running tasks and coalesced/dropped counters
+        401: Unauthorized
+    """
+    from core.learning.pattern_learning_executor import get_pattern_learning_executor
+    
+    return APIResponse.success(
+        get_pattern_learning_executor().get_stats(),
+        "Pattern learning statistics retrieved successfully"
+    )
+
+
+@learning_bp.route('/validation-events/stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_validation_event_stats():
+    """
+    Get validation event pipeline statistics
+    
+    Returns:
+        200: Events per status (pending = learning backlog) and consumer counters
+        401: Unauthorized
+    """
+    from core.learning.validation_pipeline import get_validation_pipeline
+    
+    return APIResponse.success(
+        get_validation_pipeline().get_stats(),
+        "Validation event statistics retrieved successfully"
+    )
+
+
+@learning_bp.route('/strategy-performance/cache-stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_strategy_performance_cache_stats():
+    """
+    Get strategy performance snapshot cache statistics
+    
+    Returns:
+        200: Hit rate, TTL and snapshot age per template
+        401: Unauthorized
+    """
+    from core.extraction.strategy_performance_cache import get_strategy_performance_cache
+    
+    return APIResponse.success(
+        get_strategy_performance_cache().get_stats(),
+        "Strategy performance cache statistics retrieved successfully"
+    )
+
+
+@learning_bp.route('/db-pool/stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_db_pool_stats():
+    """
+    Get SQLite connection pool statistics of this process
+    
+    Returns:
+        200: Created/reused/returned connection counters
+        401: Unauthorized
+    """
+    from database.db_manager import DatabaseManager
+    
+    return APIResponse.success(
+        DatabaseManager().get_pool_stats(),
+        "Connection pool statistics retrieved successfully"
+    )
+
+
+@learning_bp.route('/db-writer/stats', methods=['GET'])
+@handle_errors
+@require_auth
+@require_role('admin')
+def get_db_writer_stats():
+    """
+    Get single-writer queue statistics of this process
+    
+    Returns:
+        200: Queue depth, batch size and commit latency metrics
+        401: Unauthorized
+    """
+    from database.write_queue import get_sqlite_writer
+    
+    return APIResponse.success(
+        get_sqlite_writer().get_stats(),
+        "Writer statistics retrieved successfully"
+    )
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk extraction throughput: in-process vs worker processes
+
+Re-extracts the stored PDFs of a template's documents (results are not
+saved) with 1, 2, 4, ... worker processes up to the CPU count.
+
+Usage:
+    python benchmark_bulk_extraction.py <template_id> [max_documents] [max_workers]
+"""
+
+import os
+import time
+from database.db_manager import DatabaseManager
+from core.templates.config_loader import get_config_loader
+from core.extraction.bulk_extraction import extract_files
+
+
+def benchmark_bulk_extraction(template_id: int, max_documents: int = 32, max_workers: int = None):
+    """Measure documents/second per worker count and check result parity"""
+
+    print(f"\n{'='*60}")
+    print(f"🔍 BENCHMARK BULK EXTRACTION")
+    print(f"{'='*60}\n")
+
+    db = DatabaseManager()
+    config = get_config_loader(db_manager=db).load_config(template_id)
+    if not config:
+        print(f"❌ Failed to load config for template {template_id}")
+        return None
+
+    model_path = os.path.join("models", f"template_{template_id}_model.joblib")
+    if not os.path.exists(model_path):
+        model_path = None
+
+    rows = db.execute_query(
+        "SELECT file_path FROM documents WHERE template_id = ? ORDER BY id DESC LIMIT ?",
+        (template_id, max_documents),
+    )
+    filepaths = [row["file_path"] for row in rows if os.path.exists(row["file_path"])]
+    if not filepaths:
+        print("❌ No documents available for benchmark")
+        return None
+
+    max_workers = max_workers or os.cpu_count() or 1
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != max_workers:
+        worker_counts.append(max_workers)
+
+    timings = {}
+    reference = None
+    mismatches = 0
+    for workers in worker_counts:
+        start = time.time()
+        outcomes = sorted(extract_files(config, model_path, filepaths, workers=workers), key=lambda o: o[0])
+        timings[workers] = time.time() - start
+
+        extracted = [(results or {}).get("extracted_data") for _index, results, _error in outcomes]
+        if reference is None:
+            reference = extracted
+        else:
+            mismatches += sum(1 for a, b in zip(reference, extracted) if a != b)
+
+        errors = sum(1 for _index, _results, error in outcomes if error)
+        print(
+            f"⚙️  {workers} worker(s): {timings[workers]:.2f}s, "
+            f"{len(filepaths) / timings[workers]:.2f} docs/s, {errors} error(s)"
+        )
+
+    print(f"\n{'='*60}")
+    print(f"📊 BENCHMARK RESULTS")
+    print(f"{'='*60}\n")
+    print(f"Documents: {len(filepaths)}, CRF model: {'yes' if model_path else 'no'}")
+    for workers, elapsed in timings.items():
+        print(f"{workers:>3} worker(s): {timings[1] / elapsed:.2f}x speedup")
+    print(f"{'─'*60}")
+    print(f"Documents with different results: {mismatches}")
+    print()
+
+    return {"timings": timings, "documents": len(filepaths), "mismatches": mismatches}
+
+
+if __name__ == "__main__":
+    import sys
+
+    template_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    max_documents = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    benchmark_bulk_extraction(template_id, max_documents, max_workers)
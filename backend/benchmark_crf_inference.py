@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark CRF inference: crfsuite tagger vs NumPy inference engine
+
+Usage:
+    python benchmark_crf_inference.py <template_id> [max_documents]
+"""
+
+import os
+import time
+from database.db_manager import DatabaseManager
+from core.templates.config_loader import get_config_loader
+from core.extraction.crf_strategy import CRFExtractionStrategy
+from core.extraction.hybrid_strategy import HybridExtractionStrategy
+
+
+def _decode_all(strategy, words, fields, engine, constrained=False):
+    strategy.inference_engine = engine
+    strategy.constrained_decoding = constrained
+    strategy._reset_document_cache()
+
+    start = time.time()
+    strategy.predict_batch(words, fields)
+    elapsed = time.time() - start
+
+    predictions = {
+        key: (labels, marginals)
+        for key, (_words, labels, marginals) in strategy._batch_predictions.items()
+    }
+    return elapsed, predictions
+
+
+def benchmark_inference(template_id: int, max_documents: int = 10):
+    """Benchmark CRF decoding for all fields of real documents"""
+
+    print(f"\n{'='*60}")
+    print(f"🔍 BENCHMARK CRF INFERENCE")
+    print(f"{'='*60}\n")
+
+    model_path = os.path.join("models", f"template_{template_id}_model.joblib")
+    if not os.path.exists(model_path):
+        print(f"❌ Model not found: {model_path}")
+        return None
+
+    db = DatabaseManager()
+    config = get_config_loader(db_manager=db).load_config(template_id)
+    if not config:
+        print(f"❌ Failed to load config for template {template_id}")
+        return None
+    fields = config.get("fields", {})
+
+    documents = db.execute_query(
+        """
+        SELECT id, file_path FROM documents
+        WHERE template_id = ?
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (template_id, max_documents),
+    )
+
+    strategy = CRFExtractionStrategy(model_path)
+    hybrid = HybridExtractionStrategy(db)
+
+    totals = {"crfsuite": 0.0, "numpy": 0.0, "numpy_constrained": 0.0}
+    sequences = 0
+    label_mismatches = 0
+    max_marginal_diff = 0.0
+    tokens = 0
+
+    for doc in documents:
+        if not os.path.exists(doc["file_path"]):
+            continue
+
+        words = hybrid._extract_words_from_pdf(doc["file_path"])
+        if not words:
+            continue
+        tokens += len(words)
+
+        t_crf, reference = _decode_all(strategy, words, fields, "crfsuite")
+        t_np, numpy_results = _decode_all(strategy, words, fields, "numpy")
+        t_np_c, _ = _decode_all(strategy, words, fields, "numpy", constrained=True)
+
+        totals["crfsuite"] += t_crf
+        totals["numpy"] += t_np
+        totals["numpy_constrained"] += t_np_c
+
+        # Parity check on the unconstrained path
+        for key, (ref_labels, ref_marginals) in reference.items():
+            labels, marginals = numpy_results[key]
+            sequences += 1
+            label_mismatches += sum(1 for a, b in zip(labels, ref_labels) if a != b)
+            for row, ref_row in zip(marginals, ref_marginals):
+                for label, value in ref_row.items():
+                    max_marginal_diff = max(max_marginal_diff, abs(row[label] - value))
+
+        print(
+            f"📄 Document {doc['id']}: {len(words)} words, "
+            f"crfsuite {t_crf*1000:.0f}ms | numpy {t_np*1000:.0f}ms | "
+            f"constrained {t_np_c*1000:.0f}ms"
+        )
+
+    if not sequences:
+        print("❌ No documents available for benchmark")
+        return None
+
+    print(f"\n{'='*60}")
+    print(f"📊 BENCHMARK RESULTS")
+    print(f"{'='*60}\n")
+    print(f"Documents: {len(documents)}, fields: {len(fields)}, sequences: {sequences}, tokens: {tokens}")
+    print(f"crfsuite (tag + marginals):   {totals['crfsuite']:.3f}s")
+    print(f"numpy (unconstrained):        {totals['numpy']:.3f}s "
+          f"({totals['crfsuite'] / max(totals['numpy'], 1e-9):.1f}x)")
+    print(f"numpy (constrained O/B/I):    {totals['numpy_constrained']:.3f}s "
+          f"({totals['crfsuite'] / max(totals['numpy_constrained'], 1e-9):.1f}x)")
+    print(f"{'─'*60}")
+    print(f"Label mismatches (unconstrained): {label_mismatches}")
+    print(f"Max marginal difference:          {max_marginal_diff:.2e}")
+    print()
+
+    return {
+        "times": totals,
+        "sequences": sequences,
+        "label_mismatches": label_mismatches,
+        "max_marginal_diff": max_marginal_diff,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    template_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    max_documents = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    benchmark_inference(template_id, max_documents)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-query overhead: fresh SQLite connections vs connection pool
+
+Usage:
+    python benchmark_db_pool.py [iterations] [threads]
+"""
+
+import sys
+import threading
+import time
+from database.db_manager import DatabaseManager
+from database.connection_pool import ConnectionPool
+
+
+def _run_queries(db: DatabaseManager, iterations: int) -> None:
+    for _ in range(iterations):
+        # Same shape as repository calls: get_connection, one query, close
+        conn = db.get_connection()
+        conn.execute("SELECT COUNT(*) FROM templates").fetchone()
+        conn.close()
+
+
+def _time_pool(db: DatabaseManager, pool: ConnectionPool, iterations: int, threads: int):
+    db.pool = pool
+    _run_queries(db, 10)  # warm-up
+
+    workers = [
+        threading.Thread(target=_run_queries, args=(db, iterations))
+        for _ in range(threads)
+    ]
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.time() - start
+
+    pool.close_all()
+    return elapsed, pool.get_stats()
+
+
+def benchmark_pool(iterations: int = 2000, threads: int = 1):
+    """Benchmark get_connection + query + close with and without pooling"""
+
+    print(f"\n{'='*60}")
+    print(f"🔍 BENCHMARK DB CONNECTION POOL")
+    print(f"{'='*60}\n")
+
+    db = DatabaseManager()
+    original_pool = db.pool
+    total = iterations * threads
+    print(f"📁 Database: {db.db_path}")
+    print(f"🔁 {iterations} queries x {threads} thread(s)\n")
+
+    results = {}
+    for label, pool in (
+        ("fresh connection", ConnectionPool(db.db_path, enabled=False)),
+        ("pooled", ConnectionPool(db.db_path, enabled=True)),
+    ):
+        elapsed, stats = _time_pool(db, pool, iterations, threads)
+        results[label] = elapsed
+        print(
+            f"   {label:<18} {elapsed:.3f}s total, "
+            f"{elapsed / total * 1e6:.1f}µs/query "
+            f"(created={stats['created']}, reused={stats['reused']})"
+        )
+
+    db.pool = original_pool
+
+    speedup = results["fresh connection"] / results["pooled"] if results["pooled"] else 0
+    print(f"\n⚡ Speedup: {speedup:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    benchmark_pool(iterations, threads)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the document-level layout feature builder used for CRF training
+
+Compares the previous per-word layout computation (every word rescans the
+whole document) with DocumentLayout on synthetic 500, 2,000 and 10,000 word
+documents, and checks that the feature dicts are identical (values and types).
+
+Usage:
+    python benchmark_feature_builder.py [seed]
+"""
+
+import random
+import time
+from core.learning.learner import AdaptiveLearner
+from tests.layout_reference import LAYOUT_KEYS, legacy_layout_features, make_document
+
+
+def same_value(a, b) -> bool:
+    return type(a) is type(b) and a == b
+
+
+def benchmark_feature_builder(seed: int = 42, sizes=(500, 2000, 10000), legacy_sample: int = 200):
+    """Time legacy vs document-level layout features and check parity"""
+
+    print(f"\n{'='*60}")
+    print(f"🔍 BENCHMARK TRAINING FEATURE BUILDER")
+    print(f"{'='*60}\n")
+
+    rng = random.Random(seed)
+    learner = AdaptiveLearner()
+    results = {}
+
+    for size in sizes:
+        words = make_document(size, rng)
+
+        # New: layout once per document, then every word's features
+        start = time.perf_counter()
+        layout = learner._build_document_layout(words)
+        layout_time = time.perf_counter() - start
+        start = time.perf_counter()
+        features = [learner._extract_word_features(w, words, i, layout=layout) for i, w in enumerate(words)]
+        features_time = time.perf_counter() - start
+
+        # Legacy: per-word layout on a sample, extrapolated to the document
+        indices = sorted(rng.sample(range(size), min(legacy_sample, size)))
+        start = time.perf_counter()
+        legacy = {i: legacy_layout_features(learner, words, i) for i in indices}
+        legacy_time = (time.perf_counter() - start) * size / len(indices)
+
+        # Parity: layout keys on every sampled word, full dict vs per-word path
+        mismatches = 0
+        for i in indices:
+            if any(not same_value(features[i][key], legacy[i][key]) for key in LAYOUT_KEYS):
+                mismatches += 1
+                continue
+            standalone = learner._extract_word_features(words[i], words, i)
+            if standalone.keys() != features[i].keys() or any(
+                not same_value(standalone[key], features[i][key]) for key in standalone
+            ):
+                mismatches += 1
+
+        results[size] = {
+            'legacy_layout': legacy_time,
+            'layout': layout_time,
+            'features': features_time,
+            'mismatches': mismatches,
+            'checked': len(indices),
+        }
+        print(
+            f"⚙️  {size:>6} words: legacy layout {legacy_time:8.2f}s"
+            f"{' (extrapolated)' if len(indices) < size else ''}, "
+            f"document layout {layout_time * 1000:7.1f}ms, all features {features_time:.2f}s"
+        )
+
+    print(f"\n{'='*60}")
+    print(f"📊 BENCHMARK RESULTS")
+    print(f"{'='*60}\n")
+    print(f"{'Words':>8} {'Legacy':>10} {'Layout':>10} {'Speedup':>10} {'Mismatch':>10}")
+    print(f"{'─'*60}")
+    for size, r in results.items():
+        print(
+            f"{size:>8} {r['legacy_layout']:>9.2f}s {r['layout']:>9.3f}s "
+            f"{r['legacy_layout'] / r['layout']:>9.0f}x {r['mismatches']:>4}/{r['checked']}"
+        )
+    print()
+
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 42
+    benchmark_feature_builder(seed)
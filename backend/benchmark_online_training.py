@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark online incremental CRF updates against L-BFGS retraining
+
+Simulates the auto-training loop on synthetic form documents: an initial
+L-BFGS model, then batches of newly validated documents whose layout
+drifts (other label wording, shifted columns). After every batch each
+strategy updates its model and is scored on held-out documents of all
+layouts seen so far:
+- full:        L-BFGS on every document so far (FULL_RETRAIN_INTERVAL run)
+- lbfgs-new:   L-BFGS on the new batch only (previous incremental mode)
+- online:      passive-aggressive updates on the new batch (OnlineCRF)
+
+Usage:
+    python benchmark_online_training.py [batches] [batch_size] [seed]
+"""
+
+import random
+import time
+from core.learning.learner import AdaptiveLearner
+from tests.form_documents import make_document, make_sequences
+
+
+def evaluate(learner: AdaptiveLearner, X_test, y_test):
+    results = learner.evaluate(X_test, y_test)
+    return results['accuracy'], results['f1']
+
+
+def benchmark_online_training(batches: int = 4, batch_size: int = 10, seed: int = 42):
+    """Compare update time and held-out accuracy of the incremental strategies"""
+
+    print(f"\n{'='*60}")
+    print(f"🔄 BENCHMARK ONLINE INCREMENTAL TRAINING")
+    print(f"{'='*60}\n")
+
+    rng = random.Random(seed)
+    builder = AdaptiveLearner()
+
+    def make_batch(variant, count):
+        return make_sequences(builder, [make_document(variant, rng) for _ in range(count)])
+
+    X_seen, y_seen = make_batch(0, 40)
+    print(f"📊 Initial model: {len(X_seen)} sequences (layout 0), {batches} batches x {batch_size} documents")
+
+    base = AdaptiveLearner()
+    base.train(X_seen, y_seen, max_iterations=1000, skip_evaluation=True)
+
+    online = AdaptiveLearner()
+    online.model = base.model
+    learners = {'full': base, 'lbfgs-new': base, 'online': online}
+
+    X_test, y_test = make_batch(0, 10)
+    totals = {name: 0.0 for name in learners}
+    rows = []
+
+    for batch in range(1, batches + 1):
+        variant = min(batch, 3)
+        X_new, y_new = make_batch(variant, batch_size)
+        X_seen, y_seen = X_seen + X_new, y_seen + y_new
+        X_more, y_more = make_batch(variant, 5)
+        X_test, y_test = X_test + X_more, y_test + y_more
+
+        for name in learners:
+            start = time.time()
+            if name == 'full':
+                learner = AdaptiveLearner()
+                learner.train(X_seen, y_seen, max_iterations=1000, skip_evaluation=True)
+            elif name == 'lbfgs-new':
+                learner = AdaptiveLearner()
+                learner.train(X_new, y_new, max_iterations=500, skip_evaluation=True)
+            else:
+                learner = learners[name]
+                learner.online_train(X_new, y_new)
+            elapsed = time.time() - start
+            learners[name] = learner
+            totals[name] += elapsed
+
+            accuracy, f1 = evaluate(learner, X_test, y_test)
+            rows.append((batch, name, elapsed, accuracy, f1))
+            print(f"   Batch {batch} {name:<10} {elapsed:7.3f}s  accuracy {accuracy:.4f}  F1 {f1:.4f}")
+
+    print(f"\n{'='*60}")
+    print(f"📊 BENCHMARK RESULTS (after batch {batches}, {len(X_test)} held-out sequences)")
+    print(f"{'='*60}\n")
+    print(f"{'Strategy':<12}{'Update time':>14}{'Accuracy':>12}{'F1':>10}")
+    print(f"{'─'*48}")
+    final = {row[1]: row for row in rows if row[0] == batches}
+    for name in learners:
+        _, _, _, accuracy, f1 = final[name]
+        print(f"{name:<12}{totals[name] / batches:>13.3f}s{accuracy:>12.4f}{f1:>10.4f}")
+    print(f"\n(Update time: mean per batch)\n")
+
+    return {'rows': rows, 'mean_update_time': {k: v / batches for k, v in totals.items()}}
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [int(a) for a in sys.argv[1:4]]
+    benchmark_online_training(*args)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel cross-validation / hyperparameter search
+
+Runs the same K-fold grid search over c1/c2 serially (in-process) and on
+the process-pool orchestrator, checks that both pick the same parameters
+with the same scores, and reports wall-clock speedup.
+
+Usage:
+    python benchmark_parallel_training.py [workers] [documents] [folds]
+"""
+
+import os
+import random
+from core.learning.learner import AdaptiveLearner
+from core.learning.parallel_training import cross_validate, make_param_grid
+from tests.form_documents import make_document, make_sequences
+
+
+def benchmark_parallel_training(workers: int = 0, documents: int = 60, folds: int = 3):
+    """Compare serial and parallel grid search wall-clock time"""
+
+    print(f"\n{'='*60}")
+    print(f"🧪 BENCHMARK PARALLEL CROSS-VALIDATION")
+    print(f"{'='*60}\n")
+
+    rng = random.Random(42)
+    X, y = make_sequences(
+        AdaptiveLearner(), [make_document(rng.randint(0, 3), rng) for _ in range(documents)]
+    )
+    candidates = make_param_grid([0.01, 0.1, 0.5], [0.01, 0.1, 0.5])
+    workers = workers or (os.cpu_count() or 1)
+
+    print(f"📊 {len(X)} sequences, {len(candidates)} candidates x {folds} folds "
+          f"= {len(candidates) * folds} fits")
+
+    serial = cross_validate(X, y, candidates, n_folds=folds, workers=1)
+    print(f"   Serial:   {serial['wall_seconds']:7.2f}s")
+
+    parallel = cross_validate(X, y, candidates, n_folds=folds, workers=workers)
+    print(f"   Parallel: {parallel['wall_seconds']:7.2f}s ({parallel['workers']} workers)")
+
+    same = all(
+        a['params'] == b['params'] and a['accuracy'] == b['accuracy'] and a['f1'] == b['f1']
+        for a, b in zip(serial['results'], parallel['results'])
+    )
+
+    print(f"\n{'='*60}")
+    print(f"📊 BENCHMARK RESULTS")
+    print(f"{'='*60}\n")
+    print(f"Best params:        {parallel['best']['params']} "
+          f"(CV accuracy {parallel['best']['accuracy']:.4f})")
+    print(f"Wall-clock speedup: {serial['wall_seconds'] / parallel['wall_seconds']:.2f}x "
+          f"on {parallel['workers']} workers")
+    print(f"Identical results:  {'✅ yes' if same else '❌ no'}\n")
+
+    return {
+        'serial_seconds': serial['wall_seconds'],
+        'parallel_seconds': parallel['wall_seconds'],
+        'workers': parallel['workers'],
+        'identical': same,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [int(a) for a in sys.argv[1:4]]
+    benchmark_parallel_training(*args)
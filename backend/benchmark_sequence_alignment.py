@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark BIO sequence alignment on a template's training corpus
+
+Runs AdaptiveLearner._find_best_sequence_match and the previous exhaustive
+window scan on every (document, value) pair training would label: feedback
+corrections and the extracted values of validated documents. Reports the
+time of both and the pairs whose matched indices differ (expected: 0).
+
+Usage:
+    python benchmark_sequence_alignment.py <template_id>
+"""
+
+import json
+import time
+from database.db_manager import DatabaseManager
+from core.extraction.word_cache import get_word_cache
+from core.learning.learner import AdaptiveLearner
+from database.repositories.document_repository import DocumentRepository
+from database.repositories.feedback_repository import FeedbackRepository
+
+
+def exhaustive_sequence_match(learner: AdaptiveLearner, word_texts, target_tokens):
+    """_find_best_sequence_match as it was before the indexed alignment"""
+    if not target_tokens:
+        return []
+
+    best_match_indices = []
+    best_match_score = 0
+
+    for start_idx in range(len(word_texts)):
+        for end_idx in range(start_idx + 1, min(start_idx + len(target_tokens) * 2, len(word_texts) + 1)):
+            candidate_words = word_texts[start_idx:end_idx]
+            score = learner._calculate_sequence_match_score(candidate_words, target_tokens)
+            if score > best_match_score:
+                best_match_score = score
+                best_match_indices = list(range(start_idx, end_idx))
+
+    if best_match_score < 0.5:
+        best_match_indices = []
+        for token in target_tokens:
+            try:
+                idx = word_texts.index(token)
+                if idx not in best_match_indices:
+                    best_match_indices.append(idx)
+            except ValueError:
+                for i, word in enumerate(word_texts):
+                    if i not in best_match_indices and learner._fuzzy_match(word, token):
+                        best_match_indices.append(i)
+                        break
+
+    return sorted(best_match_indices)
+
+
+def load_corpus(template_id: int):
+    """(word_texts, target_tokens) pairs of a template's training data"""
+    db = DatabaseManager()
+    document_repo = DocumentRepository(db)
+    values_by_doc = {}
+
+    for feedback in FeedbackRepository(db).find_for_training(template_id, unused_only=False):
+        values_by_doc.setdefault(feedback["document_id"], []).append(feedback["corrected_value"])
+
+    for document in document_repo.find_validated_documents(template_id):
+        extracted = json.loads(document.extraction_result or "{}").get("extracted_data", {})
+        values_by_doc.setdefault(document.id, []).extend(v for v in extracted.values() if v)
+
+    corpus = []
+    for doc_id, values in values_by_doc.items():
+        document = document_repo.find_by_id(doc_id)
+        if not document:
+            continue
+        try:
+            words = get_word_cache().get_words(document.file_path, x_tolerance=3, y_tolerance=3)
+        except Exception as e:
+            print(f"⚠️  Skipping document {doc_id}: {e}")
+            continue
+        word_texts = [w["text"] for w in words]
+        corpus.extend((word_texts, str(value).split()) for value in values)
+    return corpus
+
+
+def benchmark_sequence_alignment(template_id: int):
+    """Compare indexed and exhaustive alignment (time and matched indices)"""
+
+    print(f"\n{'='*60}")
+    print(f"🔍 BENCHMARK SEQUENCE ALIGNMENT")
+    print(f"{'='*60}\n")
+
+    corpus = load_corpus(template_id)
+    if not corpus:
+        print(f"❌ No training data for template {template_id}")
+        return None
+    print(f"📊 Pairs: {len(corpus)} (document, value)")
+
+    learner = AdaptiveLearner()
+
+    start = time.time()
+    indexed = [learner._find_best_sequence_match(w, t) for w, t in corpus]
+    indexed_time = time.time() - start
+
+    start = time.time()
+    exhaustive = [exhaustive_sequence_match(learner, w, t) for w, t in corpus]
+    exhaustive_time = time.time() - start
+
+    mismatches = sum(1 for a, b in zip(indexed, exhaustive) if a != b)
+
+    print(f"\n{'='*60}")
+    print(f"📊 BENCHMARK RESULTS")
+    print(f"{'='*60}\n")
+    print(f"Exhaustive scan:   {exhaustive_time:.3f}s")
+    print(f"Indexed alignment: {indexed_time:.3f}s")
+    print(f"{'─'*60}")
+    print(f"Speedup:           {exhaustive_time / indexed_time if indexed_time else 0:.1f}x")
+    print(f"Different indices: {mismatches}")
+    print()
+
+    return {"exhaustive": exhaustive_time, "indexed": indexed_time, "mismatches": mismatches}
+
+
+if __name__ == "__main__":
+    import sys
+
+    template_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    benchmark_sequence_alignment(template_id)
@@ -0,0 +1,132 @@
+"""
+Parallel Bulk Extraction
+Fans the PDFs of a bulk upload out over worker processes.
+
+Extraction is CPU-bound (pdfplumber layout analysis, crfsuite tagging), so
+threads do not help under the GIL. Bulk extraction uses a process pool
+instead:
+- the pool initializer builds one DataExtractor per worker and warms the
+  process caches (CRF model registry, compiled learned patterns), so
+  template state is loaded once per worker instead of once per file
+- workers only extract; document rows are created and updated by the
+  calling process, so per-file errors are reported exactly as before
+- workers are spawned (not forked): they must not inherit SQLite
+  connections or locks from the API process
+
+Small uploads (< BULK_EXTRACTION_MIN_FILES) are extracted in-process with
+a single DataExtractor, since spawning workers costs about a second.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (index, results, error)
+ExtractionOutcome = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+# Per-worker-process extractor (set by _init_worker)
+_worker_extractor = None
+
+
+def get_bulk_extraction_workers(file_count: int) -> int:
+    """
+    Number of worker processes for a bulk upload
+
+    Args:
+        file_count: Number of files to extract
+
+    Returns:
+        Worker count (1 = extract in-process)
+    """
+    workers = int(os.getenv('BULK_EXTRACTION_WORKERS', '0')) or (os.cpu_count() or 1)
+    min_files = int(os.getenv('BULK_EXTRACTION_MIN_FILES', '4'))
+    if file_count < max(min_files, 2):
+        return 1
+    return max(1, min(workers, file_count))
+
+
+def _init_worker(template_config: Dict[str, Any], model_path: Optional[str]):
+    """Pool initializer: load template state once per worker process"""
+    global _worker_extractor
+
+    from core.extraction.extractor import DataExtractor
+
+    _worker_extractor = DataExtractor(template_config, model_path)
+
+    # Warm process-wide caches used by every extraction
+    if model_path:
+        from core.extraction.model_registry import get_model_registry
+
+        get_model_registry().get(model_path)
+
+    template_id = template_config.get('template_id')
+    fields = template_config.get('fields') or {}
+    if template_id and fields:
+        from core.extraction.pattern_registry import get_pattern_registry
+
+        # One lookup loads and compiles the patterns of the whole template
+        get_pattern_registry().get_patterns(template_id, next(iter(fields)))
+
+
+def _extract_in_worker(index: int, filepath: str) -> ExtractionOutcome:
+    """Extract one file with the worker's preloaded extractor"""
+    try:
+        return index, _worker_extractor.extract(filepath), None
+    except Exception as e:
+        logger.error(f"Failed to extract {os.path.basename(filepath)}: {e}")
+        return index, None, str(e)
+
+
+def extract_files(
+    template_config: Dict[str, Any],
+    model_path: Optional[str],
+    filepaths: List[str],
+    workers: int = None,
+) -> Iterator[ExtractionOutcome]:
+    """
+    Extract files, in parallel when worth it
+
+    Args:
+        template_config: Template configuration
+        model_path: Path to CRF model (None = rule/position based only)
+        filepaths: PDF paths
+        workers: Worker processes (default: get_bulk_extraction_workers)
+
+    Yields:
+        (index into filepaths, results or None, error or None), in completion order
+    """
+    if workers is None:
+        workers = get_bulk_extraction_workers(len(filepaths))
+
+    if workers <= 1:
+        from core.extraction.extractor import DataExtractor
+
+        extractor = DataExtractor(template_config, model_path)
+        for index, filepath in enumerate(filepaths):
+            try:
+                yield index, extractor.extract(filepath), None
+            except Exception as e:
+                logger.error(f"Failed to extract {os.path.basename(filepath)}: {e}")
+                yield index, None, str(e)
+        return
+
+    logger.info(f"⚡ Extracting {len(filepaths)} files with {workers} worker processes")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(template_config, model_path),
+    ) as pool:
+        futures = {
+            pool.submit(_extract_in_worker, index, filepath): index
+            for index, filepath in enumerate(filepaths)
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker crashed (e.g. killed); report the file, keep the others
+                yield futures[future], None, f"Extraction worker failed: {e}"
@@ -0,0 +1,323 @@
+"""
+NumPy CRF Inference Engine
+Dense re-implementation of linear-chain CRF decoding for trained
+sklearn-crfsuite models.
+
+The crfsuite tagger decodes over every label of the template and needs two
+passes (predict + predict_marginals). This engine exports the learned
+weights into dense matrices once per model and computes state scores a
+single time per sequence, reusing them for Viterbi and forward-backward.
+
+Unconstrained decoding gives the same labels as crfsuite. Marginals agree
+to about 1e-5, because sklearn-crfsuite exposes the weights through the
+crfsuite text dump, which rounds them to six decimals.
+
+Constrained decoding restricts the label space to {O, B-<FIELD>,
+I-<FIELD>} of the field being extracted. That is 3 labels instead of
+2F+1, and the marginals are renormalized within that subspace.
+"""
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Finite stand-in for -inf so exp() underflows to 0 without NaNs
+_NEG_INF = -1e9
+
+
+class NumpyCRFInference:
+    """
+    Viterbi and forward-backward over dense CRF weights
+    """
+
+    def __init__(self, model):
+        """
+        Export model weights into dense matrices
+
+        Args:
+            model: Trained sklearn_crfsuite.CRF instance
+        """
+        self.labels: List[str] = list(model.classes_)
+        self.label_index = {label: i for i, label in enumerate(self.labels)}
+        n_labels = len(self.labels)
+
+        # State weights: one row per attribute, one column per label
+        self.attr_index: Dict[str, int] = {}
+        rows, cols, weights = [], [], []
+        for (attr, label), weight in model.state_features_.items():
+            col = self.label_index.get(label)
+            if col is None:
+                continue
+            row = self.attr_index.setdefault(attr, len(self.attr_index))
+            rows.append(row)
+            cols.append(col)
+            weights.append(weight)
+
+        self.state_weights = np.zeros((len(self.attr_index), n_labels))
+        if rows:
+            self.state_weights[rows, cols] = weights
+
+        self.transitions = np.zeros((n_labels, n_labels))
+        for (label_from, label_to), weight in model.transition_features_.items():
+            if label_from in self.label_index and label_to in self.label_index:
+                self.transitions[
+                    self.label_index[label_from], self.label_index[label_to]
+                ] = weight
+
+    @classmethod
+    def from_weights(
+        cls,
+        labels: List[str],
+        attr_index: Dict[str, int],
+        state_weights: np.ndarray,
+        transitions: np.ndarray,
+    ) -> "NumpyCRFInference":
+        """
+        Build an engine over existing dense weights (no crfsuite model)
+
+        Args:
+            labels: Label names (column order)
+            attr_index: Attribute name -> row of state_weights
+            state_weights: Array of shape (n_attrs, n_labels)
+            transitions: Array of shape (n_labels, n_labels)
+
+        Returns:
+            NumpyCRFInference instance
+        """
+        engine = cls.__new__(cls)
+        engine.labels = list(labels)
+        engine.label_index = {label: i for i, label in enumerate(engine.labels)}
+        engine.attr_index = attr_index
+        engine.state_weights = state_weights
+        engine.transitions = transitions
+        return engine
+
+    def state_scores(self, xseq: List[Dict]) -> np.ndarray:
+        """
+        Compute per-token label scores for a feature sequence
+
+        Attributes follow python-crfsuite conventions: string values become
+        "name:value" with weight 1.0, numbers and booleans keep "name" with
+        their float value. Unknown attributes are ignored.
+
+        Args:
+            xseq: List of feature dicts
+
+        Returns:
+            Array of shape (len(xseq), n_labels)
+        """
+        token_ids, attr_ids, values = [], [], []
+        attr_index = self.attr_index
+
+        for t, item in enumerate(xseq):
+            for name, value in item.items():
+                if isinstance(value, str):
+                    key = f"{name}:{value}"
+                    value = 1.0
+                else:
+                    key = name
+                    value = float(value)
+                    if value == 0.0:
+                        continue
+                attr_id = attr_index.get(key)
+                if attr_id is not None:
+                    token_ids.append(t)
+                    attr_ids.append(attr_id)
+                    values.append(value)
+
+        scores = np.zeros((len(xseq), len(self.labels)))
+        if attr_ids:
+            contributions = self.state_weights[attr_ids] * np.asarray(values)[:, None]
+            np.add.at(scores, np.asarray(token_ids), contributions)
+        return scores
+
+    def decode(
+        self, scores: np.ndarray, target_field: Optional[str] = None
+    ) -> Tuple[List[str], List[Dict[str, float]]]:
+        """
+        Run Viterbi and forward-backward on precomputed state scores
+
+        Args:
+            scores: State scores from state_scores() (may include overlays)
+            target_field: Restrict decoding to O/B-/I- labels of this field
+
+        Returns:
+            Tuple of (predicted labels, per-token marginals)
+        """
+        return self.decode_batch(scores[None], [target_field])[0]
+
+    def decode_batch(
+        self, scores: np.ndarray, target_fields: List[Optional[str]]
+    ) -> List[Tuple[List[str], List[Dict[str, float]]]]:
+        """
+        Decode several sequences of the same document in one vectorized pass
+
+        All fields of a document share the token sequence, so their score
+        matrices are stacked and Viterbi / forward-backward step through the
+        tokens once for every field at the same time.
+
+        Args:
+            scores: Array of shape (n_fields, n_tokens, n_labels)
+            target_fields: Per sequence, field to constrain to (or None)
+
+        Returns:
+            List of (predicted labels, per-token marginals) tuples
+        """
+        n_seqs, n_tokens, _ = scores.shape
+        if n_tokens == 0:
+            return [([], []) for _ in range(n_seqs)]
+
+        results: List[Optional[tuple]] = [None] * n_seqs
+
+        # Unconstrained sequences run over the full label space
+        full = [i for i, field in enumerate(target_fields) if not field]
+        if full:
+            decoded = self._decode_stacked(
+                scores[full], self.transitions, [self.labels] * len(full)
+            )
+            for i, result in zip(full, decoded):
+                results[i] = result
+
+        # Constrained sequences run over their own {O, B-F, I-F} subspace
+        constrained = []
+        subsets, label_sets = [], []
+        for i, field in enumerate(target_fields):
+            if not field:
+                continue
+            wanted = ("O", f"B-{field.upper()}", f"I-{field.upper()}")
+            present = [label in self.label_index for label in wanted]
+            if sum(present) < 2 or not (present[1] or present[2]):
+                # Model never learned this field - nothing to tag
+                results[i] = (["O"] * n_tokens, [{"O": 1.0} for _ in range(n_tokens)])
+                continue
+            constrained.append(i)
+            subsets.append([self.label_index.get(label, 0) for label in wanted])
+            label_sets.append(list(wanted))
+
+        if constrained:
+            subset_idx = np.asarray(subsets)  # (k, 3)
+            sub_scores = np.take_along_axis(
+                scores[constrained], subset_idx[:, None, :], axis=2
+            )
+            sub_trans = self.transitions[subset_idx[:, :, None], subset_idx[:, None, :]]
+
+            # Labels missing from the model get a prohibitive state score
+            missing = np.array(
+                [[label not in self.label_index for label in wanted] for wanted in label_sets]
+            )
+            sub_scores[np.broadcast_to(missing[:, None, :], sub_scores.shape)] = _NEG_INF
+
+            decoded = self._decode_stacked(sub_scores, sub_trans, label_sets, missing)
+            for i, result in zip(constrained, decoded):
+                results[i] = result
+
+        return results
+
+    def tag(
+        self, xseq: List[Dict], target_field: Optional[str] = None
+    ) -> Tuple[List[str], List[Dict[str, float]]]:
+        """
+        Decode a feature sequence (state scores + decode in one call)
+
+        Args:
+            xseq: List of feature dicts
+            target_field: Restrict decoding to this field's labels
+
+        Returns:
+            Tuple of (predicted labels, per-token marginals)
+        """
+        return self.decode(self.state_scores(xseq), target_field)
+
+    def _decode_stacked(self, scores, transitions, label_sets, missing=None):
+        paths = self._viterbi(scores, transitions)
+        probabilities = self._marginals(scores, transitions)
+
+        results = []
+        for k, labels in enumerate(label_sets):
+            keep = [
+                j for j in range(len(labels))
+                if missing is None or not missing[k, j]
+            ]
+            predictions = [labels[j] for j in paths[k]]
+            marginals = [
+                {labels[j]: row[j] for j in keep}
+                for row in probabilities[k].tolist()
+            ]
+            results.append((predictions, marginals))
+        return results
+
+    @staticmethod
+    def _viterbi(scores: np.ndarray, transitions: np.ndarray) -> np.ndarray:
+        # scores: (S, T, L); transitions: (L, L) shared or (S, L, L) per sequence
+        n_seqs, n_tokens, n_labels = scores.shape
+        trans = transitions if transitions.ndim == 3 else transitions[None]
+        backpointers = np.zeros((n_seqs, n_tokens, n_labels), dtype=np.int64)
+        best = scores[:, 0].copy()
+
+        for t in range(1, n_tokens):
+            candidates = best[:, :, None] + trans
+            backpointers[:, t] = np.argmax(candidates, axis=1)
+            best = candidates.max(axis=1) + scores[:, t]
+
+        paths = np.zeros((n_seqs, n_tokens), dtype=np.int64)
+        paths[:, -1] = np.argmax(best, axis=1)
+        rows = np.arange(n_seqs)
+        for t in range(n_tokens - 1, 0, -1):
+            paths[:, t - 1] = backpointers[rows, t, paths[:, t]]
+        return paths
+
+    @staticmethod
+    def _marginals(scores: np.ndarray, transitions: np.ndarray) -> np.ndarray:
+        # Scaled forward-backward in probability space (as crfsuite does)
+        n_seqs, n_tokens, n_labels = scores.shape
+        exp_trans = np.exp(transitions if transitions.ndim == 3 else transitions[None])
+        exp_state = np.exp(scores - scores.max(axis=2, keepdims=True))
+
+        alpha = np.zeros((n_seqs, n_tokens, n_labels))
+        beta = np.ones((n_seqs, n_tokens, n_labels))
+        scale = np.zeros((n_seqs, n_tokens, 1))
+
+        alpha[:, 0] = exp_state[:, 0]
+        scale[:, 0] = alpha[:, 0].sum(axis=1, keepdims=True)
+        alpha[:, 0] /= scale[:, 0]
+        for t in range(1, n_tokens):
+            alpha[:, t] = np.matmul(alpha[:, t - 1, None, :], exp_trans)[:, 0] * exp_state[:, t]
+            scale[:, t] = alpha[:, t].sum(axis=1, keepdims=True)
+            alpha[:, t] /= scale[:, t]
+
+        for t in range(n_tokens - 2, -1, -1):
+            beta[:, t] = np.matmul(exp_trans, (exp_state[:, t + 1] * beta[:, t + 1])[:, :, None])[:, :, 0]
+            beta[:, t] /= scale[:, t + 1]
+
+        probabilities = alpha * beta
+        probabilities /= probabilities.sum(axis=2, keepdims=True)
+        return probabilities
+
+
+# Engines are cached per model object; dropping the model drops its engine
+_engines: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_engines_lock = threading.Lock()
+
+
+def get_inference_engine(model) -> NumpyCRFInference:
+    """
+    Get (or build) the NumPy inference engine for a trained model
+
+    Args:
+        model: Trained sklearn_crfsuite.CRF (or OnlineCRF) instance
+
+    Returns:
+        NumpyCRFInference instance
+    """
+    # Models updated online carry their own dense weights (OnlineCRF)
+    own_engine = getattr(model, "inference_engine_", None)
+    if own_engine is not None:
+        return own_engine
+
+    with _engines_lock:
+        engine = _engines.get(model)
+        if engine is None:
+            engine = NumpyCRFInference(model)
+            _engines[model] = engine
+        return engine
@@ -1,3 +1,4 @@
+import os
 from typing import Dict, List, Any, Optional
 from .strategies import ExtractionStrategy, FieldValue, get_field_locations
 
@@ -13,6 +14,19 @@ class CRFExtractionStrategy(ExtractionStrategy):
         self.model = None
         self.model_path = model_path
         self.model_mtime = None  # Track model file modification time
+        self._model_lock = None  # Shared with other users of the registry model
+        # Per-document caches, reset whenever a new word list comes in
+        self._document_words = None
+        self._base_feature_cache = {}  # id(words) -> (words, base features)
+        self._base_score_cache = {}  # id(words) -> (words, engine, scores)
+        self._roi_windows = {}  # ROI bounds -> cropped word list
+        self._batch_predictions = {}  # key -> (words, predictions, marginals)
+
+        # Optional NumPy inference engine (see crf_inference.py)
+        self.inference_engine = os.getenv("CRF_INFERENCE_ENGINE", "crfsuite").lower()
+        self.constrained_decoding = (
+            os.getenv("CRF_CONSTRAINED_DECODING", "false").lower() == "true"
+        )
 
         if model_path:
             self._load_model(model_path)
@@ -21,40 +35,47 @@ class CRFExtractionStrategy(ExtractionStrategy):
         """
         Load trained CRF model with hot reload support
 
+        Models are borrowed from the process-wide model registry, so the
+        joblib file is only read once per model version.
+
         Args:
             model_path: Path to model file
             force_reload: Force reload even if file hasn't changed
         """
         try:
-            import joblib
             import os
+            from .model_registry import get_model_registry
 
             if not os.path.exists(model_path):
                 self.model = None
                 self.model_mtime = None
+                self._model_lock = None
                 self.logger.error(f"❌ [CRF] Model file not found: {model_path}")
                 return
 
-            # Check if model file has been updated
-            current_mtime = os.path.getmtime(model_path)
+            registry = get_model_registry()
+            if force_reload:
+                registry.invalidate(model_path)
 
-            if (
-                not force_reload
-                and self.model is not None
-                and self.model_mtime == current_mtime
-            ):
+            entry = registry.get(model_path)
+            if entry is None:
+                self.model = None
+                self.model_mtime = None
+                self._model_lock = None
+                return
+
+            if self.model is entry.model and self.model_mtime == entry.mtime:
                 # Model already loaded and file hasn't changed
                 return
 
-            # print(f"🔍 [CRF] Loading model from: {model_path}")
-            self.model = joblib.load(model_path)
-            self.model_mtime = current_mtime
-            # print(f"✅ [CRF] Model loaded successfully (mtime: {current_mtime})")
-            # print(f"✅ [CRF] Model type: {type(self.model)}")
+            self.model = entry.model
+            self.model_mtime = entry.mtime
+            self._model_lock = entry.lock
+            self._reset_document_cache()
 
             # ✅ DEBUG: Show what labels the model knows
             if hasattr(self.model, "classes_"):
-                self.logger.info(f"📋 [CRF] Model knows these labels: {self.model.classes_}")
+                self.logger.debug(f"📋 [CRF] Model knows these labels: {self.model.classes_}")
 
         except Exception as e:
             self.logger.error(f"❌ [CRF] Error loading model: {e}")
@@ -63,6 +84,236 @@ class CRFExtractionStrategy(ExtractionStrategy):
             self.logger.error(traceback.format_exc())
             self.model = None
             self.model_mtime = None
+            self._model_lock = None
+
+    def _predict(self, features: List[Dict]):
+        """
+        Run Viterbi decoding and marginals for one sequence
+
+        Args:
+            features: Feature sequence
+
+        Returns:
+            Tuple of (predicted labels, per-token marginals)
+        """
+        return self._predict_sequences([features])[0]
+
+    def _predict_sequences(self, sequences: List[List[Dict]]) -> List[tuple]:
+        """
+        Decode several sequences in one pass over the crfsuite tagger
+
+        Equivalent to model.predict() followed by model.predict_marginals(),
+        but each sequence is loaded into the tagger once instead of twice.
+        The registry model may be shared between threads and the tagger is
+        stateful between set() and marginal(), so this runs under the model
+        lock.
+
+        Args:
+            sequences: List of feature sequences
+
+        Returns:
+            List of (predicted labels, per-token marginals) tuples
+        """
+        if self._model_lock is None:
+            return self._decode(sequences)
+        with self._model_lock:
+            return self._decode(sequences)
+
+    def _decode(self, sequences: List[List[Dict]]) -> List[tuple]:
+        engine = getattr(self.model, "inference_engine_", None)
+        if engine is not None:
+            # Online-updated model (OnlineCRF): no crfsuite tagger, dense weights only
+            return [engine.tag(xseq) for xseq in sequences]
+
+        tagger = self.model.tagger_
+        labels = tagger.labels()
+        results = []
+        for xseq in sequences:
+            # tag() loads the sequence; marginals reuse it without another set()
+            predictions = tagger.tag(xseq)
+            marginals = [
+                {label: tagger.marginal(label, i) for label in labels}
+                for i in range(len(xseq))
+            ]
+            results.append((predictions, marginals))
+        return results
+
+    @staticmethod
+    def _prediction_key(field_name: str, context: Dict) -> str:
+        import json
+
+        return f"{field_name}|{json.dumps(context, sort_keys=True, default=str)}"
+
+    def _decode_fields(
+        self, all_words: List[Dict], requests: List[tuple]
+    ) -> List[tuple]:
+        """
+        Decode (field_name, field_config, context) requests for one document
+
+        Uses the NumPy inference engine when CRF_INFERENCE_ENGINE=numpy or
+        the model was updated online (dense weights only), otherwise the
+        crfsuite tagger.
+
+        Args:
+            all_words: All extracted words from PDF
+            requests: List of (field_name, field_config, context) tuples
+
+        Returns:
+            List of (predicted labels, per-token marginals) tuples
+        """
+        dense_model = getattr(self.model, "inference_engine_", None) is not None
+        if self.inference_engine == "numpy" or dense_model:
+            try:
+                return self._decode_fields_numpy(all_words, requests)
+            except Exception as e:
+                self.logger.warning(
+                    f"⚠️ [CRF] NumPy inference failed, falling back to crfsuite: {e}"
+                )
+
+        sequences = [
+            self._extract_features(
+                all_words,
+                field_name,
+                field_config,
+                context,
+                target_field=field_name,  # ✅ FIELD-AWARE: target field indicator
+            )
+            for field_name, field_config, context in requests
+        ]
+        return self._predict_sequences(sequences)
+
+    def _decode_fields_numpy(
+        self, all_words: List[Dict], requests: List[tuple]
+    ) -> List[tuple]:
+        from .crf_inference import get_inference_engine
+
+        engine = get_inference_engine(self.model)
+
+        # Base feature scores are shared by every field of the document;
+        # each field only scores its own overlay features on top.
+        cached = self._base_score_cache.get(id(all_words))
+        if cached and cached[0] is all_words and cached[1] is engine:
+            base_scores = cached[2]
+        else:
+            base_scores = engine.state_scores(self._get_base_features(all_words))
+            self._base_score_cache[id(all_words)] = (all_words, engine, base_scores)
+
+        import numpy as np
+
+        scores = np.stack([
+            base_scores
+            + engine.state_scores(self._get_field_features(all_words, context, field_name))
+            for field_name, _field_config, context in requests
+        ])
+        target_fields = [
+            field_name if self.constrained_decoding else None
+            for field_name, _field_config, _context in requests
+        ]
+        return engine.decode_batch(scores, target_fields)
+
+    def _reset_document_cache(self, all_words: List[Dict] = None):
+        self._document_words = all_words
+        self._base_feature_cache = {}
+        self._base_score_cache = {}
+        self._roi_windows = {}
+        self._batch_predictions = {}
+
+    def _start_document(self, all_words: List[Dict]):
+        if self._document_words is not all_words:
+            self._reset_document_cache(all_words)
+
+    def _get_sequence_words(
+        self, all_words: List[Dict], field_config: Dict
+    ) -> List[Dict]:
+        """
+        Get the word sequence to tag for a field (ROI window or full document)
+
+        Fields sharing the same window get the same list object, so base
+        features are built once per window.
+
+        Args:
+            all_words: All extracted words from PDF
+            field_config: Field configuration
+
+        Returns:
+            Cropped word list, or all_words when ROI is disabled/empty
+        """
+        from .roi_window import is_roi_enabled, get_roi_bounds, select_roi_indices
+
+        if not is_roi_enabled():
+            return all_words
+
+        bounds = get_roi_bounds(field_config)
+        if bounds is None:
+            return all_words
+
+        self._start_document(all_words)
+        window = self._roi_windows.get(bounds)
+        if window is None:
+            indices = select_roi_indices(all_words, bounds)
+            window = [all_words[i] for i in indices] if indices else all_words
+            self._roi_windows[bounds] = window
+        return window
+
+    def predict_batch(self, all_words: List[Dict], fields: Dict[str, Dict]) -> int:
+        """
+        Predict every field (and every location) of a document in one batch
+
+        Results are kept for this word list and picked up by extract(), so
+        the per-field extraction flow stays unchanged.
+
+        Args:
+            all_words: All extracted words from PDF
+            fields: Template fields (field_name -> field_config)
+
+        Returns:
+            Number of sequences decoded
+        """
+        self.reload_model_if_updated()
+        if not self.model or not all_words:
+            return 0
+
+        self._start_document(all_words)
+
+        # Group requests by word sequence (ROI windows differ per field)
+        groups = {}
+        seen = set()
+        for field_name, field_config in fields.items():
+            locations = get_field_locations(field_config) or [{}]
+            for location in locations:
+                context = location.get("context", {}) or {}
+                key = self._prediction_key(field_name, context)
+                if key in seen:
+                    continue
+                seen.add(key)
+                location_config = dict(field_config, locations=[location])
+                words = self._get_sequence_words(all_words, location_config)
+                group = groups.setdefault(id(words), (words, []))
+                group[1].append((key, (field_name, field_config, context)))
+
+        decoded_count = 0
+        try:
+            for words, items in groups.values():
+                decoded = self._decode_fields(words, [request for _, request in items])
+                for (key, _request), (predictions, marginals) in zip(items, decoded):
+                    self._batch_predictions[key] = (words, predictions, marginals)
+                decoded_count += len(items)
+        except Exception as e:
+            self.logger.error(f"❌ [CRF] Batch prediction failed: {e}")
+            self._batch_predictions = {}
+            return 0
+
+        self.logger.info(
+            f"🤖 [CRF] Batch-decoded {decoded_count} sequences in {len(groups)} windows"
+        )
+        return decoded_count
+
+    def _get_batched_prediction(
+        self, all_words: List[Dict], field_name: str, context: Dict
+    ) -> Optional[tuple]:
+        if self._document_words is not all_words:
+            return None
+        return self._batch_predictions.get(self._prediction_key(field_name, context))
 
     def reload_model_if_updated(self):
         """Check and reload model if file has been updated"""
@@ -70,13 +321,13 @@ class CRFExtractionStrategy(ExtractionStrategy):
             self._load_model(self.model_path, force_reload=False)
 
     def extract(
-        self, pdf_path: str, field_config: Dict, all_words: List[Dict]
+        self, document: Any, field_config: Dict, all_words: List[Dict]
     ) -> Optional[FieldValue]:
         """
         Extract field using CRF model with hot reload support
 
         Args:
-            pdf_path: Path to PDF file
+            document: DocumentContext of the PDF (or path to PDF file)
             field_config: Field configuration
             all_words: All extracted words from PDF
 
@@ -99,24 +350,29 @@ class CRFExtractionStrategy(ExtractionStrategy):
             locations = get_field_locations(field_config)
             context = locations[0].get("context", {}) if locations else {}
 
-            # ✅ FIELD-AWARE: Prepare features with target field indicator
-            # This tells the model which field we're looking for
-            features = self._extract_features(
-                all_words,
-                field_name,
-                field_config,
-                context,
-                target_field=field_name,  # ✅ NEW: Pass target field
-            )
-
-            # Predict using CRF model
-            predictions = self.model.predict([features])[0]
-            marginals = self.model.predict_marginals([features])[0]
+            # Use batched predictions when the whole document was decoded at once
+            batched = self._get_batched_prediction(all_words, field_name, context)
+            if batched is not None:
+                words, predictions, marginals = batched
+            else:
+                words = self._get_sequence_words(all_words, field_config)
+                predictions, marginals = self._decode_fields(
+                    words, [(field_name, field_config, context)]
+                )[0]
 
             # Extract tokens labeled for this field
             target_label = f"B-{field_name.upper()}"
             inside_label = f"I-{field_name.upper()}"
 
+            # ROI window found nothing for this field - retry on the full document
+            if words is not all_words and not any(
+                pred in (target_label, inside_label) for pred in predictions
+            ):
+                words = all_words
+                predictions, marginals = self._decode_fields(
+                    all_words, [(field_name, field_config, context)]
+                )[0]
+
             # print(f"🔍 [CRF] Looking for labels: {target_label}, {inside_label}")
             # print(f"🔍 [CRF] Predictions sample (first 10): {predictions[:10]}")
             # print(f"🔍 [CRF] Unique labels in predictions: {set(predictions)}")
@@ -183,8 +439,8 @@ class CRFExtractionStrategy(ExtractionStrategy):
             # But enforce hard stop at next_field_y/X (adaptive, not hardcoded!)
             for i, (pred, marginal) in enumerate(zip(predictions, marginals)):
                 if pred in [target_label, inside_label]:
-                    if i < len(all_words):
-                        word = all_words[i]
+                    if i < len(words):
+                        word = words[i]
                         word_x0 = word.get("x0", 0)
                         word_y = word.get("top", 0)
                         word_text = word.get("text", "")
@@ -405,6 +661,10 @@ class CRFExtractionStrategy(ExtractionStrategy):
         Extract features from words for CRF model with context information
         MUST match exactly with AdaptiveLearner._extract_word_features!
 
+        Field-independent features are built once per document (see
+        _get_base_features); only the context, next-field and target-field
+        features (_get_field_features) are computed for each field.
+
         Args:
             words: List of word dictionaries
             field_name: Name of the field being extracted
@@ -412,20 +672,40 @@ class CRFExtractionStrategy(ExtractionStrategy):
             context: Context information (label, position, etc.)
             target_field: Target field name for field-aware features
         """
+        base_features = self._get_base_features(words)
+        overlay_features = self._get_field_features(words, context, target_field)
+
         features = []
+        for base, overlay in zip(base_features, overlay_features):
+            word_features = dict(base)
+            word_features.update(overlay)
+            features.append(word_features)
 
-        # ✅ NEW: Detect column structure from X-coordinates
-        x_coords = [w.get("x0", 0) for w in words]
-        column_boundaries = self._detect_column_boundaries(x_coords)
+        return features
 
-        # ✅ NEW: Detect line groups for text wrapping
-        line_groups = self._detect_line_groups(words)
+    def _get_field_features(
+        self, words: List[Dict], context: Dict, target_field: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build field-specific features (label context, next field, target field)
+
+        These keys never overlap with _build_base_features, so a full feature
+        dict is simply the union of both.
 
+        Args:
+            words: List of word dictionaries
+            context: Context information (label, position, etc.)
+            target_field: Target field name for field-aware features
+
+        Returns:
+            List of field-specific feature dicts, one per word
+        """
         # Extract context information
         label = context.get("label", "")
         label_pos = context.get("label_position", {})
         words_before = context.get("words_before", [])
         words_after = context.get("words_after", [])
+        next_field_y = context.get("next_field_y")
 
         # Build context text for matching
         context_before_text = " ".join(
@@ -435,62 +715,18 @@ class CRFExtractionStrategy(ExtractionStrategy):
             w.get("text", "") if isinstance(w, dict) else str(w) for w in words_after
         ).lower()
 
-        # Import regex for pattern matching
-        import re
-
-        for i, word in enumerate(words):
-            text = word.get("text", "")
+        features = []
+        for word in words:
+            word_features = {}
+            text_lower = word.get("text", "").lower()
             word_x = word.get("x0", 0)
             word_y = word.get("top", 0)
 
-            word_features = {
-                # Lexical features
-                "word": text,
-                "word.lower": text.lower(),
-                "word.isupper": text.isupper(),
-                "word.istitle": text.istitle(),
-                "word.isdigit": text.isdigit(),
-                "word.isalpha": text.isalpha(),
-                "word.isalnum": text.isalnum(),
-                "word.length": len(text),
-                # Orthographic features
-                "has_digit": any(c.isdigit() for c in text),
-                "has_upper": any(c.isupper() for c in text),
-                "has_hyphen": "-" in text,
-                "has_dot": "." in text,
-                "has_comma": "," in text,
-                "has_slash": "/" in text,
-                # Layout features (normalized)
-                "x0_norm": word.get("x0", 0) / 1000,
-                "y0_norm": word.get("top", 0) / 1000,
-                "width": (word.get("x1", 0) - word.get("x0", 0)) / 1000,
-                "height": (word.get("bottom", 0) - word.get("top", 0)) / 1000,
-                # ✅ NEW: Date-specific features (PATTERN-BASED, NOT HARDCODED!)
-                "is_capitalized_word": text.istitle()
-                and text.isalpha()
-                and len(text) > 2,  # Likely month/location
-                "is_year": text.isdigit()
-                and len(text) == 4
-                and 1900 <= int(text) <= 2100,
-                "is_day_number": text.isdigit()
-                and len(text) <= 2
-                and (1 <= int(text) <= 31 if text.isdigit() else False),
-                "is_date_separator": text in [",", "-", "/", "."],
-                "looks_like_date_pattern": bool(
-                    re.match(r"\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}", text)
-                ),
-                "has_numeric_context": False,  # Will be set below based on neighbors
-                # ✅ NEW: Boundary detection features (MUST MATCH learner.py!)
-                "is_after_punctuation": False,
-                "is_before_punctuation": False,
-                "is_after_newline": False,
-                "position_in_line": 0,
-                # Context features
-                "has_label": bool(label),
-                "label_text": label.lower() if label else "",
-                "in_context_before": text.lower() in context_before_text,
-                "in_context_after": text.lower() in context_after_text,
-            }
+            # Context features
+            word_features["has_label"] = bool(label)
+            word_features["label_text"] = label.lower() if label else ""
+            word_features["in_context_before"] = text_lower in context_before_text
+            word_features["in_context_after"] = text_lower in context_after_text
 
             # ✅ ENHANCED: Distance from label with stronger constraints (MUST match learner.py!)
             if label_pos:
@@ -532,7 +768,6 @@ class CRFExtractionStrategy(ExtractionStrategy):
                 word_features["valid_position"] = False
 
             # ✅ NEW: Next field boundary features (MUST match learner.py!)
-            next_field_y = context.get("next_field_y")
             if next_field_y is not None:
                 distance_to_next = next_field_y - word_y
                 word_features["has_next_field"] = True
@@ -547,6 +782,113 @@ class CRFExtractionStrategy(ExtractionStrategy):
                 word_features["near_next_field"] = False
                 word_features["far_from_next_field"] = False
 
+            # ✅ CRITICAL: Add field-aware feature for target field
+            # This tells the model which field we're currently extracting
+            # During training: all fields in document have this feature set to True
+            # During inference: only the target field has this feature set to True
+            if target_field:
+                word_features[f"target_field_{target_field}"] = True
+
+            features.append(word_features)
+
+        return features
+
+    def _get_base_features(self, words: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Get field-independent features for a document, cached per word list
+
+        The hybrid strategy passes the same word list for every field of a
+        document, so the expensive layout features are built only once.
+
+        Args:
+            words: List of word dictionaries
+
+        Returns:
+            List of base feature dicts (must not be mutated by callers)
+        """
+        cached = self._base_feature_cache.get(id(words))
+        if cached and cached[0] is words and len(cached[1]) == len(words):
+            return cached[1]
+
+        if len(self._base_feature_cache) >= 64:
+            self._base_feature_cache.clear()
+
+        base_features = self._build_base_features(words)
+        # Keep a reference to the word list so its id stays valid
+        self._base_feature_cache[id(words)] = (words, base_features)
+        return base_features
+
+    def _build_base_features(self, words: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Build field-independent features for every word of a document
+
+        Args:
+            words: List of word dictionaries
+
+        Returns:
+            List of feature dicts without context/target-field features
+        """
+        features = []
+
+        # ✅ NEW: Detect column structure from X-coordinates
+        x_coords = [w.get("x0", 0) for w in words]
+        column_boundaries = self._detect_column_boundaries(x_coords)
+
+        # ✅ NEW: Detect line groups for text wrapping
+        line_groups = self._detect_line_groups(words)
+
+        # Import regex for pattern matching
+        import re
+
+        for i, word in enumerate(words):
+            text = word.get("text", "")
+            word_x = word.get("x0", 0)
+            word_y = word.get("top", 0)
+
+            word_features = {
+                # Lexical features
+                "word": text,
+                "word.lower": text.lower(),
+                "word.isupper": text.isupper(),
+                "word.istitle": text.istitle(),
+                "word.isdigit": text.isdigit(),
+                "word.isalpha": text.isalpha(),
+                "word.isalnum": text.isalnum(),
+                "word.length": len(text),
+                # Orthographic features
+                "has_digit": any(c.isdigit() for c in text),
+                "has_upper": any(c.isupper() for c in text),
+                "has_hyphen": "-" in text,
+                "has_dot": "." in text,
+                "has_comma": "," in text,
+                "has_slash": "/" in text,
+                # Layout features (normalized)
+                "x0_norm": word.get("x0", 0) / 1000,
+                "y0_norm": word.get("top", 0) / 1000,
+                "width": (word.get("x1", 0) - word.get("x0", 0)) / 1000,
+                "height": (word.get("bottom", 0) - word.get("top", 0)) / 1000,
+                # ✅ NEW: Date-specific features (PATTERN-BASED, NOT HARDCODED!)
+                "is_capitalized_word": text.istitle()
+                and text.isalpha()
+                and len(text) > 2,  # Likely month/location
+                "is_year": text.isdigit()
+                and len(text) == 4
+                and 1900 <= int(text) <= 2100,
+                "is_day_number": text.isdigit()
+                and len(text) <= 2
+                and (1 <= int(text) <= 31 if text.isdigit() else False),
+                "is_date_separator": text in [",", "-", "/", "."],
+                "looks_like_date_pattern": bool(
+                    re.match(r"\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}", text)
+                ),
+                "has_numeric_context": False,  # Will be set below based on neighbors
+                # ✅ NEW: Boundary detection features (MUST MATCH learner.py!)
+                "is_after_punctuation": False,
+                "is_before_punctuation": False,
+                "is_after_newline": False,
+                "position_in_line": 0,
+            }
+
             # Prefix and suffix features
             if len(text) > 1:
                 word_features["prefix-2"] = text[:2]
@@ -725,16 +1067,6 @@ class CRFExtractionStrategy(ExtractionStrategy):
             )  # Likely table row
             word_features["is_sparse_line"] = len(words_in_same_line) < 5
 
-            # ✅ CRITICAL: Add field-aware feature for target field
-            # This tells the model which field we're currently extracting
-            # During training: all fields in document have this feature set to True
-            # During inference: only the target field has this feature set to True
-            if target_field:
-                word_features[f"target_field_{target_field}"] = True
-                # Debug: Log first word to verify feature is added
-                # if i == 0:
-                #     print(f"🔍 [CRF] Added field-aware feature: target_field_{target_field}=True")
-
             features.append(word_features)
 
         return features
@@ -0,0 +1,189 @@
+"""
+Document Context
+
+Per-extraction store of artifacts derived from one PDF. Words, tables,
+page text and page layout are computed lazily on first use and memoized,
+so strategies that need the same artifact for many fields (e.g. table
+lookup for area_finding_1, area_id_2, ...) parse the PDF only once.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+class DocumentContext:
+    """
+    Lazily computed, memoized artifacts of a single PDF document
+    """
+
+    def __init__(self, pdf_path: str, words: Optional[List[Dict]] = None):
+        """
+        Initialize document context
+
+        Args:
+            pdf_path: Path to PDF file
+            words: Already extracted words (optional, avoids re-extraction)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.pdf_path = pdf_path
+
+        self._pdf = None
+        self._words = words
+        self._words_by_page: Optional[List[List[Dict]]] = None
+        self._tables: Dict[int, List[List[List[str]]]] = {}
+        self._page_text: Dict[int, str] = {}
+        self._page_layout: Dict[int, Dict[str, Any]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __str__(self) -> str:
+        return self.pdf_path
+
+    def __fspath__(self) -> str:
+        return self.pdf_path
+
+    # ========================================================================
+    # Artifacts
+    # ========================================================================
+
+    @property
+    def pdf(self):
+        """Open pdfplumber document (opened once, closed by close())"""
+        if self._pdf is None:
+            import pdfplumber
+
+            self._pdf = pdfplumber.open(self.pdf_path)
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    @property
+    def words_by_page(self) -> List[List[Dict]]:
+        """Words per page (x/y tolerance 3, same as extraction)"""
+        if self._words_by_page is None:
+            from .word_cache import get_word_cache
+
+            self._words_by_page = get_word_cache().get_words_by_page(
+                self.pdf_path, x_tolerance=3, y_tolerance=3
+            )
+        return self._words_by_page
+
+    @property
+    def words(self) -> List[Dict]:
+        """All words of the document in page order"""
+        if self._words is None:
+            words: List[Dict] = []
+            for page_words in self.words_by_page:
+                words.extend(page_words)
+            self._words = words
+        return self._words
+
+    def get_tables(self, page_number: int = 0) -> List[List[List[str]]]:
+        """
+        Get cleaned tables of a page (detected once per page)
+
+        Args:
+            page_number: Page number (0-indexed)
+
+        Returns:
+            List of tables (rows of cell strings)
+        """
+        if page_number not in self._tables:
+            from .table_extractor import AdaptiveTableExtractor
+
+            tables: List[List[List[str]]] = []
+            try:
+                if page_number < self.page_count:
+                    tables = AdaptiveTableExtractor().extract_tables_from_page(
+                        self.pdf.pages[page_number], page_number
+                    )
+                else:
+                    self.logger.warning(f"Page {page_number} not found in PDF")
+            except Exception as e:
+                self.logger.error(f"Error extracting tables: {e}")
+            self._tables[page_number] = tables
+        return self._tables[page_number]
+
+    def get_page_text(self, page_number: int = 0) -> str:
+        """
+        Get plain text of a page
+
+        Args:
+            page_number: Page number (0-indexed)
+
+        Returns:
+            Page text ('' if page missing)
+        """
+        if page_number not in self._page_text:
+            text = ""
+            try:
+                if page_number < self.page_count:
+                    text = self.pdf.pages[page_number].extract_text() or ""
+            except Exception as e:
+                self.logger.error(f"Error extracting page text: {e}")
+            self._page_text[page_number] = text
+        return self._page_text[page_number]
+
+    def get_page_layout(self, page_number: int = 0) -> Dict[str, Any]:
+        """
+        Get page geometry
+
+        Args:
+            page_number: Page number (0-indexed)
+
+        Returns:
+            Dictionary with width, height and word_count
+        """
+        if page_number not in self._page_layout:
+            layout: Dict[str, Any] = {"width": 0.0, "height": 0.0, "word_count": 0}
+            if page_number < self.page_count:
+                page = self.pdf.pages[page_number]
+                layout = {
+                    "width": float(page.width),
+                    "height": float(page.height),
+                    "word_count": len(self.words_by_page[page_number])
+                    if page_number < len(self.words_by_page)
+                    else 0,
+                }
+            self._page_layout[page_number] = layout
+        return self._page_layout[page_number]
+
+    def close(self):
+        """Close the underlying PDF (memoized artifacts stay available)"""
+        if self._pdf is not None:
+            try:
+                self._pdf.close()
+            except Exception:
+                pass
+            self._pdf = None
+
+
+@contextmanager
+def as_document_context(document: Union[str, DocumentContext]) -> Iterator[DocumentContext]:
+    """
+    Accept either a DocumentContext or a plain PDF path
+
+    A context created here for a path is closed on exit; a given
+    DocumentContext is left open for its owner.
+
+    Usage:
+        with as_document_context(document) as doc:
+            tables = doc.get_tables(page_number=0)
+
+    Args:
+        document: DocumentContext or path to PDF file
+
+    Yields:
+        DocumentContext (new one for a path)
+    """
+    if isinstance(document, DocumentContext):
+        yield document
+        return
+    with DocumentContext(str(document)) as doc:
+        yield doc
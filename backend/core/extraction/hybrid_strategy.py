@@ -18,6 +18,11 @@ from datetime import datetime
 from enum import Enum
 
 from .strategies import ExtractionStrategy, FieldValue
+from .document_context import DocumentContext
+from .strategy_performance_cache import (
+    StrategyPerformanceSnapshot,
+    get_strategy_performance_cache,
+)
 from .crf_strategy import CRFExtractionStrategy
 from .position_based_strategy import PositionExtractionStrategy
 from .rule_based_strategy import RuleBasedExtractionStrategy
@@ -100,6 +105,8 @@ class ExtractionContext:
     field_count: int
     has_model: bool
     historical_performance: Dict[str, Any]
+    # Strategy performance of the template, loaded once per extraction
+    strategy_performance: Optional[StrategyPerformanceSnapshot] = None
 
 
 class HybridExtractionStrategy:
@@ -192,6 +199,9 @@ class HybridExtractionStrategy:
 
         print(f"🔍 [HybridStrategy] Starting extraction for template {template_name}")
 
+        # ⚡ One strategy_performance snapshot serves every field lookup below
+        performance_snapshot = self._get_performance_snapshot(template_id)
+
         # Initialize CRF strategy if model available
         print(f"🔍 [HybridStrategy] Checking model path: {model_path}")
         if model_path:
@@ -200,7 +210,9 @@ class HybridExtractionStrategy:
                 self.crf_strategy = CRFExtractionStrategy(model_path)
 
                 # ✅ ADAPTIVE: Set initial weight based on historical performance
-                crf_weight = self._get_adaptive_crf_weight(template_id)
+                crf_weight = self._get_adaptive_crf_weight(
+                    template_id, performance_snapshot
+                )
                 self.strategy_weights[StrategyType.CRF] = crf_weight
                 print(
                     f"✅ [HybridStrategy] CRF strategy initialized with adaptive weight {crf_weight:.2f}"
@@ -212,10 +224,14 @@ class HybridExtractionStrategy:
 
         # Analyze extraction context
         context = self._analyze_context(template_config, model_path)
+        context.strategy_performance = performance_snapshot
 
         # Extract words from PDF
         all_words = self._extract_words_from_pdf(pdf_path)
 
+        # 📄 One context per document: tables, page text, layout parsed at most once
+        document = DocumentContext(pdf_path, words=all_words)
+
         # Extract each field
         results = {
             "extracted_data": {},
@@ -232,53 +248,61 @@ class HybridExtractionStrategy:
         }
 
         fields = template_config.get("fields", {})
-        for field_name, field_config in fields.items():
-            field_config["field_name"] = field_name
 
-            # Extract with conflict detection
-            extraction_result = self._extract_field_with_conflict_detection(
-                pdf_path, field_config, all_words, context, field_name
-            )
+        # ⚡ Decode all fields in one CRF batch; extract() reuses the results
+        if self.crf_strategy:
+            self.crf_strategy.predict_batch(all_words, fields)
 
-            if extraction_result:
-                results["extracted_data"][field_name] = extraction_result["value"]
-                results["confidence_scores"][field_name] = extraction_result[
-                    "confidence"
-                ]
-                results["extraction_methods"][field_name] = extraction_result["method"]
-
-                # Add to strategies_used
-                strategy_info = {
-                    "field_name": field_name,  # ✅ Fixed: use 'field_name' not 'field'
-                    "method": extraction_result["method"],
-                    "confidence": extraction_result["confidence"],
-                }
+        try:
+            for field_name, field_config in fields.items():
+                field_config["field_name"] = field_name
 
-                # Add location info if available
-                if "metadata" in extraction_result:
-                    metadata = extraction_result["metadata"]
-                    if "location_index" in metadata:
-                        strategy_info["location_index"] = metadata["location_index"]
-                    if "page" in metadata:
-                        strategy_info["page"] = metadata["page"]
-                    if "label" in metadata:
-                        strategy_info["label"] = metadata["label"]
-
-                    # ✅ CRITICAL: Copy all_strategies_attempted for performance tracking
-                    if "all_strategies_attempted" in metadata:
-                        strategy_info["all_strategies_attempted"] = metadata[
-                            "all_strategies_attempted"
-                        ]
-
-                results["metadata"]["strategies_used"].append(strategy_info)
-
-                # Add conflict info if detected
-                if "conflict" in extraction_result:
-                    results["conflicts"][field_name] = extraction_result["conflict"]
-            else:
-                results["extracted_data"][field_name] = ""
-                results["confidence_scores"][field_name] = 0.0
-                results["extraction_methods"][field_name] = "none"
+                # Extract with conflict detection
+                extraction_result = self._extract_field_with_conflict_detection(
+                    document, field_config, all_words, context, field_name
+                )
+
+                if extraction_result:
+                    results["extracted_data"][field_name] = extraction_result["value"]
+                    results["confidence_scores"][field_name] = extraction_result[
+                        "confidence"
+                    ]
+                    results["extraction_methods"][field_name] = extraction_result["method"]
+
+                    # Add to strategies_used
+                    strategy_info = {
+                        "field_name": field_name,  # ✅ Fixed: use 'field_name' not 'field'
+                        "method": extraction_result["method"],
+                        "confidence": extraction_result["confidence"],
+                    }
+
+                    # Add location info if available
+                    if "metadata" in extraction_result:
+                        metadata = extraction_result["metadata"]
+                        if "location_index" in metadata:
+                            strategy_info["location_index"] = metadata["location_index"]
+                        if "page" in metadata:
+                            strategy_info["page"] = metadata["page"]
+                        if "label" in metadata:
+                            strategy_info["label"] = metadata["label"]
+
+                        # ✅ CRITICAL: Copy all_strategies_attempted for performance tracking
+                        if "all_strategies_attempted" in metadata:
+                            strategy_info["all_strategies_attempted"] = metadata[
+                                "all_strategies_attempted"
+                            ]
+
+                    results["metadata"]["strategies_used"].append(strategy_info)
+
+                    # Add conflict info if detected
+                    if "conflict" in extraction_result:
+                        results["conflicts"][field_name] = extraction_result["conflict"]
+                else:
+                    results["extracted_data"][field_name] = ""
+                    results["confidence_scores"][field_name] = 0.0
+                    results["extraction_methods"][field_name] = "none"
+        finally:
+            document.close()
 
         # ✅ NEW: Calculate extraction time
         extraction_time_ms = int((time.time() - start_time) * 1000)
@@ -324,7 +348,7 @@ class HybridExtractionStrategy:
 
     def _extract_field_with_conflict_detection(
         self,
-        pdf_path: str,
+        document: DocumentContext,
         field_config: Dict,
         all_words: List[Dict],
         context: ExtractionContext,
@@ -334,7 +358,7 @@ class HybridExtractionStrategy:
         Extract field with conflict detection across multiple locations
 
         Args:
-            pdf_path: Path to PDF file
+            document: DocumentContext of the PDF
             field_config: Field configuration
             all_words: All extracted words
             context: Extraction context
@@ -351,7 +375,7 @@ class HybridExtractionStrategy:
         # If single location, use normal extraction
         if len(locations) <= 1:
             strategy_results = self._extract_field_with_strategies(
-                pdf_path, field_config, all_words, context
+                document, field_config, all_words, context
             )
             final_result = self._combine_strategy_results(
                 strategy_results, context, field_name
@@ -378,7 +402,7 @@ class HybridExtractionStrategy:
 
             # Extract using all strategies
             strategy_results = self._extract_field_with_strategies(
-                pdf_path, temp_field_config, all_words, context
+                document, temp_field_config, all_words, context
             )
 
             # Combine strategy results
@@ -448,7 +472,7 @@ class HybridExtractionStrategy:
 
     def _extract_field_with_strategies(
         self,
-        pdf_path: str,
+        document: DocumentContext,
         field_config: Dict,
         all_words: List[Dict],
         context: ExtractionContext,
@@ -464,7 +488,7 @@ class HybridExtractionStrategy:
         # Always try rule-based (baseline)
         try:
             rule_result = self.rule_based_strategy.extract(
-                pdf_path, field_config, all_words
+                document, field_config, all_words
             )
             results[StrategyType.RULE_BASED] = rule_result
             if rule_result:
@@ -481,7 +505,7 @@ class HybridExtractionStrategy:
         # ):  # Increased from 0.7 to enable for more templates
         #     try:
         #         pos_result = self.position_strategy.extract(
-        #             pdf_path, field_config, all_words
+        #             document, field_config, all_words
         #         )
         #         results[StrategyType.POSITION_BASED] = pos_result
         #         if pos_result:
@@ -497,7 +521,7 @@ class HybridExtractionStrategy:
             self.logger.debug(f"  🤖 Trying CRF strategy for '{field_name}'...")
             try:
                 crf_result = self.crf_strategy.extract(
-                    pdf_path, field_config, all_words
+                    document, field_config, all_words
                 )
                 # ✅ ALWAYS store result (even if None) for performance tracking
                 results[StrategyType.CRF] = crf_result
@@ -537,7 +561,7 @@ class HybridExtractionStrategy:
         # Filter results based on adaptive minimum confidence
         # Lower threshold for strategies with proven track record
         field_performance = self._get_field_performance_from_db(
-            context.template_id, field_name
+            context.template_id, field_name, context.strategy_performance
         )
 
         valid_results = []
@@ -701,7 +725,7 @@ class HybridExtractionStrategy:
 
         # ✅ Load performance from DATABASE (not JSON file)
         field_performance = self._get_field_performance_from_db(
-            context.template_id, field_name
+            context.template_id, field_name, context.strategy_performance
         )
 
         for strategy_type, field_value in valid_results:
@@ -808,6 +832,9 @@ class HybridExtractionStrategy:
             "strategies_used", []
         )
 
+        # ⚡ Collect DB outcomes and write them in one transaction after the loop
+        performance_updates: List[Dict[str, Any]] = []
+
         for strategy_info in strategies_used:
             field_name = strategy_info.get(
                 "field_name"
@@ -827,7 +854,12 @@ class HybridExtractionStrategy:
 
             # ✅ Update performance for SELECTED strategy
             self._update_strategy_performance(
-                template_id, field_name, method, was_correct, confidence
+                template_id,
+                field_name,
+                method,
+                was_correct,
+                confidence,
+                pending_updates=performance_updates,
             )
 
             # ✅ CRITICAL: Track performance for ALL attempted strategies
@@ -890,8 +922,11 @@ class HybridExtractionStrategy:
                         strategy_name,
                         was_correct=strategy_was_correct,  # ✅ Based on actual value comparison
                         confidence=strategy_data.get("confidence", 0.0),
+                        pending_updates=performance_updates,
                     )
 
+        self._flush_strategy_performance(performance_updates)
+
         # Adjust strategy weights based on performance
         self._adjust_strategy_weights(template_id)
 
@@ -909,17 +944,32 @@ class HybridExtractionStrategy:
         method: str,
         was_correct: bool,
         confidence: float,
+        pending_updates: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         """
         Update performance metrics for a strategy
 
         ✅ UPDATED: Now tracks per-field performance in database with normalized strategy types
+
+        Args:
+            pending_updates: If given, the database update is appended here
+                (written later by _flush_strategy_performance) instead of
+                being committed immediately
         """
         # ✅ NORMALIZE strategy type to standard enum value
         normalized_method = StrategyType.normalize(method)
 
         # ✅ Update database performance tracking (per-field)
-        if self.db:
+        if pending_updates is not None:
+            pending_updates.append(
+                {
+                    "template_id": template_id,
+                    "field_name": field_name,
+                    "strategy_type": normalized_method,
+                    "was_correct": was_correct,
+                }
+            )
+        elif self.db:
             try:
                 from database.repositories.strategy_performance_repository import (
                     StrategyPerformanceRepository,
@@ -971,6 +1021,30 @@ class HybridExtractionStrategy:
 
         perf["last_updated"] = datetime.now().isoformat()
 
+    def _flush_strategy_performance(self, updates: List[Dict[str, Any]]) -> None:
+        """
+        Write collected strategy performance outcomes in one transaction
+
+        Args:
+            updates: Outcomes collected by _update_strategy_performance
+        """
+        if not self.db or not updates:
+            return
+
+        try:
+            from database.repositories.strategy_performance_repository import (
+                StrategyPerformanceRepository,
+            )
+
+            rows = StrategyPerformanceRepository(self.db).update_performance_batch(
+                updates
+            )
+            self.logger.info(
+                f"💾 Strategy performance: {len(updates)} outcomes -> {rows} rows in one transaction"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to update database performance: {e}")
+
     def _adjust_strategy_weights(self, template_id: int) -> None:
         """Adjust strategy weights based on performance"""
         template_key = str(template_id)
@@ -1044,15 +1118,15 @@ class HybridExtractionStrategy:
         fields that are already extracting correctly. Only enable if you have specific
         concatenated word issues.
         """
-        import pdfplumber
+        from .word_cache import get_word_cache
 
         all_words = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    words = page.extract_words(x_tolerance=3, y_tolerance=3)
-                    all_words.extend(words)
+            # ⚡ Cached by file hash - re-extraction skips PDF parsing
+            all_words = get_word_cache().get_words(
+                pdf_path, x_tolerance=3, y_tolerance=3
+            )
                     
             # Apply normalization only if explicitly enabled
             if enable_normalization:
@@ -1113,12 +1187,33 @@ class HybridExtractionStrategy:
         
         return normalized_words
 
-    def _get_adaptive_crf_weight(self, template_id: int) -> float:
+    def _get_performance_snapshot(
+        self, template_id: int
+    ) -> Optional[StrategyPerformanceSnapshot]:
+        """
+        Get strategy performance snapshot of a template (process cache)
+
+        Args:
+            template_id: Template ID
+
+        Returns:
+            StrategyPerformanceSnapshot, or None without a database
+        """
+        if not self.db:
+            return None
+        return get_strategy_performance_cache().get_snapshot(template_id, self.db)
+
+    def _get_adaptive_crf_weight(
+        self,
+        template_id: int,
+        snapshot: Optional[StrategyPerformanceSnapshot] = None,
+    ) -> float:
         """
         Calculate adaptive CRF weight based on historical performance
 
         Args:
             template_id: Template ID
+            snapshot: Preloaded performance snapshot (optional)
 
         Returns:
             Weight between 0.3 and 0.9
@@ -1127,23 +1222,13 @@ class HybridExtractionStrategy:
             return 0.5  # Default neutral weight
 
         try:
-            conn = self.db.get_connection()
-            cursor = conn.execute(
-                """
-                SELECT AVG(accuracy) as avg_accuracy, COUNT(*) as total_fields
-                FROM strategy_performance
-                WHERE template_id = ? AND strategy_type = 'crf'
-                AND total_extractions >= 5
-            """,
-                (template_id,),
-            )
+            if snapshot is None:
+                snapshot = self._get_performance_snapshot(template_id)
 
-            row = cursor.fetchone()
-            conn.close()
+            avg_accuracy = snapshot.crf_avg_accuracy
+            total_fields = snapshot.crf_field_count
 
-            if row and row["avg_accuracy"] is not None and row["total_fields"] > 0:
-                avg_accuracy = row["avg_accuracy"]
-                total_fields = row["total_fields"]
+            if avg_accuracy is not None and total_fields > 0:
 
                 # ✅ ADAPTIVE FORMULA:
                 # - If CRF performs well (>70%): weight 0.7-0.9
@@ -1219,11 +1304,22 @@ class HybridExtractionStrategy:
             }
 
     def _get_field_performance_from_db(
-        self, template_id: int, field_name: str
+        self,
+        template_id: int,
+        field_name: str,
+        snapshot: Optional[StrategyPerformanceSnapshot] = None,
     ) -> Dict[str, Dict]:
         """
         Get strategy performance for a specific field from database
 
+        Served from the template's performance snapshot (one query per
+        template instead of one per field).
+
+        Args:
+            template_id: Template ID
+            field_name: Field name
+            snapshot: Preloaded performance snapshot (optional)
+
         Returns:
             Dict mapping strategy_type -> {'accuracy': float, 'attempts': int}
         """
@@ -1231,29 +1327,9 @@ class HybridExtractionStrategy:
             return {}
 
         try:
-            conn = self.db.get_connection()
-            cursor = conn.execute(
-                """
-                SELECT strategy_type, accuracy, total_extractions
-                FROM strategy_performance
-                WHERE template_id = ? AND field_name = ?
-                ORDER BY accuracy DESC
-            """,
-                (template_id, field_name),
-            )
-
-            performance = {}
-            for row in cursor.fetchall():
-                strategy_type = row["strategy_type"]
-                accuracy = row["accuracy"]
-                attempts = row["total_extractions"]
-                performance[strategy_type] = {
-                    "accuracy": accuracy,
-                    "attempts": attempts,
-                }
-
-            conn.close()
-            return performance
+            if snapshot is None:
+                snapshot = self._get_performance_snapshot(template_id)
+            return snapshot.get_field_performance(field_name)
         except Exception as e:
             self.logger.error(f"Error loading field performance from DB: {e}")
             return {}
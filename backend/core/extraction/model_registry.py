@@ -0,0 +1,252 @@
+"""
+CRF Model Registry
+Process-wide cache of loaded CRF models with LRU eviction.
+
+Every extraction used to `joblib.load` the template model from disk. The
+registry keeps loaded models in memory, keyed by model path (one per
+template) and validated against the file mtime, so a retrained model is
+picked up automatically while unchanged models are served from memory.
+Online updates (OnlineCRF) are saved next to the crfsuite model and served
+instead of it until the next full retrain removes them.
+"""
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+def online_model_path(model_path: str) -> str:
+    """Path of the online-updated weights saved next to a crfsuite model"""
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.online{ext}"
+
+
+@dataclass
+class RegisteredModel:
+    """Loaded model plus the metadata needed to validate and evict it"""
+    model: Any
+    model_path: str
+    template_id: Optional[int]
+    mtime: float
+    size_bytes: int
+    # crfsuite taggers keep per-sequence state between set() and marginal(),
+    # so callers sharing one model must serialize prediction on this lock
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """
+    Thread-safe LRU cache of CRF models under a count and byte budget
+    """
+
+    def __init__(self, max_models: int = None, max_bytes: int = None):
+        """
+        Initialize model registry
+
+        Args:
+            max_models: Maximum number of models kept in memory
+            max_bytes: Maximum total size (bytes on disk) of cached models
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_models = max_models if max_models is not None else int(
+            os.getenv('MODEL_REGISTRY_MAX_MODELS', '16')
+        )
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.getenv('MODEL_REGISTRY_MAX_BYTES', str(512 * 1024 * 1024))
+        )
+
+        self._entries: "OrderedDict[str, RegisteredModel]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _key(model_path: str) -> str:
+        return os.path.abspath(model_path)
+
+    @staticmethod
+    def _template_id_from_path(model_path: str) -> Optional[int]:
+        match = re.search(r'template_(\d+)_model', os.path.basename(model_path))
+        return int(match.group(1)) if match else None
+
+    def get(self, model_path: str) -> Optional[RegisteredModel]:
+        """
+        Get model for path, loading it from disk on miss or when the file changed
+
+        Args:
+            model_path: Path to joblib model file
+
+        Returns:
+            RegisteredModel or None if file is missing / cannot be loaded
+        """
+        if not model_path or not os.path.exists(model_path):
+            return None
+
+        key = self._key(model_path)
+        load_path = online_model_path(model_path)
+        try:
+            current_mtime = os.path.getmtime(load_path)
+        except OSError:
+            load_path = model_path
+            try:
+                current_mtime = os.path.getmtime(model_path)
+            except OSError:
+                return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.model_path, entry.mtime) == (load_path, current_mtime):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            if entry is not None:
+                # Stale entry (model retrained) - drop it before reloading
+                self.reloads += 1
+                self._remove(key)
+
+        # Load outside the registry lock so other templates are not blocked
+        entry = self._load(load_path, current_mtime)
+        if entry is None:
+            return None
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and (existing.model_path, existing.mtime) == (load_path, entry.mtime):
+                # Another thread loaded the same version meanwhile
+                self._entries.move_to_end(key)
+                return existing
+            if existing is not None:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._total_bytes += entry.size_bytes
+            self._evict_if_needed()
+            return entry
+
+    def get_model(self, model_path: str) -> Any:
+        """
+        Get model object only (convenience wrapper around get)
+
+        Args:
+            model_path: Path to joblib model file
+
+        Returns:
+            Model object or None
+        """
+        entry = self.get(model_path)
+        return entry.model if entry else None
+
+    def invalidate(self, model_path: str = None):
+        """
+        Drop a cached model (or all models if path is None)
+
+        Args:
+            model_path: Path to model file
+        """
+        with self._lock:
+            if model_path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            key = self._key(model_path)
+            if key in self._entries:
+                self._remove(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get registry counters and current contents
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and cached models
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'reloads': self.reloads,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'cached_models': len(self._entries),
+                'cached_bytes': self._total_bytes,
+                'max_models': self.max_models,
+                'max_bytes': self.max_bytes,
+                'models': [
+                    {
+                        'template_id': entry.template_id,
+                        'model_path': entry.model_path,
+                        'mtime': entry.mtime,
+                        'size_bytes': entry.size_bytes,
+                    }
+                    for entry in self._entries.values()
+                ],
+            }
+
+    def _load(self, model_path: str, mtime: float) -> Optional[RegisteredModel]:
+        try:
+            import joblib
+
+            model = joblib.load(model_path)
+            size_bytes = os.path.getsize(model_path)
+            self.logger.info(
+                f"📦 [ModelRegistry] Loaded {os.path.basename(model_path)} "
+                f"({size_bytes / 1024:.0f} KB)"
+            )
+            return RegisteredModel(
+                model=model,
+                model_path=model_path,
+                template_id=self._template_id_from_path(model_path),
+                mtime=mtime,
+                size_bytes=size_bytes,
+            )
+        except Exception as e:
+            self.logger.error(f"❌ [ModelRegistry] Error loading model {model_path}: {e}")
+            return None
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size_bytes
+
+    def _evict_if_needed(self):
+        # Always keep the most recently used model, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or self._total_bytes > self.max_bytes
+        ):
+            key, entry = next(iter(self._entries.items()))
+            self._remove(key)
+            self.evictions += 1
+            self.logger.info(
+                f"♻️ [ModelRegistry] Evicted model for template {entry.template_id}"
+            )
+
+
+# Singleton instance
+_model_registry_instance = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get singleton model registry instance
+
+    Returns:
+        ModelRegistry instance
+    """
+    global _model_registry_instance
+
+    if _model_registry_instance is None:
+        with _model_registry_lock:
+            if _model_registry_instance is None:
+                _model_registry_instance = ModelRegistry()
+
+    return _model_registry_instance
@@ -0,0 +1,237 @@
+"""
+Learned Pattern Registry
+Process-wide, per-template cache of compiled learned regex patterns.
+
+Rule-based extraction used to query the active config, the field config
+and its learned patterns for every field of every document. The registry
+loads all active learned patterns of a template in one query, compiles
+them once and keeps them ordered by priority and frequency. It rebuilds
+a template only when its config generation changes or when the entry is
+older than PATTERN_REGISTRY_MAX_AGE seconds. The generation changes on
+learned-pattern writes in this process (invalidate_config_cache) and when
+a config load sees a new template_configs.revision, which the migration 016
+triggers bump for pattern writes made by other processes such as the
+background worker. A failed load is not cached.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str) -> "re.Pattern":
+    return re.compile(pattern)
+
+
+def compile_pattern(pattern) -> "re.Pattern":
+    """
+    Compile a regex pattern (memoized); compiled patterns pass through
+
+    Args:
+        pattern: Regex string or compiled pattern
+
+    Returns:
+        Compiled re.Pattern
+
+    Raises:
+        re.error: If the pattern is not a valid regex
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile(pattern)
+
+
+@dataclass
+class CompiledPattern:
+    """Learned pattern with its pre-compiled regex"""
+    pattern_id: Optional[int]
+    pattern: str
+    regex: "re.Pattern"
+    description: Optional[str] = 'learned'
+    type: str = 'learned'
+    frequency: Optional[int] = 0
+    priority: Optional[int] = 0
+
+    def to_pattern_info(self) -> Dict[str, Any]:
+        """Pattern dict in the format used by RuleBasedExtractionStrategy"""
+        return {
+            'pattern': self.pattern,
+            'compiled': self.regex,
+            'description': self.description,
+            'type': self.type,
+            'frequency': self.frequency,
+            'priority': self.priority,
+            'pattern_id': self.pattern_id,
+        }
+
+
+@dataclass
+class _TemplatePatterns:
+    generation: Tuple
+    config_id: Optional[int]
+    loaded_at: float
+    by_field: Dict[str, List[CompiledPattern]] = field(default_factory=dict)
+
+
+class LearnedPatternRegistry:
+    """
+    Thread-safe cache of compiled learned patterns per template
+    """
+
+    def __init__(self, db_manager=None, max_age: float = None):
+        """
+        Initialize pattern registry
+
+        Args:
+            db_manager: DatabaseManager instance (default: new DatabaseManager)
+            max_age: Seconds before an entry is reloaded regardless of generation
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._db = db_manager
+        self.max_age = max_age if max_age is not None else float(
+            os.getenv('PATTERN_REGISTRY_MAX_AGE', '300')
+        )
+
+        self._entries: Dict[int, _TemplatePatterns] = {}
+        self._lock = threading.RLock()
+
+        # Counters
+        self.hits = 0
+        self.refreshes = 0
+
+    def _get_repo(self):
+        from database.repositories.config_repository import ConfigRepository
+
+        if self._db is None:
+            from database.db_manager import DatabaseManager
+            self._db = DatabaseManager()
+        return ConfigRepository(self._db)
+
+    def get_patterns(self, template_id: int, field_name: str) -> List[CompiledPattern]:
+        """
+        Get compiled learned patterns of a field (priority, frequency desc)
+
+        Args:
+            template_id: Template ID
+            field_name: Field name
+
+        Returns:
+            List of CompiledPattern (empty if none)
+        """
+        from core.templates.config_loader import get_config_generation
+
+        generation = get_config_generation(template_id)
+        with self._lock:
+            entry = self._entries.get(template_id)
+            if (
+                entry is None
+                or entry.generation != generation
+                or time.time() - entry.loaded_at > self.max_age
+            ):
+                entry = self._refresh(template_id, generation)
+            else:
+                self.hits += 1
+            return entry.by_field.get(field_name, [])
+
+    def invalidate(self, template_id: int = None):
+        """
+        Drop cached patterns
+
+        Args:
+            template_id: Template to drop (None = all)
+        """
+        with self._lock:
+            if template_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(template_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry counters and cached templates"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'refreshes': self.refreshes,
+                'max_age': self.max_age,
+                'templates': {
+                    template_id: {
+                        'fields': len(entry.by_field),
+                        'patterns': sum(len(p) for p in entry.by_field.values()),
+                        'age_seconds': round(time.time() - entry.loaded_at, 1),
+                    }
+                    for template_id, entry in self._entries.items()
+                },
+            }
+
+    def _refresh(self, template_id: int, generation: Tuple) -> _TemplatePatterns:
+        from core.templates.config_loader import register_field_configs
+
+        entry = _TemplatePatterns(generation=generation, config_id=None, loaded_at=time.time())
+        try:
+            repo = self._get_repo()
+            config = repo.get_active_config(template_id)
+            if config:
+                entry.config_id = config['id']
+                rows = repo.get_learned_patterns_by_config(config['id'], active_only=True)
+
+                field_config_ids = set()
+                for row in rows:
+                    field_config_ids.add(row['field_config_id'])
+                    try:
+                        regex = compile_pattern(row['pattern'])
+                    except re.error as e:
+                        self.logger.warning(
+                            f"⚠️ [PatternRegistry] Skipping invalid pattern {row['id']} "
+                            f"for '{row['field_name']}': {e}"
+                        )
+                        continue
+                    entry.by_field.setdefault(row['field_name'], []).append(
+                        CompiledPattern(
+                            pattern_id=row['id'],
+                            pattern=row['pattern'],
+                            regex=regex,
+                            description=row.get('description', 'learned'),
+                            type=row.get('pattern_type', 'learned'),
+                            frequency=row.get('frequency', 0),
+                            priority=row.get('priority', 0),
+                        )
+                    )
+                register_field_configs(template_id, list(field_config_ids))
+
+                for patterns in entry.by_field.values():
+                    patterns.sort(key=lambda p: (p.priority or 0, p.frequency or 0), reverse=True)
+        except Exception as e:
+            # Don't cache the empty entry; the next lookup retries the load
+            self.logger.error(f"Failed to load patterns for template {template_id}: {e}")
+            return entry
+
+        self._entries[template_id] = entry
+        self.refreshes += 1
+        return entry
+
+
+# Singleton instance
+_pattern_registry_instance = None
+_pattern_registry_lock = threading.Lock()
+
+
+def get_pattern_registry() -> LearnedPatternRegistry:
+    """
+    Get singleton pattern registry instance
+
+    Returns:
+        LearnedPatternRegistry instance
+    """
+    global _pattern_registry_instance
+
+    if _pattern_registry_instance is None:
+        with _pattern_registry_lock:
+            if _pattern_registry_instance is None:
+                _pattern_registry_instance = LearnedPatternRegistry()
+
+    return _pattern_registry_instance
@@ -0,0 +1,248 @@
+"""
+Pattern Usage Aggregator
+Write-behind buffer for learned-pattern usage statistics.
+
+Every learned-pattern attempt during rule-based extraction used to commit
+its own UPDATE on learned_patterns, so read-mostly extraction requests
+competed for the SQLite write lock. The aggregator counts attempts and
+successes per pattern in memory and a background thread writes them in
+one batched transaction (ConfigRepository.apply_pattern_usage_deltas):
+- every PATTERN_USAGE_FLUSH_INTERVAL seconds, or
+- as soon as PATTERN_USAGE_FLUSH_THRESHOLD attempts are pending,
+- and once more at interpreter shutdown (atexit).
+
+Counters are eventually consistent: readers of usage_count / match_rate
+(pattern cleanup, statistics endpoints) may lag by one flush interval.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class PatternUsageAggregator:
+    """
+    Thread-safe in-memory accumulator of pattern usage deltas with
+    a background flusher
+    """
+
+    def __init__(
+        self,
+        db_manager=None,
+        flush_interval: float = None,
+        flush_threshold: int = None,
+    ):
+        """
+        Initialize aggregator
+
+        Args:
+            db_manager: DatabaseManager instance (default: new DatabaseManager)
+            flush_interval: Seconds between background flushes
+            flush_threshold: Pending attempts that trigger an early flush
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._db = db_manager
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv('PATTERN_USAGE_FLUSH_INTERVAL', '5')
+        )
+        self.flush_threshold = flush_threshold if flush_threshold is not None else int(
+            os.getenv('PATTERN_USAGE_FLUSH_THRESHOLD', '500')
+        )
+
+        # pattern_id -> {'uses', 'successes', 'actor'}
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._pending_events = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_flush_at: Optional[float] = None
+        self.last_flush_ms: Optional[float] = None
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def record(self, pattern_id: int, matched: bool, actor: Any = None):
+        """
+        Record one pattern attempt (never touches the database)
+
+        Args:
+            pattern_id: Learned pattern ID
+            matched: True if pattern matched successfully
+            actor: User ID to store as updated_by (default: current request user)
+        """
+        if pattern_id is None:
+            return
+        if actor is None:
+            actor = _current_user_id()
+
+        with self._lock:
+            delta = self._pending.get(pattern_id)
+            if delta is None:
+                delta = {'uses': 0, 'successes': 0, 'actor': None}
+                self._pending[pattern_id] = delta
+            delta['uses'] += 1
+            if matched:
+                delta['successes'] += 1
+            delta['actor'] = actor
+            self._pending_events += 1
+            self.recorded += 1
+            over_threshold = self._pending_events >= self.flush_threshold
+
+        self._ensure_thread()
+        if over_threshold:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write all pending deltas in one transaction
+
+        Deltas are put back if the write fails, so nothing is lost on a
+        transient "database is locked" error.
+
+        Returns:
+            Number of attempts written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending, self._pending = self._pending, {}
+                events, self._pending_events = self._pending_events, 0
+
+            start = time.time()
+            try:
+                self._get_repo().apply_pattern_usage_deltas([
+                    {'pattern_id': pattern_id, **delta}
+                    for pattern_id, delta in pending.items()
+                ])
+            except Exception as e:
+                self.logger.error(f"❌ [PatternUsage] Flush of {events} attempts failed: {e}")
+                self._requeue(pending, events)
+                with self._lock:
+                    self.failures += 1
+                return 0
+
+            with self._lock:
+                self.flushed += events
+                self.flushes += 1
+                self.last_flush_at = time.time()
+                self.last_flush_ms = (self.last_flush_at - start) * 1000
+            return events
+
+    def shutdown(self):
+        """Stop the background flusher and write remaining deltas"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pending-delta and flush metrics"""
+        with self._lock:
+            return {
+                'pending_patterns': len(self._pending),
+                'pending_attempts': self._pending_events,
+                'recorded_attempts': self.recorded,
+                'flushed_attempts': self.flushed,
+                'flushes': self.flushes,
+                'failures': self.failures,
+                'last_flush_at': self.last_flush_at,
+                'last_flush_ms': self.last_flush_ms,
+                'flush_interval': self.flush_interval,
+                'flush_threshold': self.flush_threshold,
+            }
+
+    # ========================================================================
+    # Internals
+    # ========================================================================
+
+    def _get_repo(self):
+        from database.repositories.config_repository import ConfigRepository
+
+        if self._db is None:
+            from database.db_manager import DatabaseManager
+            self._db = DatabaseManager()
+        return ConfigRepository(self._db)
+
+    def _requeue(self, pending: Dict[int, Dict[str, Any]], events: int):
+        with self._lock:
+            for pattern_id, delta in pending.items():
+                current = self._pending.get(pattern_id)
+                if current is None:
+                    self._pending[pattern_id] = delta
+                else:
+                    current['uses'] += delta['uses']
+                    current['successes'] += delta['successes']
+                    current['actor'] = current['actor'] or delta['actor']
+            self._pending_events += events
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='PatternUsageFlusher', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"❌ [PatternUsage] Background flush error: {e}")
+
+
+def _current_user_id():
+    try:
+        from flask import g
+
+        return getattr(g, 'user_id', None)
+    except Exception:
+        return None
+
+
+def is_write_behind_enabled() -> bool:
+    """Check if pattern usage write-behind is enabled (PATTERN_USAGE_WRITE_BEHIND)"""
+    return os.getenv('PATTERN_USAGE_WRITE_BEHIND', 'true').lower() == 'true'
+
+
+# Singleton instance
+_aggregator_instance = None
+_aggregator_lock = threading.Lock()
+
+
+def get_pattern_usage_aggregator() -> PatternUsageAggregator:
+    """
+    Get singleton pattern usage aggregator (flushed at interpreter exit)
+
+    Returns:
+        PatternUsageAggregator instance
+    """
+    global _aggregator_instance
+
+    if _aggregator_instance is None:
+        with _aggregator_lock:
+            if _aggregator_instance is None:
+                _aggregator_instance = PatternUsageAggregator()
+                atexit.register(_aggregator_instance.shutdown)
+
+    return _aggregator_instance
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from core.extraction.strategies import ExtractionStrategy, FieldValue
 
 
@@ -9,13 +9,13 @@ class PositionExtractionStrategy(ExtractionStrategy):
     """
 
     def extract(
-        self, pdf_path: str, field_config: Dict, all_words: List[Dict]
+        self, document: Any, field_config: Dict, all_words: List[Dict]
     ) -> Optional[FieldValue]:
         """
         Extract field using position-based approach
 
         Args:
-            pdf_path: Path to PDF file
+            document: DocumentContext of the PDF (or path to PDF file)
             field_config: Field configuration with location(s)
             all_words: All extracted words from PDF
 
@@ -0,0 +1,152 @@
+"""
+Region-of-Interest Windowing for CRF Sequences
+
+Crops a document's word sequence to the region around a field's known
+location: the field box, the label box and the next-field boundary, on
+the field's page, plus a configurable margin. The CRF then tags tens of
+words instead of every word of every page.
+
+The same cropping is applied when building training sequences
+(AdaptiveLearner._create_bio_sequence) and at inference
+(CRFExtractionStrategy), so features such as BOS/EOS, column and line
+groups are computed the same way on both sides. Changing CRF_ROI_WINDOW
+therefore requires retraining the template model.
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .strategies import get_field_locations
+
+
+def is_roi_enabled() -> bool:
+    """Check if ROI windowing is enabled (CRF_ROI_WINDOW)"""
+    return os.getenv("CRF_ROI_WINDOW", "false").lower() == "true"
+
+
+def get_roi_margin() -> float:
+    """Vertical margin (PDF points) added around the field region"""
+    return float(os.getenv("CRF_ROI_MARGIN", "50"))
+
+
+def assign_pages(words: List[Dict]) -> Optional[List[int]]:
+    """
+    Get the page index of each word
+
+    Words from the PDF word cache carry `page_number`. For words extracted
+    elsewhere the page is derived from `doctop - top` (constant per page,
+    growing with the page number); that ranking cannot see pages without
+    words, so it is only a fallback.
+
+    Args:
+        words: List of word dictionaries
+
+    Returns:
+        List of 0-based page indices, or None if words have neither
+    """
+    if all("page_number" in word for word in words):
+        return [int(word["page_number"]) for word in words]
+
+    offsets = []
+    for word in words:
+        if "doctop" not in word:
+            return None
+        offsets.append(round(float(word["doctop"]) - float(word.get("top", 0)), 1))
+
+    page_by_offset = {offset: i for i, offset in enumerate(sorted(set(offsets)))}
+    return [page_by_offset[offset] for offset in offsets]
+
+
+def get_roi_bounds(
+    field_config: Dict, margin: float = None
+) -> Optional[Tuple[int, float, float]]:
+    """
+    Compute the vertical window for a field from its first location
+
+    Args:
+        field_config: Field configuration with locations
+        margin: Margin in PDF points (default: CRF_ROI_MARGIN)
+
+    Returns:
+        Tuple of (page, top, bottom), or None if the location has no box
+    """
+    locations = get_field_locations(field_config)
+    if not locations:
+        return None
+
+    location = locations[0]
+    if location.get("y0") is None or location.get("y1") is None:
+        return None
+
+    if margin is None:
+        margin = get_roi_margin()
+
+    context = location.get("context", {}) or {}
+    label_pos = context.get("label_position") or {}
+
+    tops = [float(location["y0"])]
+    bottoms = [float(location["y1"])]
+    if label_pos.get("y0") is not None:
+        tops.append(float(label_pos["y0"]))
+    if label_pos.get("y1") is not None:
+        bottoms.append(float(label_pos["y1"]))
+    if context.get("next_field_y"):
+        bottoms.append(float(context["next_field_y"]))
+
+    return int(location.get("page", 0) or 0), min(tops) - margin, max(bottoms) + margin
+
+
+def select_roi_indices(
+    words: List[Dict], bounds: Tuple[int, float, float]
+) -> List[int]:
+    """
+    Select indices of words that fall inside the window (document order kept)
+
+    Args:
+        words: List of word dictionaries
+        bounds: (page, top, bottom) from get_roi_bounds
+
+    Returns:
+        List of word indices
+    """
+    page, top, bottom = bounds
+    pages = assign_pages(words)
+
+    indices = []
+    for i, word in enumerate(words):
+        if pages is not None and pages[i] != page:
+            continue
+        word_top = word.get("top", 0)
+        if top <= word_top <= bottom:
+            indices.append(i)
+    return indices
+
+
+def crop_to_roi(
+    words: List[Dict], field_config: Dict, margin: float = None
+) -> List[Dict]:
+    """
+    Crop a document's words to the field's ROI window
+
+    Returns the original list unchanged if ROI is disabled, the field has no
+    location box, or the window would be empty.
+
+    Args:
+        words: List of word dictionaries
+        field_config: Field configuration with locations
+        margin: Margin in PDF points (default: CRF_ROI_MARGIN)
+
+    Returns:
+        Words inside the window, or the full word list
+    """
+    if not words or not is_roi_enabled():
+        return words
+
+    bounds = get_roi_bounds(field_config, margin)
+    if bounds is None:
+        return words
+
+    indices = select_roi_indices(words, bounds)
+    if not indices:
+        return words
+
+    return [words[i] for i in indices]
@@ -2,10 +2,11 @@
 import logging
 import re
 import pdfplumber
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 from core.extraction.strategies import ExtractionStrategy, FieldValue
+from core.extraction.pattern_registry import compile_pattern, get_pattern_registry
 
 
 class RuleBasedExtractionStrategy(ExtractionStrategy):
@@ -14,12 +15,12 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
     Good for structured documents with consistent layouts.
     """
     
-    def extract(self, pdf_path: str, field_config: Dict, all_words: List[Dict]) -> Optional[FieldValue]:
+    def extract(self, document: Any, field_config: Dict, all_words: List[Dict]) -> Optional[FieldValue]:
         """
         Extract field using rule-based approach with adaptive learned patterns
         
         Args:
-            pdf_path: Path to PDF file
+            document: DocumentContext of the PDF (or path to PDF file)
             field_config: Field configuration with location(s) and regex
             all_words: All extracted words from PDF
             
@@ -31,7 +32,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         # ✅ NEW: Try table extraction first for table-like fields
         # This is part of rule-based strategy (structured data extraction)
         # self.logger.debug(f"🔍 [{field_name}] Checking if table extraction needed...")
-        table_result = self._try_table_extraction(pdf_path, field_config, all_words)
+        table_result = self._try_table_extraction(document, field_config, all_words)
         if table_result:
             # self.logger.info(f"✅ [{field_name}] Table extraction SUCCESS: {table_result.value[:50]}")
             return table_result
@@ -73,7 +74,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                 
                 try:
                     result = self._extract_from_location(
-                        location, field_name, pattern_info['pattern'], all_words
+                        location, field_name, pattern_info.get('compiled') or pattern_info['pattern'], all_words
                     )
                     
                     if result and result.confidence > best_confidence:
@@ -111,7 +112,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                 for pattern_info in base_patterns:
                     try:
                         result = self._extract_from_location(
-                            location, field_name, pattern_info['pattern'], all_words
+                            location, field_name, pattern_info.get('compiled') or pattern_info['pattern'], all_words
                         )
                         
                         # ✅ NEW: Require minimum confidence for base pattern
@@ -199,6 +200,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         if base_pattern:
             patterns.append({
                 'pattern': base_pattern,
+                'compiled': self._try_compile(base_pattern),
                 'description': 'base_pattern (user-defined)',
                 'type': 'manual',
                 'pattern_id': None,
@@ -226,6 +228,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                 for lp in learned_patterns:
                     patterns.append({
                         'pattern': lp.get('pattern', r'.+'),
+                        'compiled': self._try_compile(lp.get('pattern', r'.+')),
                         'description': lp.get('description', 'learned'),
                         'type': lp.get('type', 'learned'),
                         'frequency': lp.get('frequency', 0),
@@ -242,10 +245,14 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
     
     def _load_patterns_from_db(self, field_config: Dict) -> List[Dict]:
         """
-        Load learned patterns from database
+        Load learned patterns from the compiled pattern registry
+        
+        The registry holds pre-compiled patterns per template and only hits
+        the database when learned patterns changed, so this is in-memory on
+        the extraction hot path.
         
         Returns:
-            List of pattern dicts or empty list
+            List of pattern dicts (with 'compiled' regex) or empty list
         """
         try:
             # Get template_id and field_name from config
@@ -255,54 +262,22 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
             if not template_id or not field_name:
                 return []
             
-            # Import here to avoid circular dependency
-            from database.db_manager import DatabaseManager
-            from database.repositories.config_repository import ConfigRepository
-            
-            db = DatabaseManager()
-            config_repo = ConfigRepository(db)
-            
-            # Get active config
-            config = config_repo.get_active_config(template_id)
-            if not config:
-                return []
-            
-            # Get field config
-            field_cfg = config_repo.get_field_config_by_name(
-                config_id=config['id'],
-                field_name=field_name
-            )
-            
-            if not field_cfg:
-                return []
-            
-            # Get learned patterns
-            learned = config_repo.get_learned_patterns(
-                field_config_id=field_cfg['id'],
-                active_only=True
-            )
-            
-            # Convert to pattern dicts
-            patterns = []
-            for lp in learned:
-                patterns.append({
-                    'pattern': lp['pattern'],
-                    'description': lp.get('description', 'learned'),
-                    'type': lp.get('pattern_type', 'learned'),
-                    'frequency': lp.get('frequency', 0),
-                    'priority': lp.get('priority', 0),
-                    'pattern_id': lp['id']  # Store ID for usage tracking
-                })
-            
-            # Sort by priority and frequency
-            patterns.sort(key=lambda x: (x.get('priority', 0), x.get('frequency', 0)), reverse=True)
-            
-            return patterns
+            return [
+                compiled.to_pattern_info()
+                for compiled in get_pattern_registry().get_patterns(template_id, field_name)
+            ]
             
         except Exception as e:
             self.logger.error(f"Failed to load patterns from database: {e}")
             return []
     
+    def _try_compile(self, pattern: str):
+        """Compile pattern, or None if invalid (extraction then logs the regex error)"""
+        try:
+            return compile_pattern(pattern)
+        except re.error:
+            return None
+    
     def _update_pattern_usage(self, pattern_id: int, matched: bool):
         """
         Update pattern usage statistics
@@ -312,6 +287,13 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
             matched: True if pattern matched successfully
         """
         try:
+            from .pattern_usage import get_pattern_usage_aggregator, is_write_behind_enabled
+            
+            # ⚡ Write-behind: counted in memory, flushed in batches off the request path
+            if is_write_behind_enabled():
+                get_pattern_usage_aggregator().record(pattern_id, matched)
+                return
+            
             from database.db_manager import DatabaseManager
             from database.repositories.config_repository import ConfigRepository
             
@@ -356,7 +338,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         self, 
         location: Dict, 
         field_name: str, 
-        regex_pattern: str, 
+        regex_pattern: Union[str, re.Pattern], 
         all_words: List[Dict]
     ) -> Optional[FieldValue]:
         """Extract field from a specific location using context-aware approach"""
@@ -390,7 +372,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         label: str,
         label_pos: Dict,
         field_name: str,
-        regex_pattern: str,
+        regex_pattern: Union[str, re.Pattern],
         all_words: List[Dict],
         context: Dict
     ) -> Optional[FieldValue]:
@@ -450,7 +432,8 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
             if candidate_text:
                 # Try to extract value using pattern
                 # Pattern can match partial text (e.g., extract "27" from ": 27 Tahun")
-                match = re.search(regex_pattern, candidate_text)
+                regex = compile_pattern(regex_pattern)
+                match = regex.search(candidate_text)
                 if match:
                     # Use captured group if exists, otherwise use full match
                     raw_value = match.group(1) if match.groups() else match.group(0)
@@ -459,7 +442,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                     
                     # Higher confidence for label-based extraction
                     confidence = self._calculate_confidence(
-                        cleaned_value, regex_pattern, len(candidate_words), field_name, raw_value
+                        cleaned_value, regex, len(candidate_words), field_name, raw_value
                     )
                     confidence = min(confidence + 0.15, 1.0)  # Boost confidence
                     
@@ -473,7 +456,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                             'extraction_type': 'label-based',
                             'label': label,
                             'label_position': label_pos,
-                            'regex_pattern': regex_pattern,
+                            'regex_pattern': regex.pattern,
                             'candidate_words_count': len(candidate_words),
                             'raw_value': raw_value
                         }
@@ -489,7 +472,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         self,
         location: Dict,
         field_name: str,
-        regex_pattern: str,
+        regex_pattern: Union[str, re.Pattern],
         all_words: List[Dict]
     ) -> Optional[FieldValue]:
         """Extract field value using position-based approach (fallback)"""
@@ -556,7 +539,8 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
             if candidate_text:
                 # Try to extract value using pattern
                 # Pattern can match partial text (e.g., extract "27" from ": 27 Tahun")
-                match = re.search(regex_pattern, candidate_text)
+                regex = compile_pattern(regex_pattern)
+                match = regex.search(candidate_text)
                 if match:
                     # Use captured group if exists, otherwise use full match
                     raw_value = match.group(1) if match.groups() else match.group(0)
@@ -572,7 +556,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                     # Calculate confidence based on match quality
                     confidence = self._calculate_confidence(
                         cleaned_value, 
-                        regex_pattern, 
+                        regex, 
                         len(candidate_words),
                         field_name,
                         raw_value  # Pass raw value for comparison
@@ -585,7 +569,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
                         confidence=confidence,
                         method='rule_based',
                         metadata={
-                            'regex_pattern': regex_pattern,
+                            'regex_pattern': regex.pattern,
                             'search_area': {'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1},
                             'candidate_words_count': len(candidate_words),
                             'raw_value': raw_value  # Store raw for debugging
@@ -602,7 +586,7 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
     def _calculate_confidence(
         self, 
         value: str, 
-        pattern: str, 
+        pattern: Union[str, re.Pattern], 
         word_count: int,
         field_name: str,
         raw_value: str = None
@@ -634,11 +618,14 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
             elif cleaning_ratio > 0.15:  # 15-30% removed
                 confidence -= 0.1
         
+        regex = compile_pattern(pattern)
+        pattern = regex.pattern
+        
         # 1. Pattern match quality (most important)
-        if re.fullmatch(pattern, value):
+        if regex.fullmatch(value):
             # Perfect pattern match
             confidence += 0.3
-        elif re.search(pattern, value):
+        elif regex.search(value):
             # Partial pattern match
             confidence += 0.15
         else:
@@ -689,16 +676,18 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         return max(0.0, min(1.0, confidence))
     
     def _try_table_extraction(
-        self, pdf_path: str, field_config: Dict, all_words: List[Dict]
+        self, document: Any, field_config: Dict, all_words: List[Dict]
     ) -> Optional[FieldValue]:
         """
         Try to extract field from table structure
         
         This is part of rule-based strategy for handling structured tabular data.
         Uses adaptive table detection without hardcoded column mappings.
+        Tables come from the DocumentContext, so they are detected once per
+        document no matter how many table fields are extracted.
         
         Args:
-            pdf_path: Path to PDF file
+            document: DocumentContext of the PDF (or path to PDF file)
             field_config: Field configuration
             all_words: All words from PDF
             
@@ -718,11 +707,13 @@ class RuleBasedExtractionStrategy(ExtractionStrategy):
         
         try:
             from .table_extractor import AdaptiveTableExtractor
+            from .document_context import as_document_context
             
             extractor = AdaptiveTableExtractor()
             
-            # Extract tables from PDF
-            tables = extractor.extract_tables(pdf_path, page_number=0)
+            # Extract tables from PDF (memoized per document)
+            with as_document_context(document) as doc:
+                tables = doc.get_tables(page_number=0)
             
             if not tables:
                 # self.logger.debug(f"[Table] No tables found in PDF for '{field_name}'")
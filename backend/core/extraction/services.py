@@ -4,7 +4,7 @@ Business logic for document extraction
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from core.extraction.extractor import DataExtractor
 from database.repositories.document_repository import DocumentRepository
 from database.repositories.feedback_repository import FeedbackRepository
@@ -13,6 +13,7 @@ from database.repositories.training_repository import TrainingRepository
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 from datetime import datetime
+import hashlib
 import os
 import json
 import re
@@ -213,20 +214,99 @@ class ExtractionService:
 
     def save_corrections(self, document_id: int, corrections: Dict) -> Dict[str, Any]:
         """
-        Save user corrections as feedback and trigger adaptive learning
+        Save user corrections as feedback and publish a validation event
+
+        Only the database writes happen here; learning runs in the
+        validation event pipeline (see core.learning.validation_pipeline).
 
         Args:
             document_id: Document ID
             corrections: Corrections dictionary
 
         Returns:
-            Feedback info
+            Feedback info (with validation_event_id)
         """
+        from database.write_queue import run_write
+
         # Get document
         document = self.document_repo.find_by_id(document_id)
         if not document:
             raise NotFoundError(f"Document with ID {document_id} not found")
 
+        validation = self._prepare_validation(document, corrections)
+        run_write(self.db, lambda conn: self._write_validation(conn, validation))
+
+        return validation["result"]
+
+    def save_corrections_batch(self, items: List[Dict]) -> Dict[str, Any]:
+        """
+        Validate many documents at once (reviewer bulk approval)
+
+        All feedback rows, status updates and validation events are written
+        in one transaction: either every document is validated or none is.
+
+        Args:
+            items: List of {"document_id": int, "corrections": dict}
+
+        Returns:
+            Dict with per-document results and affected template IDs
+        """
+        from database.write_queue import run_write
+
+        if not items:
+            raise ValidationError("At least one document is required")
+
+        documents = {}
+        for item in items:
+            if not isinstance(item, dict) or "document_id" not in item:
+                raise ValidationError("Each item requires document_id and corrections")
+            document_id = item["document_id"]
+            if document_id in documents:
+                raise ValidationError(f"Document {document_id} is listed more than once")
+            documents[document_id] = self.document_repo.find_by_id(document_id)
+
+        missing = [document_id for document_id, document in documents.items() if not document]
+        if missing:
+            raise NotFoundError(f"Documents not found: {missing}")
+
+        validations = [
+            self._prepare_validation(documents[item["document_id"]], item.get("corrections") or {})
+            for item in items
+        ]
+
+        def _write_all(conn):
+            for validation in validations:
+                self._write_validation(conn, validation)
+
+        run_write(self.db, _write_all)
+
+        results = [validation["result"] for validation in validations]
+        template_ids = sorted({result["template_id"] for result in results})
+        self.logger.info(
+            f"✅ Validated {len(results)} documents in one transaction "
+            f"({len(template_ids)} template(s))"
+        )
+
+        return {
+            "documents": results,
+            "validated_count": len(results),
+            "corrections_count": sum(result["corrections_count"] for result in results),
+            "template_ids": template_ids,
+        }
+
+    def _prepare_validation(self, document, corrections: Dict) -> Dict[str, Any]:
+        """
+        Compute what validating a document writes (no database access)
+
+        Args:
+            document: Document to validate
+            corrections: Corrections dictionary
+
+        Returns:
+            Dict with write arguments and the (partially filled) result
+        """
+        document_id = document.id
+
         # Load original extraction results
         original_results = json.loads(document.extraction_result)
         extracted_data = original_results.get("extracted_data", {})
@@ -263,154 +343,112 @@ class ExtractionService:
         # ✅ Handle "all correct" validation (empty corrections)
         # Don't save to feedback table to avoid UI confusion (showing all fields as corrections)
         # Auto-training will count validated documents instead
-        if not actual_corrections:
+        all_correct = not actual_corrections
+        if all_correct:
             self.logger.info(f"✅ All data correct for document {document_id}. Marking as validated.")
-            
-            # Save to feedback folder for training (with all_correct flag)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            feedback_filename = f"feedback_{document_id}_{timestamp}.json"
-            feedback_path = os.path.join(self.feedback_folder, feedback_filename)
-            
-            feedback_data = {
-                "document_id": document_id,
-                "template_id": document.template_id,
-                "original_results": original_results,
-                "corrections": {},  # Empty - all correct
-                "all_correct": True,  # Flag for training
-                "timestamp": timestamp,
-            }
-            
-            with open(feedback_path, "w", encoding="utf-8") as f:
-                json.dump(feedback_data, f, indent=2)
-            
-            # Update metadata and mark as validated
-            updated_results = original_results.copy()
-            if "metadata" not in updated_results:
-                updated_results["metadata"] = {}
-            updated_results["metadata"]["validated"] = True
-            updated_results["metadata"]["validated_at"] = timestamp
-            updated_results["metadata"]["corrections_count"] = 0
-            updated_results["metadata"]["all_correct"] = True
-            
-            self.document_repo.update_extraction_result(document_id, updated_results)
-            self.document_repo.update_status(document_id, "validated")
-            
-            return {
-                "feedback_ids": [],  # No feedback records saved
-                "document_id": document_id,
-                "corrections_count": 0,
-                "all_correct": True,
-                "all_fields": extracted_data,
-                "corrected_fields": {},
-            }
 
-        # Save feedback (only actual corrections)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         feedback_filename = f"feedback_{document_id}_{timestamp}.json"
         feedback_path = os.path.join(self.feedback_folder, feedback_filename)
 
-        feedback_data = {
-            "document_id": document_id,
-            "template_id": document.template_id,
-            "original_results": original_results,
-            "corrections": actual_corrections,  # ✅ Only actual corrections
-            "timestamp": timestamp,
-        }
-
-        with open(feedback_path, "w", encoding="utf-8") as f:
-            json.dump(feedback_data, f, indent=2)
-
-        # Store feedback in database (one record per corrected field)
-        # Uses UPSERT: updates existing feedback or creates new
-
-        feedback_ids = self.feedback_repo.upsert(
-            document_id=document_id,
-            corrections=actual_corrections,  # ✅ Only actual corrections
-            original_data=extracted_data,  # ✅ Pass original values
-            confidence_scores=confidence_scores,  # ✅ Pass confidence scores
-            feedback_path=feedback_path,
-        )
-
-        # ✅ MULTILINE LEARNING (immediate): update allow_multiline as soon as we have
-        # a correction that suggests wrapped text in the PDF.
-        try:
-            from core.learning.services import ModelService
-
-            model_service = ModelService(self.db)
-            model_service.update_allow_multiline_from_document_feedback(
-                document_id=document_id,
-                all_fields=extracted_data,
-                corrected_fields=actual_corrections,
-            )
-        except Exception as e:
-            self.logger.warning(f"⚠️ allow_multiline immediate update failed: {e}")
-
-        # ✅ KEEP original extraction_result unchanged in documents table
+        # ✅ KEEP original extracted_data unchanged in documents table
         # Corrected values are stored in feedback table
         # This preserves the original extraction for comparison and metrics
-
-        # Note: To get validated data, query:
-        # 1. Get extraction_result from documents table (original)
-        # 2. Get corrections from feedback table
-        # 3. Merge: use corrected_value if exists, else use original
-
-        # Optional: Update metadata to mark as validated
         updated_results = original_results.copy()
-        if "metadata" not in updated_results:
-            updated_results["metadata"] = {}
+        updated_results["metadata"] = dict(updated_results.get("metadata") or {})
         updated_results["metadata"]["validated"] = True
         updated_results["metadata"]["validated_at"] = timestamp
-        updated_results["metadata"]["corrections_count"] = len(
-            actual_corrections
-        )  # ✅ Only actual corrections
-
-        # Save metadata update (but keep extracted_data unchanged)
-        self.document_repo.update_extraction_result(document_id, updated_results)
-
-        # Update document status
-        self.document_repo.update_status(document_id, "validated")
-
-        # 🤖 AUTO-TRAINING: Trigger training if enabled
-        # ⚠️ AUTO-TRAINING REMOVED FROM SERVICE LAYER
-        # Training is now handled in the API endpoint (/api/v1/extraction/validate)
-        # via async job queue to avoid blocking the API request.
-        # This ensures better performance and scalability.
-        auto_training_result = None
-        try:
-            # Pattern learning still runs here (lightweight operation)
-            auto_training_enabled = os.getenv("AUTO_TRAINING", "True").lower() == "true"
-
-            if auto_training_enabled:
-                from core.learning.services import ModelService
+        updated_results["metadata"]["corrections_count"] = len(actual_corrections)
+        if all_correct:
+            updated_results["metadata"]["all_correct"] = True
 
-                model_service = ModelService(self.db)
+        from core.learning.validation_pipeline import DOCUMENT_VALIDATED
 
-                # Only trigger pattern learning (no training)
-                model_service.trigger_adaptive_learning(
-                    document_id, extracted_data, actual_corrections
-                )
-                
-                auto_training_result = {
-                    "status": "deferred",
-                    "message": "Training will be handled by endpoint via job queue",
-                }
-        except Exception as e:
-            self.logger.warning(f"⚠️  Auto-training failed: {e}")
-            auto_training_result = {"status": "failed", "error": str(e)}
+        event_payload = {
+            "original_results": original_results,
+            "all_fields": extracted_data,
+            "corrected_fields": actual_corrections,
+            "all_correct": all_correct,
+            "timestamp": timestamp,
+            "feedback_path": feedback_path,
+            "auto_training": os.getenv("AUTO_TRAINING", "True").lower() == "true",
+        }
+        # Identical re-submissions (same extraction, same corrections) publish once
+        dedupe_key = "{}:{}:{}".format(
+            DOCUMENT_VALIDATED,
+            document_id,
+            hashlib.sha256(
+                json.dumps(
+                    {"extracted": extracted_data, "corrections": actual_corrections},
+                    sort_keys=True,
+                    default=str,
+                ).encode("utf-8")
+            ).hexdigest(),
+        )
 
-        # Return result with learning info
         result = {
-            "feedback_ids": feedback_ids,
+            "feedback_ids": [],  # Empty for "all correct"
             "document_id": document_id,
+            "template_id": document.template_id,
             "corrections_count": len(actual_corrections),
             "all_fields": extracted_data,  # ✅ All extracted fields
             "corrected_fields": actual_corrections,  # ✅ Only corrected fields
+            "validation_event_id": None,
+        }
+        if all_correct:
+            result["all_correct"] = True
+
+        return {
+            "document_id": document_id,
+            "template_id": document.template_id,
+            "corrections": actual_corrections,
+            "original_data": extracted_data,
+            "confidence_scores": confidence_scores,
+            "feedback_path": feedback_path,
+            "updated_results": updated_results,
+            "event_payload": event_payload,
+            "dedupe_key": dedupe_key,
+            "result": result,
         }
 
-        if auto_training_result:
-            result["auto_training"] = auto_training_result
+    def _write_validation(self, conn, validation: Dict[str, Any]):
+        """
+        Write one prepared validation on conn (caller owns the transaction)
 
-        return result
+        ⚡ FAST PATH: feedback, document status and the validation event only.
+        Feedback file, allow_multiline inference and adaptive learning run off
+        the request path (core.learning.validation_pipeline).
+
+        Args:
+            conn: Connection of the enclosing transaction
+            validation: Output of _prepare_validation (result is filled in)
+        """
+        from core.learning.validation_pipeline import DOCUMENT_VALIDATED
+        from database.repositories.validation_event_repository import ValidationEventRepository
+
+        document_id = validation["document_id"]
+
+        # Store feedback in database (one record per corrected field, UPSERT)
+        if validation["corrections"]:
+            validation["result"]["feedback_ids"] = self.feedback_repo.upsert(
+                document_id=document_id,
+                corrections=validation["corrections"],  # ✅ Only actual corrections
+                original_data=validation["original_data"],  # ✅ Pass original values
+                confidence_scores=validation["confidence_scores"],  # ✅ Pass confidence scores
+                feedback_path=validation["feedback_path"],
+                conn=conn,
+            )
+
+        self.document_repo.mark_validated(document_id, validation["updated_results"], conn=conn)
+
+        validation["result"]["validation_event_id"] = ValidationEventRepository(self.db).publish(
+            event_type=DOCUMENT_VALIDATED,
+            document_id=document_id,
+            template_id=validation["template_id"],
+            payload=validation["event_payload"],
+            dedupe_key=validation["dedupe_key"],
+            conn=conn,
+        )
 
     def get_all_documents(
         self,
@@ -516,6 +554,8 @@ class ExtractionService:
             "errors": [],
         }
 
+        # Save uploads and create document rows (in this process)
+        entries = []  # (file, document_id, filepath, save error)
         for file in files:
             try:
                 filename = secure_filename(file.filename)
@@ -530,41 +570,62 @@ class ExtractionService:
                     file_path=filepath,
                     experiment_phase=experiment_phase,
                 )
+                entries.append((file, document_id, filepath, None))
+            except Exception as e:
+                self.logger.error(f"Failed to extract {file.filename}: {str(e)}")
+                entries.append((file, None, None, str(e)))
 
-                if experiment_phase == "baseline":
-                    model_path = None
-                else:
-                    model_path = os.path.join(
-                        self.model_folder, f"template_{template_id}_model.joblib"
-                    )
-                    if not os.path.exists(model_path):
-                        model_path = None
-
-                extractor = DataExtractor(config, model_path)
-                extraction_results = extractor.extract(filepath)
-
-                extraction_time_ms = extraction_results.get("extraction_time_ms", 0)
-                self.document_repo.update_extraction(
-                    document_id=document_id,
-                    extraction_result=json.dumps(extraction_results),
-                    status="extracted",
-                    extraction_time_ms=extraction_time_ms,
-                )
+        if experiment_phase == "baseline":
+            model_path = None
+        else:
+            model_path = os.path.join(
+                self.model_folder, f"template_{template_id}_model.joblib"
+            )
+            if not os.path.exists(model_path):
+                model_path = None
 
-                results["successful"] += 1
-                results["documents"].append({
-                    "document_id": document_id,
-                    "filename": file.filename,
-                    "status": "success",
-                    "results": extraction_results,
-                })
+        # ⚡ Extract in parallel worker processes (template state loaded once per worker)
+        from core.extraction.bulk_extraction import extract_files
+
+        pending = [i for i, entry in enumerate(entries) if entry[1] is not None]
+        outcomes = {}
+        for index, extraction_results, error in extract_files(
+            config, model_path, [entries[i][2] for i in pending]
+        ):
+            entry_index = pending[index]
+            if error is None:
+                try:
+                    extraction_time_ms = extraction_results.get("extraction_time_ms", 0)
+                    self.document_repo.update_extraction(
+                        document_id=entries[entry_index][1],
+                        extraction_result=json.dumps(extraction_results),
+                        status="extracted",
+                        extraction_time_ms=extraction_time_ms,
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to extract {entries[entry_index][0].filename}: {str(e)}"
+                    )
+                    extraction_results, error = None, str(e)
+            outcomes[entry_index] = (extraction_results, error)
 
-            except Exception as e:
-                self.logger.error(f"Failed to extract {file.filename}: {str(e)}")
+        # Same response shape and order as sequential extraction
+        for entry_index, (file, document_id, _filepath, save_error) in enumerate(entries):
+            extraction_results, error = outcomes.get(entry_index, (None, save_error))
+            if error is not None:
                 results["failed"] += 1
                 results["errors"].append({
                     "filename": file.filename,
-                    "error": str(e),
+                    "error": error,
                 })
+                continue
+
+            results["successful"] += 1
+            results["documents"].append({
+                "document_id": document_id,
+                "filename": file.filename,
+                "status": "success",
+                "results": extraction_results,
+            })
 
         return results
@@ -54,9 +54,16 @@ class ExtractionStrategy(ABC):
 
     @abstractmethod
     def extract(
-        self, pdf_path: str, field_config: Dict, all_words: List[Dict]
+        self, document: Any, field_config: Dict, all_words: List[Dict]
     ) -> Optional[FieldValue]:
-        """Extract a field value from PDF"""
+        """
+        Extract a field value from PDF
+
+        Args:
+            document: DocumentContext of the PDF (a plain PDF path is also accepted)
+            field_config: Field configuration
+            all_words: All extracted words from PDF
+        """
         pass
 
     def _post_process_value(self, value: str, field_name: str, full_text: str) -> str:
@@ -0,0 +1,228 @@
+"""
+Strategy Performance Cache
+Process-wide, per-template snapshot of the strategy_performance table.
+
+Hybrid extraction used to query strategy_performance twice per field
+(adaptive threshold + scoring) and once more for the adaptive CRF weight,
+each on a fresh SQLite connection. A snapshot loads all rows of a template
+in one query and serves per-field lookups and the CRF weight aggregate
+from memory. Snapshots are reused until:
+- StrategyPerformanceRepository writes to the template in this process
+  (version bump via invalidate()), or
+- they are older than STRATEGY_PERFORMANCE_CACHE_TTL seconds, which bounds
+  staleness for writes made by other processes (0 = reload per extraction).
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# Minimum attempts before a field's CRF accuracy counts towards the CRF weight
+CRF_WEIGHT_MIN_EXTRACTIONS = 5
+
+
+@dataclass
+class StrategyPerformanceSnapshot:
+    """Read-only strategy performance of one template"""
+    template_id: int
+    loaded_at: float
+    # field_name -> strategy_type -> {'accuracy', 'attempts'} (accuracy desc)
+    by_field: Dict[Optional[str], Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    # AVG(accuracy), COUNT(*) of CRF rows with enough attempts
+    crf_avg_accuracy: Optional[float] = None
+    crf_field_count: int = 0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.loaded_at
+
+    def get_field_performance(self, field_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get strategy performance of a field
+
+        Args:
+            field_name: Field name
+
+        Returns:
+            Dict mapping strategy_type -> {'accuracy': float, 'attempts': int}
+        """
+        return dict(self.by_field.get(field_name, {}))
+
+    @classmethod
+    def from_rows(cls, template_id: int, rows: List[Dict[str, Any]]) -> "StrategyPerformanceSnapshot":
+        """
+        Build snapshot from strategy_performance rows
+
+        Args:
+            template_id: Template ID
+            rows: Rows ordered by field_name, accuracy DESC
+
+        Returns:
+            StrategyPerformanceSnapshot
+        """
+        snapshot = cls(template_id=template_id, loaded_at=time.time())
+
+        crf_accuracies = []
+        crf_count = 0
+        for row in rows:
+            snapshot.by_field.setdefault(row['field_name'], {})[row['strategy_type']] = {
+                'accuracy': row['accuracy'],
+                'attempts': row['total_extractions'],
+            }
+            if (
+                row['strategy_type'] == 'crf'
+                and (row['total_extractions'] or 0) >= CRF_WEIGHT_MIN_EXTRACTIONS
+            ):
+                crf_count += 1
+                if row['accuracy'] is not None:
+                    crf_accuracies.append(row['accuracy'])
+
+        # Same semantics as SQL AVG(accuracy) / COUNT(*)
+        snapshot.crf_field_count = crf_count
+        if crf_accuracies:
+            snapshot.crf_avg_accuracy = sum(crf_accuracies) / len(crf_accuracies)
+        return snapshot
+
+
+class StrategyPerformanceCache:
+    """
+    Thread-safe TTL + version invalidated cache of performance snapshots
+    """
+
+    def __init__(self, db_manager=None, ttl: float = None):
+        """
+        Initialize strategy performance cache
+
+        Args:
+            db_manager: DatabaseManager instance (default: new DatabaseManager)
+            ttl: Seconds a snapshot is served before reloading
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._db = db_manager
+        self.ttl = ttl if ttl is not None else float(
+            os.getenv('STRATEGY_PERFORMANCE_CACHE_TTL', '60')
+        )
+
+        self._snapshots: Dict[int, StrategyPerformanceSnapshot] = {}
+        self._versions: Dict[int, int] = {}
+        self._global_version = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_snapshot(self, template_id: int, db_manager=None) -> StrategyPerformanceSnapshot:
+        """
+        Get performance snapshot of a template (loaded on miss or expiry)
+
+        Args:
+            template_id: Template ID
+            db_manager: DatabaseManager to load with (default: cache's own)
+
+        Returns:
+            StrategyPerformanceSnapshot (empty if loading fails)
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(template_id)
+            if snapshot is not None and snapshot.age <= self.ttl:
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            version = (self._global_version, self._versions.get(template_id, 0))
+
+        rows = self._load_rows(template_id, db_manager)
+        snapshot = StrategyPerformanceSnapshot.from_rows(template_id, rows or [])
+
+        with self._lock:
+            # Don't cache failed loads or a snapshot that raced with a write
+            current = (self._global_version, self._versions.get(template_id, 0))
+            if rows is not None and current == version:
+                self._snapshots[template_id] = snapshot
+        return snapshot
+
+    def invalidate(self, template_id: int = None):
+        """
+        Drop cached snapshots after strategy performance changed
+
+        Args:
+            template_id: Template to drop (None = all)
+        """
+        with self._lock:
+            self.invalidations += 1
+            if template_id is None:
+                self._global_version += 1
+                self._snapshots.clear()
+            else:
+                self._versions[template_id] = self._versions.get(template_id, 0) + 1
+                self._snapshots.pop(template_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate and per-template snapshot age"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'ttl': self.ttl,
+                'templates': {
+                    template_id: {
+                        'fields': len(snapshot.by_field),
+                        'age_seconds': round(snapshot.age, 1),
+                    }
+                    for template_id, snapshot in self._snapshots.items()
+                },
+            }
+
+    def _load_rows(self, template_id: int, db_manager=None) -> Optional[List[Dict[str, Any]]]:
+        db = db_manager or self._db
+        if db is None:
+            from database.db_manager import DatabaseManager
+            db = self._db = DatabaseManager()
+
+        try:
+            conn = db.get_connection()
+            try:
+                cursor = conn.execute(
+                    """
+                    SELECT field_name, strategy_type, accuracy, total_extractions
+                    FROM strategy_performance
+                    WHERE template_id = ?
+                    ORDER BY field_name, accuracy DESC
+                """,
+                    (template_id,),
+                )
+                return [dict(row) for row in cursor.fetchall()]
+            finally:
+                conn.close()
+        except Exception as e:
+            self.logger.error(f"Error loading strategy performance for template {template_id}: {e}")
+            return None
+
+
+# Singleton instance
+_performance_cache_instance = None
+_performance_cache_lock = threading.Lock()
+
+
+def get_strategy_performance_cache() -> StrategyPerformanceCache:
+    """
+    Get singleton strategy performance cache instance
+
+    Returns:
+        StrategyPerformanceCache instance
+    """
+    global _performance_cache_instance
+
+    if _performance_cache_instance is None:
+        with _performance_cache_lock:
+            if _performance_cache_instance is None:
+                _performance_cache_instance = StrategyPerformanceCache()
+
+    return _performance_cache_instance
@@ -37,40 +37,52 @@ class AdaptiveTableExtractor:
                     self.logger.warning(f"Page {page_number} not found in PDF")
                     return []
                 
-                page = pdf.pages[page_number]
-                
-                # Extract tables with settings optimized for complex layouts
-                tables = page.extract_tables({
-                    'vertical_strategy': 'lines_strict',  # Use explicit lines
-                    'horizontal_strategy': 'lines_strict',
-                    'snap_tolerance': 3,  # Snap to lines within 3 pixels
-                    'join_tolerance': 3,  # Join lines within 3 pixels
-                    'edge_min_length': 3,  # Minimum line length
-                    'min_words_vertical': 1,  # Minimum words to detect vertical boundary
-                    'min_words_horizontal': 1,  # Minimum words to detect horizontal boundary
-                    'text_tolerance': 3,
-                    'intersection_tolerance': 3,
-                })
-                
-                # Clean tables (remove None values, strip whitespace)
-                cleaned_tables = []
-                for table in tables:
-                    cleaned_table = []
-                    for row in table:
-                        cleaned_row = [
-                            cell.strip() if cell else '' 
-                            for cell in row
-                        ]
-                        cleaned_table.append(cleaned_row)
-                    cleaned_tables.append(cleaned_table)
-                
-                self.logger.info(f"📊 Extracted {len(cleaned_tables)} tables from page {page_number}")
-                return cleaned_tables
+                return self.extract_tables_from_page(pdf.pages[page_number], page_number)
                 
         except Exception as e:
             self.logger.error(f"Error extracting tables: {e}")
             return []
     
+    def extract_tables_from_page(self, page, page_number: int = 0) -> List[List[List[str]]]:
+        """
+        Extract all tables from an already opened pdfplumber page
+        
+        Args:
+            page: pdfplumber Page object
+            page_number: Page number (0-indexed, for logging)
+            
+        Returns:
+            List of tables, where each table is a list of rows, 
+            and each row is a list of cell values
+        """
+        # Extract tables with settings optimized for complex layouts
+        tables = page.extract_tables({
+            'vertical_strategy': 'lines_strict',  # Use explicit lines
+            'horizontal_strategy': 'lines_strict',
+            'snap_tolerance': 3,  # Snap to lines within 3 pixels
+            'join_tolerance': 3,  # Join lines within 3 pixels
+            'edge_min_length': 3,  # Minimum line length
+            'min_words_vertical': 1,  # Minimum words to detect vertical boundary
+            'min_words_horizontal': 1,  # Minimum words to detect horizontal boundary
+            'text_tolerance': 3,
+            'intersection_tolerance': 3,
+        })
+        
+        # Clean tables (remove None values, strip whitespace)
+        cleaned_tables = []
+        for table in tables:
+            cleaned_table = []
+            for row in table:
+                cleaned_row = [
+                    cell.strip() if cell else '' 
+                    for cell in row
+                ]
+                cleaned_table.append(cleaned_row)
+            cleaned_tables.append(cleaned_table)
+        
+        self.logger.info(f"📊 Extracted {len(cleaned_tables)} tables from page {page_number}")
+        return cleaned_tables
+    
     def find_field_in_tables(
         self, 
         tables: List[List[List[str]]], 
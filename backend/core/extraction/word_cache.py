@@ -0,0 +1,377 @@
+"""
+PDF Word Cache
+Persistent, content-addressed cache of pdfplumber word extraction.
+
+Extraction, retraining and multiline inference all parse the same PDFs
+with `page.extract_words(...)`. The cache key is the SHA-256 of the file
+contents plus the extraction parameters, so a re-uploaded copy of the same
+file hits the cache while a modified file never does.
+
+Layout on disk (one directory per key):
+    meta.json               pages, numeric columns and types, extraction params
+    page_<n>.coords.npy     float64 array (words x numeric columns)
+    page_<n>.text.bin       UTF-8 text of all words, concatenated
+    page_<n>.offsets.npy    int64 byte offsets into text.bin (words + 1)
+    page_<n>.extra.json     other keys per word (e.g. direction, fontname), if any
+
+Numeric columns are keys every word has with the same int/float/bool
+type; they are restored with that type. Any other key is stored as JSON
+per word, so a cache hit returns the same word dicts as a miss (an entry
+whose extra values would not survive JSON is not stored).
+
+A hit reads the arrays whole and rebuilds the word dicts, since callers
+consume every word. Every word carries `page_number` (0-based page index),
+like pdfplumber's chars and objects. A PDF with a page that failed to
+extract is returned without that page's words and is not stored.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Schema version of the on-disk layout; bump to invalidate old entries
+CACHE_FORMAT_VERSION = 3
+
+# File hashes remembered per (path, mtime, size), least recently used dropped first
+HASH_MEMO_SIZE = 1024
+
+# Types of values stored in the float64 coords array
+_NUMERIC_TYPES = {float: "float", int: "int", bool: "bool"}
+_CASTS = {"float": float, "int": int, "bool": bool}
+
+
+class PDFWordCache:
+    """
+    Disk cache for per-page pdfplumber words keyed by file hash + params
+    """
+
+    def __init__(self, cache_dir: str = None, enabled: bool = None):
+        """
+        Initialize word cache
+
+        Args:
+            cache_dir: Cache directory (default: PDF_WORD_CACHE_DIR or backend/data/word_cache)
+            enabled: Enable cache (default: PDF_WORD_CACHE env, true)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        cache_dir = cache_dir or os.getenv(
+            "PDF_WORD_CACHE_DIR", os.path.join("data", "word_cache")
+        )
+        # Resolve relative paths against backend/ (like DatabaseManager), so API,
+        # worker and CLI processes share one cache whatever their cwd
+        if not os.path.isabs(cache_dir):
+            backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+            cache_dir = os.path.join(backend_dir, cache_dir)
+        self.cache_dir = cache_dir
+        self.enabled = enabled if enabled is not None else (
+            os.getenv("PDF_WORD_CACHE", "true").lower() == "true"
+        )
+
+        # (abs path, mtime, size) -> sha256, avoids re-hashing unchanged files
+        self._hash_memo: "OrderedDict[Tuple[str, float, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def get_words_by_page(
+        self,
+        pdf_path: str,
+        x_tolerance: float = 3,
+        y_tolerance: float = 3,
+        keep_blank_chars: bool = False,
+        use_text_flow: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Get words for every page of a PDF (cached)
+
+        Args:
+            pdf_path: Path to PDF file
+            x_tolerance, y_tolerance, keep_blank_chars, use_text_flow:
+                Passed to pdfplumber's page.extract_words
+
+        Returns:
+            List of pages, each a list of word dictionaries
+        """
+        params = {
+            "x_tolerance": x_tolerance,
+            "y_tolerance": y_tolerance,
+            "keep_blank_chars": keep_blank_chars,
+            "use_text_flow": use_text_flow,
+        }
+
+        if not self.enabled:
+            return self._extract(pdf_path, params)[0]
+
+        try:
+            key = self._cache_key(pdf_path, params)
+        except OSError as e:
+            self.logger.warning(f"⚠️ [WordCache] Cannot hash {pdf_path}: {e}")
+            return self._extract(pdf_path, params)[0]
+
+        entry_dir = os.path.join(self.cache_dir, key[:2], key)
+        pages = self._read_entry(entry_dir)
+        if pages is not None:
+            with self._lock:
+                self.hits += 1
+            return pages
+
+        with self._lock:
+            self.misses += 1
+
+        pages, complete = self._extract(pdf_path, params)
+        if not complete:
+            # Don't persist missing pages; the next call retries them
+            return pages
+        try:
+            self._write_entry(entry_dir, pages, params)
+        except Exception as e:
+            self.logger.warning(f"⚠️ [WordCache] Failed to store words for {pdf_path}: {e}")
+        return pages
+
+    def get_words(self, pdf_path: str, **params) -> List[Dict[str, Any]]:
+        """
+        Get words of all pages as one flat list (document order)
+
+        Args:
+            pdf_path: Path to PDF file
+            **params: Extraction parameters (see get_words_by_page)
+
+        Returns:
+            List of word dictionaries
+        """
+        words: List[Dict[str, Any]] = []
+        for page_words in self.get_words_by_page(pdf_path, **params):
+            words.extend(page_words)
+        return words
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "cache_dir": self.cache_dir,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Remove all cached entries"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    # ========================================================================
+    # Internals
+    # ========================================================================
+
+    def _file_hash(self, pdf_path: str) -> str:
+        stat = os.stat(pdf_path)
+        memo_key = (os.path.abspath(pdf_path), stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._hash_memo.get(memo_key)
+            if cached:
+                self._hash_memo.move_to_end(memo_key)
+        if cached:
+            return cached
+
+        sha = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._hash_memo[memo_key] = digest
+            while len(self._hash_memo) > HASH_MEMO_SIZE:
+                self._hash_memo.popitem(last=False)
+        return digest
+
+    def _cache_key(self, pdf_path: str, params: Dict[str, Any]) -> str:
+        param_str = json.dumps(params, sort_keys=True)
+        raw = f"{self._file_hash(pdf_path)}|{param_str}|v{CACHE_FORMAT_VERSION}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _extract(
+        self, pdf_path: str, params: Dict[str, Any]
+    ) -> Tuple[List[List[Dict[str, Any]]], bool]:
+        """Words per page, and whether every page extracted (failed pages are empty)"""
+        import pdfplumber
+
+        pages = []
+        complete = True
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_idx, page in enumerate(pdf.pages):
+                try:
+                    page_words = page.extract_words(**params)
+                    for word in page_words:
+                        word["page_number"] = page_idx
+                    pages.append(page_words)
+                except Exception as e:
+                    self.logger.warning(
+                        f"⚠️ [WordCache] Failed to extract page {page_idx} of {pdf_path}: {e}"
+                    )
+                    pages.append([])
+                    complete = False
+        return pages, complete
+
+    @staticmethod
+    def _numeric_columns(pages: List[List[Dict[str, Any]]]) -> Tuple[List[str], Dict[str, str]]:
+        """Keys every word has with one int/float/bool type, in pdfplumber's key order"""
+        columns: List[str] = []
+        column_types: Dict[str, str] = {}
+        first = True
+        for page_words in pages:
+            for word in page_words:
+                if first:
+                    for key, value in word.items():
+                        if key != "text" and type(value) in _NUMERIC_TYPES:
+                            columns.append(key)
+                            column_types[key] = _NUMERIC_TYPES[type(value)]
+                    first = False
+                    continue
+                for key in list(columns):
+                    if key not in word or _NUMERIC_TYPES.get(type(word[key])) != column_types[key]:
+                        columns.remove(key)
+                        del column_types[key]
+        return columns, column_types
+
+    def _read_entry(self, entry_dir: str) -> Optional[List[List[Dict[str, Any]]]]:
+        meta_path = os.path.join(entry_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("format_version") != CACHE_FORMAT_VERSION:
+                return None
+
+            columns = meta["columns"]
+            casts = [_CASTS[meta["column_types"][column]] for column in columns]
+            pages = []
+            for page_idx in range(meta["page_count"]):
+                prefix = os.path.join(entry_dir, f"page_{page_idx}")
+                offsets = np.load(f"{prefix}.offsets.npy")
+                n_words = len(offsets) - 1
+                if n_words <= 0:
+                    pages.append([])
+                    continue
+
+                coords = np.load(f"{prefix}.coords.npy")
+                with open(f"{prefix}.text.bin", "rb") as f:
+                    text_blob = f.read()
+                extras = None
+                if os.path.exists(f"{prefix}.extra.json"):
+                    with open(f"{prefix}.extra.json", "r", encoding="utf-8") as f:
+                        extras = json.load(f)
+
+                offset_list = offsets.tolist()
+                rows = coords.tolist()
+                page_words = []
+                for i in range(n_words):
+                    word = {"text": text_blob[offset_list[i]:offset_list[i + 1]].decode("utf-8")}
+                    for column, cast, value in zip(columns, casts, rows[i]):
+                        word[column] = cast(value)
+                    if extras is not None:
+                        word.update(extras[i])
+                    page_words.append(word)
+                pages.append(page_words)
+            return pages
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ [WordCache] Corrupt entry {entry_dir}, re-extracting: {e}")
+            return None
+
+    def _write_entry(
+        self, entry_dir: str, pages: List[List[Dict[str, Any]]], params: Dict[str, Any]
+    ):
+        columns, column_types = self._numeric_columns(pages)
+        stored_keys = set(columns) | {"text"}
+        extras_by_page = [
+            [{k: v for k, v in w.items() if k not in stored_keys} for w in page_words]
+            for page_words in pages
+        ]
+        for page_extras in extras_by_page:
+            if json.loads(json.dumps(page_extras)) != page_extras:
+                raise ValueError("word attributes are not JSON round-trippable")
+
+        parent = os.path.dirname(entry_dir)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp_")
+
+        try:
+            for page_idx, page_words in enumerate(pages):
+                prefix = os.path.join(tmp_dir, f"page_{page_idx}")
+                encoded = [w.get("text", "").encode("utf-8") for w in page_words]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                if encoded:
+                    offsets[1:] = np.cumsum([len(b) for b in encoded])
+                coords = np.array(
+                    [[float(w.get(column, 0.0)) for column in columns] for w in page_words],
+                    dtype=np.float64,
+                ).reshape(len(page_words), len(columns))
+
+                np.save(f"{prefix}.offsets.npy", offsets)
+                np.save(f"{prefix}.coords.npy", coords)
+                with open(f"{prefix}.text.bin", "wb") as f:
+                    f.write(b"".join(encoded))
+                if any(extras_by_page[page_idx]):
+                    with open(f"{prefix}.extra.json", "w", encoding="utf-8") as f:
+                        json.dump(extras_by_page[page_idx], f)
+
+            # meta.json last: its presence marks a complete entry
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "format_version": CACHE_FORMAT_VERSION,
+                        "page_count": len(pages),
+                        "columns": columns,
+                        "column_types": column_types,
+                        "params": params,
+                    },
+                    f,
+                )
+
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Another process stored the same entry first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+
+# Singleton instance
+_word_cache_instance = None
+_word_cache_lock = threading.Lock()
+
+
+def get_word_cache() -> PDFWordCache:
+    """
+    Get singleton word cache instance
+
+    Returns:
+        PDFWordCache instance
+    """
+    global _word_cache_instance
+
+    if _word_cache_instance is None:
+        with _word_cache_lock:
+            if _word_cache_instance is None:
+                _word_cache_instance = PDFWordCache()
+
+    return _word_cache_instance
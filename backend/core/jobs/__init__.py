@@ -0,0 +1,7 @@
+"""
+Jobs Domain
+Background job execution (multi-worker runner, handlers, wakeup)
+"""
+from .runner import JobRunner, JobRunnerOptions, JobWorker
+
+__all__ = ['JobRunner', 'JobRunnerOptions', 'JobWorker']
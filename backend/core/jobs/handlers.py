@@ -0,0 +1,56 @@
+"""
+Job Handlers
+Functions executing one claimed job, registered per job type.
+"""
+import json
+from typing import Any, Callable, Dict
+
+
+def handle_auto_training(job: Dict[str, Any], db) -> Dict[str, Any]:
+    """
+    Run (auto/manual) CRF training for a template
+
+    Args:
+        job: Claimed job row (id, type, template_id, payload, ...)
+        db: DatabaseManager instance
+
+    Returns:
+        Summary dict (status 'trained' or 'skipped')
+    """
+    from core.learning.auto_trainer import get_auto_training_service
+
+    template_id = job["template_id"]
+    payload = json.loads(job["payload"])
+    model_folder = payload.get("model_folder", "models")
+    is_first_training = payload.get("is_first_training", False)
+
+    auto_trainer = get_auto_training_service(db)
+    result = auto_trainer.check_and_train(
+        template_id=template_id,
+        model_folder=model_folder,
+        force_first_training=is_first_training,
+    )
+
+    if not result:
+        print(f"ℹ️  Auto-training skipped for template {template_id} (conditions not met)")
+        return {"status": "skipped"}
+
+    accuracy = result['test_metrics'].get('accuracy')
+    if accuracy is not None:
+        print(
+            f"✅ Auto-training completed for template {template_id}: "
+            f"{result['training_samples']} samples, "
+            f"{accuracy*100:.2f}% accuracy"
+        )
+    else:
+        print(
+            f"✅ Auto-training completed for template {template_id}: "
+            f"{result['training_samples']} samples (metrics not evaluated)"
+        )
+    return {"status": "trained", "training_samples": result['training_samples']}
+
+
+# Job type -> handler
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], Any], Any]] = {
+    "auto_training": handle_auto_training,
+}
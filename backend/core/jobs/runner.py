@@ -0,0 +1,250 @@
+"""
+Job Runner
+Multi-process worker pool for the jobs table.
+
+Replaces the single `manage.py worker` polling loop:
+- N worker processes claim jobs with one guarded UPDATE
+  (JobRepository.claim_next_job), so two workers never run the same job
+- claim order is priority DESC, created_at ASC; a template never has more
+  than max_per_template running jobs, so one template's training does
+  not block the others
+- a running job holds a lease renewed by a heartbeat thread; workers
+  requeue jobs whose lease expired (crashed or killed worker) instead of
+  failing everything older than 30 minutes at startup
+- idle workers sleep on the wakeup file (core.jobs.wakeup) and claim as
+  soon as a job is enqueued; idle_timeout is only a fallback poll
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class JobRunnerOptions:
+    """Job runner settings (defaults from environment, see Config)"""
+    workers: int = field(default_factory=lambda: int(os.getenv('JOB_WORKERS', '1')))
+    idle_timeout: float = field(default_factory=lambda: float(os.getenv('JOB_IDLE_TIMEOUT', '30')))
+    lease_seconds: int = field(default_factory=lambda: int(os.getenv('JOB_LEASE_SECONDS', '120')))
+    heartbeat_interval: float = field(default_factory=lambda: float(os.getenv('JOB_HEARTBEAT_INTERVAL', '30')))
+    max_per_template: int = field(default_factory=lambda: int(os.getenv('JOB_MAX_PER_TEMPLATE', '1')))
+    max_attempts: int = field(default_factory=lambda: int(os.getenv('JOB_MAX_ATTEMPTS', '3')))
+    reap_interval: float = field(default_factory=lambda: float(os.getenv('JOB_REAP_INTERVAL', '60')))
+    shutdown_timeout: float = 30.0
+    job_types: Optional[List[str]] = None
+
+
+class JobWorker:
+    """
+    Claim-execute loop of one worker process
+    """
+
+    def __init__(self, options: JobRunnerOptions, stop_event=None, db_manager=None):
+        """
+        Initialize worker
+
+        Args:
+            options: Runner options
+            stop_event: Event set to stop after the current job
+            db_manager: DatabaseManager instance (default: new DatabaseManager)
+        """
+        from database.db_manager import DatabaseManager
+        from database.repositories.job_repository import JobRepository
+        from .wakeup import get_job_wakeup
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.options = options
+        self.stop_event = stop_event or threading.Event()
+        self.db = db_manager or DatabaseManager()
+        self.job_repo = JobRepository(self.db)
+        self.wakeup = get_job_wakeup()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._last_reap = 0.0
+
+        # Counters
+        self.claimed = 0
+        self.completed = 0
+        self.failed = 0
+
+    def run(self):
+        """Process jobs until stop_event is set"""
+        print(f"🔧 [{self.worker_id}] Worker started")
+        while not self.stop_event.is_set():
+            self._reap_expired_leases()
+
+            job = self.job_repo.claim_next_job(
+                worker_id=self.worker_id,
+                lease_seconds=self.options.lease_seconds,
+                job_types=self.options.job_types,
+                max_per_template=self.options.max_per_template,
+            )
+            if job:
+                self.claimed += 1
+                self.execute(job)
+                continue
+
+            self.wakeup.wait(self.options.idle_timeout, should_stop=self.stop_event.is_set)
+
+        print(
+            f"🛑 [{self.worker_id}] Worker stopped "
+            f"(claimed={self.claimed}, completed={self.completed}, failed={self.failed})"
+        )
+
+    def execute(self, job: Dict[str, Any]):
+        """
+        Run a claimed job while heartbeating its lease
+
+        Args:
+            job: Claimed job row
+        """
+        from .handlers import JOB_HANDLERS
+
+        job_id = job["id"]
+        print(
+            f"\n⚙️  [{self.worker_id}] Processing job {job_id} ({job['type']}, "
+            f"priority {job.get('priority', 0)}) for template {job['template_id']}..."
+        )
+
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job_id, done), name=f"JobHeartbeat-{job_id}", daemon=True
+        )
+        heartbeat.start()
+
+        try:
+            handler = JOB_HANDLERS.get(job["type"])
+            if handler is None:
+                raise ValueError(f"No handler for job type '{job['type']}'")
+
+            handler(job, self.db)
+            if self.job_repo.mark_completed(job_id, worker_id=self.worker_id):
+                self.completed += 1
+            else:
+                print(f"⚠️  [{self.worker_id}] Job {job_id} finished after losing its lease")
+        except KeyboardInterrupt:
+            # Interrupted mid-job: hand it back instead of failing it
+            self.job_repo.release_job(job_id, self.worker_id)
+            raise
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            traceback.print_exc()
+
+            # Mark job as failed and log to failed_jobs table
+            self.job_repo.mark_failed(job_id, str(e), worker_id=self.worker_id)
+            self.failed += 1
+        finally:
+            done.set()
+            heartbeat.join(timeout=5)
+            # Jobs held back by the per-template limit may be runnable now
+            self.wakeup.notify()
+
+    def _heartbeat(self, job_id: int, done: threading.Event):
+        while not done.wait(self.options.heartbeat_interval):
+            try:
+                if not self.job_repo.heartbeat(job_id, self.worker_id, self.options.lease_seconds):
+                    self.logger.warning(f"⚠️ [{self.worker_id}] Lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                self.logger.error(f"❌ [{self.worker_id}] Heartbeat for job {job_id} failed: {e}")
+
+    def _reap_expired_leases(self):
+        if time.time() - self._last_reap < self.options.reap_interval:
+            return
+        self._last_reap = time.time()
+        try:
+            result = self.job_repo.requeue_expired_leases(self.options.max_attempts)
+            if result["requeued"] or result["failed"]:
+                print(
+                    f"ℹ️  [{self.worker_id}] Expired leases: {result['requeued']} requeued, "
+                    f"{result['failed']} failed (max attempts reached)"
+                )
+        except Exception as e:
+            self.logger.error(f"❌ [{self.worker_id}] Lease recovery failed: {e}")
+
+
+def _worker_process(options: JobRunnerOptions, stop_event):
+    """Entry point of a spawned worker process"""
+    # The supervisor coordinates shutdown: finish the current job on Ctrl+C/SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    JobWorker(options, stop_event=stop_event).run()
+
+
+class JobRunner:
+    """
+    Supervisor starting and restarting worker processes
+    """
+
+    def __init__(self, options: Optional[JobRunnerOptions] = None):
+        """
+        Initialize runner
+
+        Args:
+            options: Runner options (default: from environment)
+        """
+        self.options = options or JobRunnerOptions()
+
+    def run(self):
+        """Run workers until interrupted (SIGINT/SIGTERM)"""
+        opts = self.options
+        print(
+            f"🔧 Starting job runner: {opts.workers} worker(s), lease {opts.lease_seconds}s, "
+            f"max {opts.max_per_template or 'unlimited'} running job(s) per template"
+        )
+
+        if opts.workers <= 1:
+            self._run_inline()
+        else:
+            self._run_processes()
+
+    def _run_inline(self):
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        try:
+            JobWorker(self.options, stop_event=stop_event).run()
+        except KeyboardInterrupt:
+            print("\n🛑 Worker stopped by user")
+
+    def _run_processes(self):
+        # spawn: children must not inherit SQLite handles or locks from the supervisor
+        ctx = multiprocessing.get_context("spawn")
+        stop_event = ctx.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+        def start(index: int):
+            process = ctx.Process(
+                target=_worker_process,
+                args=(self.options, stop_event),
+                name=f"JobWorker-{index}",
+                daemon=False,
+            )
+            process.start()
+            return process
+
+        processes = [start(i) for i in range(self.options.workers)]
+        try:
+            while not stop_event.is_set():
+                for i, process in enumerate(processes):
+                    if not process.is_alive() and not stop_event.is_set():
+                        print(f"⚠️  Worker {process.name} exited ({process.exitcode}), restarting")
+                        processes[i] = start(i)
+                stop_event.wait(1.0)
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping workers (finishing current jobs)...")
+        finally:
+            stop_event.set()
+            deadline = time.time() + self.options.shutdown_timeout
+            for process in processes:
+                process.join(timeout=max(0.0, deadline - time.time()))
+            for process in processes:
+                if process.is_alive():
+                    # Its job's lease expires and another worker picks it up
+                    process.terminate()
+                    process.join(timeout=5)
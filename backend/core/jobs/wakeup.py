@@ -0,0 +1,98 @@
+"""
+Job Wakeup Signal
+Wakes idle job workers as soon as a job is enqueued.
+
+The API and the worker run in different processes (and containers) that
+only share the data volume, so the signal is a small file next to the
+SQLite database: enqueue touches it, idle workers watch its modification
+time (a stat() every JOB_WAKEUP_CHECK_INTERVAL seconds, no database
+query) and claim a job as soon as it changes.
+"""
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+class JobWakeup:
+    """File-based cross-process wakeup signal"""
+
+    def __init__(self, path: str, check_interval: float = None):
+        """
+        Initialize wakeup signal
+
+        Args:
+            path: Signal file path (must be visible to API and workers)
+            check_interval: Seconds between checks while waiting
+        """
+        self.path = path
+        self.check_interval = check_interval if check_interval is not None else float(
+            os.getenv('JOB_WAKEUP_CHECK_INTERVAL', '0.25')
+        )
+        self._last_seen = self._mtime()
+
+    def notify(self):
+        """Signal waiting workers"""
+        with open(self.path, 'a'):
+            pass
+        now = time.time()
+        os.utime(self.path, (now, now))
+
+    def wait(self, timeout: float, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Block until notified, timeout or should_stop() returns True
+
+        Args:
+            timeout: Max seconds to wait (fallback poll interval)
+            should_stop: Optional stop check evaluated between checks
+
+        Returns:
+            True if notified since the previous wait
+        """
+        deadline = time.time() + timeout
+        while True:
+            mtime = self._mtime()
+            if mtime != self._last_seen:
+                self._last_seen = mtime
+                return True
+            if should_stop and should_stop():
+                return False
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.check_interval, remaining))
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+
+# Singleton instance
+_wakeup_instance = None
+_wakeup_lock = threading.Lock()
+
+
+def get_job_wakeup() -> JobWakeup:
+    """
+    Get singleton wakeup signal (JOB_WAKEUP_FILE, default next to the database)
+
+    Returns:
+        JobWakeup instance
+    """
+    global _wakeup_instance
+
+    if _wakeup_instance is None:
+        with _wakeup_lock:
+            if _wakeup_instance is None:
+                path = os.getenv('JOB_WAKEUP_FILE')
+                if not path:
+                    from database.db_manager import DatabaseManager
+
+                    path = os.path.join(
+                        os.path.dirname(DatabaseManager().db_path), '.jobs_wakeup'
+                    )
+                _wakeup_instance = JobWakeup(path)
+
+    return _wakeup_instance
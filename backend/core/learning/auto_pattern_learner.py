@@ -2,10 +2,11 @@
 Auto Pattern Learner
 
 Automatically triggers pattern learning after feedback submission.
-Runs in background to avoid blocking user requests.
+Runs in background (bounded pattern learning executor) to avoid blocking
+user requests.
 """
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 import threading
 
@@ -57,48 +58,92 @@ class AutoPatternLearner:
         Returns:
             True if learning should be triggered
         """
-        try:
-            # Count validated documents since last learning
-            # Include both: documents with feedback + documents without feedback (validated)
-            query = """
-                SELECT COUNT(DISTINCT d.id) as document_count
-                FROM documents d
-                WHERE d.template_id = ?
-                  AND d.status = 'validated'
-                  AND d.created_at > COALESCE(
-                      (SELECT MAX(completed_at) 
-                       FROM pattern_learning_jobs 
-                       WHERE template_id = ? 
-                         AND field_name = ? 
-                         AND status = 'completed'),
-                      '2000-01-01'
-                  )
-            """
-            
-            result = self.db.execute_query(
-                query,
-                (template_id, template_id, field_name)
+        return field_name in self.get_fields_ready_for_learning(template_id, [field_name])
+
+    def get_pending_document_counts(
+        self,
+        template_id: int,
+        field_names: List[str]
+    ) -> Dict[str, int]:
+        """
+        Count validated documents since the last completed learning run, per field
+
+        One grouped query for all fields (the validation path used to run one
+        COUNT with a correlated MAX(completed_at) subquery per field).
+
+        Args:
+            template_id: Template ID
+            field_names: Field names to check
+
+        Returns:
+            Dict field_name -> new validated document count
+        """
+        field_names = list(dict.fromkeys(field_names))
+        if not field_names:
+            return {}
+
+        # Include both: documents with feedback + documents without feedback (validated)
+        placeholders = ", ".join("(?)" for _ in field_names)
+        query = f"""
+            WITH requested(field_name) AS (VALUES {placeholders}),
+            last_learning AS (
+                SELECT field_name, MAX(completed_at) AS completed_at
+                FROM pattern_learning_jobs
+                WHERE template_id = ?
+                  AND status = 'completed'
+                GROUP BY field_name
             )
-            
-            document_count = result[0]['document_count'] if result else 0
-            
+            SELECT
+                r.field_name,
+                (SELECT COUNT(*)
+                 FROM documents d
+                 WHERE d.template_id = ?
+                   AND d.status = 'validated'
+                   AND d.created_at > COALESCE(l.completed_at, '2000-01-01')
+                ) AS document_count
+            FROM requested r
+            LEFT JOIN last_learning l ON l.field_name = r.field_name
+        """
+
+        rows = self.db.execute_query(query, (*field_names, template_id, template_id))
+        return {row['field_name']: row['document_count'] for row in rows}
+
+    def get_fields_ready_for_learning(
+        self,
+        template_id: int,
+        field_names: List[str]
+    ) -> Set[str]:
+        """
+        Fields whose new validated document count reached the threshold
+
+        Args:
+            template_id: Template ID
+            field_names: Field names to check
+
+        Returns:
+            Set of field names that should trigger learning
+        """
+        try:
+            counts = self.get_pending_document_counts(template_id, field_names)
+        except Exception as e:
+            self.logger.error(f"Error checking trigger condition: {e}")
+            return set()
+
+        ready = set()
+        for field_name, document_count in counts.items():
             if document_count >= self.min_feedback_count:  # Reuse threshold (5 documents)
                 self.logger.info(
                     f"✅ Trigger condition met for {field_name}: "
                     f"{document_count} new validated documents (threshold: {self.min_feedback_count})"
                 )
-                return True
+                ready.add(field_name)
             else:
                 self.logger.debug(
                     f"⏳ Not enough documents for {field_name}: "
                     f"{document_count}/{self.min_feedback_count}"
                 )
-            
-            return False
-            
-        except Exception as e:
-            self.logger.error(f"Error checking trigger condition: {e}")
-            return False
+
+        return ready
     
     def trigger_learning(
         self,
@@ -112,20 +157,23 @@ class AutoPatternLearner:
         Args:
             template_id: Template ID
             field_name: Field name
-            async_mode: Run in background thread
+            async_mode: Run on the pattern learning executor
             
         Returns:
             Result dict or None if async
         """
         if async_mode:
-            # Run in background thread
-            thread = threading.Thread(
-                target=self._run_learning,
-                args=(template_id, field_name),
-                daemon=True
+            # Bounded executor; repeated triggers for a queued field collapse into one run
+            from core.learning.pattern_learning_executor import get_pattern_learning_executor
+
+            scheduled = get_pattern_learning_executor().submit(
+                ('pattern', template_id, field_name),
+                self._run_learning,
+                template_id,
+                field_name,
             )
-            thread.start()
-            self.logger.info(f"🚀 Started background learning for {field_name}")
+            if scheduled:
+                self.logger.info(f"🚀 Scheduled background learning for {field_name}")
             return None
         else:
             # Run synchronously
@@ -316,6 +364,7 @@ class AutoPatternLearner:
 
 # Singleton instance
 _auto_learner_instance = None
+_auto_learner_lock = threading.Lock()
 
 
 def get_auto_learner(db_manager=None):
@@ -331,10 +380,12 @@ def get_auto_learner(db_manager=None):
     global _auto_learner_instance
     
     if _auto_learner_instance is None:
-        if db_manager is None:
-            from database.db_manager import DatabaseManager
-            db_manager = DatabaseManager()
-        
-        _auto_learner_instance = AutoPatternLearner(db_manager)
+        with _auto_learner_lock:
+            if _auto_learner_instance is None:
+                if db_manager is None:
+                    from database.db_manager import DatabaseManager
+                    db_manager = DatabaseManager()
+
+                _auto_learner_instance = AutoPatternLearner(db_manager)
     
     return _auto_learner_instance
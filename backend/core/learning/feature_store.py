@@ -0,0 +1,302 @@
+"""
+Training Feature Store
+Persistent per-document CRF training sequences (features + BIO labels).
+
+ModelService.retrain_model used to rebuild X/y for every feedback and
+validated document on every run, although only a few documents change
+between runs. The store keeps the prepared sequences of each document on
+disk, keyed by:
+- document_id
+- revision: hash of everything the sequences are derived from (the values
+  labeled, their feedback ids, the field configs, the PDF file's size and
+  mtime, ROI window settings)
+- FEATURE_SCHEMA_VERSION (AdaptiveLearner feature code)
+
+A stale entry (other revision or schema version) is simply recomputed and
+overwritten, so each document has at most one file.
+
+Layout on disk:
+    template_<template_id>/doc_<document_id>.pkl
+        {'format_version', 'schema_version', 'revision', 'features', 'sequences'}
+        features:  unique word feature dicts without target_field_* keys
+        sequences: list of (feature indices, target keys, labels, feedback_id)
+
+The sequences of one document differ mostly in their target_field_<field>
+key, so word feature dicts are stored once per document and rebuilt by
+copying (about 5x smaller and 3x faster to load than pickling the samples).
+Entries are written to a temp file first, then renamed.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.learning.learner import FEATURE_SCHEMA_VERSION
+
+
+# Schema version of the on-disk layout; bump to invalidate old entries
+STORE_FORMAT_VERSION = 1
+
+# Feature added per sequence by AdaptiveLearner._create_bio_sequence
+TARGET_FIELD_PREFIX = 'target_field_'
+
+# (features, labels, feedback_id or None)
+TrainingSample = Tuple[List[Dict[str, Any]], List[str], Optional[int]]
+
+
+def compute_revision(
+    file_path: str,
+    feedbacks: List[Dict[str, Any]],
+    field_configs: Dict[str, Any],
+) -> Optional[str]:
+    """
+    Revision of a document's training sequences
+
+    Args:
+        file_path: PDF path of the document
+        feedbacks: Values labeled in the document ({'field_name', 'corrected_value', ['id']})
+        field_configs: Template field configs by field name
+
+    Returns:
+        Hex digest, or None if the PDF is not accessible
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    source = {
+        'file': [stat.st_size, stat.st_mtime_ns],
+        'feedbacks': [
+            [fb.get('id'), fb['field_name'], fb['corrected_value']] for fb in feedbacks
+        ],
+        'field_configs': {
+            fb['field_name']: field_configs.get(fb['field_name']) for fb in feedbacks
+        },
+        'roi': [os.getenv('CRF_ROI_WINDOW', 'false'), os.getenv('CRF_ROI_MARGIN', '50')],
+    }
+    raw = json.dumps(source, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _encode_samples(samples: List[TrainingSample]) -> Dict[str, Any]:
+    """Store each distinct word feature dict once (target_field_* keys split off)"""
+    features: List[Dict[str, Any]] = []
+    feature_index: Dict[tuple, int] = {}
+    sequences = []
+
+    for word_features, labels, feedback_id in samples:
+        indices = []
+        target_keys = None
+        for word in word_features:
+            base = {}
+            targets = []
+            for key, value in word.items():
+                if key.startswith(TARGET_FIELD_PREFIX) and value is True:
+                    targets.append(key)
+                else:
+                    base[key] = value
+            if target_keys is None:
+                target_keys = targets
+            elif targets != target_keys:
+                raise ValueError("target_field_* features differ within a sequence")
+
+            # Value types are part of the key (True == 1 == 1.0 otherwise)
+            key = tuple((k, v.__class__, v) for k, v in base.items())
+            if key not in feature_index:
+                feature_index[key] = len(features)
+                features.append(base)
+            indices.append(feature_index[key])
+        sequences.append((indices, target_keys or [], labels, feedback_id))
+
+    return {'features': features, 'sequences': sequences}
+
+
+def _decode_samples(entry: Dict[str, Any]) -> List[TrainingSample]:
+    features = entry['features']
+    samples = []
+    for indices, target_keys, labels, feedback_id in entry['sequences']:
+        word_features = []
+        for index in indices:
+            word = features[index].copy()
+            for key in target_keys:
+                word[key] = True
+            word_features.append(word)
+        samples.append((word_features, labels, feedback_id))
+    return samples
+
+
+class TrainingFeatureStore:
+    """
+    Disk store of prepared training sequences per document
+    """
+
+    def __init__(self, store_dir: str = None, enabled: bool = None):
+        """
+        Initialize feature store
+
+        Args:
+            store_dir: Store directory (default: TRAINING_FEATURE_STORE_DIR or backend/data/feature_store)
+            enabled: Enable store (default: TRAINING_FEATURE_STORE env, true)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        store_dir = store_dir or os.getenv(
+            'TRAINING_FEATURE_STORE_DIR', os.path.join('data', 'feature_store')
+        )
+        # Resolve relative paths against backend/ (like DatabaseManager), so API,
+        # worker and CLI processes share one store whatever their cwd
+        if not os.path.isabs(store_dir):
+            backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+            store_dir = os.path.join(backend_dir, store_dir)
+        self.store_dir = store_dir
+        self.enabled = enabled if enabled is not None else (
+            os.getenv('TRAINING_FEATURE_STORE', 'true').lower() == 'true'
+        )
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def get(
+        self, template_id: int, document_id: int, revision: Optional[str]
+    ) -> Optional[List[TrainingSample]]:
+        """
+        Load the stored sequences of a document
+
+        Args:
+            template_id: Template ID
+            document_id: Document ID
+            revision: Current revision (compute_revision)
+
+        Returns:
+            List of samples, or None if missing or stale
+        """
+        if not self.enabled or revision is None:
+            return None
+
+        samples = self._read_entry(self._entry_path(template_id, document_id), revision)
+        with self._lock:
+            if samples is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return samples
+
+    def put(
+        self,
+        template_id: int,
+        document_id: int,
+        revision: Optional[str],
+        samples: List[TrainingSample],
+    ):
+        """
+        Store the sequences of a document (replaces any previous revision)
+
+        Args:
+            template_id: Template ID
+            document_id: Document ID
+            revision: Revision the samples were computed for
+            samples: List of (features, labels, feedback_id)
+        """
+        if not self.enabled or revision is None:
+            return
+
+        path = self._entry_path(template_id, document_id)
+        try:
+            self._write_entry(path, {
+                'format_version': STORE_FORMAT_VERSION,
+                'schema_version': FEATURE_SCHEMA_VERSION,
+                'revision': revision,
+                **_encode_samples(samples),
+            })
+        except Exception as e:
+            self.logger.warning(f"⚠️ [FeatureStore] Failed to store document {document_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'store_dir': self.store_dir,
+                'schema_version': FEATURE_SCHEMA_VERSION,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def clear(self, template_id: int = None):
+        """Remove stored entries (of one template, or all)"""
+        if template_id is None:
+            shutil.rmtree(self.store_dir, ignore_errors=True)
+        else:
+            shutil.rmtree(os.path.join(self.store_dir, f"template_{template_id}"), ignore_errors=True)
+
+    # ========================================================================
+    # Internals
+    # ========================================================================
+
+    def _entry_path(self, template_id: int, document_id: int) -> str:
+        return os.path.join(self.store_dir, f"template_{template_id}", f"doc_{document_id}.pkl")
+
+    def _read_entry(self, path: str, revision: str) -> Optional[List[TrainingSample]]:
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if (
+                entry.get('format_version') != STORE_FORMAT_VERSION
+                or entry.get('schema_version') != FEATURE_SCHEMA_VERSION
+                or entry.get('revision') != revision
+            ):
+                return None
+            return _decode_samples(entry)
+        except Exception as e:
+            self.logger.warning(f"⚠️ [FeatureStore] Corrupt entry {path}, recomputing: {e}")
+            return None
+
+    def _write_entry(self, path: str, entry: Dict[str, Any]):
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Singleton instance
+_feature_store_instance = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> TrainingFeatureStore:
+    """
+    Get singleton training feature store
+
+    Returns:
+        TrainingFeatureStore instance
+    """
+    global _feature_store_instance
+
+    if _feature_store_instance is None:
+        with _feature_store_lock:
+            if _feature_store_instance is None:
+                _feature_store_instance = TrainingFeatureStore()
+
+    return _feature_store_instance
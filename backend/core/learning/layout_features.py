@@ -0,0 +1,107 @@
+"""
+Document Layout Features
+Whole-document layout features for CRF training, built in one pass.
+
+AdaptiveLearner._extract_word_features used to recompute document-level
+work for every word: position_in_line and words_in_line scanned all words,
+column boundaries and line groups were rebuilt, and the line group lookups
+were linear scans, so preparing one sequence was O(n²). DocumentLayout
+computes these values for all words at once:
+- same-line neighbours (|top_j - top_i| < 5) come from a window in the
+  words sorted by top (np.searchsorted), filtered with the exact original
+  comparison, so the counts are identical
+- column index is a searchsorted over the column boundaries
+- line group index / position come from an index map over the line groups
+
+Values are plain Python ints/bools, identical to the per-word code.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Words whose tops differ by less than this are on the same line
+SAME_LINE_TOLERANCE = 5
+# Words of a line group counted as its first line (see is_first_line_in_group)
+FIRST_LINE_WORDS = 5
+
+
+@dataclass
+class DocumentLayout:
+    """Per-word layout features of one document (indexed like the word list)"""
+    position_in_line: List[int]
+    words_in_line: List[int]
+    column_index: List[int]
+    line_group_index: List[int]
+    is_first_line_in_group: List[bool]
+    is_continuation_line: List[bool]
+    max_x: Any
+
+    @classmethod
+    def build(
+        cls,
+        words: List[Dict],
+        column_boundaries: List[float],
+        line_groups: List[List[int]],
+    ) -> "DocumentLayout":
+        """
+        Build layout features for all words
+
+        Args:
+            words: Word dictionaries of the document
+            column_boundaries: Output of _detect_column_boundaries (sorted)
+            line_groups: Output of _detect_line_groups
+
+        Returns:
+            DocumentLayout instance
+        """
+        n = len(words)
+        x_coords = [w.get('x0', 0) for w in words]
+        tops = np.array([w.get('top', 0) for w in words], dtype=float)
+
+        # Same-line neighbours: candidate window in top order (with slack), then
+        # the exact comparison used per word before
+        order = np.argsort(tops, kind='stable')
+        sorted_tops = tops[order]
+        lows = np.searchsorted(sorted_tops, tops - (SAME_LINE_TOLERANCE + 1), side='left')
+        highs = np.searchsorted(sorted_tops, tops + (SAME_LINE_TOLERANCE + 1), side='right')
+
+        position_in_line = [0] * n
+        words_in_line = [0] * n
+        for i in range(n):
+            lo, hi = lows[i], highs[i]
+            same_line = order[lo:hi][np.abs(sorted_tops[lo:hi] - tops[i]) < SAME_LINE_TOLERANCE]
+            words_in_line[i] = int(same_line.size)
+            position_in_line[i] = int(np.count_nonzero(same_line < i))
+
+        # Column index: number of boundaries <= x (first boundary with x < boundary)
+        if column_boundaries:
+            column_index = np.searchsorted(
+                np.asarray(column_boundaries, dtype=float),
+                np.asarray(x_coords, dtype=float),
+                side='right',
+            ).tolist()
+        else:
+            column_index = [0] * n
+
+        # Line groups: index map instead of scanning groups per word
+        line_group_index = [-1] * n
+        is_first_line = [False] * n
+        is_continuation = [False] * n
+        for group_idx, group in enumerate(line_groups):
+            for position, word_idx in enumerate(group):
+                if line_group_index[word_idx] != -1:
+                    continue  # First group containing the word wins (as before)
+                line_group_index[word_idx] = group_idx
+                is_first_line[word_idx] = position < FIRST_LINE_WORDS
+                is_continuation[word_idx] = position >= FIRST_LINE_WORDS
+
+        return cls(
+            position_in_line=position_in_line,
+            words_in_line=words_in_line,
+            column_index=column_index,
+            line_group_index=line_group_index,
+            is_first_line_in_group=is_first_line,
+            is_continuation_line=is_continuation,
+            max_x=max(x_coords) if x_coords else 0,
+        )
@@ -7,11 +7,21 @@ from sklearn_crfsuite import metrics
 from sklearn.metrics import classification_report
 import joblib
 import json
+import copy
 import os
 from typing import Dict, List, Tuple, Any
 import numpy as np
 import time
 
+from core.learning.layout_features import DocumentLayout
+from core.learning.online_crf import OnlineCRF
+from core.learning.sequence_alignment import find_best_window
+
+# Version of the training sequences built by _create_bio_sequence /
+# _extract_word_features. Bump on any feature or labeling change: the
+# training feature store (feature_store.py) drops entries of other versions.
+FEATURE_SCHEMA_VERSION = 1
+
 class AdaptiveLearner:
     """Handles adaptive learning from user feedback"""
     
@@ -24,9 +34,14 @@ class AdaptiveLearner:
         """
         self.model_path = model_path
         self.model = None
+        # Model borrowed from the shared registry must be copied before fit()
+        self._model_shared = False
+        # ⚡ Document layout per word list (shared by all fields of a document)
+        self._layout_cache = {}  # id(words) -> (words, DocumentLayout)
         
         if model_path and os.path.exists(model_path):
             self.model = self._load_model(model_path)
+            self._model_shared = self.model is not None
         else:
             # Initialize new CRF model with optimized hyperparameters for high accuracy
             # ✅ Default params match grid search best results (c1=0.01, c2=0.01)
@@ -102,16 +117,32 @@ class AdaptiveLearner:
         
         # ✅ ADAPTIVE: Find best matching sequence in PDF words
         # Instead of exact token matching, use sequence-based fuzzy matching
+        # ⚡ ROI: Train on the same window the CRF strategy tags at inference
+        # (no-op unless CRF_ROI_WINDOW is enabled)
+        from core.extraction.roi_window import crop_to_roi
+        
+        full_words = words
+        words = crop_to_roi(words, field_config) if field_config else words
         word_texts = [w['text'] for w in words]
         matched_indices = self._find_best_sequence_match(word_texts, corrected_tokens)
         
+        if not matched_indices and words is not full_words:
+            # Value not inside the window - inference falls back to the full document too
+            words = full_words
+            word_texts = [w['text'] for w in words]
+            matched_indices = self._find_best_sequence_match(word_texts, corrected_tokens)
+        
+        # ⚡ Layout features computed once for the whole document
+        layout = self._get_document_layout(words)
+        
         # Create BIO labels based on matched sequence
         for i, word in enumerate(words):
             # ✅ Extract features with context
             word_features = self._extract_word_features(
                 word, words, i,
                 field_config=field_config,
-                context=context
+                context=context,
+                layout=layout
             )
             
             # ✅ CRITICAL FIX: Add field-aware feature for THIS field only
@@ -152,20 +183,12 @@ class AdaptiveLearner:
         if not target_tokens:
             return []
         
-        best_match_indices = []
-        best_match_score = 0
-        
         # Try to find the best contiguous sequence
-        for start_idx in range(len(word_texts)):
-            for end_idx in range(start_idx + 1, min(start_idx + len(target_tokens) * 2, len(word_texts) + 1)):
-                candidate_words = word_texts[start_idx:end_idx]
-                
-                # Calculate match score using fuzzy matching
-                score = self._calculate_sequence_match_score(candidate_words, target_tokens)
-                
-                if score > best_match_score:
-                    best_match_score = score
-                    best_match_indices = list(range(start_idx, end_idx))
+        # ⚡ Windows are pruned with a character index bound and only the
+        # plausible ones are scored (same result as scoring every window)
+        best_match_indices, best_match_score = find_best_window(
+            word_texts, target_tokens, self._calculate_sequence_match_score
+        )
         
         # If no good match found, fall back to token-by-token matching
         if best_match_score < 0.5:
@@ -241,11 +264,16 @@ class AdaptiveLearner:
         all_words: List[Dict], 
         index: int,
         field_config: Dict = None,
-        context: Dict = None
+        context: Dict = None,
+        layout: DocumentLayout = None
     ) -> Dict[str, Any]:
         """
         Extract features for a single word
         
+        Pass layout (from _build_document_layout) when extracting features
+        for every word of a document; otherwise the cached layout of
+        all_words is used (built once per word list).
+        
         Features include:
         - Lexical features (word form, case, digits)
         - Orthographic features (capitalization patterns)
@@ -503,16 +531,14 @@ class AdaptiveLearner:
         else:
             features['EOS'] = True  # End of sequence
         
+        if layout is None:
+            layout = self._get_document_layout(all_words)
+        
         # Position in line (for boundary detection)
-        features['position_in_line'] = sum(
-            1 for w in all_words[:index] 
-            if abs(w.get('top', 0) - word_y) < 5
-        )
+        features['position_in_line'] = layout.position_in_line[index]
         
         # ✅ NEW: Column-based features for multi-column layout
-        x_coords = [w.get('x0', 0) for w in all_words]
-        column_boundaries = self._detect_column_boundaries(x_coords)
-        column_idx = self._get_column_index(word_x, column_boundaries)
+        column_idx = layout.column_index[index]
         features['column_index'] = column_idx
         features['in_first_column'] = column_idx == 0
         features['in_second_column'] = column_idx == 1
@@ -520,14 +546,12 @@ class AdaptiveLearner:
         features['in_fourth_column'] = column_idx == 3
         
         # ✅ NEW: Line group features for text wrapping detection
-        line_groups = self._detect_line_groups(all_words)
-        line_group_idx = self._get_line_group_index(index, line_groups)
-        features['line_group_index'] = line_group_idx
-        features['is_first_line_in_group'] = self._is_first_line_in_group(index, line_groups)
-        features['is_continuation_line'] = self._is_continuation_line(index, line_groups)
+        features['line_group_index'] = layout.line_group_index[index]
+        features['is_first_line_in_group'] = layout.is_first_line_in_group[index]
+        features['is_continuation_line'] = layout.is_continuation_line[index]
         
         # ✅ NEW: Sequence position features (for Finding vs Recommendation)
-        features['relative_x_position'] = word_x / max(x_coords) if x_coords else 0
+        features['relative_x_position'] = word_x / layout.max_x
         features['is_left_aligned'] = word_x < 200  # Typically Finding
         features['is_right_aligned'] = word_x > 400  # Typically Recommendation
         features['is_center_aligned'] = 200 <= word_x <= 400
@@ -551,10 +575,10 @@ class AdaptiveLearner:
         features['before_period'] = index < len(all_words) - 1 and all_words[index+1].get('text', '') == '.'
         
         # ✅ NEW: Word density features (for table detection)
-        words_in_same_line = [w for w in all_words if abs(w.get('top', 0) - word_y) < 5]
-        features['words_in_line'] = len(words_in_same_line)
-        features['is_dense_line'] = len(words_in_same_line) > 10  # Likely table row
-        features['is_sparse_line'] = len(words_in_same_line) < 5
+        words_in_line = layout.words_in_line[index]
+        features['words_in_line'] = words_in_line
+        features['is_dense_line'] = words_in_line > 10  # Likely table row
+        features['is_sparse_line'] = words_in_line < 5
         
         return features
     
@@ -635,6 +659,17 @@ class AdaptiveLearner:
                 verbose=False,
                 num_memories=12,
             )
+            self._model_shared = False
+        
+        if isinstance(self.model, OnlineCRF):
+            # Full L-BFGS fit consolidates online updates into a crfsuite model
+            self.model = self.model.to_estimator()
+            self._model_shared = False
+        
+        if self._model_shared:
+            # Don't retrain the instance other extractions are using
+            self.model = copy.deepcopy(self.model)
+            self._model_shared = False
         
         # ⚡ Train the model (this is the bottleneck)
         self.model.fit(X_train, y_train)
@@ -693,20 +728,107 @@ class AdaptiveLearner:
                          max_iterations=250, 
                          skip_evaluation=skip_evaluation)
     
+    def online_train(self, X_new: List[List[Dict]], y_new: List[List[str]],
+                     epochs: int = None, c: float = None) -> Dict[str, Any]:
+        """
+        Apply new sequences to the current model without refitting it
+        
+        Warm-starts from the trained weights and runs passive-aggressive
+        updates on the new sequences only (OnlineCRF). save_model keeps the
+        crfsuite model file and writes the updated weights next to it.
+        
+        Args:
+            X_new: New feature sequences
+            y_new: New label sequences
+            epochs: Passes over the new sequences (default: CRF_ONLINE_EPOCHS env, 5)
+            c: PA aggressiveness (default: CRF_ONLINE_C env, 1.0)
+            
+        Returns:
+            Update statistics (sequences, updates, mistakes in the last epoch)
+        """
+        if not X_new or not y_new:
+            raise ValueError("Training data cannot be empty")
+        if self.model is None or not self.model.classes_:
+            raise ValueError("Online updates need a trained model")
+        
+        # Always works on a copy: the current model may be shared by extractions
+        online_model = OnlineCRF.from_crf(self.model)
+        stats = online_model.partial_fit(
+            X_new, y_new,
+            epochs=epochs if epochs is not None else int(os.getenv('CRF_ONLINE_EPOCHS', '5')),
+            c=c if c is not None else float(os.getenv('CRF_ONLINE_C', '1.0')),
+        )
+        self.model = online_model
+        self._model_shared = False
+        return stats
+    
     def save_model(self, output_path: str):
         """Save trained model to file"""
+        from core.extraction.model_registry import get_model_registry, online_model_path
+        
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        joblib.dump(self.model, output_path)
+        online_path = online_model_path(output_path)
+        if isinstance(self.model, OnlineCRF):
+            # The crfsuite model stays the model file; online weights go next to it
+            joblib.dump(self.model, online_path)
+        else:
+            joblib.dump(self.model, output_path)
+            # A full fit supersedes earlier online updates
+            if os.path.exists(online_path):
+                os.remove(online_path)
         self.model_path = output_path
+        
+        # Drop the previous version from the registry right away
+        get_model_registry().invalidate(output_path)
     
     def _load_model(self, model_path: str):
-        """Load trained model from file"""
+        """Load trained model from the shared model registry"""
         try:
-            return joblib.load(model_path)
+            from core.extraction.model_registry import get_model_registry
+            return get_model_registry().get_model(model_path)
         except Exception as e:
             print(f"Error loading model from {model_path}: {e}")
             return None
     
+    def _get_document_layout(self, words: List[Dict]) -> DocumentLayout:
+        """
+        Get layout features of a word list (cached per list object)
+        
+        Args:
+            words: List of word dictionaries
+            
+        Returns:
+            DocumentLayout instance
+        """
+        cached = self._layout_cache.get(id(words))
+        if cached and cached[0] is words and len(cached[1].words_in_line) == len(words):
+            return cached[1]
+        
+        if len(self._layout_cache) >= 64:
+            self._layout_cache.clear()
+        
+        layout = self._build_document_layout(words)
+        # Keep a reference to the word list so its id stays valid
+        self._layout_cache[id(words)] = (words, layout)
+        return layout
+    
+    def _build_document_layout(self, words: List[Dict]) -> DocumentLayout:
+        """
+        Compute layout features (line, column, line group) for all words at once
+        
+        Args:
+            words: List of word dictionaries
+            
+        Returns:
+            DocumentLayout instance
+        """
+        x_coords = [w.get('x0', 0) for w in words]
+        return DocumentLayout.build(
+            words,
+            column_boundaries=self._detect_column_boundaries(x_coords),
+            line_groups=self._detect_line_groups(words),
+        )
+    
     def _detect_column_boundaries(self, x_coords: List[float]) -> List[float]:
         """
         Detect column boundaries from X-coordinates using clustering
@@ -0,0 +1,280 @@
+"""
+Online CRF Updates
+Applies newly validated sequences to a trained CRF without refitting it.
+
+Incremental training used to refit L-BFGS from scratch (half the
+iterations) on the new documents. OnlineCRF instead warm-starts from the
+current model's weights and runs a NumPy reimplementation of crfsuite's
+passive-aggressive trainer (PA-I, error sensitive, like crfsuite type=1).
+It decodes every new sequence with Viterbi and only updates the weights of
+sequences that are still mislabeled, so the cost depends on the new data
+only. Weights are averaged over all steps (crfsuite's averaging), which
+keeps a single update from overriding what the L-BFGS model learned.
+
+crfsuite cannot start training from existing weights or write a model from
+them, so the updated weights live in dense NumPy matrices and are decoded
+with the NumPy inference engine (crf_inference.py), which gives the same
+labels as the crfsuite tagger. They are saved next to the crfsuite model
+(model_registry.online_model_path), which stays the template's model file;
+a periodic full L-BFGS retrain (FULL_RETRAIN_INTERVAL) consolidates the
+online updates into a new crfsuite model and removes them.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from core.extraction.crf_inference import NumpyCRFInference
+
+
+def _estimator_params(model) -> Dict[str, Any]:
+    """Constructor params of a sklearn_crfsuite.CRF (get_params() fails on unset ones)"""
+    import inspect
+
+    names = inspect.signature(model.__class__.__init__).parameters
+    return {
+        name: getattr(model, name)
+        for name in names
+        if name != 'self' and hasattr(model, name)
+    }
+
+
+class OnlineCRF:
+    """
+    CRF with dense weights that can be updated one sequence at a time
+    """
+
+    def __init__(self, engine: NumpyCRFInference, base_params: Dict[str, Any]):
+        """
+        Initialize online CRF
+
+        Args:
+            engine: NumPy engine holding the weights (updated in place)
+            base_params: sklearn_crfsuite.CRF params for the next full retrain
+        """
+        self.inference_engine_ = engine
+        self.base_params = base_params
+        self.online_updates = 0  # partial_fit runs since the last L-BFGS fit
+        self.sequences_seen = 0
+
+    @classmethod
+    def from_crf(cls, model) -> "OnlineCRF":
+        """
+        Warm-start from a trained model
+
+        Args:
+            model: Trained sklearn_crfsuite.CRF or OnlineCRF
+
+        Returns:
+            New OnlineCRF (the given model is not modified)
+        """
+        if not isinstance(model, OnlineCRF):
+            return cls(NumpyCRFInference(model), _estimator_params(model))
+
+        source = model.inference_engine_
+        engine = NumpyCRFInference.from_weights(
+            source.labels,
+            dict(source.attr_index),
+            source.state_weights.copy(),
+            source.transitions.copy(),
+        )
+        online = cls(engine, dict(model.base_params))
+        online.online_updates = model.online_updates
+        online.sequences_seen = model.sequences_seen
+        return online
+
+    def to_estimator(self):
+        """
+        Fresh (untrained) crfsuite estimator with the original parameters
+
+        Returns:
+            sklearn_crfsuite.CRF instance
+        """
+        import sklearn_crfsuite
+
+        return sklearn_crfsuite.CRF(**self.base_params)
+
+    # ========================================================================
+    # sklearn_crfsuite.CRF interface (prediction and weights)
+    # ========================================================================
+
+    @property
+    def classes_(self) -> List[str]:
+        return list(self.inference_engine_.labels)
+
+    @property
+    def state_features_(self) -> Dict[Tuple[str, str], float]:
+        engine = self.inference_engine_
+        attrs = {row: attr for attr, row in engine.attr_index.items()}
+        rows, cols = np.nonzero(engine.state_weights)
+        return {
+            (attrs[row], engine.labels[col]): float(engine.state_weights[row, col])
+            for row, col in zip(rows.tolist(), cols.tolist())
+        }
+
+    @property
+    def transition_features_(self) -> Dict[Tuple[str, str], float]:
+        engine = self.inference_engine_
+        rows, cols = np.nonzero(engine.transitions)
+        return {
+            (engine.labels[row], engine.labels[col]): float(engine.transitions[row, col])
+            for row, col in zip(rows.tolist(), cols.tolist())
+        }
+
+    def predict(self, X: List[List[Dict]]) -> List[List[str]]:
+        return [self.inference_engine_.tag(xseq)[0] for xseq in X]
+
+    def predict_marginals(self, X: List[List[Dict]]) -> List[List[Dict[str, float]]]:
+        return [self.inference_engine_.tag(xseq)[1] for xseq in X]
+
+    # ========================================================================
+    # Online training
+    # ========================================================================
+
+    def partial_fit(
+        self,
+        X: List[List[Dict]],
+        y: List[List[str]],
+        epochs: int = 5,
+        c: float = 1.0,
+        seed: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Update the weights with new sequences (passive-aggressive)
+
+        Args:
+            X: Feature sequences
+            y: Label sequences
+            epochs: Passes over the new sequences
+            c: PA aggressiveness (maximum step size)
+            seed: Shuffle seed (updates are deterministic)
+
+        Returns:
+            Dict with sequences, epochs, updates and mistakes in the last epoch
+        """
+        sequences = [self._encode(xseq, yseq) for xseq, yseq in zip(X, y) if xseq]
+        engine = self.inference_engine_
+        weights = engine.state_weights
+        transitions = engine.transitions
+        n_labels = len(engine.labels)
+
+        # Averaging: avg = w_T - sum(step * delta) / steps (warm start cancels out)
+        weight_sum = np.zeros_like(weights)
+        transition_sum = np.zeros_like(transitions)
+        step = 1
+        updates = 0
+        mistakes = 0
+        rng = np.random.default_rng(seed)
+
+        for _epoch in range(max(1, epochs)):
+            mistakes = 0
+            for index in rng.permutation(len(sequences)):
+                token_ids, attr_ids, values, gold = sequences[index]
+
+                scores = np.zeros((len(gold), n_labels))
+                np.add.at(scores, token_ids, weights[attr_ids] * values[:, None])
+                predicted = NumpyCRFInference._viterbi(scores[None], transitions)[0]
+
+                wrong = predicted != gold
+                if not wrong.any():
+                    step += 1
+                    continue
+                mistakes += 1
+
+                # Feature difference phi(gold) - phi(predicted), on mislabeled tokens
+                on_wrong = wrong[token_ids]
+                rows = np.concatenate([attr_ids[on_wrong], attr_ids[on_wrong]])
+                cols = np.concatenate([gold[token_ids[on_wrong]], predicted[token_ids[on_wrong]]])
+                deltas = np.concatenate([values[on_wrong], -values[on_wrong]])
+                keys, inverse = np.unique(rows * n_labels + cols, return_inverse=True)
+                state_delta = np.bincount(inverse, weights=deltas)
+                state_rows, state_cols = keys // n_labels, keys % n_labels
+
+                transition_delta = np.zeros_like(transitions)
+                np.add.at(transition_delta, (gold[:-1], gold[1:]), 1.0)
+                np.add.at(transition_delta, (predicted[:-1], predicted[1:]), -1.0)
+
+                norm = float(state_delta @ state_delta + np.sum(transition_delta ** 2))
+                if norm == 0.0:
+                    step += 1
+                    continue
+                margin = (
+                    scores[np.arange(len(gold)), predicted].sum()
+                    + transitions[predicted[:-1], predicted[1:]].sum()
+                    - scores[np.arange(len(gold)), gold].sum()
+                    - transitions[gold[:-1], gold[1:]].sum()
+                )
+                loss = margin + np.sqrt(np.count_nonzero(wrong))
+                tau = min(c, loss / norm)
+
+                weights[state_rows, state_cols] += tau * state_delta
+                weight_sum[state_rows, state_cols] += step * tau * state_delta
+                transitions += tau * transition_delta
+                transition_sum += step * tau * transition_delta
+                updates += 1
+                step += 1
+
+        weights -= weight_sum / step
+        transitions -= transition_sum / step
+
+        self.online_updates += 1
+        self.sequences_seen += len(sequences)
+        return {
+            'sequences': len(sequences),
+            'epochs': max(1, epochs),
+            'updates': updates,
+            'mistakes_last_epoch': mistakes,
+        }
+
+    def _encode(self, xseq: List[Dict], yseq: List[str]):
+        """Attribute ids/values per token (adds unseen attributes and labels)"""
+        engine = self.inference_engine_
+        for label in yseq:
+            if label not in engine.label_index:
+                self._add_label(label)
+
+        token_ids, attr_ids, values = [], [], []
+        new_attrs = 0
+        for t, item in enumerate(xseq):
+            for name, value in item.items():
+                # Same attribute conventions as NumpyCRFInference.state_scores
+                if isinstance(value, str):
+                    key = f"{name}:{value}"
+                    value = 1.0
+                else:
+                    key = name
+                    value = float(value)
+                    if value == 0.0:
+                        continue
+                attr_id = engine.attr_index.get(key)
+                if attr_id is None:
+                    attr_id = len(engine.attr_index)
+                    engine.attr_index[key] = attr_id
+                    new_attrs += 1
+                token_ids.append(t)
+                attr_ids.append(attr_id)
+                values.append(value)
+
+        if new_attrs:
+            engine.state_weights = np.vstack(
+                [engine.state_weights, np.zeros((new_attrs, len(engine.labels)))]
+            )
+
+        gold = np.array([engine.label_index[label] for label in yseq], dtype=np.int64)
+        return (
+            np.asarray(token_ids, dtype=np.int64),
+            np.asarray(attr_ids, dtype=np.int64),
+            np.asarray(values, dtype=float),
+            gold,
+        )
+
+    def _add_label(self, label: str):
+        engine = self.inference_engine_
+        engine.labels.append(label)
+        engine.label_index[label] = len(engine.labels) - 1
+        engine.state_weights = np.hstack(
+            [engine.state_weights, np.zeros((engine.state_weights.shape[0], 1))]
+        )
+        n_labels = len(engine.labels)
+        transitions = np.zeros((n_labels, n_labels))
+        transitions[:-1, :-1] = engine.transitions
+        engine.transitions = transitions
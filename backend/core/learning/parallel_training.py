@@ -0,0 +1,284 @@
+"""
+Parallel CRF Training
+Runs cross-validation folds and hyperparameter candidates concurrently.
+
+crfsuite training is single-threaded and CPU-bound, so a grid search over
+c1/c2 (x folds) used to take the sum of all fits. The orchestrator fans the
+(candidate, split) fits out over a process pool under a CPU budget
+(TRAINING_WORKERS, 0 = CPU count):
+- the prepared dataset is written once to a temporary file and loaded by
+  each worker in the pool initializer; tasks only carry index lists and
+  parameters, so X/y are not pickled per task
+- workers are spawned (not forked), like bulk extraction: they must not
+  inherit SQLite connections or locks from the API process
+- every fit is deterministic (L-BFGS), so results match a serial run
+
+With one worker (or one task) everything runs in-process.
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+
+from core.learning.training_utils import k_fold_indices
+
+logger = logging.getLogger(__name__)
+
+# (train indices, test indices) into the shared dataset
+Split = Tuple[List[int], List[int]]
+
+# Estimator settings of AdaptiveLearner.train (candidates set c1/c2)
+DEFAULT_CRF_PARAMS = {
+    'algorithm': 'lbfgs',
+    'all_possible_transitions': True,
+    'verbose': False,
+    'num_memories': 12,
+}
+
+# Per-worker-process dataset (set by _init_worker)
+_worker_dataset = None
+
+
+def get_training_workers(task_count: int) -> int:
+    """
+    Number of worker processes for a set of training tasks
+
+    Args:
+        task_count: Number of fits to run
+
+    Returns:
+        Worker count (1 = train in-process)
+    """
+    workers = int(os.getenv('TRAINING_WORKERS', '0')) or (os.cpu_count() or 1)
+    return max(1, min(workers, task_count))
+
+
+def make_param_grid(c1_values: Sequence[float], c2_values: Sequence[float]) -> List[Dict[str, float]]:
+    """
+    Build c1/c2 candidates (c1-major order, like the nested grid search loops)
+
+    Args:
+        c1_values: L1 regularization values
+        c2_values: L2 regularization values
+
+    Returns:
+        List of {'c1': ..., 'c2': ...} dicts
+    """
+    return [{'c1': c1, 'c2': c2} for c1 in c1_values for c2 in c2_values]
+
+
+def _init_worker(dataset_path: str):
+    """Pool initializer: load the shared dataset once per worker process"""
+    global _worker_dataset
+    _worker_dataset = joblib.load(dataset_path)
+
+
+def _fit_and_score(
+    task_id: int,
+    params: Dict[str, Any],
+    train_indices: List[int],
+    test_indices: List[int],
+    max_iterations: int,
+    crf_params: Dict[str, Any],
+    score_train: bool,
+    return_model: bool,
+) -> Dict[str, Any]:
+    """Fit one CRF on the shared dataset and score it on the test indices"""
+    import sklearn_crfsuite
+    from sklearn_crfsuite import metrics
+
+    X, y = _worker_dataset
+    start = time.time()
+
+    # Candidate parameters override the shared estimator settings
+    crf = sklearn_crfsuite.CRF(**{
+        'c1': 0.01,
+        'c2': 0.01,
+        **crf_params,
+        'max_iterations': max_iterations,
+        **params,
+    })
+    crf.fit([X[i] for i in train_indices], [y[i] for i in train_indices])
+
+    y_test = [y[i] for i in test_indices]
+    y_pred = crf.predict([X[i] for i in test_indices])
+    labels = [label for label in crf.classes_ if label != 'O']
+
+    result = {
+        'task_id': task_id,
+        'params': params,
+        'accuracy': metrics.flat_accuracy_score(y_test, y_pred),
+        'f1': metrics.flat_f1_score(y_test, y_pred, average='weighted',
+                                    labels=labels, zero_division=0),
+        'train_accuracy': None,
+        'model': crf if return_model else None,
+    }
+    if score_train:
+        result['train_accuracy'] = crf.score(
+            [X[i] for i in train_indices], [y[i] for i in train_indices]
+        )
+    result['seconds'] = time.time() - start
+    return result
+
+
+def run_training_tasks(
+    X: List[List[Dict]],
+    y: List[List[str]],
+    candidates: List[Dict[str, Any]],
+    splits: List[Split],
+    max_iterations: int = 250,
+    workers: int = None,
+    score_train: bool = False,
+    return_models: bool = False,
+    crf_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Fit and score every (candidate, split) pair, in parallel when worth it
+
+    Args:
+        X: Feature sequences (shared by all tasks)
+        y: Label sequences
+        candidates: CRF parameter dicts (c1, c2, optional max_iterations)
+        splits: (train indices, test indices) pairs
+        max_iterations: L-BFGS iterations unless a candidate sets its own
+        workers: Worker processes (default: get_training_workers)
+        score_train: Also report accuracy on the training indices
+        return_models: Return the fitted models (pickled back from workers)
+        crf_params: sklearn_crfsuite.CRF settings shared by all candidates
+            (default: DEFAULT_CRF_PARAMS, the AdaptiveLearner.train settings)
+
+    Returns:
+        Dict with 'results' (candidate order), 'best' candidate, 'folds'
+        (one result per fit), 'workers', 'wall_seconds', 'task_seconds'
+        and 'speedup' (task seconds / wall seconds)
+    """
+    if len(X) != len(y):
+        raise ValueError(f"X and y must have same length. Got {len(X)} and {len(y)}")
+    if not candidates or not splits:
+        raise ValueError("Need at least one candidate and one split")
+
+    tasks = [
+        (len(splits) * c_index + s_index, params, train_indices, test_indices)
+        for c_index, params in enumerate(candidates)
+        for s_index, (train_indices, test_indices) in enumerate(splits)
+    ]
+    if workers is None:
+        workers = get_training_workers(len(tasks))
+    workers = max(1, min(workers, len(tasks)))
+    if crf_params is None:
+        crf_params = DEFAULT_CRF_PARAMS
+
+    start = time.time()
+    if workers <= 1:
+        global _worker_dataset
+        previous, _worker_dataset = _worker_dataset, (X, y)
+        try:
+            fits = [
+                _fit_and_score(*task, max_iterations, crf_params, score_train, return_models)
+                for task in tasks
+            ]
+        finally:
+            _worker_dataset = previous
+    else:
+        logger.info(f"⚡ Running {len(tasks)} CRF fits with {workers} worker processes")
+        fits = _run_in_pool(
+            X, y, tasks, workers, max_iterations, crf_params, score_train, return_models
+        )
+    wall_seconds = time.time() - start
+
+    fits.sort(key=lambda fit: fit['task_id'])
+    for fit in fits:
+        fit['fold'] = fit['task_id'] % len(splits)
+
+    results = []
+    for c_index, params in enumerate(candidates):
+        candidate_fits = fits[c_index * len(splits):(c_index + 1) * len(splits)]
+        train_scores = [fit['train_accuracy'] for fit in candidate_fits]
+        results.append({
+            'params': params,
+            'accuracy': sum(fit['accuracy'] for fit in candidate_fits) / len(candidate_fits),
+            'f1': sum(fit['f1'] for fit in candidate_fits) / len(candidate_fits),
+            'train_accuracy': (
+                sum(train_scores) / len(train_scores) if score_train else None
+            ),
+            'seconds': sum(fit['seconds'] for fit in candidate_fits),
+        })
+
+    # Highest mean accuracy wins; ties go to the earlier candidate
+    best = max(results, key=lambda result: result['accuracy'])
+    task_seconds = sum(fit['seconds'] for fit in fits)
+
+    return {
+        'results': results,
+        'best': best,
+        'folds': fits,
+        'workers': workers,
+        'wall_seconds': wall_seconds,
+        'task_seconds': task_seconds,
+        'speedup': task_seconds / wall_seconds if wall_seconds > 0 else 1.0,
+    }
+
+
+def _run_in_pool(X, y, tasks, workers, max_iterations, crf_params, score_train, return_models):
+    """Run tasks on spawned workers sharing one on-disk copy of the dataset"""
+    fd, dataset_path = tempfile.mkstemp(prefix='crf_training_', suffix='.joblib')
+    os.close(fd)
+    try:
+        joblib.dump((X, y), dataset_path)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(dataset_path,),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _fit_and_score, *task, max_iterations, crf_params, score_train, return_models
+                )
+                for task in tasks
+            ]
+            return [future.result() for future in as_completed(futures)]
+    finally:
+        os.remove(dataset_path)
+
+
+def cross_validate(
+    X: List[List[Dict]],
+    y: List[List[str]],
+    candidates: List[Dict[str, Any]],
+    n_folds: int = 5,
+    random_state: int = 42,
+    max_iterations: int = 250,
+    workers: int = None,
+) -> Dict[str, Any]:
+    """
+    K-fold cross-validation of every candidate, folds and candidates in parallel
+
+    Args:
+        X: Feature sequences
+        y: Label sequences
+        candidates: CRF parameter dicts (see make_param_grid)
+        n_folds: Number of folds (same folds as k_fold_split)
+        random_state: Fold shuffle seed
+        max_iterations: L-BFGS iterations per fit
+        workers: Worker processes (default: get_training_workers)
+
+    Returns:
+        See run_training_tasks
+    """
+    splits = k_fold_indices(len(X), n_folds=n_folds, random_state=random_state)
+    search = run_training_tasks(
+        X, y, candidates, splits, max_iterations=max_iterations, workers=workers
+    )
+    logger.info(
+        f"📊 {n_folds}-fold CV of {len(candidates)} candidates: "
+        f"best {search['best']['params']} (accuracy {search['best']['accuracy']:.4f}), "
+        f"{search['wall_seconds']:.1f}s wall, {search['speedup']:.1f}x speedup "
+        f"on {search['workers']} workers"
+    )
+    return search
@@ -91,6 +91,10 @@ class PatternCleaner:
                 else:
                     results['kept'].append(pattern['id'])
             
+            if not dry_run and (results['deactivated'] or results['deleted']):
+                from core.templates.config_loader import invalidate_config_cache
+                invalidate_config_cache(template_id=template_id)
+            
             # self.logger.info(
             #     f"✅ Cleanup complete: "
             #     f"{len(results['deactivated'])} deactivated, "
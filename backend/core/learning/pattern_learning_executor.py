@@ -0,0 +1,227 @@
+"""
+Pattern Learning Executor
+Bounded, coalescing background executor for pattern learning.
+
+AutoPatternLearner used to start one daemon thread per field, and the
+validate endpoint another thread per request, so a burst of validations
+on a 40-field template created hundreds of threads competing for SQLite.
+Tasks now run on a fixed number of worker threads (PATTERN_LEARNING_WORKERS)
+and are keyed, e.g. ('pattern', template_id, field_name):
+- a trigger for a key that is still queued collapses into the queued run
+  (latest arguments win)
+- a trigger for a key that is running schedules exactly one follow-up run
+  after it, so feedback that arrived meanwhile is still learned
+- at most PATTERN_LEARNING_MAX_PENDING tasks wait; further triggers are
+  dropped (the next validation triggers them again)
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+@dataclass
+class _LearningTask:
+    key: Hashable
+    fn: Callable[..., Any]
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    state: str = 'pending'  # pending -> running
+    rerun: Optional[Tuple[Callable[..., Any], Tuple, Dict[str, Any]]] = None
+    submitted_at: float = field(default_factory=time.time)
+
+
+class PatternLearningExecutor:
+    """
+    Fixed-size pool of daemon threads running keyed, coalesced tasks
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None):
+        """
+        Initialize executor
+
+        Args:
+            max_workers: Worker threads (default: PATTERN_LEARNING_WORKERS)
+            max_pending: Max queued tasks (default: PATTERN_LEARNING_MAX_PENDING)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_workers = max_workers if max_workers is not None else int(
+            os.getenv('PATTERN_LEARNING_WORKERS', '2')
+        )
+        self.max_pending = max_pending if max_pending is not None else int(
+            os.getenv('PATTERN_LEARNING_MAX_PENDING', '1000')
+        )
+
+        self._tasks: Dict[Hashable, _LearningTask] = {}
+        self._queue: "queue.Queue[Hashable]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+        # Counters
+        self.submitted = 0
+        self.coalesced = 0
+        self.reruns = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        Schedule fn(*args, **kwargs) unless a run for key is already queued
+
+        Args:
+            key: Coalescing key, e.g. ('pattern', template_id, field_name)
+            fn: Task function
+            *args, **kwargs: Task arguments
+
+        Returns:
+            True if scheduled or coalesced, False if dropped (queue full)
+        """
+        with self._lock:
+            self.submitted += 1
+            task = self._tasks.get(key)
+
+            if task is not None and task.state == 'pending':
+                task.fn, task.args, task.kwargs = fn, args, kwargs
+                self.coalesced += 1
+                return True
+
+            if task is not None and task.state == 'running':
+                if task.rerun is not None:
+                    self.coalesced += 1
+                task.rerun = (fn, args, kwargs)
+                return True
+
+            if self._pending_count() >= self.max_pending:
+                self.dropped += 1
+                self.logger.warning(
+                    f"⚠️ [PatternLearning] Queue full ({self.max_pending}), dropped {key}"
+                )
+                return False
+
+            self._tasks[key] = _LearningTask(key=key, fn=fn, args=args, kwargs=kwargs)
+
+        self._ensure_threads()
+        self._queue.put(key)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and task counters"""
+        with self._lock:
+            pending = [t for t in self._tasks.values() if t.state == 'pending']
+            return {
+                'queue_depth': len(pending),
+                'running': sum(1 for t in self._tasks.values() if t.state == 'running'),
+                'oldest_pending_seconds': round(
+                    time.time() - min(t.submitted_at for t in pending), 1
+                ) if pending else 0.0,
+                'submitted': self.submitted,
+                'coalesced': self.coalesced,
+                'reruns': self.reruns,
+                'dropped': self.dropped,
+                'completed': self.completed,
+                'failed': self.failed,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+            }
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """
+        Wait until no task is queued or running (scripts and tools)
+
+        Args:
+            timeout: Max seconds to wait (None = forever)
+
+        Returns:
+            True if idle
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    # ========================================================================
+    # Workers
+    # ========================================================================
+
+    def _pending_count(self) -> int:
+        return sum(1 for t in self._tasks.values() if t.state == 'pending')
+
+    def _ensure_threads(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f'PatternLearning-{len(self._threads)}',
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            key = self._queue.get()
+            with self._lock:
+                task = self._tasks.get(key)
+                if task is None or task.state != 'pending':
+                    continue
+                task.state = 'running'
+                fn, args, kwargs = task.fn, task.args, task.kwargs
+
+            try:
+                fn(*args, **kwargs)
+                with self._lock:
+                    self.completed += 1
+            except Exception as e:
+                self.logger.error(f"❌ [PatternLearning] Task {key} failed: {e}", exc_info=True)
+                with self._lock:
+                    self.failed += 1
+
+            with self._lock:
+                if task.rerun is not None:
+                    # Triggered again while running: one follow-up run
+                    task.fn, task.args, task.kwargs = task.rerun
+                    task.rerun = None
+                    task.state = 'pending'
+                    task.submitted_at = time.time()
+                    self.reruns += 1
+                    requeue = True
+                else:
+                    self._tasks.pop(key, None)
+                    requeue = False
+            if requeue:
+                self._queue.put(key)
+
+
+# Singleton instance
+_executor_instance = None
+_executor_lock = threading.Lock()
+
+
+def get_pattern_learning_executor() -> PatternLearningExecutor:
+    """
+    Get singleton pattern learning executor
+
+    Returns:
+        PatternLearningExecutor instance
+    """
+    global _executor_instance
+
+    if _executor_instance is None:
+        with _executor_lock:
+            if _executor_instance is None:
+                _executor_instance = PatternLearningExecutor()
+
+    return _executor_instance
@@ -0,0 +1,141 @@
+"""
+Sequence Alignment
+Finds the word window that best matches a corrected value (BIO labeling).
+
+AdaptiveLearner._find_best_sequence_match scores every window of up to
+2×len(target)-1 words with difflib.SequenceMatcher, i.e. O(n·k) matcher
+runs per field and document. The score of a window is
+
+    ratio(window text, target text) * 0.8 + length_ratio * 0.2
+
+and ratio = 2·M / (len_a + len_b), where M (matched characters) can never
+exceed the character multiset overlap of both texts (the same bound as
+SequenceMatcher.quick_ratio). CharacterIndex keeps, per target character,
+the count of that character in every word (a character inverted index), so
+the bounds of all windows of one size come from prefix sums in one
+vectorized pass (O(n) memory per size). Window sizes are visited by their
+best bound, and windows of a size are scored exactly, best bound first,
+until no remaining bound can reach the best score found.
+
+The result is identical to the exhaustive scan: the exact score is computed
+by the same function, and among equal best scores the first window in scan
+order (start, then end) wins.
+"""
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+# Bounds are compared with a margin so float rounding never prunes a tie
+BOUND_EPSILON = 1e-9
+
+
+class CharacterIndex:
+    """Per-word character counts for the characters of one target text"""
+
+    def __init__(self, word_texts: List[str], target_text: str):
+        """
+        Build index
+
+        Args:
+            word_texts: Words of the document
+            target_text: Lowercased target text (tokens joined with spaces)
+        """
+        lowered = [w.lower() for w in word_texts]
+        self.word_lengths = np.array([len(w) for w in lowered], dtype=np.int64)
+
+        target_counts: Dict[str, int] = {}
+        for char in target_text:
+            target_counts[char] = target_counts.get(char, 0) + 1
+        self.target_spaces = target_counts.get(' ', 0)
+
+        # overlap[i] = sum over chars of min(count in word i, count in target)
+        self.word_overlap = np.zeros(len(lowered), dtype=np.int64)
+        for char, limit in target_counts.items():
+            counts = np.fromiter((w.count(char) for w in lowered), dtype=np.int64, count=len(lowered))
+            self.word_overlap += np.minimum(counts, limit)
+
+
+def window_upper_bounds(
+    index: CharacterIndex, target_length: int, token_count: int, size: int
+) -> np.ndarray:
+    """
+    Upper bound of the match score of every window of one size
+
+    Args:
+        index: CharacterIndex of the document and target
+        target_length: Length of the target text
+        token_count: Number of target tokens
+        size: Window size (words)
+
+    Returns:
+        Bounds indexed by window start (empty if size exceeds the document)
+    """
+    # Window sums as differences of prefix sums, 1-D slices only
+    overlap_sum = np.concatenate(([0], np.cumsum(index.word_overlap)))
+    length_sum = np.concatenate(([0], np.cumsum(index.word_lengths)))
+
+    # Joined window text: word characters plus one space between words
+    candidate_length = length_sum[size:] - length_sum[:-size] + (size - 1)
+    matched = (
+        overlap_sum[size:] - overlap_sum[:-size]
+        + min(size - 1, index.target_spaces)
+    )
+    matched = np.minimum(matched, np.minimum(candidate_length, target_length))
+
+    ratio_bound = 2.0 * matched / (candidate_length + target_length)
+    length_ratio = min(size, token_count) / max(size, token_count)
+    return ratio_bound * 0.8 + length_ratio * 0.2
+
+
+def find_best_window(
+    word_texts: List[str],
+    target_tokens: List[str],
+    score_fn: Callable[[List[str], List[str]], float],
+) -> Tuple[List[int], float]:
+    """
+    Find the best scoring contiguous window of words
+
+    Args:
+        word_texts: Words of the document
+        target_tokens: Tokens of the corrected value (non-empty)
+        score_fn: Exact window score (AdaptiveLearner._calculate_sequence_match_score)
+
+    Returns:
+        (word indices of the best window, its score); ([], 0) if no window scores > 0
+    """
+    if not word_texts or not target_tokens:
+        return [], 0.0
+
+    target_text = ' '.join(target_tokens).lower()
+    index = CharacterIndex(word_texts, target_text)
+    sizes = range(1, min(len(target_tokens) * 2 - 1, len(word_texts)) + 1)
+
+    def bounds_of(size: int) -> np.ndarray:
+        return window_upper_bounds(index, len(target_text), len(target_tokens), size)
+
+    # Best bound per window size; bounds are recomputed per size when searched
+    size_bounds = {size: float(bounds_of(size).max()) for size in sizes}
+
+    best_score = 0.0
+    best_windows: List[Tuple[int, int]] = []
+    for size in sorted(sizes, key=lambda size: -size_bounds[size]):
+        if size_bounds[size] + BOUND_EPSILON < best_score:
+            break  # No remaining window size can reach the best score
+        bounds = bounds_of(size)
+        for start in np.argsort(-bounds, kind='stable'):
+            if bounds[start] + BOUND_EPSILON < best_score:
+                break  # No remaining window of this size can reach it
+            start = int(start)
+            score = score_fn(word_texts[start:start + size], target_tokens)
+            if score > best_score:
+                best_score = score
+                best_windows = [(start, start + size)]
+            elif score == best_score and best_windows:
+                best_windows.append((start, start + size))
+
+    if not best_windows:
+        return [], 0.0
+
+    # Exhaustive scan keeps the first window (by start, then end) with the best score
+    start, end = min(best_windows)
+    return list(range(start, end)), best_score
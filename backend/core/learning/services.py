@@ -10,10 +10,10 @@ Separation of Concerns:
 
 from typing import Dict, Any, Optional, List
 import os
-import pdfplumber
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .learner import AdaptiveLearner
+from .feature_store import compute_revision, get_feature_store
 from .training_utils import (
     split_training_data,
     validate_training_data_diversity,
@@ -21,6 +21,8 @@ from .training_utils import (
     get_training_recommendations,
 )
 from .validation_strategy import ValidationStrategy
+from core.extraction.word_cache import get_word_cache
+from core.templates.config_loader import invalidate_config_cache
 from database.db_manager import DatabaseManager
 from database.repositories.data_quality_repository import DataQualityRepository
 import time
@@ -62,6 +64,231 @@ class ModelService:
         """Set maximum L-BFGS iterations for CRF training"""
         self.max_iterations = max(10, iterations)
 
+    def _search_hyperparameters(
+        self,
+        X_train: List[List[Dict]],
+        y_train: List[List[str]],
+        default_params: Dict[str, float],
+    ) -> Dict[str, float]:
+        """
+        Pick c1/c2 by K-fold CV, folds and candidates trained in parallel
+
+        Args:
+            X_train: Training feature sequences
+            y_train: Training label sequences
+            default_params: Params kept when the search cannot run
+
+        Returns:
+            Best {'c1': ..., 'c2': ...}
+        """
+        from .parallel_training import cross_validate, make_param_grid
+
+        n_folds = int(os.getenv('CRF_SEARCH_FOLDS', '3'))
+        if len(X_train) < max(n_folds, 2) * 2:
+            self.logger.info(f"Hyperparameter search skipped: {len(X_train)} samples")
+            return default_params
+
+        def _values(name: str, default: str) -> List[float]:
+            return [float(value) for value in os.getenv(name, default).split(',') if value.strip()]
+
+        candidates = make_param_grid(
+            _values('CRF_SEARCH_C1_VALUES', '0.01,0.1,0.5'),
+            _values('CRF_SEARCH_C2_VALUES', '0.01,0.1,0.5'),
+        )
+        search = cross_validate(
+            X_train, y_train, candidates,
+            n_folds=n_folds,
+            max_iterations=self.max_iterations,
+        )
+        self.logger.info(
+            f"Hyperparameter search: best {search['best']['params']} "
+            f"(CV accuracy {search['best']['accuracy']*100:.2f}%, "
+            f"{search['wall_seconds']:.1f}s, {search['speedup']:.1f}x speedup)"
+        )
+        return dict(search['best']['params'])
+
+    def prepare_training_data(
+        self,
+        template_id: int,
+        feedback_list: List[Dict[str, Any]],
+        validated_docs: List[Any],
+        template_config: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build CRF training sequences (X/y) from feedback and validated documents
+
+        Sequences of documents whose labeled values, field configs and PDF are
+        unchanged since the last run are loaded from the training feature
+        store; only new or changed documents are prepared from their PDFs.
+
+        Args:
+            template_id: Template ID
+            feedback_list: Feedback records (FeedbackRepository.find_for_training)
+            validated_docs: Validated documents (pseudo-labels from extractions)
+            template_config: Template config (field context features), optional
+
+        Returns:
+            Dict with X_train, y_train, feedback_ids, feedback_documents,
+            validated_count, reused_documents, prepared_documents
+        """
+        X_train = []
+        y_train = []
+        feedback_ids = []
+
+        # 1. Add feedback data (user corrections - highest priority)
+        # Group feedback by document_id to create complete training samples
+        feedback_by_doc = {}
+        for feedback in feedback_list:
+            doc_id = feedback["document_id"]
+            if doc_id not in feedback_by_doc:
+                feedback_by_doc[doc_id] = []
+            feedback_by_doc[doc_id].append(feedback)
+
+        self.logger.info(f"   - Unique documents with feedback: {len(feedback_by_doc)}")
+
+        # ⚡ OPTIMIZATION: Reuse single learner instance
+        learner = AdaptiveLearner()
+
+        field_configs = {}
+        if template_config:
+            field_configs = dict(template_config.get('fields', {}))
+
+        # Plan samples per document: (document, values to label, from_feedback)
+        plans = []
+        for doc_id, doc_feedbacks in feedback_by_doc.items():
+            document = self.document_repo.find_by_id(doc_id)
+            if not document:
+                continue
+
+            # ✅ FIX: Include ALL fields (corrected + non-corrected) for complete context
+            # Get extraction results to include non-corrected fields
+            extraction_result = json.loads(document.extraction_result)
+            extracted_data = extraction_result.get("extracted_data", {})
+            confidence_scores = extraction_result.get("confidence_scores", {})
+
+            # Create complete feedback list (corrected + high-confidence non-corrected)
+            corrected_fields = set(fb["field_name"] for fb in doc_feedbacks)
+            complete_feedbacks = list(doc_feedbacks)
+
+            # Add non-corrected fields with reasonable confidence
+            for field_name, value in extracted_data.items():
+                if field_name not in corrected_fields:
+                    confidence = confidence_scores.get(field_name, 0.0)
+                    if confidence >= 0.3:  
+                        complete_feedbacks.append(
+                            {"field_name": field_name, "corrected_value": value}
+                        )
+
+            plans.append((document, complete_feedbacks, True))
+
+        # Validated documents (skip documents that already have feedback)
+        for document in validated_docs:
+            if document.id in feedback_by_doc:
+                continue
+
+            extraction_result = json.loads(document.extraction_result)
+            extracted_data = extraction_result.get("extracted_data", {})
+            confidence_scores = extraction_result.get("confidence_scores", {})
+
+            # Create pseudo-feedback from high-confidence extractions
+            pseudo_feedbacks = []
+            for field_name, value in extracted_data.items():
+                confidence = confidence_scores.get(field_name, 0.0)
+                if confidence >= 0.3:  
+                    pseudo_feedbacks.append(
+                        {"field_name": field_name, "corrected_value": value}
+                    )
+
+            plans.append((document, pseudo_feedbacks, False))
+
+        # ⚡ Feature store: reuse sequences of unchanged documents, compute the rest
+        feature_store = get_feature_store()
+        stored_samples = {}
+        revisions = {}
+        for document, feedbacks, _from_feedback in plans:
+            if not feedbacks:
+                continue
+            revisions[document.id] = compute_revision(document.file_path, feedbacks, field_configs)
+            samples = feature_store.get(template_id, document.id, revisions[document.id])
+            if samples is not None:
+                stored_samples[document.id] = samples
+
+        # ⚡ OPTIMIZATION: Parallel PDF extraction using ThreadPoolExecutor
+        # Extract PDFs of documents not in the store in parallel (I/O-bound operation)
+        pdf_words_cache = {}
+        
+        def extract_pdf_words(doc_id, file_path):
+            """Extract words from PDF (thread-safe)"""
+            try:
+                words = get_word_cache().get_words(
+                    file_path, x_tolerance=3, y_tolerance=3
+                )
+                return doc_id, words
+            except Exception as e:
+                self.logger.warning(f"⚠️  Error extracting PDF {doc_id}: {e}")
+                return doc_id, []
+        
+        docs_to_extract = [
+            (document.id, document.file_path)
+            for document, feedbacks, _from_feedback in plans
+            if feedbacks and document.id not in stored_samples
+        ]
+        self.logger.info(
+            f"Feature store: {len(stored_samples)} documents reused, {len(docs_to_extract)} to prepare"
+        )
+        
+        # ⚡ Extract PDFs in parallel (2-4x faster)
+        if docs_to_extract:
+            print(f"⚡ Extracting {len(docs_to_extract)} PDFs with {self.max_workers} workers...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(extract_pdf_words, doc_id, path): doc_id 
+                          for doc_id, path in docs_to_extract}
+                
+                for future in as_completed(futures):
+                    doc_id, words = future.result()
+                    pdf_words_cache[doc_id] = words
+
+        validated_count = 0
+        for document, feedbacks, from_feedback in plans:
+            doc_id = document.id
+            samples = stored_samples.get(doc_id)
+
+            if samples is None:
+                words = pdf_words_cache.get(doc_id, [])
+                if not words:
+                    continue
+
+                samples = []
+                for fb in feedbacks:
+                    features, labels = learner._create_bio_sequence(
+                        fb,
+                        words,
+                        field_config=field_configs.get(fb["field_name"])
+                    )
+                    if features and labels:
+                        samples.append((features, labels, fb.get("id") if from_feedback else None))
+
+                feature_store.put(template_id, doc_id, revisions.get(doc_id), samples)
+
+            for features, labels, feedback_id in samples:
+                X_train.append(features)
+                y_train.append(labels)
+                if feedback_id is not None:
+                    feedback_ids.append(feedback_id)
+
+            if not from_feedback and feedbacks:
+                validated_count += 1
+
+        return {
+            "X_train": X_train,
+            "y_train": y_train,
+            "feedback_ids": feedback_ids,
+            "feedback_documents": len(feedback_by_doc),
+            "validated_count": validated_count,
+            "reused_documents": len(stored_samples),
+            "prepared_documents": len(docs_to_extract),
+        }
+
     def retrain_model(
         self,
         template_id: int,
@@ -139,194 +366,23 @@ class ModelService:
             self.logger.warning(f"   - UndefinedMetricWarning from sklearn")
             self.logger.warning(f"\n💡 RECOMMENDATION: Use 'use_all_feedback=True' for better results")
 
-        # Prepare training data
-        X_train = []
-        y_train = []
-        feedback_ids = []
-        doc_ids_train = []  # ✅ Track document IDs for leakage detection
-
         self.logger.info(f"📊 Training data sources:")
         self.logger.info(f"   - Feedback (corrected): {len(feedback_list)} records")
         self.logger.info(f"   - Validated (high-confidence): {len(validated_docs)} documents")
 
-        # 1. Add feedback data (user corrections - highest priority)
-        # Group feedback by document_id to create complete training samples
-        feedback_by_doc = {}
-        for feedback in feedback_list:
-            doc_id = feedback["document_id"]
-            if doc_id not in feedback_by_doc:
-                feedback_by_doc[doc_id] = []
-            feedback_by_doc[doc_id].append(feedback)
-
-        self.logger.info(f"   - Unique documents with feedback: {len(feedback_by_doc)}")
-
-        # ⚡ OPTIMIZATION: Reuse single learner instance
-        learner = AdaptiveLearner()
-        
-        # ⚡ OPTIMIZATION: Parallel PDF extraction using ThreadPoolExecutor
-        # Extract all PDFs in parallel (I/O-bound operation)
-        pdf_words_cache = {}
-        
-        def extract_pdf_words(doc_id, file_path):
-            """Extract words from PDF (thread-safe)"""
-            try:
-                with pdfplumber.open(file_path) as pdf:
-                    words = []
-                    for page in pdf.pages:
-                        page_words = page.extract_words(x_tolerance=3, y_tolerance=3)
-                        words.extend(page_words)
-                return doc_id, words
-            except Exception as e:
-                self.logger.warning(f"⚠️  Error extracting PDF {doc_id}: {e}")
-                return doc_id, []
-        
-        # Collect all documents that need PDF extraction
-        docs_to_extract = []
-        for doc_id in feedback_by_doc.keys():
-            document = self.document_repo.find_by_id(doc_id)
-            if document:
-                docs_to_extract.append((doc_id, document.file_path))
-        
-        # ⚡ Extract PDFs in parallel (2-4x faster)
-        if docs_to_extract:
-            print(f"⚡ Extracting {len(docs_to_extract)} PDFs with {self.max_workers} workers...")
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {executor.submit(extract_pdf_words, doc_id, path): doc_id 
-                          for doc_id, path in docs_to_extract}
-                
-                for future in as_completed(futures):
-                    doc_id, words = future.result()
-                    pdf_words_cache[doc_id] = words
-
-        for doc_id, doc_feedbacks in feedback_by_doc.items():
-            # Get document
-            document = self.document_repo.find_by_id(doc_id)
-            if not document:
-                continue
-
-            # ⚡ Get words from cache (already extracted in parallel)
-            words = pdf_words_cache.get(doc_id, [])
-            if not words:
-                continue
-
-            # ✅ FIX: Include ALL fields (corrected + non-corrected) for complete context
-            # Get extraction results to include non-corrected fields
-            extraction_result = json.loads(document.extraction_result)
-            extracted_data = extraction_result.get("extracted_data", {})
-            confidence_scores = extraction_result.get("confidence_scores", {})
-
-            # Create complete feedback list (corrected + high-confidence non-corrected)
-            complete_feedbacks = []
-            corrected_fields = set(fb["field_name"] for fb in doc_feedbacks)
-
-            # Add corrected fields
-            for fb in doc_feedbacks:
-                complete_feedbacks.append(fb)
-
-            # Add non-corrected fields with reasonable confidence
-            for field_name, value in extracted_data.items():
-                if field_name not in corrected_fields:
-                    confidence = confidence_scores.get(field_name, 0.0)
-                    if confidence >= 0.3:  
-                        complete_feedbacks.append(
-                            {"field_name": field_name, "corrected_value": value}
-                        )
-
-            field_configs = {}
-            if template_config:
-                fields = template_config.get('fields', {})
-                for field_name, field_config in fields.items():
-                    field_configs[field_name] = field_config
-            
-            for fb in complete_feedbacks:
-                field_name = fb["field_name"]
-                field_config = field_configs.get(field_name)
-                
-                features, labels = learner._create_bio_sequence(
-                    fb,
-                    words,
-                    field_config=field_config
-                )
-                
-                if features and labels:
-                    X_train.append(features)
-                    y_train.append(labels)
-                    if fb in doc_feedbacks:
-                        feedback_ids.append(fb["id"])
-
-        # ✅ ALWAYS process validated docs (both full and incremental)
-        # Filter based on use_all_feedback to include only unused or all
-        validated_count = 0
-        docs_with_feedback = set(feedback_by_doc.keys())
-
-        self.logger.info(f"Processing {len(validated_docs)} validated documents...")
-        
-        validated_docs_to_extract = []
-        for document in validated_docs:
-            if document.id not in pdf_words_cache:
-                validated_docs_to_extract.append((document.id, document.file_path))
-        
-        if validated_docs_to_extract:
-            self.logger.info(f"Extracting {len(validated_docs_to_extract)} validated documents with {self.max_workers} workers...")
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {executor.submit(extract_pdf_words, doc_id, path): doc_id 
-                          for doc_id, path in validated_docs_to_extract}
-                
-                for future in as_completed(futures):
-                    doc_id, words = future.result()
-                    pdf_words_cache[doc_id] = words
-
-        for document in validated_docs:
-            doc_id = document.id
-
-            # Skip documents that already have feedback (to avoid duplication)
-            if doc_id in docs_with_feedback:
-                continue
-
-            extraction_result = json.loads(document.extraction_result)
-            extracted_data = extraction_result.get("extracted_data", {})
-            confidence_scores = extraction_result.get("confidence_scores", {})
-
-            words = pdf_words_cache.get(doc_id, [])
-            if not words:
-                continue
-
-            # Create pseudo-feedback from high-confidence extractions
-            pseudo_feedbacks = []
-            for field_name, value in extracted_data.items():
-                confidence = confidence_scores.get(field_name, 0.0)
-                if confidence >= 0.3:  
-                    pseudo_feedbacks.append(
-                        {"field_name": field_name, "corrected_value": value}
-                    )
-
-            if pseudo_feedbacks:
-                field_configs = {}
-                if template_config:
-                    fields = template_config.get('fields', {})
-                    for field_name, field_config in fields.items():
-                        field_configs[field_name] = field_config
-                
-                for fb in pseudo_feedbacks:
-                    field_name = fb["field_name"]
-                    field_config = field_configs.get(field_name)
-                    
-                    features, labels = learner._create_bio_sequence(
-                        fb,
-                        words,
-                        field_config=field_config
-                    )
-                    
-                    if features and labels:
-                        X_train.append(features)
-                        y_train.append(labels)
-                
-                validated_count += 1
+        # Prepare training data
+        training_data = self.prepare_training_data(
+            template_id, feedback_list, validated_docs, template_config
+        )
+        X_train = training_data["X_train"]
+        y_train = training_data["y_train"]
+        feedback_ids = training_data["feedback_ids"]
+        validated_count = training_data["validated_count"]
 
         if not X_train:
             raise ValueError("Could not prepare training data - no feedback or validated documents available")
 
-        self.logger.info(f"Training: {len(X_train)} samples ({len(feedback_by_doc)} feedback docs, {validated_count} validated docs)")
+        self.logger.info(f"Training: {len(X_train)} samples ({training_data['feedback_documents']} feedback docs, {validated_count} validated docs)")
 
         validation_strategy = ValidationStrategy(template_id=template_id)
         
@@ -431,14 +487,25 @@ class ModelService:
                 # Not in Flask context (e.g., CLI), read from env directly
                 evaluate_incremental = os.getenv('INCREMENTAL_TRAINING_EVALUATE', 'false').lower() == 'true'
             
-            if evaluate_incremental:
-                self.logger.info(f"Incremental training ({incremental_iterations} iterations, with evaluation)")
-            else:
-                self.logger.info(f"Incremental training ({incremental_iterations} iterations, skip evaluation)")
+            # ⚡ Online mode (opt-in): apply only the new sequences to the current
+            # weights (passive-aggressive); full retrains stay L-BFGS
+            online_updates = os.getenv('CRF_ONLINE_UPDATES', 'false').lower() == 'true'
+            # Scoring the held-out split is cheap for online updates (NumPy decoding)
+            evaluate_incremental = evaluate_incremental or (online_updates and bool(X_test_split))
+            evaluation_note = "with evaluation" if evaluate_incremental else "skip evaluation"
             
-            metrics = learner.train(X_train_split, y_train_split, 
-                                   max_iterations=incremental_iterations,
-                                   skip_evaluation=True)  # Skip training eval
+            if online_updates:
+                online_stats = learner.online_train(X_train_split, y_train_split)
+                self.logger.info(
+                    f"Online incremental update ({online_stats['sequences']} sequences, "
+                    f"{online_stats['updates']} updates, {evaluation_note})"
+                )
+                metrics = {}
+            else:
+                self.logger.info(f"Incremental training ({incremental_iterations} iterations, {evaluation_note})")
+                metrics = learner.train(X_train_split, y_train_split, 
+                                       max_iterations=incremental_iterations,
+                                       skip_evaluation=True)  # Skip training eval
             
             # ✅ Conditionally evaluate on test set based on config
             if evaluate_incremental:
@@ -457,6 +524,8 @@ class ModelService:
             self.logger.info(f"Max iterations: {self.max_iterations}")
             
             best_params = {'c1': 0.01, 'c2': 0.01}
+            if os.getenv('CRF_HYPERPARAM_SEARCH', 'false').lower() == 'true':
+                best_params = self._search_hyperparameters(X_train_split, y_train_split, best_params)
             
             learner = AdaptiveLearner()
             
@@ -545,29 +614,26 @@ class ModelService:
 
         def _extract_words_by_page(pdf_path: str) -> Dict[int, List[Dict[str, Any]]]:
             words_by_page: Dict[int, List[Dict[str, Any]]] = {}
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_idx, page in enumerate(pdf.pages):
-                    try:
-                        page_words = page.extract_words(
-                            x_tolerance=1,
-                            y_tolerance=1,
-                            keep_blank_chars=False,
-                            use_text_flow=True,
-                        )
-                    except Exception:
-                        page_words = []
-                    normalized: List[Dict[str, Any]] = []
-                    for w in page_words:
-                        normalized.append(
-                            {
-                                'text': w.get('text', ''),
-                                'x0': float(w.get('x0', 0.0)),
-                                'x1': float(w.get('x1', 0.0)),
-                                'top': float(w.get('top', 0.0)),
-                                'bottom': float(w.get('bottom', 0.0)),
-                            }
-                        )
-                    words_by_page[page_idx] = normalized
+            pages = get_word_cache().get_words_by_page(
+                pdf_path,
+                x_tolerance=1,
+                y_tolerance=1,
+                keep_blank_chars=False,
+                use_text_flow=True,
+            )
+            for page_idx, page_words in enumerate(pages):
+                normalized: List[Dict[str, Any]] = []
+                for w in page_words:
+                    normalized.append(
+                        {
+                            'text': w.get('text', ''),
+                            'x0': float(w.get('x0', 0.0)),
+                            'x1': float(w.get('x1', 0.0)),
+                            'top': float(w.get('top', 0.0)),
+                            'bottom': float(w.get('bottom', 0.0)),
+                        }
+                    )
+                words_by_page[page_idx] = normalized
             return words_by_page
 
         # Load field bounding boxes for this template (location_index=0 primary)
@@ -826,6 +892,7 @@ class ModelService:
             ),
         )
         conn.commit()
+        invalidate_config_cache(template_id=template_id)
         self.logger.info("Updated allow_multiline flags based on feedback statistics")
         
         cursor.execute('''
@@ -974,9 +1041,14 @@ class ModelService:
         skipped_fields = []
         errors = []
 
+        # One grouped query for all fields instead of one COUNT per field
+        ready_fields = auto_learner.get_fields_ready_for_learning(
+            template_id, list(all_fields.keys())
+        )
+
         for field_name in all_fields.keys():
             try:
-                if auto_learner.should_trigger_learning(template_id, field_name):
+                if field_name in ready_fields:
                     auto_learner.trigger_learning(
                         template_id=template_id, field_name=field_name, async_mode=True
                     )
@@ -1096,29 +1168,26 @@ class ModelService:
 
         # Load words per page (single PDF only)
         words_by_page: Dict[int, List[Dict[str, Any]]] = {}
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_idx, page in enumerate(pdf.pages):
-                try:
-                    page_words = page.extract_words(
-                        x_tolerance=1,
-                        y_tolerance=1,
-                        keep_blank_chars=False,
-                        use_text_flow=True,
-                    )
-                except Exception:
-                    page_words = []
-                normalized = []
-                for w in page_words:
-                    normalized.append(
-                        {
-                            "text": w.get("text", ""),
-                            "x0": float(w.get("x0", 0.0)),
-                            "x1": float(w.get("x1", 0.0)),
-                            "top": float(w.get("top", 0.0)),
-                            "bottom": float(w.get("bottom", 0.0)),
-                        }
-                    )
-                words_by_page[page_idx] = normalized
+        pages = get_word_cache().get_words_by_page(
+            pdf_path,
+            x_tolerance=1,
+            y_tolerance=1,
+            keep_blank_chars=False,
+            use_text_flow=True,
+        )
+        for page_idx, page_words in enumerate(pages):
+            normalized = []
+            for w in page_words:
+                normalized.append(
+                    {
+                        "text": w.get("text", ""),
+                        "x0": float(w.get("x0", 0.0)),
+                        "x1": float(w.get("x1", 0.0)),
+                        "top": float(w.get("top", 0.0)),
+                        "bottom": float(w.get("bottom", 0.0)),
+                    }
+                )
+            words_by_page[page_idx] = normalized
 
         conn = self.db.get_connection()
         cursor = conn.cursor()
@@ -1245,6 +1314,8 @@ class ModelService:
                 updated_fields.append(field_name)
 
             conn.commit()
+            if updated_fields:
+                invalidate_config_cache(template_id=template_id)
         finally:
             conn.close()
 
@@ -54,45 +54,65 @@ def split_training_data(
     return X_train, X_test, y_train, y_test
 
 
-def k_fold_split(
-    X: List[List[Dict]], 
-    y: List[List[str]], 
+def k_fold_indices(
+    n_samples: int,
     n_folds: int = 5,
     random_state: int = 42
-) -> List[Tuple[List, List, List, List]]:
+) -> List[Tuple[List[int], List[int]]]:
     """
-    Create K-fold cross-validation splits
+    Create K-fold cross-validation index splits
     
     Args:
-        X: Feature sequences
-        y: Label sequences
+        n_samples: Number of samples
         n_folds: Number of folds (default: 5)
         random_state: Random seed
         
     Returns:
-        List of (X_train, X_test, y_train, y_test) tuples for each fold
+        List of (train_indices, test_indices) tuples for each fold
     """
-    if len(X) < n_folds:
-        raise ValueError(f"Not enough samples ({len(X)}) for {n_folds}-fold CV")
+    if n_samples < n_folds:
+        raise ValueError(f"Not enough samples ({n_samples}) for {n_folds}-fold CV")
     
     # Shuffle data
-    random.seed(random_state)
-    indices = list(range(len(X)))
-    random.shuffle(indices)
+    indices = list(range(n_samples))
+    random.Random(random_state).shuffle(indices)
     
     # Create folds
-    fold_size = len(X) // n_folds
-    folds = []
+    fold_size = n_samples // n_folds
+    splits = []
     
     for i in range(n_folds):
         # Test indices for this fold
         test_start = i * fold_size
-        test_end = test_start + fold_size if i < n_folds - 1 else len(X)
-        test_indices = indices[test_start:test_end]
+        test_end = test_start + fold_size if i < n_folds - 1 else n_samples
         
-        # Train indices (everything else)
-        train_indices = [idx for idx in indices if idx not in test_indices]
+        # Train indices (everything else, in shuffled order)
+        splits.append((indices[:test_start] + indices[test_end:], indices[test_start:test_end]))
+    
+    return splits
+
+
+def k_fold_split(
+    X: List[List[Dict]], 
+    y: List[List[str]], 
+    n_folds: int = 5,
+    random_state: int = 42
+) -> List[Tuple[List, List, List, List]]:
+    """
+    Create K-fold cross-validation splits
+    
+    Args:
+        X: Feature sequences
+        y: Label sequences
+        n_folds: Number of folds (default: 5)
+        random_state: Random seed
         
+    Returns:
+        List of (X_train, X_test, y_train, y_test) tuples for each fold
+    """
+    folds = []
+    
+    for train_indices, test_indices in k_fold_indices(len(X), n_folds, random_state):
         # Split data
         X_train = [X[idx] for idx in train_indices]
         X_test = [X[idx] for idx in test_indices]
@@ -0,0 +1,309 @@
+"""
+Validation Event Pipeline
+Processes validation side effects off the request path.
+
+/api/v1/extraction/validate only commits feedback, the document status and
+a 'document_validated' event (validation_events outbox) in one transaction.
+This pipeline then runs the slow parts:
+- writing the feedback JSON file
+- allow_multiline inference (reopens the PDF)
+- adaptive learning (pattern learning triggers, DataExtractor.learn_from_feedback)
+
+Ordering and idempotency:
+- events of a template are processed strictly in id order, also with
+  several consumers (see ValidationEventRepository.claim_next)
+- re-submitting an identical validation publishes no new event (dedupe_key)
+- each step is recorded when it finishes; a retried event (failure or
+  expired lease) skips the steps already done
+"""
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+DOCUMENT_VALIDATED = 'document_validated'
+
+
+# ============================================================================
+# Steps
+# ============================================================================
+
+def _write_feedback_file(event: Dict[str, Any], db) -> None:
+    """Write the feedback JSON file (same content as the synchronous path had)"""
+    payload = event["payload"]
+    feedback_path = payload["feedback_path"]
+
+    feedback_data = {
+        "document_id": event["document_id"],
+        "template_id": event["template_id"],
+        "original_results": payload["original_results"],
+        "corrections": payload["corrected_fields"],
+        "timestamp": payload["timestamp"],
+    }
+    if payload.get("all_correct"):
+        feedback_data["all_correct"] = True  # Flag for training
+
+    folder = os.path.dirname(feedback_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(feedback_path, "w", encoding="utf-8") as f:
+        json.dump(feedback_data, f, indent=2)
+
+
+def _update_allow_multiline(event: Dict[str, Any], db) -> None:
+    """allow_multiline inference only (adaptive learning disabled)"""
+    from core.learning.services import ModelService
+
+    payload = event["payload"]
+    if not payload["corrected_fields"]:
+        return
+
+    ModelService(db).update_allow_multiline_from_document_feedback(
+        document_id=event["document_id"],
+        all_fields=payload["all_fields"],
+        corrected_fields=payload["corrected_fields"],
+    )
+
+
+def _run_adaptive_learning(event: Dict[str, Any], db) -> None:
+    """Adaptive learning (includes allow_multiline inference)"""
+    from core.learning.services import ModelService
+
+    payload = event["payload"]
+    result = ModelService(db).trigger_adaptive_learning(
+        document_id=event["document_id"],
+        all_fields=payload["all_fields"],
+        corrected_fields=payload["corrected_fields"],
+    )
+    if result.get("success") is False:
+        raise RuntimeError(result.get("error", "Adaptive learning failed"))
+
+
+def _document_validated_steps(event: Dict[str, Any]) -> List[str]:
+    auto_training = event["payload"].get("auto_training", True)
+    return ["feedback_file", "adaptive_learning" if auto_training else "allow_multiline"]
+
+
+# Step name -> function(event, db)
+STEP_HANDLERS: Dict[str, Callable[[Dict[str, Any], Any], None]] = {
+    "feedback_file": _write_feedback_file,
+    "allow_multiline": _update_allow_multiline,
+    "adaptive_learning": _run_adaptive_learning,
+}
+
+# Event type -> function(event) returning its ordered step names
+EVENT_STEPS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    DOCUMENT_VALIDATED: _document_validated_steps,
+}
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+class ValidationEventPipeline:
+    """
+    Background consumer of the validation_events outbox
+    """
+
+    def __init__(self, db_manager=None):
+        """
+        Initialize pipeline
+
+        Args:
+            db_manager: DatabaseManager instance (default: new DatabaseManager)
+        """
+        from database.db_manager import DatabaseManager
+        from database.repositories.validation_event_repository import ValidationEventRepository
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db = db_manager or DatabaseManager()
+        self.event_repo = ValidationEventRepository(self.db)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:validation"
+
+        self.poll_interval = float(os.getenv('VALIDATION_EVENTS_POLL_INTERVAL', '5'))
+        self.lease_seconds = int(os.getenv('VALIDATION_EVENTS_LEASE_SECONDS', '300'))
+        self.max_attempts = int(os.getenv('VALIDATION_EVENTS_MAX_ATTEMPTS', '3'))
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        # One drain at a time per process (background thread or sync callers)
+        self._drain_lock = threading.Lock()
+
+        # Counters
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def start(self):
+        """Start the background consumer thread (idempotent)"""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='ValidationEventPipeline', daemon=True
+            )
+            self._thread.start()
+
+    def notify(self):
+        """Wake the consumer after publishing an event"""
+        self.start()
+        self._wakeup.set()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the consumer thread after the current event"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def process_pending(self, max_events: int = None) -> int:
+        """
+        Process pending events in order until none is runnable
+
+        Args:
+            max_events: Stop after this many events (None = all)
+
+        Returns:
+            Number of events processed
+        """
+        count = 0
+        with self._drain_lock:
+            self._requeue_expired()
+            while max_events is None or count < max_events:
+                event = self.event_repo.claim_next(self.worker_id, self.lease_seconds)
+                if not event:
+                    break
+                self.process_event(event)
+                count += 1
+        return count
+
+    def process_until(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Process events in order until event_id is finished (synchronous mode)
+
+        Args:
+            event_id: Event to wait for
+
+        Returns:
+            Event row, or None if it does not exist
+        """
+        while True:
+            event = self.event_repo.find_by_id(event_id)
+            if event is None or event["status"] in ("done", "failed"):
+                return event
+            if not self.process_pending(max_events=1):
+                # Held by another consumer: wait for it
+                self._stop.wait(0.1)
+
+    def process_event(self, event: Dict[str, Any]) -> bool:
+        """
+        Run the remaining steps of a claimed event
+
+        Args:
+            event: Claimed event (payload and completed_steps decoded)
+
+        Returns:
+            True if the event is done
+        """
+        event_id = event["id"]
+        completed = list(event.get("completed_steps") or [])
+
+        try:
+            steps_for = EVENT_STEPS.get(event["event_type"])
+            if steps_for is None:
+                raise ValueError(f"No steps for event type '{event['event_type']}'")
+
+            for step in steps_for(event):
+                if step in completed:
+                    continue
+                STEP_HANDLERS[step](event, self.db)
+                completed.append(step)
+                if not self.event_repo.set_completed_steps(event_id, self.worker_id, completed):
+                    self.logger.warning(f"⚠️ [ValidationEvents] Lost lease on event {event_id}")
+                    return False
+
+            self.event_repo.mark_done(event_id, self.worker_id)
+            self.processed += 1
+            self.logger.debug(f"✅ [ValidationEvents] Event {event_id} processed")
+            return True
+        except Exception as e:
+            self.logger.error(
+                f"❌ [ValidationEvents] Event {event_id} failed (attempt {event['attempts']}): {e}",
+                exc_info=True,
+            )
+            self.event_repo.mark_failed(event_id, self.worker_id, str(e), self.max_attempts)
+            if event["attempts"] >= self.max_attempts:
+                self.failed += 1
+            else:
+                self.retried += 1
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get outbox status counts and this process's counters"""
+        return {
+            'events': self.event_repo.get_status_counts(),
+            'processed': self.processed,
+            'retried': self.retried,
+            'failed': self.failed,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'poll_interval': self.poll_interval,
+            'max_attempts': self.max_attempts,
+        }
+
+    # ========================================================================
+    # Consumer thread
+    # ========================================================================
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.process_pending()
+            except Exception as e:
+                self.logger.error(f"❌ [ValidationEvents] Consumer error: {e}", exc_info=True)
+            # Poll as fallback: events published by other processes, retries
+            self._wakeup.wait(self.poll_interval)
+
+    def _requeue_expired(self):
+        try:
+            recovered = self.event_repo.requeue_expired_leases(self.max_attempts)
+            if recovered:
+                self.logger.info(f"ℹ️ [ValidationEvents] Requeued {recovered} expired event(s)")
+        except Exception as e:
+            self.logger.error(f"❌ [ValidationEvents] Lease recovery failed: {e}")
+
+
+# Singleton instance
+_pipeline_instance = None
+_pipeline_lock = threading.Lock()
+
+
+def get_validation_pipeline(db_manager=None) -> ValidationEventPipeline:
+    """
+    Get singleton validation event pipeline
+
+    Args:
+        db_manager: DatabaseManager instance (used on first call)
+
+    Returns:
+        ValidationEventPipeline instance
+    """
+    global _pipeline_instance
+
+    if _pipeline_instance is None:
+        with _pipeline_lock:
+            if _pipeline_instance is None:
+                _pipeline_instance = ValidationEventPipeline(db_manager)
+
+    return _pipeline_instance
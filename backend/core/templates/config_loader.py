@@ -5,13 +5,125 @@ Abstracts config loading from JSON files or database.
 Provides backward compatibility during migration.
 """
 import os
+import copy
 import json
 import logging
 import re
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 
+# ============================================================================
+# In-process config cache
+# ============================================================================
+#
+# Loaded configs are cached per template, keyed by the active config row
+# (id, version, revision) plus a local generation counter. A new config
+# version changes the key by itself. Writes that edit a config in place
+# (learned patterns, allow_multiline, base_pattern, locations) bump
+# template_configs.revision through triggers in the same transaction
+# (migration 016), so other processes see them on their next load;
+# invalidate_config_cache() additionally bumps the local generation.
+# The active row last read per template is kept in _config_revisions so
+# derived caches (the compiled pattern registry) follow those writes too.
+
+_config_cache: Dict[int, Tuple[Tuple, Dict[str, Any]]] = {}
+_config_generations: Dict[int, int] = {}
+_config_revisions: Dict[int, Tuple[int, int, int]] = {}  # template_id -> (id, version, revision)
+_global_generation = 0  # bumped by template-less invalidation
+_field_config_templates: Dict[int, int] = {}  # field_config_id -> template_id
+_config_cache_lock = threading.Lock()
+_config_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def is_config_cache_enabled() -> bool:
+    """Check if template config caching is enabled (TEMPLATE_CONFIG_CACHE)"""
+    return os.getenv('TEMPLATE_CONFIG_CACHE', 'true').lower() == 'true'
+
+
+def invalidate_config_cache(template_id: int = None, field_config_id: int = None):
+    """
+    Invalidate cached template configs
+    
+    Args:
+        template_id: Template to invalidate
+        field_config_id: Field config whose template should be invalidated
+        
+    With neither argument (or an unknown field_config_id) every cached
+    template is invalidated.
+    """
+    global _global_generation
+
+    with _config_cache_lock:
+        if template_id is None and field_config_id is not None:
+            # Unknown field (not loaded by this process yet) falls through to all
+            template_id = _field_config_templates.get(field_config_id)
+
+        if template_id is None:
+            _global_generation += 1
+            template_ids = set(_config_cache) | set(_config_generations)
+        else:
+            template_ids = {template_id}
+
+        for tid in template_ids:
+            _config_generations[tid] = _config_generations.get(tid, 0) + 1
+            _config_cache.pop(tid, None)
+        _config_cache_stats['invalidations'] += 1
+
+
+def get_config_generation(template_id: int) -> Tuple:
+    """
+    Get the change counter of a template config
+    
+    Combines the in-process generation with the active config row
+    (id, version, revision) last read from the database, so writes made by
+    other processes change it on this process's next config load. Derived
+    caches (e.g. the compiled pattern registry) store this value and
+    rebuild when it differs.
+    
+    Args:
+        template_id: Template ID
+        
+    Returns:
+        Tuple of (global generation, template generation, active config row
+        key or None if not loaded yet)
+    """
+    with _config_cache_lock:
+        return (
+            _global_generation,
+            _config_generations.get(template_id, 0),
+            _config_revisions.get(template_id),
+        )
+
+
+def register_field_configs(template_id: int, field_config_ids: List[int]):
+    """
+    Remember which template field configs belong to
+    
+    Lets invalidate_config_cache(field_config_id=...) target one template.
+    
+    Args:
+        template_id: Template ID
+        field_config_ids: Field config IDs of the template
+    """
+    with _config_cache_lock:
+        for field_config_id in field_config_ids:
+            _field_config_templates[field_config_id] = template_id
+
+
+def get_config_cache_stats() -> Dict[str, Any]:
+    """Get config cache hit/miss counters"""
+    with _config_cache_lock:
+        lookups = _config_cache_stats['hits'] + _config_cache_stats['misses']
+        return {
+            'enabled': is_config_cache_enabled(),
+            'cached_templates': len(_config_cache),
+            **_config_cache_stats,
+            'hit_rate': (_config_cache_stats['hits'] / lookups) if lookups else 0.0,
+        }
+
+
 class TemplateConfigLoader:
     """
     Loads template configuration from database or JSON (fallback)
@@ -122,7 +234,7 @@ class TemplateConfigLoader:
     
     def _load_from_database(self, template_id: int) -> Optional[Dict[str, Any]]:
         """
-        Load config from database
+        Load config from database (cached per active config version/revision)
         
         Returns:
             Config dict in same format as JSON
@@ -130,15 +242,60 @@ class TemplateConfigLoader:
         if not self.config_repo:
             return None
         
-        # Get active config
+        # Get active config (also the cache version check)
         config_header = self.config_repo.get_active_config(template_id)
         if not config_header:
             return None
         
+        use_cache = is_config_cache_enabled()
+        with _config_cache_lock:
+            generation = (_global_generation, _config_generations.get(template_id, 0))
+            cache_key = (
+                config_header['id'],
+                config_header.get('version', 1),
+                config_header.get('revision', 0),
+                generation,
+            )
+            _config_revisions[template_id] = cache_key[:3]
+            if use_cache:
+                cached = _config_cache.get(template_id)
+                if cached and cached[0] == cache_key:
+                    _config_cache_stats['hits'] += 1
+                    # Callers mutate field configs; never hand out the cached dict
+                    return copy.deepcopy(cached[1])
+                _config_cache_stats['misses'] += 1
+        
+        config = self._build_config(template_id, config_header)
+        
+        if use_cache:
+            with _config_cache_lock:
+                # Skip store if a write invalidated the template while loading
+                if (_global_generation, _config_generations.get(template_id, 0)) == generation:
+                    _config_cache[template_id] = (cache_key, copy.deepcopy(config))
+        
+        return config
+    
+    def _build_config(self, template_id: int, config_header: Dict) -> Dict[str, Any]:
+        """
+        Build config dict from the database with set-based queries
+        
+        Fields, locations and contexts come from one JOIN query and learned
+        patterns of all fields from a second one.
+        
+        Args:
+            template_id: Template ID
+            config_header: Active template_configs row
+            
+        Returns:
+            Config dict in same format as JSON
+        """
         config_id = config_header['id']
         
-        # Get field configs
-        field_configs = self.config_repo.get_field_configs(config_id)
+        rows = self.config_repo.get_field_configs_with_locations(config_id)
+        
+        patterns_by_field: Dict[int, List[Dict]] = {}
+        for lp in self.config_repo.get_learned_patterns_by_config(config_id, active_only=True):
+            patterns_by_field.setdefault(lp['field_config_id'], []).append(lp)
         
         # Build config dict (compatible with JSON format)
         config = {
@@ -148,90 +305,87 @@ class TemplateConfigLoader:
             'fields': {}
         }
         
-        # Convert field configs to JSON format
-        for field_cfg in field_configs:
-            field_name = field_cfg['field_name']
+        field_config_ids = []
+        for row in rows:
+            field_name = row['field_name']
+            field_config = config['fields'].get(field_name)
             
-            # Get locations for this field
-            locations = self.config_repo.get_field_locations(field_cfg['id'])
-            
-            # Get learned patterns
-            learned_patterns = self.config_repo.get_learned_patterns(
-                field_config_id=field_cfg['id'],
-                active_only=True
-            )
-            
-            # Build field config
-            # ✅ NEW: Keep base_pattern as NULL if not set (don't default to r'.+')
-            # This enables pure adaptive learning from feedback
-            base_pattern = field_cfg.get('base_pattern')
-            
-            field_config = {
-                'field_name': field_name,
-                'field_type': field_cfg.get('field_type', 'text'),
-                'template_id': template_id,
-                'regex_pattern': base_pattern,  # Can be NULL
-                'base_pattern': base_pattern,   # Also add as base_pattern for consistency
-                'confidence_threshold': field_cfg.get('confidence_threshold', 0.7),
-                'is_required': field_cfg.get('is_required', False),
-                'allow_multiline': bool(field_cfg.get('allow_multiline')) if field_cfg.get('allow_multiline') is not None else None,
-                'locations': []
-            }
-            
-            # Add locations with full context
-            for loc in locations:
-                location = {
-                    'page': loc.get('page', 0),
-                    'x0': loc['x0'],
-                    'y0': loc['y0'],
-                    'x1': loc['x1'],
-                    'y1': loc['y1']
+            if field_config is None:
+                field_config_ids.append(row['id'])
+                
+                # Build field config
+                # ✅ NEW: Keep base_pattern as NULL if not set (don't default to r'.+')
+                # This enables pure adaptive learning from feedback
+                base_pattern = row.get('base_pattern')
+                
+                field_config = {
+                    'field_name': field_name,
+                    'field_type': row.get('field_type', 'text'),
+                    'template_id': template_id,
+                    'regex_pattern': base_pattern,  # Can be NULL
+                    'base_pattern': base_pattern,   # Also add as base_pattern for consistency
+                    'confidence_threshold': row.get('confidence_threshold', 0.7),
+                    'is_required': row.get('is_required', False),
+                    'allow_multiline': bool(row.get('allow_multiline')) if row.get('allow_multiline') is not None else None,
+                    'locations': []
                 }
                 
-                # Get context from field_contexts table
-                context = self.config_repo.get_field_context(loc['id'])
-                if context:
-                    import json
-                    location['context'] = {
-                        'label': context.get('label', ''),
-                        'label_position': json.loads(context['label_position']) if context.get('label_position') else {},
-                        'words_before': json.loads(context['words_before']) if context.get('words_before') else [],
-                        'words_after': json.loads(context['words_after']) if context.get('words_after') else [],
-                        'next_field_y': context.get('next_field_y')  # ✅ CRITICAL: Load boundary hint!
+                # Add learned patterns (for backward compatibility)
+                learned_patterns = patterns_by_field.get(row['id'], [])
+                if learned_patterns:
+                    field_config['rules'] = {
+                        'learned_patterns': []
                     }
-                elif loc.get('label'):
-                    # Fallback to simple label (backward compatibility)
-                    location['context'] = {'label': loc['label']}
+                    # Sort by priority (highest first)
+                    sorted_patterns = sorted(learned_patterns, key=lambda x: x.get('priority', 0), reverse=True)
+                    
+                    for lp in sorted_patterns:
+                        field_config['rules']['learned_patterns'].append({
+                            'pattern': lp['pattern'],
+                            'type': lp.get('pattern_type', 'learned'),
+                            'description': lp.get('description', ''),
+                            'frequency': lp.get('frequency', 0),
+                            'priority': lp.get('priority', 0),
+                            'pattern_id': lp['id']
+                        })
+                    
+                    # Add the highest priority pattern as the active trained pattern
+                    if sorted_patterns:
+                        field_config['pattern'] = sorted_patterns[0]['pattern']
                 
-                field_config['locations'].append(location)
+                config['fields'][field_name] = field_config
+            
+            if row.get('loc_id') is None:
+                continue
+            
+            # Add location with full context
+            location = {
+                'page': row.get('loc_page', 0),
+                'x0': row['loc_x0'],
+                'y0': row['loc_y0'],
+                'x1': row['loc_x1'],
+                'y1': row['loc_y1']
+            }
             
-            # Add learned patterns (for backward compatibility)
-            if learned_patterns:
-                field_config['rules'] = {
-                    'learned_patterns': []
+            if row.get('ctx_id') is not None:
+                location['context'] = {
+                    'label': row.get('ctx_label', ''),
+                    'label_position': json.loads(row['ctx_label_position']) if row.get('ctx_label_position') else {},
+                    'words_before': json.loads(row['ctx_words_before']) if row.get('ctx_words_before') else [],
+                    'words_after': json.loads(row['ctx_words_after']) if row.get('ctx_words_after') else [],
+                    'next_field_y': row.get('ctx_next_field_y')  # ✅ CRITICAL: Load boundary hint!
                 }
-                # Sort by priority (highest first)
-                sorted_patterns = sorted(learned_patterns, key=lambda x: x.get('priority', 0), reverse=True)
-                
-                for lp in sorted_patterns:
-                    field_config['rules']['learned_patterns'].append({
-                        'pattern': lp['pattern'],
-                        'type': lp.get('pattern_type', 'learned'),
-                        'description': lp.get('description', ''),
-                        'frequency': lp.get('frequency', 0),
-                        'priority': lp.get('priority', 0),
-                        'pattern_id': lp['id']
-                    })
-                
-                # Add the highest priority pattern as the active trained pattern
-                if sorted_patterns:
-                    field_config['pattern'] = sorted_patterns[0]['pattern']
+            elif row.get('loc_label'):
+                # Fallback to simple label (backward compatibility)
+                location['context'] = {'label': row['loc_label']}
             
-            config['fields'][field_name] = field_config
+            field_config['locations'].append(location)
+        
+        register_field_configs(template_id, field_config_ids)
         
         # Add metadata
         config['metadata'] = {
-            'field_count': len(field_configs),
+            'field_count': len(field_config_ids),
             'version': config_header.get('version', 1),
             'created_at': config_header.get('created_at'),
             'source': 'database'
@@ -365,6 +519,7 @@ class TemplateConfigLoader:
                         priority=lp.get('priority', 0)
                     )
             
+            invalidate_config_cache(template_id=template_id)
             self.logger.info(f"✅ Migrated config for template {template_id} to database")
             return config_id
             
@@ -272,9 +272,12 @@ class TemplateService:
         # Delete from database
         self.repository.delete(template_id)
         os.remove(os.path.join(self.upload_folder, template.filename))
-        os.remove(
-            os.path.join(self.model_folder, f"template_{template_id}_model.joblib")
-        )
+        model_path = os.path.join(self.model_folder, f"template_{template_id}_model.joblib")
+        os.remove(model_path)
+        # Online CRF updates saved next to the model (CRF_ONLINE_UPDATES)
+        from core.extraction.model_registry import online_model_path
+        if os.path.exists(online_model_path(model_path)):
+            os.remove(online_model_path(model_path))
         os.remove(
             os.path.join(self.model_folder, f"template_{template_id}_patterns.json")
         )
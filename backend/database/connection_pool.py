@@ -0,0 +1,263 @@
+"""
+SQLite Connection Pool
+
+DatabaseManager.get_connection used to open a new sqlite3 connection and
+re-issue the WAL/synchronous PRAGMAs on every call, and repositories close
+it again after a single query. The pool keeps configured connections per
+thread (and per process) and hands them out again:
+
+- get_connection() returns an idle connection of the calling thread or
+  opens a new one; nested calls get distinct connections
+- conn.close() returns the connection to the pool instead of closing it;
+  an open transaction is rolled back first, exactly like a real close
+- connections inherited through fork() are never reused in the child
+
+Tuning (environment):
+- DB_POOL_ENABLED (default true)
+- DB_POOL_MAX_IDLE: idle connections kept per thread (default 4)
+- DB_MMAP_SIZE: PRAGMA mmap_size in bytes (default: SQLite default)
+- DB_CACHE_SIZE: PRAGMA cache_size (pages, or negative KiB) (default: SQLite default)
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its pool"""
+
+    _pool: Optional["ConnectionPool"] = None
+    _pid: Optional[int] = None
+    _pooled: bool = False
+
+    def close(self):
+        pool = self._pool
+        if pool is None or not pool.release(self):
+            super().close()
+
+    def close_connection(self):
+        """Close the underlying SQLite connection (bypasses the pool)"""
+        self._pool = None
+        super().close()
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of configured SQLite connections for one database file
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        enabled: bool = None,
+        max_idle: int = None,
+        mmap_size: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ):
+        """
+        Initialize connection pool
+
+        Args:
+            db_path: SQLite database path
+            enabled: Reuse connections (default: DB_POOL_ENABLED)
+            max_idle: Idle connections kept per thread (default: DB_POOL_MAX_IDLE)
+            mmap_size: PRAGMA mmap_size (default: DB_MMAP_SIZE, unset = SQLite default)
+            cache_size: PRAGMA cache_size (default: DB_CACHE_SIZE, unset = SQLite default)
+        """
+        self.db_path = db_path
+        self.enabled = enabled if enabled is not None else (
+            os.getenv('DB_POOL_ENABLED', 'true').lower() == 'true'
+        )
+        self.max_idle = max_idle if max_idle is not None else int(
+            os.getenv('DB_POOL_MAX_IDLE', '4')
+        )
+        self.mmap_size = mmap_size if mmap_size is not None else _env_int('DB_MMAP_SIZE')
+        self.cache_size = cache_size if cache_size is not None else _env_int('DB_CACHE_SIZE')
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+        # Bumped by close_all(); idle connections of older generations are dropped
+        self._generation = 0
+
+        # Counters
+        self.created = 0
+        self.reused = 0
+        self.returned = 0
+        self.discarded = 0
+
+    # ========================================================================
+    # Checkout / return
+    # ========================================================================
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Get a configured connection (idle one of this thread, or a new one)
+
+        Returns:
+            sqlite3 connection with Row factory, WAL and tuning PRAGMAs applied
+        """
+        if self.enabled:
+            idle = self._idle()
+            while idle:
+                conn = idle.pop()
+                conn._pooled = False
+                if getattr(conn, '_generation', None) == self._generation:
+                    with self._lock:
+                        self.reused += 1
+                    return conn
+                conn.close_connection()
+
+        return self._create()
+
+    def release(self, conn: PooledConnection) -> bool:
+        """
+        Return a connection to the calling thread's idle list
+
+        Args:
+            conn: Connection obtained from acquire()
+
+        Returns:
+            True if pooled, False if the caller should really close it
+        """
+        if conn._pooled:
+            # Already returned (double close)
+            return True
+        if not self.enabled or conn._pid != os.getpid():
+            return False
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            with self._lock:
+                self.discarded += 1
+            return False
+
+        idle = self._idle()
+        if len(idle) >= self.max_idle or getattr(conn, '_generation', None) != self._generation:
+            with self._lock:
+                self.discarded += 1
+            return False
+
+        conn._pooled = True
+        idle.append(conn)
+        with self._lock:
+            self.returned += 1
+        return True
+
+    def close_all(self):
+        """
+        Close this thread's idle connections and retire all others
+
+        Use before deleting or replacing the database file. Connections that
+        are checked out or idle in other threads are closed when returned.
+        """
+        with self._lock:
+            self._generation += 1
+        idle = self._idle()
+        while idle:
+            idle.pop().close_connection()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool counters"""
+        with self._lock:
+            checkouts = self.created + self.reused
+            return {
+                'enabled': self.enabled,
+                'db_path': self.db_path,
+                'open_connections': len(self._connections),
+                'created': self.created,
+                'reused': self.reused,
+                'returned': self.returned,
+                'discarded': self.discarded,
+                'reuse_rate': round(self.reused / checkouts, 4) if checkouts else 0.0,
+                'max_idle_per_thread': self.max_idle,
+                'mmap_size': self.mmap_size,
+                'cache_size': self.cache_size,
+            }
+
+    # ========================================================================
+    # Internals
+    # ========================================================================
+
+    def _idle(self) -> list:
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, 'pid', None) != pid:
+            # New thread, or forked child: never reuse the parent's connections
+            local.pid = pid
+            local.idle = []
+        return local.idle
+
+    def _create(self) -> PooledConnection:
+        # Configure SQLite for better concurrency:
+        # - timeout: wait for a while if the database is locked
+        # - check_same_thread=False: allow usage from different threads
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.row_factory = sqlite3.Row
+
+        # Use WAL mode to improve concurrent reads while a writer is active.
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            if self.mmap_size is not None:
+                conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)};")
+            if self.cache_size is not None:
+                conn.execute(f"PRAGMA cache_size={int(self.cache_size)};")
+        except Exception:
+            # PRAGMA failures should not break normal operation
+            pass
+
+        conn._pid = os.getpid()
+        conn._generation = self._generation
+        if self.enabled:
+            conn._pool = self
+
+        with self._lock:
+            self.created += 1
+            self._connections.add(conn)
+        return conn
+
+
+# Pools per database file (shared by all DatabaseManager instances)
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str) -> ConnectionPool:
+    """
+    Get the process-wide pool of a database file
+
+    Args:
+        db_path: Absolute SQLite database path
+
+    Returns:
+        ConnectionPool instance
+    """
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = ConnectionPool(db_path)
+                _pools[db_path] = pool
+    return pool
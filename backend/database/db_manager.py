@@ -5,8 +5,11 @@ Handles metadata storage for templates, documents, and feedback
 
 import sqlite3
 import os
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+
+from .connection_pool import get_connection_pool
 
 
 class DatabaseManager:
@@ -29,6 +32,7 @@ class DatabaseManager:
 
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.pool = get_connection_pool(db_path)
 
         # Run migrations only once per process to avoid contention and
         # expensive DDL on every DatabaseManager() construction.
@@ -37,26 +41,62 @@ class DatabaseManager:
             DatabaseManager._migrations_applied = True
 
     def get_connection(self):
-        """Create and return a database connection"""
-        # Configure SQLite for better concurrency:
-        # - timeout: wait for a while if the database is locked
-        # - check_same_thread=False: allow usage from different threads
-        conn = sqlite3.connect(
-            self.db_path,
-            timeout=30,
-            check_same_thread=False,
-        )
-        conn.row_factory = sqlite3.Row
+        """
+        Return a configured database connection from the pool
+
+        conn.close() hands the connection back to the pool (rolling back any
+        uncommitted transaction) instead of closing it.
+        """
+        return self.pool.acquire()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a pooled connection for the duration of a with-block
 
-        # Use WAL mode to improve concurrent reads while a writer is active.
+        Usage:
+            with db.connection() as conn:
+                rows = conn.execute(...).fetchall()
+        """
+        conn = self.get_connection()
         try:
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Run a with-block in one transaction (commit on success, rollback on error)
+
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE), avoiding
+                lock upgrades failing midway for read-then-write blocks
+
+        Usage:
+            with db.transaction() as conn:
+                conn.execute("UPDATE ...")
+                conn.execute("INSERT ...")
+        """
+        conn = self.get_connection()
+        try:
+            if immediate:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
         except Exception:
-            # PRAGMA failures should not break normal operation
-            pass
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
-        return conn
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        return self.pool.get_stats()
+
+    def close_pool(self):
+        """Close pooled connections (call before deleting the database file)"""
+        self.pool.close_all()
 
     def init_database(self):
         """Initialize database schema and run migrations"""
@@ -127,22 +167,19 @@ class DatabaseManager:
 
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict]:
         """Execute a SELECT query and return results"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """Execute an INSERT/UPDATE/DELETE query and return affected rows"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        affected = cursor.rowcount
-        lastrowid = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            affected = cursor.rowcount
+            lastrowid = cursor.lastrowid
         return lastrowid if "INSERT" in query.upper() else affected
 
     def get_page_of_data_filtered(
@@ -0,0 +1,11 @@
+-- 013_job_leases.sql
+-- Priorities and heartbeat leases for the multi-worker job runner
+
+ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN locked_by TEXT;              -- worker id (host:pid) holding the lease
+ALTER TABLE jobs ADD COLUMN lease_expires_at TIMESTAMP;  -- renewed by worker heartbeats
+ALTER TABLE jobs ADD COLUMN started_at TIMESTAMP;
+
+-- Claim order: highest priority first, then oldest
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority DESC, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires_at);
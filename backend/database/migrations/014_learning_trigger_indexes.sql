@@ -0,0 +1,11 @@
+-- 014_learning_trigger_indexes.sql
+-- Indexes for the grouped pattern learning trigger check
+-- (AutoPatternLearner.get_pending_document_counts)
+
+-- Validated documents of a template created after a cutoff
+CREATE INDEX IF NOT EXISTS idx_documents_template_status_created
+ON documents(template_id, status, created_at);
+
+-- Last completed learning run per field
+CREATE INDEX IF NOT EXISTS idx_pattern_jobs_field_completed
+ON pattern_learning_jobs(template_id, status, field_name, completed_at);
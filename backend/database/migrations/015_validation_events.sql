@@ -0,0 +1,26 @@
+-- 015_validation_events.sql
+-- Outbox of validation events, written in the validate transaction and
+-- processed off the request path (core.learning.validation_pipeline)
+
+CREATE TABLE IF NOT EXISTS validation_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,      -- processing order
+    event_type TEXT NOT NULL,                  -- document_validated
+    document_id INTEGER NOT NULL,
+    template_id INTEGER NOT NULL,
+    dedupe_key TEXT NOT NULL UNIQUE,           -- identical re-submissions publish once
+    payload TEXT NOT NULL,                     -- JSON
+    status TEXT NOT NULL DEFAULT 'pending',    -- pending, processing, done, failed
+    completed_steps TEXT NOT NULL DEFAULT '[]',-- JSON list; finished steps are skipped on retry
+    attempts INTEGER NOT NULL DEFAULT 0,
+    locked_by TEXT,
+    lease_expires_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP,
+    created_by INTEGER,
+    FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
+);
+
+-- Claim order: oldest pending event of a template without a running event
+CREATE INDEX IF NOT EXISTS idx_validation_events_claim ON validation_events(status, template_id, id);
+CREATE INDEX IF NOT EXISTS idx_validation_events_lease ON validation_events(status, lease_expires_at);
@@ -0,0 +1,112 @@
+-- 016_config_revision.sql
+-- Change counter for in-place template config edits
+--
+-- TemplateConfigLoader caches configs per (config id, version, revision).
+-- Learned patterns, allow_multiline, locations and contexts are edited in
+-- place without a new version; these triggers bump template_configs.revision
+-- in the same transaction, so every process (API workers, job worker)
+-- reloads the config on its next extraction.
+-- Pattern usage statistics (usage_count, match_rate, ...) are not part of
+-- the config and do not bump the revision.
+
+ALTER TABLE template_configs ADD COLUMN revision INTEGER NOT NULL DEFAULT 0;
+
+-- Field configs
+CREATE TRIGGER IF NOT EXISTS trg_field_configs_revision_insert
+AFTER INSERT ON field_configs
+BEGIN
+    UPDATE template_configs SET revision = revision + 1 WHERE id = NEW.config_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_field_configs_revision_update
+AFTER UPDATE OF field_name, field_type, base_pattern, confidence_threshold,
+                is_required, allow_multiline ON field_configs
+BEGIN
+    UPDATE template_configs SET revision = revision + 1 WHERE id = NEW.config_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_field_configs_revision_delete
+AFTER DELETE ON field_configs
+BEGIN
+    UPDATE template_configs SET revision = revision + 1 WHERE id = OLD.config_id;
+END;
+
+-- Field locations
+CREATE TRIGGER IF NOT EXISTS trg_field_locations_revision_insert
+AFTER INSERT ON field_locations
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (SELECT config_id FROM field_configs WHERE id = NEW.field_config_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_field_locations_revision_update
+AFTER UPDATE ON field_locations
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (SELECT config_id FROM field_configs WHERE id = NEW.field_config_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_field_locations_revision_delete
+AFTER DELETE ON field_locations
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (SELECT config_id FROM field_configs WHERE id = OLD.field_config_id);
+END;
+
+-- Field contexts (typical_length is not loaded into the config)
+CREATE TRIGGER IF NOT EXISTS trg_field_contexts_revision_insert
+AFTER INSERT ON field_contexts
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (
+        SELECT fc.config_id FROM field_locations fl
+        JOIN field_configs fc ON fc.id = fl.field_config_id
+        WHERE fl.id = NEW.field_location_id
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_field_contexts_revision_update
+AFTER UPDATE OF label, label_position, words_before, words_after, next_field_y
+ON field_contexts
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (
+        SELECT fc.config_id FROM field_locations fl
+        JOIN field_configs fc ON fc.id = fl.field_config_id
+        WHERE fl.id = NEW.field_location_id
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_field_contexts_revision_delete
+AFTER DELETE ON field_contexts
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (
+        SELECT fc.config_id FROM field_locations fl
+        JOIN field_configs fc ON fc.id = fl.field_config_id
+        WHERE fl.id = OLD.field_location_id
+    );
+END;
+
+-- Learned patterns
+CREATE TRIGGER IF NOT EXISTS trg_learned_patterns_revision_insert
+AFTER INSERT ON learned_patterns
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (SELECT config_id FROM field_configs WHERE id = NEW.field_config_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_learned_patterns_revision_update
+AFTER UPDATE OF field_config_id, pattern, pattern_type, description, frequency,
+                priority, is_active ON learned_patterns
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (SELECT config_id FROM field_configs WHERE id = NEW.field_config_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_learned_patterns_revision_delete
+AFTER DELETE ON learned_patterns
+BEGIN
+    UPDATE template_configs SET revision = revision + 1
+    WHERE id = (SELECT config_id FROM field_configs WHERE id = OLD.field_config_id);
+END;
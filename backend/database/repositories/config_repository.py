@@ -9,6 +9,8 @@ from datetime import datetime
 import json
 import logging
 
+from database.write_queue import run_write
+
 
 class ConfigRepository:
     """Repository for template configuration data"""
@@ -35,6 +37,15 @@ class ConfigRepository:
         if isinstance(actor, int):
             return actor
         return None
+
+    def _invalidate_config_cache(self, template_id: int = None, field_config_id: int = None):
+        """Drop cached template configs affected by a write (see TemplateConfigLoader)"""
+        try:
+            from core.templates.config_loader import invalidate_config_cache
+
+            invalidate_config_cache(template_id=template_id, field_config_id=field_config_id)
+        except Exception as e:
+            self.logger.warning(f"Failed to invalidate config cache: {e}")
     
     # ========================================================================
     # Template Config Operations
@@ -98,6 +109,7 @@ class ConfigRepository:
             )
             
             conn.commit()
+            self._invalidate_config_cache(template_id=template_id)
             return config_id
             
         finally:
@@ -240,6 +252,57 @@ class ConfigRepository:
         finally:
             conn.close()
     
+    def get_field_configs_with_locations(self, config_id: int) -> List[Dict]:
+        """
+        Get field configs joined with their locations and latest context
+        
+        One row per (field, location); fields without locations appear once
+        with NULL location columns. Replaces get_field_configs +
+        get_field_locations + get_field_context per field/location.
+        
+        Args:
+            config_id: Template config ID
+            
+        Returns:
+            List of row dicts (field columns, loc_* and ctx_* columns)
+        """
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT
+                    fc.*,
+                    fl.id AS loc_id,
+                    fl.page AS loc_page,
+                    fl.x0 AS loc_x0,
+                    fl.y0 AS loc_y0,
+                    fl.x1 AS loc_x1,
+                    fl.y1 AS loc_y1,
+                    fl.label AS loc_label,
+                    fctx.id AS ctx_id,
+                    fctx.label AS ctx_label,
+                    fctx.label_position AS ctx_label_position,
+                    fctx.words_before AS ctx_words_before,
+                    fctx.words_after AS ctx_words_after,
+                    fctx.next_field_y AS ctx_next_field_y
+                FROM field_configs fc
+                LEFT JOIN field_locations fl ON fl.field_config_id = fc.id
+                LEFT JOIN field_contexts fctx ON fctx.id = (
+                    SELECT MAX(id)
+                    FROM field_contexts
+                    WHERE field_location_id = fl.id
+                )
+                WHERE fc.config_id = ?
+                ORDER BY fc.extraction_order, fc.field_name, fl.location_index, fl.page
+            """, (config_id,))
+            
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+            
+        finally:
+            conn.close()
+    
     def get_field_config_by_name(
         self,
         config_id: int,
@@ -329,6 +392,7 @@ class ConfigRepository:
             self.logger.debug(f"Updating field_config_id={field_config_id}: {updates}, params={params}")
             cursor.execute(query, params)
             conn.commit()
+            self._invalidate_config_cache(field_config_id=field_config_id)
             
             return cursor.rowcount > 0
             
@@ -537,6 +601,7 @@ class ConfigRepository:
                 )
 
                 conn.commit()
+                self._invalidate_config_cache(field_config_id=field_config_id)
                 return existing_id
 
             cursor.execute(
@@ -563,6 +628,7 @@ class ConfigRepository:
             )
             pattern_id = cursor.lastrowid
             conn.commit()
+            self._invalidate_config_cache(field_config_id=field_config_id)
             return pattern_id
         finally:
             conn.close()
@@ -816,6 +882,44 @@ class ConfigRepository:
 
         return self.db.execute_query(query, tuple(params))
     
+    def get_learned_patterns_by_config(
+        self,
+        config_id: int,
+        active_only: bool = True,
+    ) -> List[Dict]:
+        """
+        Get learned patterns of all fields of a config in one query
+        
+        Args:
+            config_id: Template config ID
+            active_only: Only return active patterns
+            
+        Returns:
+            List of pattern dicts (ordered by priority, frequency)
+        """
+        query = """
+            SELECT
+                lp.id,
+                lp.field_config_id,
+                fc.field_name,
+                lp.pattern_type,
+                lp.pattern,
+                lp.description,
+                lp.frequency,
+                lp.priority,
+                lp.is_active
+            FROM learned_patterns lp
+            JOIN field_configs fc ON fc.id = lp.field_config_id
+            WHERE fc.config_id = ?
+        """
+
+        if active_only:
+            query += " AND lp.is_active = 1"
+
+        query += " ORDER BY lp.priority DESC, lp.frequency DESC"
+
+        return self.db.execute_query(query, (config_id,))
+    
     def get_learned_patterns_by_field(
         self,
         template_id: int,
@@ -1061,12 +1165,10 @@ class ConfigRepository:
             pattern_id: Pattern ID
             matched: True if pattern successfully matched
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
         actor = self._normalize_actor(self._current_user_id())
         
-        try:
+        def _apply(conn):
+            cursor = conn.cursor()
             if matched:
                 # ✅ Pattern matched successfully
                 cursor.execute("""
@@ -1097,11 +1199,60 @@ class ConfigRepository:
                         END
                     WHERE id = ?
                 """, (actor, pattern_id,))
+        
+        run_write(self.db, _apply)
+    
+    def apply_pattern_usage_deltas(self, deltas: List[Dict[str, Any]]) -> int:
+        """
+        Apply aggregated pattern usage counters in one transaction
+        
+        Batched equivalent of update_pattern_usage: each delta carries the
+        number of attempts and successes of one pattern since the last
+        flush. match_rate is recomputed from the new totals; confidence_boost
+        follows the same thresholds (a batch of one attempt gives exactly
+        the per-call result).
+        
+        Args:
+            deltas: List of {'pattern_id', 'uses', 'successes', 'actor'} dicts
             
-            conn.commit()
-            
-        finally:
-            conn.close()
+        Returns:
+            Number of patterns updated
+        """
+        if not deltas:
+            return 0
+        
+        def _apply(conn):
+            cursor = conn.cursor()
+            cursor.executemany("""
+                UPDATE learned_patterns
+                SET usage_count = COALESCE(usage_count, 0) + :uses,
+                    success_count = COALESCE(success_count, 0) + :successes,
+                    match_rate = CAST(COALESCE(success_count, 0) + :successes AS REAL) / (COALESCE(usage_count, 0) + :uses),
+                    last_used_at = CURRENT_TIMESTAMP,
+                    updated_by = :actor,
+                    confidence_boost = CASE
+                        WHEN :uses > :successes
+                             AND CAST(COALESCE(success_count, 0) + :successes AS REAL) / (COALESCE(usage_count, 0) + :uses) < 0.3 THEN -0.1
+                        WHEN :successes > 0 THEN CASE
+                            WHEN CAST(COALESCE(success_count, 0) + :successes AS REAL) / (COALESCE(usage_count, 0) + :uses) >= 0.9 THEN 0.2
+                            WHEN CAST(COALESCE(success_count, 0) + :successes AS REAL) / (COALESCE(usage_count, 0) + :uses) >= 0.7 THEN 0.1
+                            ELSE 0.0
+                        END
+                        ELSE COALESCE(confidence_boost, 0.0)
+                    END
+                WHERE id = :pattern_id
+            """, [
+                {
+                    'pattern_id': d['pattern_id'],
+                    'uses': d['uses'],
+                    'successes': d['successes'],
+                    'actor': self._normalize_actor(d.get('actor')),
+                }
+                for d in deltas
+            ])
+            return cursor.rowcount
+        
+        return run_write(self.db, _apply)
     
     def deactivate_low_performing_patterns(
         self,
@@ -1135,6 +1286,8 @@ class ConfigRepository:
             
             deactivated = cursor.rowcount
             conn.commit()
+            if deactivated:
+                self._invalidate_config_cache(field_config_id=field_config_id)
             
             self.logger.info(f"🗑️  Deactivated {deactivated} low-performing patterns")
             
@@ -1245,6 +1398,8 @@ class ConfigRepository:
                 )
             
             conn.commit()
+            if merged_count:
+                self._invalidate_config_cache(field_config_id=field_config_id)
             
             return {
                 'success': True,
@@ -3,6 +3,7 @@ from datetime import datetime
 from core.extraction.models import Document
 import math
 from database.db_manager import DatabaseManager
+from database.write_queue import run_write
 import json
 from datetime import datetime
 
@@ -304,23 +305,20 @@ class DocumentRepository:
         status: str,
         extraction_time_ms: int = 0,
     ):
-        """Update document extraction result"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
+        """Update document extraction result (via the writer thread when enabled)"""
         user_id = self._current_user_id()
 
-        cursor.execute(
-            """
-            UPDATE documents
-            SET extraction_result = ?, status = ?, extraction_time_ms = ?, updated_at = CURRENT_TIMESTAMP, updated_by = ?
-            WHERE id = ?
-        """,
-            (extraction_result, status, extraction_time_ms, user_id, document_id),
-        )
+        def _apply(conn):
+            conn.execute(
+                """
+                UPDATE documents
+                SET extraction_result = ?, status = ?, extraction_time_ms = ?, updated_at = CURRENT_TIMESTAMP, updated_by = ?
+                WHERE id = ?
+            """,
+                (extraction_result, status, extraction_time_ms, user_id, document_id),
+            )
 
-        conn.commit()
-        conn.close()
+        run_write(self.db, _apply)
 
     def update_status(self, document_id: int, status: str):
         """Update document status"""
@@ -345,6 +343,31 @@ class DocumentRepository:
         finally:
             conn.close()
 
+    def mark_validated(self, document_id: int, extraction_result: dict, conn=None):
+        """
+        Store validation metadata and set status 'validated' in one write
+
+        Args:
+            document_id: Document ID
+            extraction_result: Extraction result with validation metadata
+            conn: Connection of an enclosing transaction (optional)
+        """
+        user_id = self._current_user_id()
+
+        def _apply(conn):
+            conn.execute(
+                """
+                UPDATE documents
+                SET extraction_result = ?, status = 'validated', validated_at = ?, updated_by = ?
+                WHERE id = ?
+                """,
+                (json.dumps(extraction_result), datetime.now(), user_id, document_id),
+            )
+
+        if conn is not None:
+            return _apply(conn)
+        return run_write(self.db, _apply)
+
     def update_extraction_result(self, document_id: int, extraction_result: dict):
         """Update extraction_result with corrected values"""
         conn = self.db.get_connection()
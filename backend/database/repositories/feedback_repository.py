@@ -1,5 +1,6 @@
 from typing import Dict, List
 from database.db_manager import DatabaseManager
+from database.write_queue import run_write
 
 
 class FeedbackRepository:
@@ -41,6 +42,7 @@ class FeedbackRepository:
         original_data: Dict,
         confidence_scores: Dict,
         feedback_path: str,
+        conn=None,
     ) -> List[int]:
         """
         Upsert feedback records (one per field)
@@ -52,83 +54,83 @@ class FeedbackRepository:
             original_data: Dictionary of {field_name: original_value}
             confidence_scores: Dictionary of {field_name: confidence}
             feedback_path: Path to feedback JSON file
+            conn: Connection of an enclosing transaction (optional)
 
         Returns:
             List of feedback IDs
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
         user_id = self._current_user_id()
-        is_admin = self._is_admin()
-
-        feedback_ids = []
 
-        for field_name, corrected_value in corrections.items():
-            original_value = original_data.get(field_name, "")
-            confidence = confidence_scores.get(field_name, 0.0)
+        def _apply(conn):
+            cursor = conn.cursor()
+            feedback_ids = []
 
-            # Check if feedback already exists for this document+field
-            cursor.execute(
-                """
-                SELECT id FROM feedback
-                WHERE document_id = ? AND field_name = ?
-            """,
-                (document_id, field_name),
-            )
-
-            existing = cursor.fetchone()
+            for field_name, corrected_value in corrections.items():
+                original_value = original_data.get(field_name, "")
+                confidence = confidence_scores.get(field_name, 0.0)
 
-            if existing:
-                # UPDATE existing feedback
+                # Check if feedback already exists for this document+field
                 cursor.execute(
                     """
-                    UPDATE feedback
-                    SET original_value = ?,
-                        corrected_value = ?,
-                        confidence_score = ?,
-                        updated_at = CURRENT_TIMESTAMP,
-                        updated_by = ?,
-                        used_for_training = 0
-                    WHERE id = ?
+                    SELECT id FROM feedback
+                    WHERE document_id = ? AND field_name = ?
                 """,
-                    (original_value, corrected_value, confidence, user_id, existing["id"]),
+                    (document_id, field_name),
                 )
 
-                feedback_ids.append(existing["id"])
-            else:
-                # INSERT new feedback
-                cursor.execute(
-                    """
-                    INSERT INTO feedback (
-                        document_id, 
-                        field_name, 
-                        original_value, 
-                        corrected_value, 
-                        confidence_score,
-                        created_by,
-                        updated_by,
-                        used_for_training
+                existing = cursor.fetchone()
+
+                if existing:
+                    # UPDATE existing feedback
+                    cursor.execute(
+                        """
+                        UPDATE feedback
+                        SET original_value = ?,
+                            corrected_value = ?,
+                            confidence_score = ?,
+                            updated_at = CURRENT_TIMESTAMP,
+                            updated_by = ?,
+                            used_for_training = 0
+                        WHERE id = ?
+                    """,
+                        (original_value, corrected_value, confidence, user_id, existing["id"]),
                     )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                """,
-                    (
-                        document_id,
-                        field_name,
-                        original_value,
-                        corrected_value,
-                        confidence,
-                        user_id,
-                        user_id,
-                    ),
-                )
 
-                feedback_ids.append(cursor.lastrowid)
+                    feedback_ids.append(existing["id"])
+                else:
+                    # INSERT new feedback
+                    cursor.execute(
+                        """
+                        INSERT INTO feedback (
+                            document_id, 
+                            field_name, 
+                            original_value, 
+                            corrected_value, 
+                            confidence_score,
+                            created_by,
+                            updated_by,
+                            used_for_training
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                    """,
+                        (
+                            document_id,
+                            field_name,
+                            original_value,
+                            corrected_value,
+                            confidence,
+                            user_id,
+                            user_id,
+                        ),
+                    )
 
-        conn.commit()
-        conn.close()
+                    feedback_ids.append(cursor.lastrowid)
+
+            return feedback_ids
 
-        return feedback_ids
+        if conn is not None:
+            return _apply(conn)
+        return run_write(self.db, _apply)
 
     def find_for_training(
         self, template_id: int, unused_only: bool = True
@@ -1,9 +1,42 @@
 from typing import Optional, Dict, Any, List
 import json
+import os
+import sqlite3
 
 from database.db_manager import DatabaseManager
 
 
+# Claim priority per job kind (higher runs first). Override with
+# JOB_PRIORITIES="manual_training=20,auto_training=10".
+DEFAULT_JOB_PRIORITIES = {
+    "manual_training": 20,
+    "auto_training": 10,
+}
+
+
+def get_job_priority(kind: str) -> int:
+    """Get claim priority of a job kind (DEFAULT_JOB_PRIORITIES + JOB_PRIORITIES env)"""
+    priorities = dict(DEFAULT_JOB_PRIORITIES)
+    for item in os.getenv("JOB_PRIORITIES", "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            try:
+                priorities[name.strip()] = int(value)
+            except ValueError:
+                pass
+    return priorities.get(kind, 0)
+
+
+def _notify_workers():
+    """Wake idle job workers (best effort)"""
+    try:
+        from core.jobs.wakeup import get_job_wakeup
+
+        get_job_wakeup().notify()
+    except Exception:
+        pass
+
+
 class JobRepository:
     """Simple job queue repository for background tasks (e.g. auto_training)."""
 
@@ -33,14 +66,15 @@ class JobRepository:
 
         cursor.execute(
             """
-            INSERT INTO jobs (type, template_id, payload, status, created_by, updated_by)
-            VALUES (?, ?, ?, 'pending', ?, ?)
+            INSERT INTO jobs (type, template_id, payload, status, priority, created_by, updated_by)
+            VALUES (?, ?, ?, 'pending', ?, ?, ?)
             """,
-            ("auto_training", template_id, payload, user_id, user_id),
+            ("auto_training", template_id, payload, get_job_priority("auto_training"), user_id, user_id),
         )
         job_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        _notify_workers()
         return job_id
     
     def enqueue_manual_training_job(
@@ -77,14 +111,15 @@ class JobRepository:
 
         cursor.execute(
             """
-            INSERT INTO jobs (type, template_id, payload, status, created_by, updated_by)
-            VALUES (?, ?, ?, 'pending', ?, ?)
+            INSERT INTO jobs (type, template_id, payload, status, priority, created_by, updated_by)
+            VALUES (?, ?, ?, 'pending', ?, ?, ?)
             """,
-            ("auto_training", template_id, payload, user_id, user_id),
+            ("auto_training", template_id, payload, get_job_priority("manual_training"), user_id, user_id),
         )
         job_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        _notify_workers()
         return job_id
 
     def has_active_auto_training_job(self, template_id: int) -> bool:
@@ -105,111 +140,249 @@ class JobRepository:
         conn.close()
         return count > 0
 
-    def fetch_next_pending_auto_training(self) -> Optional[Dict[str, Any]]:
-        """Fetch next pending auto_training job (for worker)."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, type, template_id, payload, status, attempts
-            FROM jobs
-            WHERE type = 'auto_training' AND status = 'pending'
-            ORDER BY created_at ASC
+    # ========================================================================
+    # Multi-worker claiming and leases (see core.jobs.runner)
+    # ========================================================================
+
+    def claim_next_job(
+        self,
+        worker_id: str,
+        lease_seconds: int,
+        job_types: Optional[List[str]] = None,
+        max_per_template: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically claim the next runnable pending job.
+
+        Picks the highest priority, oldest pending job whose template has fewer
+        than max_per_template running jobs, and marks it running with a lease in
+        a single guarded UPDATE, so concurrent workers never claim the same job.
+
+        Args:
+            worker_id: Claiming worker id (stored in locked_by)
+            lease_seconds: Lease duration; renewed by heartbeat()
+            job_types: Job types this worker handles (None = all)
+            max_per_template: Running jobs allowed per template (0 = unlimited)
+
+        Returns:
+            Claimed job dict, or None if nothing is runnable.
+        """
+        type_filter = ""
+        params: List[Any] = []
+        if job_types:
+            type_filter = f"AND j.type IN ({', '.join('?' for _ in job_types)})"
+            params.extend(job_types)
+
+        candidate_sql = f"""
+            SELECT j.id FROM jobs j
+            WHERE j.status = 'pending'
+              {type_filter}
+              AND (
+                  ? <= 0 OR j.template_id IS NULL
+                  OR (SELECT COUNT(1) FROM jobs r
+                      WHERE r.template_id = j.template_id AND r.status = 'running') < ?
+              )
+            ORDER BY j.priority DESC, j.created_at ASC, j.id ASC
             LIMIT 1
-            """,
-        )
-        row = cursor.fetchone()
-        conn.close()
-        if not row:
-            return None
-        return dict(row)
+        """
+        params.extend([max_per_template, max_per_template])
 
-    def reset_stale_running_jobs(self, max_age_minutes: int = 30) -> int:
-        """Mark running jobs as failed if they have not been updated recently.
+        claim_sql = """
+            UPDATE jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                locked_by = ?,
+                started_at = CURRENT_TIMESTAMP,
+                lease_expires_at = datetime('now', ?),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ({candidate}) AND status = 'pending'
+        """
+        lease = f"+{int(lease_seconds)} seconds"
+
+        conn = self.db.get_connection()
+        try:
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                row = conn.execute(
+                    claim_sql.format(candidate=candidate_sql)
+                    + " RETURNING id, type, template_id, payload, status, attempts, priority",
+                    [worker_id, lease, *params],
+                ).fetchone()
+                conn.commit()
+            else:
+                # No RETURNING: same guarded UPDATE inside one write transaction
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.execute(
+                    claim_sql.format(candidate=candidate_sql), [worker_id, lease, *params]
+                )
+                row = None
+                if cursor.rowcount:
+                    row = conn.execute(
+                        """
+                        SELECT id, type, template_id, payload, status, attempts, priority
+                        FROM jobs
+                        WHERE status = 'running' AND locked_by = ?
+                        ORDER BY started_at DESC, id DESC
+                        LIMIT 1
+                        """,
+                        (worker_id,),
+                    ).fetchone()
+                conn.commit()
+        finally:
+            conn.close()
+
+        return dict(row) if row else None
 
-        This prevents jobs from getting stuck in 'running' forever if the worker
-        crashes or restarts mid-job.
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        """Extend the lease of a running job.
 
         Returns:
-            Number of jobs updated.
+            False if the worker no longer holds the job (lease expired and the
+            job was requeued or claimed by another worker).
         """
         conn = self.db.get_connection()
-        cursor = conn.cursor()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE jobs
+                SET lease_expires_at = datetime('now', ?), updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND locked_by = ? AND status = 'running'
+                """,
+                (f"+{int(lease_seconds)} seconds", job_id, worker_id),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
 
-        cursor.execute(
-            """
-            UPDATE jobs
-            SET status = 'failed',
-                last_error = COALESCE(last_error, 'stale running job reset by worker'),
-                updated_at = CURRENT_TIMESTAMP,
-                updated_by = ?
-            WHERE status = 'running'
-              AND updated_at IS NOT NULL
-              AND updated_at < datetime('now', ?)
-            """,
-            (self._current_user_id(), f'-{int(max_age_minutes)} minutes'),
-        )
+    def requeue_expired_leases(self, max_attempts: int = 3) -> Dict[str, int]:
+        """Recover running jobs whose worker stopped heartbeating.
 
-        updated = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return updated
+        Jobs with attempts left go back to pending; the others are failed and
+        copied to failed_jobs. Running jobs from workers without leases are
+        treated as expired 30 minutes after their last update.
+
+        Returns:
+            {'requeued': n, 'failed': m}
+        """
+        expired = """
+            status = 'running'
+            AND COALESCE(lease_expires_at, datetime(updated_at, '+30 minutes')) < datetime('now')
+        """
+        error = "lease expired (worker stopped heartbeating)"
 
-    def mark_running(self, job_id: int):
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        user_id = self._current_user_id()
-        cursor.execute(
-            """
-            UPDATE jobs
-            SET status = 'running', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP, updated_by = ?
-            WHERE id = ?
-            """,
-            (user_id, job_id),
-        )
-        conn.commit()
-        conn.close()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                f"""
+                INSERT INTO failed_jobs (job_id, type, template_id, payload, error)
+                SELECT id, type, template_id, payload, ?
+                FROM jobs WHERE {expired} AND attempts >= ?
+                """,
+                (error, max_attempts),
+            )
+            failed = conn.execute(
+                f"""
+                UPDATE jobs
+                SET status = 'failed', last_error = ?, locked_by = NULL,
+                    lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE {expired} AND attempts >= ?
+                """,
+                (error, max_attempts),
+            ).rowcount
+            requeued = conn.execute(
+                f"""
+                UPDATE jobs
+                SET status = 'pending', last_error = ?, locked_by = NULL,
+                    lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE {expired}
+                """,
+                (error,),
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+
+        if requeued:
+            _notify_workers()
+        return {"requeued": requeued, "failed": failed}
+
+    def release_job(self, job_id: int, worker_id: str) -> bool:
+        """Put a claimed job back to pending (e.g. worker shutting down)."""
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'pending', locked_by = NULL, lease_expires_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND locked_by = ? AND status = 'running'
+                """,
+                (job_id, worker_id),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        if cursor.rowcount:
+            _notify_workers()
+        return cursor.rowcount > 0
 
-    def mark_completed(self, job_id: int):
+    def mark_completed(self, job_id: int, worker_id: Optional[str] = None) -> bool:
+        """Mark a job completed (only if still held by worker_id, when given)."""
         conn = self.db.get_connection()
         cursor = conn.cursor()
         user_id = self._current_user_id()
+        owner_filter, owner_params = self._owner_filter(worker_id)
         cursor.execute(
-            """
+            f"""
             UPDATE jobs
-            SET status = 'completed', updated_at = CURRENT_TIMESTAMP, updated_by = ?
-            WHERE id = ?
+            SET status = 'completed', locked_by = NULL, lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP, updated_by = ?
+            WHERE id = ? {owner_filter}
             """,
-            (user_id, job_id),
+            (user_id, job_id, *owner_params),
         )
+        updated = cursor.rowcount
         conn.commit()
         conn.close()
+        return updated > 0
 
-    def mark_failed(self, job_id: int, error: str):
+    def mark_failed(self, job_id: int, error: str, worker_id: Optional[str] = None) -> bool:
+        """Mark a job failed and copy it to failed_jobs (only if still held by worker_id, when given)."""
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
         user_id = self._current_user_id()
+        owner_filter, owner_params = self._owner_filter(worker_id)
 
         # Copy to failed_jobs
         cursor.execute(
-            """
+            f"""
             INSERT INTO failed_jobs (job_id, type, template_id, payload, error, created_by, updated_by)
             SELECT id, type, template_id, payload, ?, ?, ?
-            FROM jobs WHERE id = ?
+            FROM jobs WHERE id = ? {owner_filter}
             """,
-            (error, user_id, user_id, job_id),
+            (error, user_id, user_id, job_id, *owner_params),
         )
 
         # Update job status
         cursor.execute(
-            """
+            f"""
             UPDATE jobs
-            SET status = 'failed', last_error = ?, updated_at = CURRENT_TIMESTAMP, updated_by = ?
-            WHERE id = ?
+            SET status = 'failed', last_error = ?, locked_by = NULL, lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP, updated_by = ?
+            WHERE id = ? {owner_filter}
             """,
-            (error, user_id, job_id),
+            (error, user_id, job_id, *owner_params),
         )
+        updated = cursor.rowcount
 
         conn.commit()
         conn.close()
+        return updated > 0
+
+    @staticmethod
+    def _owner_filter(worker_id: Optional[str]):
+        if worker_id is None:
+            return "", ()
+        return "AND locked_by = ? AND status = 'running'", (worker_id,)
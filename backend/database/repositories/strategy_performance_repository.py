@@ -7,6 +7,8 @@ Handles database operations for strategy performance tracking.
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from database.write_queue import run_write
+
 
 class StrategyPerformanceRepository:
     """Repository for strategy performance data"""
@@ -27,6 +29,15 @@ class StrategyPerformanceRepository:
             return getattr(g, 'user_id', None)
         except Exception:
             return None
+
+    def _invalidate_performance_cache(self, template_id: int):
+        """Drop the cached performance snapshot of a template (see StrategyPerformanceCache)"""
+        try:
+            from core.extraction.strategy_performance_cache import get_strategy_performance_cache
+
+            get_strategy_performance_cache().invalidate(template_id)
+        except Exception:
+            pass
     
     def update_performance(
         self,
@@ -38,6 +49,10 @@ class StrategyPerformanceRepository:
         """
         Update performance metrics for a strategy
         
+        A NULL field_name (template-level outcome) updates the single
+        (template, strategy) row with field_name IS NULL, like
+        update_performance_batch.
+        
         Args:
             template_id: Template ID
             field_name: Field name
@@ -50,11 +65,13 @@ class StrategyPerformanceRepository:
         user_id = self._current_user_id()
         
         try:
-            # Check if record exists
+            # Check if record exists (IS also matches a NULL field_name)
             cursor.execute("""
                 SELECT id, total_extractions, correct_extractions
                 FROM strategy_performance
-                WHERE template_id = ? AND field_name = ? AND strategy_type = ?
+                WHERE template_id = ? AND field_name IS ? AND strategy_type = ?
+                ORDER BY id
+                LIMIT 1
             """, (template_id, field_name, strategy_type))
             
             row = cursor.fetchone()
@@ -101,6 +118,120 @@ class StrategyPerformanceRepository:
             raise e
         finally:
             conn.close()
+
+        self._invalidate_performance_cache(template_id)
+    
+    def update_performance_batch(self, updates: List[Dict]) -> int:
+        """
+        Apply many performance outcomes in one transaction
+
+        Outcomes for the same (template, field, strategy) are summed first and
+        written with a single INSERT ... ON CONFLICT DO UPDATE per key, relying
+        on UNIQUE(template_id, strategy_type, field_name). The resulting counts
+        and accuracy are the same as calling update_performance per outcome.
+        NULL field_name never conflicts on that constraint, so those outcomes
+        update the (template, strategy) row with field_name IS NULL instead,
+        inserting it if missing, in the same transaction (as update_performance
+        does for a single outcome).
+
+        Args:
+            updates: List of dicts with template_id, field_name, strategy_type,
+                was_correct
+
+        Returns:
+            Number of (template, field, strategy) rows written
+        """
+        deltas: Dict[tuple, Dict] = {}
+        for update in updates:
+            key = (update['template_id'], update.get('field_name'), update['strategy_type'])
+            delta = deltas.get(key)
+            if delta is None:
+                delta = deltas[key] = {'total': 0, 'correct': 0}
+            delta['total'] += 1
+            if update.get('was_correct'):
+                delta['correct'] += 1
+
+        if not deltas:
+            return 0
+
+        user_id = self._current_user_id()
+        now = datetime.now().isoformat()
+        params = [
+            {
+                'template_id': template_id,
+                'field_name': field_name,
+                'strategy_type': strategy_type,
+                'total': delta['total'],
+                'correct': delta['correct'],
+                'accuracy': delta['correct'] / delta['total'],
+                'now': now,
+                'user_id': user_id,
+            }
+            for (template_id, field_name, strategy_type), delta in deltas.items()
+        ]
+        keyed_params = [p for p in params if p['field_name'] is not None]
+        null_field_params = [p for p in params if p['field_name'] is None]
+
+        def _apply(conn):
+            for p in null_field_params:
+                cursor = conn.execute("""
+                    UPDATE strategy_performance
+                    SET total_extractions = total_extractions + :total,
+                        correct_extractions = correct_extractions + :correct,
+                        accuracy = CAST(correct_extractions + :correct AS REAL)
+                            / (total_extractions + :total),
+                        last_updated = :now,
+                        updated_by = :user_id
+                    WHERE id = (
+                        SELECT id FROM strategy_performance
+                        WHERE template_id = :template_id AND strategy_type = :strategy_type
+                          AND field_name IS NULL
+                        ORDER BY id
+                        LIMIT 1
+                    )
+                """, p)
+                if cursor.rowcount == 0:
+                    conn.execute("""
+                        INSERT INTO strategy_performance (
+                            template_id, field_name, strategy_type,
+                            total_extractions, correct_extractions, accuracy,
+                            last_updated,
+                            created_by, updated_by
+                        ) VALUES (
+                            :template_id, NULL, :strategy_type,
+                            :total, :correct, :accuracy,
+                            :now,
+                            :user_id, :user_id
+                        )
+                    """, p)
+
+            conn.executemany("""
+                INSERT INTO strategy_performance (
+                    template_id, field_name, strategy_type,
+                    total_extractions, correct_extractions, accuracy,
+                    last_updated,
+                    created_by, updated_by
+                ) VALUES (
+                    :template_id, :field_name, :strategy_type,
+                    :total, :correct, :accuracy,
+                    :now,
+                    :user_id, :user_id
+                )
+                ON CONFLICT(template_id, strategy_type, field_name) DO UPDATE SET
+                    total_extractions = total_extractions + excluded.total_extractions,
+                    correct_extractions = correct_extractions + excluded.correct_extractions,
+                    accuracy = CAST(correct_extractions + excluded.correct_extractions AS REAL)
+                        / (total_extractions + excluded.total_extractions),
+                    last_updated = excluded.last_updated,
+                    updated_by = excluded.updated_by
+            """, keyed_params)
+
+        run_write(self.db, _apply)
+
+        for template_id in {p['template_id'] for p in params}:
+            self._invalidate_performance_cache(template_id)
+
+        return len(params)
     
     def get_field_performance(
         self,
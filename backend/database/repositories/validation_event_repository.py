@@ -0,0 +1,236 @@
+from typing import Any, Dict, List, Optional
+import json
+import sqlite3
+
+from database.db_manager import DatabaseManager
+from database.write_queue import run_write
+
+
+class ValidationEventRepository:
+    """Repository for the validation event outbox (validation_events table)"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize repository
+
+        Args:
+            db_manager: DatabaseManager instance
+        """
+        self.db = db_manager
+
+    def _current_user_id(self):
+        try:
+            from flask import g
+
+            return getattr(g, 'user_id', None)
+        except Exception:
+            return None
+
+    def publish(
+        self,
+        event_type: str,
+        document_id: int,
+        template_id: int,
+        payload: Dict[str, Any],
+        dedupe_key: str,
+        conn=None,
+    ) -> int:
+        """
+        Append an event (no-op if an event with dedupe_key already exists)
+
+        Args:
+            event_type: Event type, e.g. 'document_validated'
+            document_id: Document ID
+            template_id: Template ID
+            payload: JSON-serializable event data
+            dedupe_key: Idempotency key
+            conn: Connection of an enclosing transaction (optional)
+
+        Returns:
+            Event ID (of the existing event for a duplicate)
+        """
+        user_id = self._current_user_id()
+
+        def _apply(conn):
+            conn.execute(
+                """
+                INSERT INTO validation_events (
+                    event_type, document_id, template_id, dedupe_key, payload, created_by
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(dedupe_key) DO NOTHING
+                """,
+                (
+                    event_type,
+                    document_id,
+                    template_id,
+                    dedupe_key,
+                    json.dumps(payload, default=str),
+                    user_id,
+                ),
+            )
+            row = conn.execute(
+                "SELECT id FROM validation_events WHERE dedupe_key = ?", (dedupe_key,)
+            ).fetchone()
+            return row["id"]
+
+        if conn is not None:
+            return _apply(conn)
+        return run_write(self.db, _apply)
+
+    def find_by_id(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """Find event by ID"""
+        rows = self.db.execute_query(
+            "SELECT * FROM validation_events WHERE id = ?", (event_id,)
+        )
+        return rows[0] if rows else None
+
+    def claim_next(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest runnable pending event.
+
+        Events of a template are processed strictly in id order: an event is
+        only claimable while no other event of its template is processing.
+
+        Args:
+            worker_id: Claiming consumer id (stored in locked_by)
+            lease_seconds: Lease duration; expired leases are requeued
+
+        Returns:
+            Claimed event dict, or None if nothing is runnable.
+        """
+        candidate_sql = """
+            SELECT e.id FROM validation_events e
+            WHERE e.status = 'pending'
+              AND NOT EXISTS (
+                  SELECT 1 FROM validation_events p
+                  WHERE p.template_id = e.template_id AND p.status = 'processing'
+              )
+            ORDER BY e.id ASC
+            LIMIT 1
+        """
+        claim_sql = f"""
+            UPDATE validation_events
+            SET status = 'processing',
+                attempts = attempts + 1,
+                locked_by = ?,
+                lease_expires_at = datetime('now', ?)
+            WHERE id = ({candidate_sql}) AND status = 'pending'
+        """
+        columns = "id, event_type, document_id, template_id, payload, completed_steps, attempts"
+        params = (worker_id, f"+{int(lease_seconds)} seconds")
+
+        conn = self.db.get_connection()
+        try:
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                row = conn.execute(claim_sql + f" RETURNING {columns}", params).fetchone()
+                conn.commit()
+            else:
+                # No RETURNING: same guarded UPDATE inside one write transaction
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.execute(claim_sql, params)
+                row = None
+                if cursor.rowcount:
+                    row = conn.execute(
+                        f"""
+                        SELECT {columns} FROM validation_events
+                        WHERE status = 'processing' AND locked_by = ?
+                        ORDER BY id DESC
+                        LIMIT 1
+                        """,
+                        (worker_id,),
+                    ).fetchone()
+                conn.commit()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        event = dict(row)
+        event["payload"] = json.loads(event["payload"])
+        event["completed_steps"] = json.loads(event["completed_steps"] or "[]")
+        return event
+
+    def set_completed_steps(self, event_id: int, worker_id: str, steps: List[str]) -> bool:
+        """
+        Record finished steps of a processing event
+
+        Returns:
+            False if the consumer no longer holds the event
+        """
+        affected = self.db.execute_update(
+            """
+            UPDATE validation_events
+            SET completed_steps = ?
+            WHERE id = ? AND locked_by = ? AND status = 'processing'
+            """,
+            (json.dumps(steps), event_id, worker_id),
+        )
+        return affected > 0
+
+    def mark_done(self, event_id: int, worker_id: str) -> bool:
+        """Mark a processing event as done"""
+        affected = self.db.execute_update(
+            """
+            UPDATE validation_events
+            SET status = 'done',
+                processed_at = CURRENT_TIMESTAMP,
+                locked_by = NULL,
+                lease_expires_at = NULL,
+                last_error = NULL
+            WHERE id = ? AND locked_by = ? AND status = 'processing'
+            """,
+            (event_id, worker_id),
+        )
+        return affected > 0
+
+    def mark_failed(
+        self, event_id: int, worker_id: str, error: str, max_attempts: int = 3
+    ) -> bool:
+        """
+        Release a failed event for retry, or fail it after max_attempts
+
+        Returns:
+            False if the consumer no longer holds the event
+        """
+        affected = self.db.execute_update(
+            """
+            UPDATE validation_events
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                processed_at = CASE WHEN attempts >= ? THEN CURRENT_TIMESTAMP ELSE NULL END,
+                locked_by = NULL,
+                lease_expires_at = NULL,
+                last_error = ?
+            WHERE id = ? AND locked_by = ? AND status = 'processing'
+            """,
+            (max_attempts, max_attempts, error, event_id, worker_id),
+        )
+        return affected > 0
+
+    def requeue_expired_leases(self, max_attempts: int = 3) -> int:
+        """
+        Recover processing events whose consumer died
+
+        Returns:
+            Number of recovered events
+        """
+        return self.db.execute_update(
+            """
+            UPDATE validation_events
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                last_error = 'Lease expired',
+                locked_by = NULL,
+                lease_expires_at = NULL
+            WHERE status = 'processing' AND lease_expires_at < datetime('now')
+            """,
+            (max_attempts,),
+        )
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Count events per status"""
+        rows = self.db.execute_query(
+            "SELECT status, COUNT(*) AS count FROM validation_events GROUP BY status"
+        )
+        counts = {'pending': 0, 'processing': 0, 'done': 0, 'failed': 0}
+        counts.update({row['status']: row['count'] for row in rows})
+        return counts
@@ -0,0 +1,315 @@
+"""
+SQLite Writer
+Optional single-writer thread with group commit.
+
+SQLite allows one writer at a time. With every repository committing on
+its own, API requests, background pattern learning threads and the job
+worker queue up on the write lock and occasionally hit the 30 second
+busy timeout. When DB_WRITER_ENABLED=true, hot write paths hand their
+work to one writer thread per process instead:
+
+- callers submit an operation (a function of a connection) and get a
+  Future with its return value (e.g. lastrowid)
+- the writer drains up to DB_WRITER_MAX_BATCH queued operations, waiting
+  at most DB_WRITER_MAX_DELAY_MS for more, and runs them in one
+  BEGIN IMMEDIATE ... COMMIT; each operation runs in its own SAVEPOINT,
+  so a failing operation is rolled back alone and fails only its Future
+- futures resolve after the group commit, so a caller that waits reads
+  its own write afterwards
+
+Operations must not commit or roll back themselves. Use run_write(),
+which falls back to a regular DatabaseManager.transaction() when the
+writer is disabled.
+"""
+import atexit
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class WriteOperation:
+    """Queued write operation"""
+    operation: Callable[[Any], Any]
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.time)
+
+
+def is_writer_enabled() -> bool:
+    """Check if the single-writer thread is enabled (DB_WRITER_ENABLED)"""
+    return os.getenv('DB_WRITER_ENABLED', 'false').lower() == 'true'
+
+
+class SQLiteWriter:
+    """
+    Single writer thread applying queued operations in group commits
+    """
+
+    def __init__(self, db_manager, max_batch: int = None, max_delay_ms: float = None):
+        """
+        Initialize writer
+
+        Args:
+            db_manager: DatabaseManager instance
+            max_batch: Max operations per commit (default: DB_WRITER_MAX_BATCH)
+            max_delay_ms: Max wait for more operations before committing
+                (default: DB_WRITER_MAX_DELAY_MS)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db = db_manager
+        self.max_batch = max_batch if max_batch is not None else int(
+            os.getenv('DB_WRITER_MAX_BATCH', '64')
+        )
+        self.max_delay = (max_delay_ms if max_delay_ms is not None else float(
+            os.getenv('DB_WRITER_MAX_DELAY_MS', '5')
+        )) / 1000.0
+
+        self._queue: "queue.Queue[Optional[WriteOperation]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # Connection of the batch being applied (for operations submitted
+        # from inside another operation)
+        self._current_conn = None
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self._commit_ms: deque = deque(maxlen=1000)
+        self._wait_ms: deque = deque(maxlen=1000)
+        self._batch_sizes: deque = deque(maxlen=1000)
+
+    # ========================================================================
+    # Public API
+    # ========================================================================
+
+    def submit(self, operation: Callable[[Any], Any]) -> Future:
+        """
+        Queue a write operation
+
+        Args:
+            operation: Function taking a sqlite3 connection; must not commit
+
+        Returns:
+            Future resolved with the operation's return value after commit
+        """
+        if self.is_writer_thread():
+            # Nested submit from a running operation: join the current batch
+            future: Future = Future()
+            try:
+                future.set_result(operation(self._current_conn))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        op = WriteOperation(operation=operation)
+        self._ensure_thread()
+        self._queue.put(op)
+
+        depth = self._queue.qsize()
+        with self._lock:
+            self.submitted += 1
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+        return op.future
+
+    def execute(self, query: str, params: tuple = ()) -> Future:
+        """
+        Queue a single statement (same result as DatabaseManager.execute_update)
+
+        Args:
+            query: INSERT/UPDATE/DELETE statement
+            params: Statement parameters
+
+        Returns:
+            Future with lastrowid for INSERT, affected rows otherwise
+        """
+        def operation(conn):
+            cursor = conn.execute(query, params)
+            return cursor.lastrowid if "INSERT" in query.upper() else cursor.rowcount
+
+        return self.submit(operation)
+
+    def is_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def shutdown(self, timeout: float = 10.0):
+        """Apply queued operations and stop the writer thread"""
+        self._stopped.set()
+        if self._thread and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, batch size and commit latency metrics"""
+        with self._lock:
+            commit_ms = sorted(self._commit_ms)
+            wait_ms = list(self._wait_ms)
+            batch_sizes = list(self._batch_sizes)
+            return {
+                'enabled': is_writer_enabled(),
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'batches': self.batches,
+                'avg_batch_size': round(sum(batch_sizes) / len(batch_sizes), 2) if batch_sizes else 0.0,
+                'avg_commit_ms': round(sum(commit_ms) / len(commit_ms), 2) if commit_ms else 0.0,
+                'p95_commit_ms': round(commit_ms[math.ceil(len(commit_ms) * 0.95) - 1], 2) if commit_ms else 0.0,
+                'max_commit_ms': round(commit_ms[-1], 2) if commit_ms else 0.0,
+                'avg_queue_wait_ms': round(sum(wait_ms) / len(wait_ms), 2) if wait_ms else 0.0,
+                'max_batch': self.max_batch,
+                'max_delay_ms': self.max_delay * 1000,
+            }
+
+    # ========================================================================
+    # Writer thread
+    # ========================================================================
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='SQLiteWriter', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            op = self._queue.get()
+            if op is None:
+                if self._stopped.is_set():
+                    if self._queue.empty():
+                        return
+                    # Operations queued behind the marker: apply them first
+                    self._queue.put(None)
+                continue
+
+            batch = [op]
+            deadline = time.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.time()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    # Shutdown marker: finish this batch, then stop once drained
+                    self._queue.put(None)
+                    break
+                batch.append(nxt)
+
+            try:
+                self._apply_batch(batch)
+            except Exception as e:
+                self.logger.error(f"❌ [SQLiteWriter] Batch error: {e}")
+
+    def _apply_batch(self, batch: List[WriteOperation]):
+        start = time.time()
+        outcomes = []
+        conn = self.db.get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._current_conn = conn
+            for op in batch:
+                conn.execute("SAVEPOINT write_op")
+                try:
+                    result = op.operation(conn)
+                    conn.execute("RELEASE write_op")
+                    outcomes.append((op, result, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_op")
+                    conn.execute("RELEASE write_op")
+                    outcomes.append((op, None, e))
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self.logger.error(f"❌ [SQLiteWriter] Group commit of {len(batch)} operations failed: {e}")
+            outcomes = [(op, None, e) for op in batch]
+        finally:
+            self._current_conn = None
+            conn.close()
+
+        commit_ms = (time.time() - start) * 1000
+        failed = 0
+        for op, result, error in outcomes:
+            if error is not None:
+                failed += 1
+                op.future.set_exception(error)
+            else:
+                op.future.set_result(result)
+
+        with self._lock:
+            self.batches += 1
+            self.completed += len(batch) - failed
+            self.failed += failed
+            self._commit_ms.append(commit_ms)
+            self._batch_sizes.append(len(batch))
+            for op in batch:
+                self._wait_ms.append((start - op.submitted_at) * 1000)
+
+
+# Writers per database file
+_writers: Dict[str, SQLiteWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_sqlite_writer(db_manager=None) -> SQLiteWriter:
+    """
+    Get the process-wide writer of a database (stopped at interpreter exit)
+
+    Args:
+        db_manager: DatabaseManager instance (default: new DatabaseManager)
+
+    Returns:
+        SQLiteWriter instance
+    """
+    if db_manager is None:
+        from database.db_manager import DatabaseManager
+        db_manager = DatabaseManager()
+
+    writer = _writers.get(db_manager.db_path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(db_manager.db_path)
+            if writer is None:
+                writer = SQLiteWriter(db_manager)
+                _writers[db_manager.db_path] = writer
+                atexit.register(writer.shutdown)
+    return writer
+
+
+def run_write(db_manager, operation: Callable[[Any], Any]) -> Any:
+    """
+    Run a write operation through the writer thread, or in a transaction
+
+    Args:
+        db_manager: DatabaseManager instance
+        operation: Function taking a sqlite3 connection; must not commit
+
+    Returns:
+        The operation's return value (after commit)
+    """
+    if is_writer_enabled():
+        return get_sqlite_writer(db_manager).submit(operation).result()
+
+    with db_manager.transaction() as conn:
+        return operation(conn)
@@ -20,8 +20,6 @@ from core.auth.repositories import UserRepository
 from core.auth.services import AuthService
 from core.auth.models import RegisterRequest
 from core.learning.services import ModelService
-from database.repositories.job_repository import JobRepository
-from core.learning.auto_trainer import get_auto_training_service
 import time
 import shutil
 
@@ -76,7 +74,8 @@ def migrate_fresh():
 
     db = DatabaseManager()
 
-    # Delete database file
+    # Delete database file (pooled connections would keep the old file alive)
+    db.close_pool()
     if os.path.exists(db.db_path):
         os.remove(db.db_path)
         print("🗑️  Database deleted")
@@ -301,79 +300,33 @@ def train():
 
 
 def worker():
-    """Background worker to process queued jobs (auto_training)."""
+    """Background job runner: N worker processes claiming queued jobs (auto_training)."""
     import argparse
-    import json
+    from core.jobs import JobRunner, JobRunnerOptions
 
+    defaults = JobRunnerOptions()
     parser = argparse.ArgumentParser(description="Background job worker")
-    parser.add_argument("--sleep", type=int, default=5,
-                        help="Sleep seconds between job polls (default: 5)")
+    parser.add_argument("--workers", type=int, default=defaults.workers,
+                        help=f"Number of worker processes (default: JOB_WORKERS or {defaults.workers})")
+    parser.add_argument("--sleep", type=float, default=defaults.idle_timeout,
+                        help="Max idle seconds between claim attempts; enqueues wake workers "
+                             f"immediately (default: {defaults.idle_timeout:g})")
+    parser.add_argument("--lease", type=int, default=defaults.lease_seconds,
+                        help=f"Job lease seconds, renewed by heartbeats (default: {defaults.lease_seconds})")
+    parser.add_argument("--max-per-template", type=int, default=defaults.max_per_template,
+                        help="Running jobs allowed per template, 0 = unlimited "
+                             f"(default: {defaults.max_per_template})")
     args = parser.parse_args(sys.argv[2:])
 
-    print("🔧 Starting worker for auto_training jobs...")
+    # Apply migrations once before workers start
+    DatabaseManager()
 
-    db = DatabaseManager()
-    job_repo = JobRepository(db)
-
-    stale_reset_count = job_repo.reset_stale_running_jobs(max_age_minutes=30)
-    if stale_reset_count:
-        print(f"ℹ️  Reset {stale_reset_count} stale running job(s) to failed")
-
-    try:
-        while True:
-            job = job_repo.fetch_next_pending_auto_training()
-            if not job:
-                # No jobs, sleep then continue
-                time.sleep(args.sleep)
-                continue
-
-            job_id = job["id"] if isinstance(job, dict) else job["id"]
-            template_id = job["template_id"]
-
-            print(f"\n⚙️  Processing job {job_id} for template {template_id}...")
-            job_repo.mark_running(job_id)
-
-            try:
-                payload = json.loads(job["payload"])
-                model_folder = payload.get("model_folder", "models")
-                is_first_training = payload.get("is_first_training", False)
-
-                auto_trainer = get_auto_training_service(db)
-                result = auto_trainer.check_and_train(
-                    template_id=template_id,
-                    model_folder=model_folder,
-                    force_first_training=is_first_training,
-                )
-
-                if result:
-                    accuracy = result['test_metrics'].get('accuracy')
-                    if accuracy is not None:
-                        print(
-                            f"✅ Auto-training completed for template {template_id}: "
-                            f"{result['training_samples']} samples, "
-                            f"{accuracy*100:.2f}% accuracy"
-                        )
-                    else:
-                        print(
-                            f"✅ Auto-training completed for template {template_id}: "
-                            f"{result['training_samples']} samples (metrics not evaluated)"
-                        )
-                    job_repo.mark_completed(job_id)
-                else:
-                    print(f"ℹ️  Auto-training skipped for template {template_id} (conditions not met)")
-                    # Mark as completed even if skipped (not an error, just conditions not met)
-                    job_repo.mark_completed(job_id)
-
-            except Exception as e:
-                print(f"❌ Job {job_id} failed: {e}")
-                import traceback
-                traceback.print_exc()
-                
-                # Mark job as failed and log to failed_jobs table
-                job_repo.mark_failed(job_id, str(e))
-
-    except KeyboardInterrupt:
-        print("\n🛑 Worker stopped by user")
+    JobRunner(JobRunnerOptions(
+        workers=args.workers,
+        idle_timeout=args.sleep,
+        lease_seconds=args.lease,
+        max_per_template=args.max_per_template,
+    )).run()
 
 
 def show_help():
@@ -386,7 +339,7 @@ def show_help():
         migrate:fresh   Drop all tables and re-run migrations (⚠️  deletes all data)
         seed            Seed database with initial data
         train           Train or retrain extraction model
-        worker          Run background worker to process jobs (auto_training)
+        worker          Run background job workers (auto_training)
         runserver       Run the application
         help            Show this help message
 
@@ -398,7 +351,7 @@ def show_help():
         python manage.py train --template-id 1 --mode full --use-all --workers 8
         python manage.py train --template-id 1 --mode full --use-all --no-parallel
         python manage.py train --template-id 2 --mode incremental --use-all
-        python manage.py worker --sleep 5
+        python manage.py worker --workers 2 --max-per-template 1
         python manage.py runserver --background
         python manage.py stopserver
         python manage.py restartserver
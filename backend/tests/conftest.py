@@ -0,0 +1,28 @@
+"""
+Shared fixtures: a migrated SQLite database per test
+"""
+import pytest
+
+from core.extraction.strategy_performance_cache import get_strategy_performance_cache
+from core.templates.config_loader import invalidate_config_cache
+from database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # Migrations normally run once per process; every test gets a fresh file
+    monkeypatch.setattr(DatabaseManager, '_migrations_applied', False)
+    manager = DatabaseManager(str(tmp_path / 'app.db'))
+    # Configs and snapshots cached for an earlier test's database must not be served
+    invalidate_config_cache()
+    get_strategy_performance_cache().invalidate()
+    yield manager
+    manager.close_pool()
+
+
+@pytest.fixture
+def template_id(db):
+    return db.execute_update(
+        "INSERT INTO templates (name, filename, config_path) VALUES (?, ?, ?)",
+        ('Formulir', 'formulir.pdf', ''),
+    )
@@ -0,0 +1,70 @@
+"""
+Synthetic form documents for CRF training tests
+
+'Label : value' form pages whose layout depends on a variant (label
+wording, field order, value column), and the BIO sequences ModelService
+builds from them. Also used by the training benchmarks.
+"""
+import random
+
+from core.learning.learner import AdaptiveLearner
+
+FIELDS = {
+    'nama': (['Nama', 'Nama Lengkap', 'Name'], lambda rng: ' '.join(
+        rng.sample(['Budi', 'Siti', 'Agus', 'Dewi', 'Santoso', 'Rahma', 'Putri', 'Wijaya'], 2))),
+    'tanggal': (['Tanggal', 'Tgl', 'Date'], lambda rng: (
+        f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(2019, 2025)}")),
+    'nomor': (['Nomor', 'No', 'Number'], lambda rng: f"SK/{rng.randint(100, 999)}/{rng.randint(1, 12)}"),
+    'kota': (['Kota', 'Tempat', 'City'], lambda rng: rng.choice(
+        ['Jakarta', 'Bandung', 'Surabaya', 'Semarang', 'Medan', 'Makassar'])),
+}
+FILLER = ['Dengan', 'ini', 'menerangkan', 'bahwa', 'yang', 'bertanda', 'tangan', 'di',
+          'bawah', 'surat', 'keterangan', 'berlaku', 'sejak', 'tanggal', 'ditetapkan']
+
+
+def make_document(variant: int, rng: random.Random):
+    """Synthetic form page: filler paragraph, then 'Label : value' rows (layout per variant)"""
+    words = []
+    top = 60.0
+
+    def add_line(tokens, x_start):
+        x0 = x_start
+        for text in tokens:
+            width = 6.0 * len(text)
+            words.append({'text': text, 'x0': x0, 'x1': x0 + width,
+                          'top': top, 'bottom': top + 10, 'page': 0})
+            x0 += width + 4.0
+
+    for _ in range(rng.randint(2, 4)):
+        add_line(rng.sample(FILLER, rng.randint(5, 9)), 50.0)
+        top += 14.0
+
+    values = {}
+    field_order = list(FIELDS)
+    if variant >= 2:
+        field_order.reverse()
+    value_x = 140.0 + 60.0 * variant
+    for field in field_order:
+        labels, make_value = FIELDS[field]
+        value = make_value(rng)
+        values[field] = value
+        add_line(labels[min(variant, len(labels) - 1)].split() + [':'], 50.0)
+        words[-1]['x1'] = words[-1]['x0'] + 6.0
+        add_line(value.split(), value_x)
+        top += 16.0 + rng.choice([0.0, 2.0])
+    add_line(rng.sample(FILLER, rng.randint(4, 8)), 50.0)
+    return words, values
+
+
+def make_sequences(learner: AdaptiveLearner, documents):
+    """One BIO sequence per (document, field), as ModelService prepares them"""
+    X, y = [], []
+    for words, values in documents:
+        for field, value in values.items():
+            features, labels = learner._create_bio_sequence(
+                {'field_name': field, 'corrected_value': value}, words
+            )
+            if features:
+                X.append(features)
+                y.append(labels)
+    return X, y
@@ -0,0 +1,74 @@
+"""
+Reference implementation of the per-word layout features
+
+Layout features exactly as AdaptiveLearner computed them for each word
+before DocumentLayout, plus a synthetic document generator; used by the
+parity tests and benchmark_feature_builder.py.
+"""
+import random
+
+from core.learning.learner import AdaptiveLearner
+
+LAYOUT_KEYS = [
+    'position_in_line', 'column_index', 'in_first_column', 'in_second_column',
+    'in_third_column', 'in_fourth_column', 'line_group_index',
+    'is_first_line_in_group', 'is_continuation_line', 'relative_x_position',
+    'words_in_line', 'is_dense_line', 'is_sparse_line',
+]
+
+
+def make_document(word_count: int, rng: random.Random):
+    """Synthetic page stream: lines of 1-16 words, two or three columns, jittered tops"""
+    words = []
+    top = 50.0
+    while len(words) < word_count:
+        columns = rng.choice([(60.0,), (60.0, 320.0), (40.0, 220.0, 420.0)])
+        words_per_line = rng.randint(1, 16)
+        for k in range(words_per_line):
+            x0 = columns[k % len(columns)] + (k // len(columns)) * rng.uniform(30, 60)
+            # Jitter around the 5pt same-line tolerance (incl. exact boundaries)
+            word_top = top + rng.choice([0.0, 0.0, 0.3, -0.4, 4.9999, 5.0, rng.uniform(-3, 3)])
+            text = rng.choice(["Nama", "Tanggal", "12", "2024", ":", ",", "Jakarta", "ABC-12", "."])
+            words.append({
+                'text': text,
+                'x0': round(x0, 2), 'x1': round(x0 + 25, 2),
+                'top': round(word_top, 4), 'bottom': round(word_top + 10, 4),
+            })
+            if len(words) == word_count:
+                break
+        top += rng.choice([11.0, 12.5, 14.0, 24.0, 40.0])
+    return words
+
+
+def legacy_layout_features(learner: AdaptiveLearner, words, index):
+    """Layout features exactly as computed per word before DocumentLayout"""
+    word_x = words[index].get('x0', 0)
+    word_y = words[index].get('top', 0)
+    features = {}
+
+    features['position_in_line'] = sum(
+        1 for w in words[:index]
+        if abs(w.get('top', 0) - word_y) < 5
+    )
+
+    x_coords = [w.get('x0', 0) for w in words]
+    column_boundaries = learner._detect_column_boundaries(x_coords)
+    column_idx = learner._get_column_index(word_x, column_boundaries)
+    features['column_index'] = column_idx
+    features['in_first_column'] = column_idx == 0
+    features['in_second_column'] = column_idx == 1
+    features['in_third_column'] = column_idx == 2
+    features['in_fourth_column'] = column_idx == 3
+
+    line_groups = learner._detect_line_groups(words)
+    features['line_group_index'] = learner._get_line_group_index(index, line_groups)
+    features['is_first_line_in_group'] = learner._is_first_line_in_group(index, line_groups)
+    features['is_continuation_line'] = learner._is_continuation_line(index, line_groups)
+
+    features['relative_x_position'] = word_x / max(x_coords) if x_coords else 0
+
+    words_in_same_line = [w for w in words if abs(w.get('top', 0) - word_y) < 5]
+    features['words_in_line'] = len(words_in_same_line)
+    features['is_dense_line'] = len(words_in_same_line) > 10
+    features['is_sparse_line'] = len(words_in_same_line) < 5
+    return features
@@ -0,0 +1,106 @@
+"""
+Tests for bulk validation (ExtractionService.save_corrections_batch)
+
+Every document of a batch is validated (feedback, status and validation
+event) in one transaction, or none is.
+"""
+import json
+
+import pytest
+
+from core.extraction.services import ExtractionService
+from database.repositories.document_repository import DocumentRepository
+from database.repositories.feedback_repository import FeedbackRepository
+from database.repositories.template_repository import TemplateRepository
+from database.repositories.training_repository import TrainingRepository
+from database.repositories.validation_event_repository import ValidationEventRepository
+from database.write_queue import get_sqlite_writer
+from shared.exceptions import NotFoundError
+
+EXTRACTION = {
+    'extracted_data': {'nama': 'Budi', 'kota': 'Jakrta'},
+    'confidence_scores': {'nama': 0.9, 'kota': 0.4},
+    'metadata': {},
+}
+
+
+@pytest.fixture
+def service(db, tmp_path, monkeypatch):
+    # The service opens its own DatabaseManager(); point it at the test database
+    monkeypatch.setenv('DATABASE_PATH', db.db_path)
+    return ExtractionService(
+        DocumentRepository(db),
+        FeedbackRepository(db),
+        TemplateRepository(db),
+        TrainingRepository(db),
+        upload_folder=str(tmp_path / 'uploads'),
+        model_folder=str(tmp_path / 'models'),
+        feedback_folder=str(tmp_path / 'feedback'),
+    )
+
+
+@pytest.fixture
+def document_ids(db, template_id):
+    return [
+        db.execute_update(
+            "INSERT INTO documents (template_id, filename, file_path, extraction_result, status) "
+            "VALUES (?, ?, ?, ?, 'extracted')",
+            (template_id, f'doc_{i}.pdf', f'/uploads/doc_{i}.pdf', json.dumps(EXTRACTION)),
+        )
+        for i in range(3)
+    ]
+
+
+def batch(document_ids):
+    return [
+        {'document_id': document_id, 'corrections': {'nama': 'Budi', 'kota': 'Jakarta'}}
+        for document_id in document_ids
+    ]
+
+
+def written(db):
+    return {
+        'validated': db.execute_query(
+            "SELECT COUNT(*) AS n FROM documents WHERE status = 'validated'"
+        )[0]['n'],
+        'feedback': db.execute_query("SELECT COUNT(*) AS n FROM feedback")[0]['n'],
+        'events': db.execute_query("SELECT COUNT(*) AS n FROM validation_events")[0]['n'],
+    }
+
+
+def test_batch_validates_every_document(db, service, document_ids):
+    result = service.save_corrections_batch(batch(document_ids))
+
+    assert result['validated_count'] == 3
+    # Only the changed field is feedback
+    assert result['corrections_count'] == 3
+    assert all(doc['validation_event_id'] for doc in result['documents'])
+    assert written(db) == {'validated': 3, 'feedback': 3, 'events': 3}
+
+
+@pytest.mark.parametrize('writer_enabled', ['false', 'true'])
+def test_failure_rolls_back_whole_batch(db, service, document_ids, monkeypatch, writer_enabled):
+    monkeypatch.setenv('DB_WRITER_ENABLED', writer_enabled)
+    publish = ValidationEventRepository.publish
+
+    def fail_on_last(self, **kwargs):
+        if kwargs['document_id'] == document_ids[-1]:
+            raise RuntimeError('disk I/O error')
+        return publish(self, **kwargs)
+
+    monkeypatch.setattr(ValidationEventRepository, 'publish', fail_on_last)
+    try:
+        with pytest.raises(RuntimeError):
+            service.save_corrections_batch(batch(document_ids))
+    finally:
+        if writer_enabled == 'true':
+            get_sqlite_writer(service.db).shutdown()
+
+    assert written(db) == {'validated': 0, 'feedback': 0, 'events': 0}
+
+
+def test_unknown_document_writes_nothing(db, service, document_ids):
+    with pytest.raises(NotFoundError):
+        service.save_corrections_batch(batch(document_ids + [999]))
+
+    assert written(db) == {'validated': 0, 'feedback': 0, 'events': 0}
@@ -0,0 +1,77 @@
+"""
+Tests for parallel bulk extraction
+
+Worker processes must return the same results as in-process extraction,
+and a failing file must not affect the others.
+"""
+import pytest
+
+from core.extraction.bulk_extraction import extract_files, get_bulk_extraction_workers
+from core.extraction.extractor import DataExtractor
+from tests.pdf_documents import write_pdf
+
+TEMPLATE_CONFIG = {
+    'template_id': 0,
+    'fields': {
+        'nama': {'type': 'text', 'locations': [{'page': 0, 'x0': 100, 'y0': 82, 'x1': 140, 'y1': 94}]},
+    },
+}
+
+
+@pytest.fixture
+def pdf_paths(tmp_path, monkeypatch):
+    # Inherited by spawned workers, unlike a patched cache instance
+    monkeypatch.setenv('PDF_WORD_CACHE_DIR', str(tmp_path / 'cache'))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'doc_{i}.pdf'
+        write_pdf(path, [f'Nama Budi{i} Kota'])
+        paths.append(str(path))
+    return paths
+
+
+def run(filepaths, workers):
+    outcomes = sorted(extract_files(TEMPLATE_CONFIG, None, filepaths, workers=workers),
+                      key=lambda outcome: outcome[0])
+    for _index, results, _error in outcomes:
+        if results:
+            results.pop('extraction_time_ms', None)
+    return outcomes
+
+
+def test_worker_processes_match_in_process(pdf_paths):
+    in_process = run(pdf_paths, workers=1)
+
+    assert [index for index, _results, _error in in_process] == [0, 1, 2]
+    assert all(results and error is None for _index, results, error in in_process)
+    assert run(pdf_paths, workers=2) == in_process
+
+
+def test_failed_file_is_reported_and_others_extracted(pdf_paths, monkeypatch):
+    extract = DataExtractor.extract
+
+    def failing_extract(self, pdf_path):
+        if pdf_path == pdf_paths[1]:
+            raise ValueError('broken PDF')
+        return extract(self, pdf_path)
+
+    monkeypatch.setattr(DataExtractor, 'extract', failing_extract)
+    outcomes = run(pdf_paths, workers=1)
+
+    assert [(index, error) for index, _results, error in outcomes] == [
+        (0, None), (1, 'broken PDF'), (2, None)
+    ]
+    assert outcomes[1][1] is None
+
+
+def test_small_uploads_stay_in_process(monkeypatch):
+    monkeypatch.setenv('BULK_EXTRACTION_WORKERS', '4')
+    monkeypatch.setenv('BULK_EXTRACTION_MIN_FILES', '3')
+
+    assert get_bulk_extraction_workers(1) == 1
+    assert get_bulk_extraction_workers(2) == 1
+    assert get_bulk_extraction_workers(3) == 3
+    assert get_bulk_extraction_workers(10) == 4
+
+    monkeypatch.setenv('BULK_EXTRACTION_MIN_FILES', '0')
+    assert get_bulk_extraction_workers(1) == 1
@@ -0,0 +1,85 @@
+"""
+Tests for the in-process template config cache
+
+Repeated loads must be served from the cache, and in-place config edits
+must be seen whether they come from this process (invalidation) or from
+another one (template_configs.revision triggers).
+"""
+import sqlite3
+
+import pytest
+
+from core.templates.config_loader import TemplateConfigLoader, get_config_cache_stats
+from database.repositories.config_repository import ConfigRepository
+
+
+@pytest.fixture
+def repo(db):
+    return ConfigRepository(db)
+
+
+@pytest.fixture
+def field_config_id(repo, template_id):
+    config_id = repo.create_config(template_id)
+    return repo.create_field_config(config_id, 'nama', 'text', base_pattern=r'(\w+)')
+
+
+def base_pattern(loader, template_id):
+    return loader.load_config(template_id)['fields']['nama']['base_pattern']
+
+
+def test_repeated_loads_hit_and_return_copies(db, template_id, field_config_id):
+    loader = TemplateConfigLoader(db_manager=db)
+    hits = get_config_cache_stats()['hits']
+
+    config = loader.load_config(template_id)
+    config['fields']['nama']['base_pattern'] = 'mutated by caller'
+
+    assert base_pattern(loader, template_id) == r'(\w+)'
+    assert get_config_cache_stats()['hits'] == hits + 1
+
+
+def test_write_in_this_process_invalidates(repo, db, template_id, field_config_id):
+    loader = TemplateConfigLoader(db_manager=db)
+    base_pattern(loader, template_id)
+
+    repo.update_field_config(field_config_id, base_pattern=r'(\d+)')
+
+    assert base_pattern(loader, template_id) == r'(\d+)'
+
+
+@pytest.mark.parametrize('statement', [
+    "UPDATE field_configs SET base_pattern = '(\\d+)' WHERE id = :id",
+    "INSERT INTO field_locations (field_config_id, page, x0, y0, x1, y1) "
+    "VALUES (:id, 0, 10, 20, 30, 40)",
+    "INSERT INTO learned_patterns (field_config_id, pattern, pattern_type) "
+    "VALUES (:id, 'NAMA (\\w+)', 'learned')",
+])
+def test_write_from_other_process_bumps_revision(db, template_id, field_config_id, statement):
+    loader = TemplateConfigLoader(db_manager=db)
+    before = loader.load_config(template_id)
+
+    # Another process: plain connection, no in-process invalidation
+    conn = sqlite3.connect(db.db_path)
+    conn.execute(statement, {'id': field_config_id})
+    conn.commit()
+    conn.close()
+
+    assert loader.load_config(template_id) != before
+
+
+def test_pattern_usage_statistics_keep_cache(repo, db, template_id, field_config_id):
+    pattern_id = repo.add_learned_pattern(field_config_id, r'Nama (\w+)', 'learned')
+    loader = TemplateConfigLoader(db_manager=db)
+    loader.load_config(template_id)
+    hits = get_config_cache_stats()['hits']
+
+    conn = sqlite3.connect(db.db_path)
+    conn.execute(
+        "UPDATE learned_patterns SET usage_count = usage_count + 1 WHERE id = ?", (pattern_id,)
+    )
+    conn.commit()
+    conn.close()
+
+    loader.load_config(template_id)
+    assert get_config_cache_stats()['hits'] == hits + 1
@@ -0,0 +1,73 @@
+"""
+Tests for the SQLite connection pool
+
+Closed connections must be reused by the same thread only, roll back
+what their user left uncommitted, and be retired by close_all().
+"""
+import threading
+
+from database.connection_pool import ConnectionPool
+
+
+def test_close_returns_connection_for_reuse(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'app.db'), enabled=True, max_idle=2)
+
+    conn = pool.acquire()
+    nested = pool.acquire()
+    assert nested is not conn
+    nested.close()
+    conn.close()
+
+    assert pool.acquire() is conn
+    assert pool.get_stats()['reused'] == 1
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_uncommitted_work_is_rolled_back_on_close(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'app.db'), enabled=True)
+    conn = pool.acquire()
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.commit()
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.close()
+
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+
+
+def test_idle_connections_are_per_thread(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'app.db'), enabled=True)
+    conn = pool.acquire()
+    conn.close()
+
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    thread.join()
+
+    assert acquired[0] is not conn
+    assert pool.acquire() is conn
+
+
+def test_close_all_retires_connections(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'app.db'), enabled=True)
+    idle = pool.acquire()
+    checked_out = pool.acquire()
+    idle.close()
+
+    pool.close_all()
+    checked_out.close()
+
+    fresh = pool.acquire()
+    assert fresh is not idle and fresh is not checked_out
+    assert pool.get_stats()['discarded'] == 1
+
+
+def test_disabled_pool_closes_connections(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'app.db'), enabled=False)
+    conn = pool.acquire()
+    conn.close()
+
+    assert pool.acquire() is not conn
+    assert pool.get_stats()['reused'] == 0
@@ -0,0 +1,65 @@
+"""
+Tests for the NumPy CRF inference engine
+
+Unconstrained decoding must give crfsuite's labels and (up to the rounding
+of the exported weights) its marginals; constrained decoding must stay
+within the field's labels.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from core.extraction.crf_inference import NumpyCRFInference, get_inference_engine
+from core.learning.learner import AdaptiveLearner
+from tests.form_documents import make_document, make_sequences
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = random.Random(5)
+    learner = AdaptiveLearner()
+    train = make_sequences(learner, [make_document(rng.randint(0, 2), rng) for _ in range(12)])
+    test = make_sequences(learner, [make_document(rng.randint(0, 3), rng) for _ in range(4)])
+    learner.train(*train, max_iterations=50, skip_evaluation=True)
+    return learner.model, test[0]
+
+
+def test_matches_crfsuite(data):
+    model, sequences = data
+    engine = NumpyCRFInference(model)
+
+    for xseq in sequences:
+        labels, marginals = engine.tag(xseq)
+        assert labels == model.predict_single(xseq)
+        expected = model.predict_marginals_single(xseq)
+        for token, expected_token in zip(marginals, expected):
+            for label, probability in expected_token.items():
+                assert token[label] == pytest.approx(probability, abs=1e-4)
+
+
+def test_batch_decoding_matches_single_sequences(data):
+    model, sequences = data
+    engine = get_inference_engine(model)
+    xseq = sequences[0]
+    scores = engine.state_scores(xseq)
+    fields = [None, 'nama', 'kota', 'unknown']
+
+    batched = engine.decode_batch(np.stack([scores] * len(fields)), fields)
+
+    assert batched == [engine.decode(scores, field) for field in fields]
+    assert get_inference_engine(model) is engine
+
+
+def test_constrained_decoding_uses_field_labels_only(data):
+    model, sequences = data
+    engine = NumpyCRFInference(model)
+
+    for xseq in sequences:
+        labels, marginals = engine.tag(xseq, target_field='nama')
+        assert set(labels) <= {'O', 'B-NAMA', 'I-NAMA'}
+        for token in marginals:
+            assert set(token) == {'O', 'B-NAMA', 'I-NAMA'}
+            assert sum(token.values()) == pytest.approx(1.0)
+
+    assert engine.tag(sequences[0], target_field='unknown')[0] == ['O'] * len(sequences[0])
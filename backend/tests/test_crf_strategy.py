@@ -0,0 +1,104 @@
+"""
+Tests for per-document CRF work in CRFExtractionStrategy
+
+Features assembled from the cached base features must be identical to
+features built from scratch, and the base features must be built once
+per document. Decoding all fields in one batch must give the same values
+as extracting field by field.
+"""
+import random
+
+import pytest
+
+from core.extraction.crf_strategy import CRFExtractionStrategy
+from core.learning.learner import AdaptiveLearner
+from tests.form_documents import FIELDS, make_document, make_sequences
+
+CONTEXT = {
+    'label': 'Nama',
+    'label_position': {'x0': 50, 'x1': 74, 'y0': 100, 'y1': 110},
+    'words_before': ['Nama', ':'],
+    'next_field_y': 130,
+}
+
+
+@pytest.fixture(scope='module')
+def documents():
+    rng = random.Random(11)
+    return [make_document(variant, rng)[0] for variant in range(4)]
+
+
+def test_cached_features_match_fresh_features(documents):
+    strategy = CRFExtractionStrategy()
+    for words in documents:
+        for field in FIELDS:
+            cached = strategy._extract_features(words, field, {}, CONTEXT, target_field=field)
+            fresh = CRFExtractionStrategy()._extract_features(
+                words, field, {}, CONTEXT, target_field=field
+            )
+            assert cached == fresh
+
+
+def test_base_features_built_once_per_document(documents, monkeypatch):
+    strategy = CRFExtractionStrategy()
+    builds = []
+    build = strategy._build_base_features
+
+    def counting_build(words):
+        builds.append(words)
+        return build(words)
+
+    monkeypatch.setattr(strategy, '_build_base_features', counting_build)
+
+    for words in documents:
+        for field in FIELDS:
+            features = strategy._extract_features(words, field, {}, {}, target_field=field)
+            # Per-field features never leak into the shared base features
+            features[0]['mutated'] = True
+            assert f'target_field_{field}' in features[0]
+        base = strategy._get_base_features(words)[0]
+        assert 'mutated' not in base
+        assert not any(key.startswith('target_field_') for key in base)
+
+    assert len(builds) == len(documents)
+
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory):
+    rng = random.Random(13)
+    learner = AdaptiveLearner()
+    learner.train(
+        *make_sequences(learner, [make_document(rng.randint(0, 3), rng) for _ in range(12)]),
+        max_iterations=50,
+        skip_evaluation=True,
+    )
+    path = str(tmp_path_factory.mktemp('models') / 'template_1_model.joblib')
+    learner.save_model(path)
+    return path
+
+
+def field_configs():
+    return {field: {'field_name': field, 'locations': []} for field in FIELDS}
+
+
+def test_tagger_decoding_matches_predict_and_marginals(model_path, documents):
+    strategy = CRFExtractionStrategy(model_path)
+    sequences = [
+        strategy._extract_features(words, field, {}, {}, target_field=field)
+        for words in documents for field in FIELDS
+    ]
+
+    decoded = strategy._predict_sequences(sequences)
+
+    assert [labels for labels, _ in decoded] == strategy.model.predict(sequences)
+    assert [marginals for _, marginals in decoded] == strategy.model.predict_marginals(sequences)
+
+
+def test_batch_prediction_matches_per_field_extraction(model_path, documents):
+    batched = CRFExtractionStrategy(model_path)
+    single = CRFExtractionStrategy(model_path)
+
+    for words in documents:
+        assert batched.predict_batch(words, field_configs()) == len(FIELDS)
+        for field, config in field_configs().items():
+            assert batched.extract(None, config, words) == single.extract(None, config, words)
@@ -0,0 +1,64 @@
+"""
+Tests for the per-document artifact store (DocumentContext)
+
+Each artifact must be computed once per document, and contexts created
+for a plain path must be closed after use.
+"""
+import pytest
+
+from core.extraction import word_cache
+from core.extraction.document_context import DocumentContext, as_document_context
+from core.extraction.table_extractor import AdaptiveTableExtractor
+from core.extraction.word_cache import PDFWordCache
+from tests.pdf_documents import write_pdf
+
+
+@pytest.fixture
+def pdf_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        word_cache, '_word_cache_instance', PDFWordCache(cache_dir=str(tmp_path / 'cache'))
+    )
+    path = tmp_path / 'doc.pdf'
+    write_pdf(path, ['Nama Budi Santoso', 'Kota Jakarta'])
+    return str(path)
+
+
+def test_artifacts_are_computed_once(pdf_path, monkeypatch):
+    calls = []
+    extract_tables = AdaptiveTableExtractor.extract_tables_from_page
+
+    def counting_extract_tables(self, page, page_number):
+        calls.append(page_number)
+        return extract_tables(self, page, page_number)
+
+    monkeypatch.setattr(AdaptiveTableExtractor, 'extract_tables_from_page', counting_extract_tables)
+
+    with DocumentContext(pdf_path) as doc:
+        assert [w['text'] for w in doc.words] == ['Nama', 'Budi', 'Santoso', 'Kota', 'Jakarta']
+        assert doc.words is doc.words
+        assert doc.get_page_layout(1)['word_count'] == 2
+        assert doc.get_tables(0) is doc.get_tables(0)
+        assert doc.get_page_text(1) == 'Kota Jakarta'
+
+    assert calls == [0]
+    assert word_cache.get_word_cache().get_stats()['misses'] == 1
+
+
+def test_given_words_are_not_extracted_again(pdf_path):
+    words = [{'text': 'Budi'}]
+    with DocumentContext(pdf_path, words=words) as doc:
+        assert doc.words is words
+    assert word_cache.get_word_cache().get_stats()['misses'] == 0
+
+
+def test_context_for_path_is_closed_after_use(pdf_path):
+    with as_document_context(pdf_path) as doc:
+        assert doc.page_count == 2
+    assert doc._pdf is None
+
+    owned = DocumentContext(pdf_path)
+    with as_document_context(owned) as doc:
+        assert doc is owned and doc.page_count == 2
+    # Left open for its owner
+    assert owned._pdf is not None
+    owned.close()
@@ -0,0 +1,64 @@
+"""
+Tests for the training feature store
+
+A stored document must load back exactly the samples that were stored,
+and only for the revision they were computed for.
+"""
+import os
+from pathlib import Path
+
+from core.learning.feature_store import TrainingFeatureStore, compute_revision
+
+SAMPLES = [
+    (
+        [
+            {'word': 'nama', 'x0': 50.0, 'is_digit': False, 'target_field_nama': True},
+            {'word': 'budi', 'x0': 90.0, 'is_digit': False, 'target_field_nama': True},
+        ],
+        ['O', 'B-NAMA'],
+        11,
+    ),
+    (
+        [
+            {'word': 'nama', 'x0': 50.0, 'is_digit': False, 'target_field_kota': True},
+            {'word': 'budi', 'x0': 90.0, 'is_digit': False, 'target_field_kota': True},
+        ],
+        ['O', 'O'],
+        None,
+    ),
+]
+
+
+def test_round_trip_and_revision_check(tmp_path):
+    store = TrainingFeatureStore(store_dir=str(tmp_path), enabled=True)
+    store.put(1, 7, 'rev-1', SAMPLES)
+
+    assert store.get(1, 7, 'rev-1') == SAMPLES
+    assert store.get(1, 7, 'rev-2') is None
+    assert store.get(1, 8, 'rev-1') is None
+    assert store.get_stats()['hits'] == 1
+
+
+def test_revision_changes_with_feedback_and_file(tmp_path):
+    pdf = tmp_path / 'doc.pdf'
+    pdf.write_bytes(b'%PDF-1.4')
+    feedbacks = [{'id': 1, 'field_name': 'nama', 'corrected_value': 'Budi'}]
+    revision = compute_revision(str(pdf), feedbacks, {'nama': {'type': 'text'}})
+
+    assert compute_revision(str(pdf), feedbacks, {'nama': {'type': 'text'}}) == revision
+    assert compute_revision(
+        str(pdf), [{**feedbacks[0], 'corrected_value': 'Siti'}], {'nama': {'type': 'text'}}
+    ) != revision
+    assert compute_revision(str(pdf), feedbacks, {'nama': {'type': 'date'}}) != revision
+    os.utime(pdf, ns=(0, 0))
+    assert compute_revision(str(pdf), feedbacks, {'nama': {'type': 'text'}}) != revision
+    assert compute_revision(str(tmp_path / 'missing.pdf'), feedbacks, {}) is None
+
+
+def test_default_store_dir_does_not_depend_on_cwd(tmp_path, monkeypatch):
+    monkeypatch.delenv('TRAINING_FEATURE_STORE_DIR', raising=False)
+    default_dir = TrainingFeatureStore().store_dir
+    monkeypatch.chdir(tmp_path)
+
+    assert TrainingFeatureStore().store_dir == default_dir
+    assert default_dir == str(Path(__file__).resolve().parents[1] / 'data' / 'feature_store')
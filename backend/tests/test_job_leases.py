@@ -0,0 +1,81 @@
+"""
+Tests for job claiming and heartbeat leases
+
+Claims must follow priority and the per-template limit, and jobs whose
+lease expired must go back to pending (or fail after max attempts)
+without the old worker being able to finish them.
+"""
+import pytest
+
+from core.jobs import wakeup
+from database.repositories.job_repository import JobRepository
+
+LEASE = 120
+
+
+@pytest.fixture
+def jobs(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(wakeup, '_wakeup_instance', wakeup.JobWakeup(str(tmp_path / '.jobs_wakeup')))
+    return JobRepository(db)
+
+
+def job_row(db, job_id):
+    return db.execute_query('SELECT * FROM jobs WHERE id = ?', (job_id,))[0]
+
+
+def expire_lease(db, job_id):
+    db.execute_update(
+        "UPDATE jobs SET lease_expires_at = datetime('now', '-1 seconds') WHERE id = ?", (job_id,)
+    )
+
+
+def test_claim_order_and_per_template_limit(jobs):
+    auto_a = jobs.enqueue_auto_training_job(1, 'models')
+    manual_a = jobs.enqueue_manual_training_job(1, 'models')
+    auto_b = jobs.enqueue_auto_training_job(2, 'models')
+
+    assert jobs.claim_next_job('w1', LEASE)['id'] == manual_a
+    # Template 1 already has a running job
+    assert jobs.claim_next_job('w2', LEASE)['id'] == auto_b
+    assert jobs.claim_next_job('w3', LEASE) is None
+    assert jobs.claim_next_job('w3', LEASE, max_per_template=0)['id'] == auto_a
+
+
+def test_expired_lease_is_requeued_and_taken_from_old_worker(db, jobs):
+    job_id = jobs.enqueue_auto_training_job(1, 'models')
+    jobs.claim_next_job('crashed', LEASE)
+
+    assert jobs.requeue_expired_leases(max_attempts=3) == {'requeued': 0, 'failed': 0}
+    expire_lease(db, job_id)
+    assert jobs.requeue_expired_leases(max_attempts=3) == {'requeued': 1, 'failed': 0}
+    assert job_row(db, job_id)['status'] == 'pending'
+
+    claimed = jobs.claim_next_job('w2', LEASE)
+    assert (claimed['id'], claimed['attempts']) == (job_id, 2)
+    assert not jobs.heartbeat(job_id, 'crashed', LEASE)
+    assert not jobs.mark_completed(job_id, worker_id='crashed')
+    assert jobs.heartbeat(job_id, 'w2', LEASE)
+    assert jobs.mark_completed(job_id, worker_id='w2')
+    assert job_row(db, job_id)['status'] == 'completed'
+
+
+def test_expired_lease_fails_after_max_attempts(db, jobs):
+    job_id = jobs.enqueue_auto_training_job(1, 'models')
+    for _ in range(2):
+        jobs.claim_next_job('crashed', LEASE)
+        expire_lease(db, job_id)
+        jobs.requeue_expired_leases(max_attempts=2)
+
+    assert job_row(db, job_id)['status'] == 'failed'
+    failed = db.execute_query('SELECT job_id, error FROM failed_jobs')
+    assert [row['job_id'] for row in failed] == [job_id]
+    assert 'lease expired' in failed[0]['error']
+
+
+def test_released_job_can_be_claimed_again(db, jobs):
+    job_id = jobs.enqueue_auto_training_job(1, 'models')
+    jobs.claim_next_job('w1', LEASE)
+
+    assert not jobs.release_job(job_id, 'w2')
+    assert jobs.release_job(job_id, 'w1')
+    assert jobs.claim_next_job('w2', LEASE)['id'] == job_id
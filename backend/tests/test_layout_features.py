@@ -0,0 +1,101 @@
+"""
+Parity tests for DocumentLayout
+
+DocumentLayout must give every word exactly the layout features the
+previous per-word code computed (values and types), since trained models
+depend on them.
+"""
+import random
+
+import pytest
+
+from core.learning.layout_features import DocumentLayout
+from core.learning.learner import AdaptiveLearner
+from tests.layout_reference import LAYOUT_KEYS, legacy_layout_features, make_document
+
+
+@pytest.fixture(scope='module')
+def learner():
+    return AdaptiveLearner()
+
+
+def word(x0, top, text='kata'):
+    return {'text': text, 'x0': x0, 'x1': x0 + 20, 'top': top, 'bottom': top + 10}
+
+
+def assert_same(actual, expected, context):
+    assert type(actual) is type(expected), f"{context}: {actual!r} vs {expected!r}"
+    assert actual == expected, f"{context}: {actual!r} vs {expected!r}"
+
+
+def assert_document_parity(learner, words):
+    layout = learner._build_document_layout(words)
+    for i, w in enumerate(words):
+        features = learner._extract_word_features(w, words, i, layout=layout)
+        expected = legacy_layout_features(learner, words, i)
+        for key in LAYOUT_KEYS:
+            assert_same(features[key], expected[key], f"word {i} {key}")
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_synthetic_documents_match_legacy(learner, seed):
+    assert_document_parity(learner, make_document(300, random.Random(seed)))
+
+
+def test_exact_same_line_tolerance_ties(learner):
+    # Tops exactly 5pt apart are not on the same line; 4.9999 apart are
+    words = [
+        word(50, 100.0), word(120, 105.0), word(190, 104.9999),
+        word(260, 95.0), word(330, 100.0), word(50, 110.0),
+        word(120, 99.9999), word(190, 100.0),
+    ]
+    assert_document_parity(learner, words)
+
+
+def test_document_without_column_boundaries(learner):
+    # No histogram bin holds more than 5 words, so no boundary is detected
+    words = [word(50.0 + 30 * i, 50.0 + 14 * (i // 3)) for i in range(12)]
+    assert learner._detect_column_boundaries([w['x0'] for w in words]) == []
+    assert_document_parity(learner, words)
+
+
+def test_empty_column_boundaries(learner):
+    words = make_document(60, random.Random(7))
+    line_groups = learner._detect_line_groups(words)
+    layout = DocumentLayout.build(words, column_boundaries=[], line_groups=line_groups)
+
+    for i, w in enumerate(words):
+        assert_same(layout.column_index[i], learner._get_column_index(w['x0'], []), f"word {i}")
+
+
+def test_words_in_no_line_group(learner):
+    words = make_document(40, random.Random(11))
+    # Groups that leave words out, repeat a word and split one line
+    line_groups = [[0, 1, 2, 3, 4, 5, 6], [8, 9, 3], [20, 21, 22, 23, 24, 25, 26, 27]]
+    column_boundaries = learner._detect_column_boundaries([w['x0'] for w in words])
+    layout = DocumentLayout.build(words, column_boundaries, line_groups)
+
+    for i in range(len(words)):
+        assert_same(layout.line_group_index[i], learner._get_line_group_index(i, line_groups), f"word {i}")
+        assert_same(
+            layout.is_first_line_in_group[i],
+            learner._is_first_line_in_group(i, line_groups),
+            f"word {i}",
+        )
+        assert_same(
+            layout.is_continuation_line[i],
+            learner._is_continuation_line(i, line_groups),
+            f"word {i}",
+        )
+    assert layout.line_group_index[10] == -1
+
+
+def test_layout_fallback_is_built_once_per_word_list(learner, monkeypatch):
+    words = make_document(50, random.Random(5))
+    calls = []
+    build = learner._build_document_layout
+    monkeypatch.setattr(learner, '_build_document_layout', lambda ws: calls.append(1) or build(ws))
+
+    for i, w in enumerate(words):
+        learner._extract_word_features(w, words, i)
+    assert len(calls) == 1
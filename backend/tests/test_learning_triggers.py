@@ -0,0 +1,73 @@
+"""
+Tests for the set-based pattern learning trigger check
+
+One query must give every field the count the per-field query gave:
+validated documents created after that field's last completed learning run.
+"""
+from core.learning.auto_pattern_learner import AutoPatternLearner
+
+
+def per_field_count(db, template_id, field_name):
+    """The previous one-query-per-field check"""
+    rows = db.execute_query(
+        """
+        SELECT COUNT(*) AS document_count
+        FROM documents d
+        WHERE d.template_id = ?
+          AND d.status = 'validated'
+          AND d.created_at > COALESCE(
+              (SELECT MAX(completed_at) FROM pattern_learning_jobs
+               WHERE template_id = ? AND field_name = ? AND status = 'completed'),
+              '2000-01-01'
+          )
+        """,
+        (template_id, template_id, field_name),
+    )
+    return rows[0]['document_count']
+
+
+def add_documents(db, template_id, day, count, status='validated'):
+    for i in range(count):
+        db.execute_update(
+            "INSERT INTO documents (template_id, filename, file_path, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (template_id, f'doc_{day}_{i}.pdf', f'/uploads/doc_{day}_{i}.pdf',
+             status, f'2024-01-{day:02d} 12:00:00'),
+        )
+
+
+def add_job(db, template_id, field_name, day, status='completed'):
+    db.execute_update(
+        "INSERT INTO pattern_learning_jobs (template_id, field_name, job_type, status, completed_at) "
+        "VALUES (?, ?, 'auto', ?, ?)",
+        (template_id, field_name, status, f'2024-01-{day:02d} 00:00:00'),
+    )
+
+
+def test_counts_match_per_field_query(db, template_id):
+    add_documents(db, template_id, day=1, count=3)
+    add_documents(db, template_id, day=5, count=4)
+    add_documents(db, template_id, day=6, count=2, status='extracted')
+    add_documents(db, template_id, day=9, count=2)
+    add_job(db, template_id, 'nama', day=2)
+    add_job(db, template_id, 'nama', day=4)
+    add_job(db, template_id, 'tanggal', day=8)
+    add_job(db, template_id, 'kota', day=10, status='failed')
+
+    fields = ['nama', 'tanggal', 'kota', 'alamat']
+    counts = AutoPatternLearner(db).get_pending_document_counts(template_id, fields)
+
+    assert counts == {name: per_field_count(db, template_id, name) for name in fields}
+    assert counts == {'nama': 6, 'tanggal': 2, 'kota': 9, 'alamat': 9}
+
+
+def test_fields_ready_use_threshold(db, template_id):
+    add_documents(db, template_id, day=1, count=3)
+    add_documents(db, template_id, day=5, count=4)
+    add_job(db, template_id, 'nama', day=2)
+    learner = AutoPatternLearner(db)
+
+    assert learner.get_fields_ready_for_learning(template_id, ['nama', 'kota', 'kota']) == {'kota'}
+    assert learner.get_fields_ready_for_learning(template_id, []) == set()
+    assert not learner.should_trigger_learning(template_id, 'nama')
+    assert learner.should_trigger_learning(template_id, 'kota')
@@ -0,0 +1,69 @@
+"""
+Tests for the process-wide CRF model registry
+
+Models must be loaded once, reloaded when the file changes, and evicted
+least recently used first when over the count or byte budget.
+"""
+import os
+
+import joblib
+
+from core.extraction.model_registry import ModelRegistry
+
+
+def save(tmp_path, template_id, model, mtime=None):
+    path = str(tmp_path / f'template_{template_id}_model.joblib')
+    joblib.dump(model, path)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_model_is_loaded_once_and_reloaded_after_retrain(tmp_path):
+    registry = ModelRegistry(max_models=4)
+    path = save(tmp_path, 1, {'weights': [1]}, mtime=1_000_000)
+
+    first = registry.get(path)
+    assert registry.get(path) is first
+    assert first.template_id == 1
+
+    save(tmp_path, 1, {'weights': [2]}, mtime=1_000_100)
+    assert registry.get_model(path) == {'weights': [2]}
+    stats = registry.get_stats()
+    assert (stats['hits'], stats['misses'], stats['reloads']) == (1, 2, 1)
+    assert stats['cached_models'] == 1
+
+
+def test_least_recently_used_model_is_evicted(tmp_path):
+    registry = ModelRegistry(max_models=2)
+    paths = [save(tmp_path, template_id, {'template': template_id}) for template_id in (1, 2, 3)]
+
+    registry.get(paths[0])
+    registry.get(paths[1])
+    registry.get(paths[0])
+    registry.get(paths[2])
+
+    assert [m['template_id'] for m in registry.get_stats()['models']] == [1, 3]
+    assert registry.get_stats()['evictions'] == 1
+
+
+def test_byte_budget_keeps_most_recent_model(tmp_path):
+    small = save(tmp_path, 1, {'w': 0})
+    large = save(tmp_path, 2, {'w': list(range(10000))})
+    registry = ModelRegistry(max_models=8, max_bytes=os.path.getsize(large) - 1)
+
+    registry.get(small)
+    registry.get(large)
+
+    # Over budget on its own, but the model in use is never evicted
+    assert [m['template_id'] for m in registry.get_stats()['models']] == [2]
+
+
+def test_missing_or_unreadable_model(tmp_path):
+    registry = ModelRegistry()
+    broken = tmp_path / 'template_9_model.joblib'
+    broken.write_bytes(b'not a joblib file')
+
+    assert registry.get(str(tmp_path / 'template_8_model.joblib')) is None
+    assert registry.get(str(broken)) is None
+    assert registry.get_stats()['cached_models'] == 0
@@ -0,0 +1,91 @@
+"""
+Tests for online CRF updates (OnlineCRF) and how they are saved
+
+The crfsuite model stays the template's model file; online weights are
+saved next to it and served by the model registry until a full retrain.
+"""
+import os
+import random
+
+import joblib
+import pytest
+import sklearn_crfsuite
+
+from core.extraction.model_registry import ModelRegistry, online_model_path
+from core.learning.learner import AdaptiveLearner
+from core.learning.online_crf import OnlineCRF
+from tests.form_documents import make_document, make_sequences
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = random.Random(3)
+    builder = AdaptiveLearner()
+
+    def batch(variant, count):
+        return make_sequences(builder, [make_document(variant, rng) for _ in range(count)])
+
+    return {'base': batch(0, 15), 'new': batch(3, 8), 'test': batch(3, 5)}
+
+
+@pytest.fixture(scope='module')
+def base_learner(data):
+    learner = AdaptiveLearner()
+    learner.train(*data['base'], max_iterations=50, skip_evaluation=True)
+    return learner
+
+
+def online_learner(base_learner):
+    learner = AdaptiveLearner()
+    learner.model = base_learner.model
+    return learner
+
+
+def test_online_update_learns_new_layout(data, base_learner):
+    learner = online_learner(base_learner)
+    before = learner.evaluate(*data['test'])['f1']
+
+    stats = learner.online_train(*data['new'])
+
+    assert isinstance(learner.model, OnlineCRF)
+    assert stats['sequences'] == len(data['new'][0])
+    assert stats['updates'] > 0
+    assert learner.evaluate(*data['test'])['f1'] > before
+
+
+def test_online_update_leaves_current_model_untouched(data, base_learner):
+    before = base_learner.model.predict(data['new'][0])
+    online_learner(base_learner).online_train(*data['new'])
+
+    assert isinstance(base_learner.model, sklearn_crfsuite.CRF)
+    assert base_learner.model.predict(data['new'][0]) == before
+
+
+def test_online_update_is_saved_next_to_crfsuite_model(tmp_path, data, base_learner):
+    model_path = str(tmp_path / 'template_1_model.joblib')
+    base_learner.save_model(model_path)
+    model_bytes = open(model_path, 'rb').read()
+
+    learner = online_learner(base_learner)
+    learner.online_train(*data['new'])
+    learner.save_model(model_path)
+
+    # The model file is still the crfsuite model
+    assert open(model_path, 'rb').read() == model_bytes
+    assert hasattr(joblib.load(model_path), 'tagger_')
+    assert os.path.exists(online_model_path(model_path))
+
+    # Extraction gets the online weights
+    registry = ModelRegistry()
+    served = registry.get_model(model_path)
+    assert isinstance(served, OnlineCRF)
+    assert served.predict(data['test'][0]) == learner.model.predict(data['test'][0])
+
+    # A full retrain replaces the model file and drops the online weights
+    retrained = AdaptiveLearner(model_path)
+    assert isinstance(retrained.model, OnlineCRF)
+    retrained.train(*data['base'], max_iterations=50, skip_evaluation=True)
+    retrained.save_model(model_path)
+
+    assert not os.path.exists(online_model_path(model_path))
+    assert isinstance(registry.get_model(model_path), sklearn_crfsuite.CRF)
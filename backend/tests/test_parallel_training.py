@@ -0,0 +1,87 @@
+"""
+Tests for parallel CRF cross-validation and hyperparameter search
+
+Folds must be the ones k_fold_split always produced, and a search on
+worker processes must score every candidate exactly like a serial run.
+"""
+import random
+
+import pytest
+
+from core.learning.learner import AdaptiveLearner
+from core.learning.parallel_training import cross_validate, make_param_grid, run_training_tasks
+from core.learning.training_utils import k_fold_indices, k_fold_split
+from tests.form_documents import make_document, make_sequences
+
+TIMING_KEYS = ('seconds', 'wall_seconds', 'task_seconds', 'speedup', 'workers')
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    rng = random.Random(11)
+    return make_sequences(AdaptiveLearner(), [make_document(rng.randint(0, 3), rng) for _ in range(8)])
+
+
+def legacy_k_fold_indices(n_samples, n_folds, random_state):
+    """Previous k_fold_split: global seed, train by membership test"""
+    state = random.getstate()
+    random.seed(random_state)
+    indices = list(range(n_samples))
+    random.shuffle(indices)
+    random.setstate(state)
+    fold_size = n_samples // n_folds
+    splits = []
+    for i in range(n_folds):
+        test_start = i * fold_size
+        test_end = test_start + fold_size if i < n_folds - 1 else n_samples
+        test_indices = indices[test_start:test_end]
+        splits.append(([idx for idx in indices if idx not in test_indices], test_indices))
+    return splits
+
+
+def without_timings(value):
+    if isinstance(value, dict):
+        return {key: without_timings(item) for key, item in value.items() if key not in TIMING_KEYS}
+    if isinstance(value, list):
+        return [without_timings(item) for item in value]
+    return value
+
+
+@pytest.mark.parametrize('n_samples, n_folds', [(5, 5), (23, 5), (40, 3), (7, 2)])
+def test_folds_are_unchanged(n_samples, n_folds):
+    assert k_fold_indices(n_samples, n_folds, 42) == legacy_k_fold_indices(n_samples, n_folds, 42)
+
+
+def test_k_fold_split_uses_index_folds(dataset):
+    X, y = dataset
+    folds = k_fold_split(X, y, n_folds=3)
+
+    for (X_train, X_test, y_train, y_test), (train, test) in zip(folds, k_fold_indices(len(X), 3)):
+        assert X_train == [X[i] for i in train] and y_test == [y[i] for i in test]
+
+
+def test_parallel_search_matches_serial(dataset):
+    X, y = dataset
+    candidates = make_param_grid([0.01, 0.1], [0.01])
+
+    serial = cross_validate(X, y, candidates, n_folds=2, max_iterations=20, workers=1)
+    parallel = cross_validate(X, y, candidates, n_folds=2, max_iterations=20, workers=2)
+
+    assert parallel['workers'] == 2
+    assert len(parallel['folds']) == 4
+    assert without_timings(parallel) == without_timings(serial)
+
+
+def test_candidate_and_shared_settings_reach_the_estimator(dataset):
+    X, y = dataset
+    splits = k_fold_indices(len(X), 2)
+
+    search = run_training_tasks(
+        X, y, [{'c1': 0.5, 'c2': 0.2, 'max_iterations': 5}], splits[:1],
+        max_iterations=20, workers=1, return_models=True,
+        crf_params={'algorithm': 'lbfgs', 'all_possible_transitions': False},
+    )
+
+    model = search['folds'][0]['model']
+    assert (model.c1, model.c2, model.max_iterations) == (0.5, 0.2, 5)
+    assert model.all_possible_transitions is False
@@ -0,0 +1,89 @@
+"""
+Tests for the bounded, coalescing pattern learning executor
+
+Triggers for a queued key collapse into one run, triggers for a running
+key schedule one follow-up run, and the queue never grows past max_pending.
+"""
+import threading
+
+from core.learning.pattern_learning_executor import PatternLearningExecutor
+
+
+def blocking_task(executor):
+    """Occupy the only worker until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+
+    def run():
+        started.set()
+        release.wait(5)
+
+    executor.submit('busy', run)
+    assert started.wait(5)
+    return release
+
+
+def test_queued_triggers_coalesce_and_latest_arguments_win():
+    executor = PatternLearningExecutor(max_workers=1, max_pending=10)
+    release = blocking_task(executor)
+    calls = []
+
+    for value in range(3):
+        assert executor.submit(('pattern', 1, 'nama'), calls.append, value)
+    release.set()
+
+    assert executor.wait_idle(5)
+    assert calls == [2]
+    stats = executor.get_stats()
+    assert stats['coalesced'] == 2
+    assert stats['completed'] == 2
+
+
+def test_trigger_while_running_schedules_one_follow_up_run():
+    executor = PatternLearningExecutor(max_workers=1, max_pending=10)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def run(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+
+    executor.submit('key', run, 0)
+    assert started.wait(5)
+    for value in (1, 2, 3):
+        executor.submit('key', run, value)
+    release.set()
+
+    assert executor.wait_idle(5)
+    assert calls == [0, 3]
+    assert executor.get_stats()['reruns'] == 1
+
+
+def test_full_queue_drops_new_keys():
+    executor = PatternLearningExecutor(max_workers=1, max_pending=1)
+    release = blocking_task(executor)
+
+    assert executor.submit('a', lambda: None)
+    assert not executor.submit('b', lambda: None)
+    # A queued key still coalesces when the queue is full
+    assert executor.submit('a', lambda: None)
+    release.set()
+
+    assert executor.wait_idle(5)
+    assert executor.get_stats()['dropped'] == 1
+
+
+def test_failed_task_does_not_stop_worker():
+    executor = PatternLearningExecutor(max_workers=1, max_pending=10)
+    calls = []
+
+    def fail():
+        raise RuntimeError('boom')
+
+    executor.submit('fail', fail)
+    executor.submit('ok', calls.append, 1)
+
+    assert executor.wait_idle(5)
+    assert calls == [1]
+    stats = executor.get_stats()
+    assert stats['failed'] == 1 and stats['completed'] == 1
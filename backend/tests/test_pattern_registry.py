@@ -0,0 +1,62 @@
+"""
+Tests for the compiled learned-pattern registry
+
+The registry must follow learned-pattern writes made by other processes
+(seen through template_configs.revision on the next config load) and
+must not cache a failed load.
+"""
+import sqlite3
+
+import pytest
+
+from core.extraction.pattern_registry import LearnedPatternRegistry
+from core.templates.config_loader import TemplateConfigLoader
+from database.repositories.config_repository import ConfigRepository
+
+
+@pytest.fixture
+def field_config_id(db, template_id):
+    repo = ConfigRepository(db)
+    config_id = repo.create_config(template_id)
+    field_config_id = repo.create_field_config(config_id, 'nama', 'text')
+    repo.add_learned_pattern(field_config_id, r'Nama\s*:\s*(\w+)', 'learned', priority=5)
+    return field_config_id
+
+
+def patterns(registry, template_id):
+    return [p.pattern for p in registry.get_patterns(template_id, 'nama')]
+
+
+def test_write_from_other_process_is_seen_after_config_load(db, template_id, field_config_id):
+    registry = LearnedPatternRegistry(db, max_age=3600)
+    loader = TemplateConfigLoader(db_manager=db)
+    loader.load_config(template_id)
+    assert patterns(registry, template_id) == [r'Nama\s*:\s*(\w+)']
+
+    # Another process: plain connection, no in-process invalidation
+    conn = sqlite3.connect(db.db_path)
+    conn.execute(
+        "INSERT INTO learned_patterns (field_config_id, pattern, pattern_type, priority) "
+        "VALUES (?, ?, 'learned', 9)",
+        (field_config_id, r'NAMA\s+(\w+)'),
+    )
+    conn.commit()
+    conn.close()
+
+    loader.load_config(template_id)
+    assert patterns(registry, template_id) == [r'NAMA\s+(\w+)', r'Nama\s*:\s*(\w+)']
+
+
+def test_failed_load_is_not_cached(db, template_id, field_config_id, monkeypatch):
+    registry = LearnedPatternRegistry(db, max_age=3600)
+    get_repo = registry._get_repo
+
+    def broken_repo():
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(registry, '_get_repo', broken_repo)
+    assert patterns(registry, template_id) == []
+    assert template_id not in registry.get_stats()['templates']
+
+    monkeypatch.setattr(registry, '_get_repo', get_repo)
+    assert patterns(registry, template_id) == [r'Nama\s*:\s*(\w+)']
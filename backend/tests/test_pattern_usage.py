@@ -0,0 +1,94 @@
+"""
+Tests for the pattern usage write-behind aggregator
+
+Flushed counters must equal per-attempt updates, a failed flush must
+keep its attempts for the next one, and the threshold must wake the
+background flusher.
+"""
+import sqlite3
+import time
+
+import pytest
+
+from core.extraction.pattern_usage import PatternUsageAggregator
+from database.repositories.config_repository import ConfigRepository
+
+OUTCOMES = [True, False, True, True, False, True, True, True, True, True]
+
+
+@pytest.fixture
+def repo(db):
+    return ConfigRepository(db)
+
+
+@pytest.fixture
+def pattern_ids(repo, template_id):
+    field_config_id = repo.create_field_config(repo.create_config(template_id), 'nama', 'text')
+    return [
+        repo.add_learned_pattern(field_config_id, pattern, 'learned')
+        for pattern in (r'Nama (\w+)', r'NAMA (\w+)')
+    ]
+
+
+@pytest.fixture
+def aggregator(db):
+    aggregator = PatternUsageAggregator(db, flush_interval=60, flush_threshold=1000)
+    yield aggregator
+    aggregator.shutdown()
+
+
+def usage(db, pattern_id):
+    return db.execute_query(
+        "SELECT usage_count, success_count, match_rate, confidence_boost "
+        "FROM learned_patterns WHERE id = ?",
+        (pattern_id,),
+    )[0]
+
+
+def test_flush_matches_per_attempt_updates(db, repo, pattern_ids, aggregator):
+    batched_id, direct_id = pattern_ids
+    for matched in OUTCOMES:
+        aggregator.record(batched_id, matched)
+        repo.update_pattern_usage(direct_id, matched)
+
+    assert aggregator.get_stats()['pending_attempts'] == len(OUTCOMES)
+    assert usage(db, batched_id)['usage_count'] == 0
+
+    assert aggregator.flush() == len(OUTCOMES)
+    assert usage(db, batched_id) == usage(db, direct_id)
+    assert aggregator.get_stats()['pending_attempts'] == 0
+
+
+def test_failed_flush_requeues_attempts(db, pattern_ids, aggregator, monkeypatch):
+    pattern_id = pattern_ids[0]
+    apply_deltas = ConfigRepository.apply_pattern_usage_deltas
+
+    def locked(self, deltas):
+        raise sqlite3.OperationalError('database is locked')
+
+    aggregator.record(pattern_id, True)
+    aggregator.record(pattern_id, False)
+    monkeypatch.setattr(ConfigRepository, 'apply_pattern_usage_deltas', locked)
+    assert aggregator.flush() == 0
+    assert aggregator.get_stats()['failures'] == 1
+
+    aggregator.record(pattern_id, True)
+    monkeypatch.setattr(ConfigRepository, 'apply_pattern_usage_deltas', apply_deltas)
+    assert aggregator.flush() == 3
+
+    row = usage(db, pattern_id)
+    assert (row['usage_count'], row['success_count']) == (3, 2)
+
+
+def test_threshold_wakes_background_flush(db, pattern_ids):
+    aggregator = PatternUsageAggregator(db, flush_interval=60, flush_threshold=3)
+    try:
+        for matched in (True, True, False):
+            aggregator.record(pattern_ids[0], matched)
+
+        deadline = time.time() + 5
+        while aggregator.get_stats()['flushed_attempts'] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert usage(db, pattern_ids[0])['usage_count'] == 3
+    finally:
+        aggregator.shutdown()
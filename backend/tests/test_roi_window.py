@@ -0,0 +1,57 @@
+"""
+Tests for CRF region-of-interest windowing
+
+The window must keep the words of the field's page between the label,
+the field box and the next field (plus margin), in document order, and
+fall back to the whole document when it cannot crop.
+"""
+from core.extraction.roi_window import assign_pages, crop_to_roi, get_roi_bounds
+
+FIELD = {
+    'field_name': 'nama',
+    'locations': [{
+        'page': 1,
+        'y0': 200,
+        'y1': 210,
+        'context': {'label_position': {'y0': 190, 'y1': 200}, 'next_field_y': 240},
+    }],
+}
+
+
+def word(text, page, top):
+    return {'text': text, 'page_number': page, 'top': top, 'doctop': 800 * page + top}
+
+
+def test_window_covers_label_field_and_next_field():
+    assert get_roi_bounds(FIELD, margin=10) == (1, 180, 250)
+    assert get_roi_bounds({'field_name': 'nama', 'locations': [{'page': 0}]}) is None
+
+
+def test_crop_keeps_field_page_in_document_order(monkeypatch):
+    monkeypatch.setenv('CRF_ROI_WINDOW', 'true')
+    words = [
+        word('header', 1, 100), word('Nama', 1, 190), word('Budi', 1, 200),
+        word('same-height-other-page', 0, 200), word('Kota', 1, 245), word('footer', 1, 700),
+    ]
+
+    assert [w['text'] for w in crop_to_roi(words, FIELD, margin=10)] == ['Nama', 'Budi', 'Kota']
+
+
+def test_crop_falls_back_to_all_words(monkeypatch):
+    words = [word('Budi', 1, 200), word('footer', 1, 700)]
+    assert crop_to_roi(words, FIELD, margin=10) is words  # disabled
+
+    monkeypatch.setenv('CRF_ROI_WINDOW', 'true')
+    assert crop_to_roi(words, {'field_name': 'nama'}, margin=10) is words
+    assert crop_to_roi([word('footer', 1, 700)], FIELD, margin=10) == [word('footer', 1, 700)]
+
+
+def test_pages_from_page_number_or_doctop():
+    words = [word('a', 0, 100), word('b', 2, 100), word('c', 2, 300)]
+    assert assign_pages(words) == [0, 2, 2]
+
+    for w in words:
+        del w['page_number']
+    # Without page_number, pages are ranked by doctop offset (empty pages unseen)
+    assert assign_pages(words) == [0, 1, 1]
+    assert assign_pages([{'text': 'x', 'top': 1}]) is None
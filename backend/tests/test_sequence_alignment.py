@@ -0,0 +1,76 @@
+"""
+Tests for the pruned word window search (find_best_window)
+
+The search must pick the same window, with the same score, as scoring
+every window of up to 2×len(target)-1 words in scan order.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from core.learning.learner import AdaptiveLearner
+from core.learning.sequence_alignment import CharacterIndex, find_best_window, window_upper_bounds
+
+WORDS = ['Nama', 'Budi', 'Santoso', 'Jakarta', '12-03-2024', 'No', 'SK/123/4', ':',
+         'Jl.', 'Merdeka', 'budi', 'santos', 'Kota', 'Bandung', '2024', 'a']
+
+
+@pytest.fixture(scope='module')
+def score_fn():
+    return AdaptiveLearner()._calculate_sequence_match_score
+
+
+def exhaustive_best_window(word_texts, target_tokens, score_fn):
+    """Scan order of the previous implementation: start, then end"""
+    best_indices, best_score = [], 0
+    for start in range(len(word_texts)):
+        for end in range(start + 1, min(start + len(target_tokens) * 2, len(word_texts) + 1)):
+            score = score_fn(word_texts[start:end], target_tokens)
+            if score > best_score:
+                best_score = score
+                best_indices = list(range(start, end))
+    return best_indices, best_score
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_exhaustive_scan(score_fn, seed):
+    rng = random.Random(seed)
+    word_texts = [rng.choice(WORDS) for _ in range(rng.randint(1, 60))]
+    # Targets from the document (exact and repeated matches) or noisy variants
+    start = rng.randrange(len(word_texts))
+    target = word_texts[start:start + rng.randint(1, 4)]
+    if seed % 3 == 0:
+        target = [rng.choice(WORDS).lower() for _ in range(rng.randint(1, 5))]
+
+    assert find_best_window(word_texts, target, score_fn) == exhaustive_best_window(
+        word_texts, target, score_fn
+    )
+
+
+def test_ties_keep_first_window_in_scan_order(score_fn):
+    word_texts = ['x', 'Budi', 'y', 'Budi', 'z']
+    assert find_best_window(word_texts, ['Budi'], score_fn) == ([1], 1.0)
+
+
+def test_bounds_are_upper_bounds(score_fn):
+    rng = random.Random(7)
+    word_texts = [rng.choice(WORDS) for _ in range(30)]
+    target = ['Budi', 'Santoso', 'Jakarta']
+    target_text = ' '.join(target).lower()
+    index = CharacterIndex(word_texts, target_text)
+
+    for size in range(1, 2 * len(target)):
+        bounds = window_upper_bounds(index, len(target_text), len(target), size)
+        assert bounds.shape == (len(word_texts) - size + 1,)
+        scores = np.array([
+            score_fn(word_texts[start:start + size], target)
+            for start in range(len(bounds))
+        ])
+        assert np.all(scores <= bounds + 1e-9)
+
+
+def test_window_longer_than_document(score_fn):
+    assert find_best_window(['Budi'], ['Budi', 'Santoso', 'Jakarta'], score_fn) == (
+        exhaustive_best_window(['Budi'], ['Budi', 'Santoso', 'Jakarta'], score_fn)
+    )
@@ -0,0 +1,129 @@
+"""
+Tests for strategy performance writes and cached snapshots
+
+Batched outcomes must leave strategy_performance exactly as writing the
+same outcomes one by one does, including template-level (NULL field)
+outcomes. Cached snapshots are reused until a write in this process or
+their TTL, and aggregate like the SQL they replace.
+"""
+import sqlite3
+
+import pytest
+
+from core.extraction.strategy_performance_cache import (
+    CRF_WEIGHT_MIN_EXTRACTIONS,
+    StrategyPerformanceCache,
+    get_strategy_performance_cache,
+)
+from database.repositories.strategy_performance_repository import StrategyPerformanceRepository
+
+OUTCOMES = [
+    ('nama', 'crf', True),
+    ('nama', 'crf', False),
+    ('nama', 'rule_based', True),
+    ('kota', 'crf', True),
+    (None, 'crf', True),
+    (None, 'crf', False),
+    (None, 'crf', True),
+]
+
+
+def performance_rows(db, template_id):
+    return db.execute_query(
+        """
+        SELECT field_name, strategy_type, total_extractions, correct_extractions, accuracy
+        FROM strategy_performance
+        WHERE template_id = ?
+        ORDER BY field_name, strategy_type
+        """,
+        (template_id,),
+    )
+
+
+def test_batch_matches_per_outcome_updates(db, template_id):
+    other_template_id = db.execute_update(
+        "INSERT INTO templates (name, filename, config_path) VALUES ('B', 'b.pdf', '')"
+    )
+    repo = StrategyPerformanceRepository(db)
+
+    for field_name, strategy_type, was_correct in OUTCOMES:
+        repo.update_performance(template_id, field_name, strategy_type, was_correct)
+    repo.update_performance_batch([
+        {
+            'template_id': other_template_id,
+            'field_name': field_name,
+            'strategy_type': strategy_type,
+            'was_correct': was_correct,
+        }
+        for field_name, strategy_type, was_correct in OUTCOMES
+    ])
+
+    per_outcome = performance_rows(db, template_id)
+    assert per_outcome == performance_rows(db, other_template_id)
+    assert per_outcome[0] == {
+        'field_name': None,
+        'strategy_type': 'crf',
+        'total_extractions': 3,
+        'correct_extractions': 2,
+        'accuracy': 2 / 3,
+    }
+
+
+def test_snapshot_is_reused_until_ttl(db, template_id):
+    cache = StrategyPerformanceCache(db, ttl=60)
+    assert cache.get_snapshot(template_id).get_field_performance('nama') == {}
+
+    # Another process: plain connection, no in-process invalidation
+    conn = sqlite3.connect(db.db_path)
+    conn.execute(
+        "INSERT INTO strategy_performance (template_id, field_name, strategy_type, "
+        "accuracy, total_extractions, correct_extractions) VALUES (?, 'nama', 'crf', 0.5, 2, 1)",
+        (template_id,),
+    )
+    conn.commit()
+    conn.close()
+
+    assert cache.get_snapshot(template_id).get_field_performance('nama') == {}
+    cache.get_snapshot(template_id).loaded_at -= 61
+    assert cache.get_snapshot(template_id).get_field_performance('nama') == {
+        'crf': {'accuracy': 0.5, 'attempts': 2},
+    }
+    assert cache.get_stats()['hits'] == 2
+
+
+def test_write_in_this_process_drops_snapshot(db, template_id):
+    cache = get_strategy_performance_cache()
+    cache.get_snapshot(template_id, db)
+
+    StrategyPerformanceRepository(db).update_performance(template_id, 'nama', 'crf', True)
+
+    assert cache.get_snapshot(template_id, db).get_field_performance('nama') == {
+        'crf': {'accuracy': 1.0, 'attempts': 1},
+    }
+
+
+def test_crf_weight_aggregate_matches_sql(db, template_id):
+    repo = StrategyPerformanceRepository(db)
+    for field_name, attempts, correct in [('nama', 6, 5), ('kota', 5, 2), ('nik', 4, 4)]:
+        repo.update_performance_batch([
+            {
+                'template_id': template_id,
+                'field_name': field_name,
+                'strategy_type': strategy_type,
+                'was_correct': i < correct,
+            }
+            for strategy_type in ('crf', 'rule_based')
+            for i in range(attempts)
+        ])
+
+    snapshot = StrategyPerformanceCache(db).get_snapshot(template_id)
+    expected = db.execute_query(
+        """
+        SELECT AVG(accuracy) AS avg_accuracy, COUNT(*) AS field_count
+        FROM strategy_performance
+        WHERE template_id = ? AND strategy_type = 'crf' AND total_extractions >= ?
+        """,
+        (template_id, CRF_WEIGHT_MIN_EXTRACTIONS),
+    )[0]
+    assert snapshot.crf_field_count == expected['field_count'] == 2
+    assert snapshot.crf_avg_accuracy == pytest.approx(expected['avg_accuracy'])
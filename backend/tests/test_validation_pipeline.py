@@ -0,0 +1,103 @@
+"""
+Tests for the validation event outbox and its pipeline
+
+Events of a template are processed in id order, identical re-submissions
+publish once, and a retried event skips the steps that already finished.
+"""
+import pytest
+
+from core.learning import validation_pipeline
+from core.learning.validation_pipeline import DOCUMENT_VALIDATED, ValidationEventPipeline
+from database.repositories.validation_event_repository import ValidationEventRepository
+
+
+@pytest.fixture
+def document_id(db, template_id):
+    return db.execute_update(
+        "INSERT INTO documents (template_id, filename, file_path, status) "
+        "VALUES (?, 'doc.pdf', '/uploads/doc.pdf', 'validated')",
+        (template_id,),
+    )
+
+
+@pytest.fixture
+def steps_run(monkeypatch):
+    """Replace the step handlers with recorders; failures[step] makes a step raise"""
+    calls, failures = [], {}
+
+    def handler(step):
+        def run(event, db):
+            if failures.get(step, 0):
+                failures[step] -= 1
+                raise RuntimeError(f'{step} failed')
+            calls.append((event['id'], step))
+        return run
+
+    for step in list(validation_pipeline.STEP_HANDLERS):
+        monkeypatch.setitem(validation_pipeline.STEP_HANDLERS, step, handler(step))
+    return calls, failures
+
+
+def publish(db, document_id, template_id, key):
+    return ValidationEventRepository(db).publish(
+        DOCUMENT_VALIDATED, document_id, template_id, {'auto_training': True}, key
+    )
+
+
+def test_identical_submission_publishes_once(db, template_id, document_id):
+    first = publish(db, document_id, template_id, 'doc-1:abc')
+
+    assert publish(db, document_id, template_id, 'doc-1:abc') == first
+    assert publish(db, document_id, template_id, 'doc-1:def') != first
+    assert ValidationEventRepository(db).get_status_counts()['pending'] == 2
+
+
+def test_events_of_a_template_are_claimed_in_order(db, template_id, document_id):
+    repo = ValidationEventRepository(db)
+    first = publish(db, document_id, template_id, 'a')
+    publish(db, document_id, template_id, 'b')
+
+    claimed = repo.claim_next('worker-1', 60)
+    assert claimed['id'] == first
+    # The next event of the template waits for the running one
+    assert repo.claim_next('worker-2', 60) is None
+
+    repo.mark_done(first, 'worker-1')
+    assert repo.claim_next('worker-2', 60)['id'] != first
+
+
+def test_pipeline_runs_steps_in_event_order(db, template_id, document_id, steps_run):
+    calls, _ = steps_run
+    ids = [publish(db, document_id, template_id, key) for key in ('a', 'b', 'c')]
+
+    assert ValidationEventPipeline(db).process_pending() == 3
+    assert calls == [(i, step) for i in ids for step in ('feedback_file', 'adaptive_learning')]
+    assert ValidationEventRepository(db).get_status_counts()['done'] == 3
+
+
+def test_retry_skips_finished_steps(db, template_id, document_id, steps_run):
+    calls, failures = steps_run
+    failures['adaptive_learning'] = 1
+    event_id = publish(db, document_id, template_id, 'a')
+    pipeline = ValidationEventPipeline(db)
+
+    pipeline.process_pending()
+
+    assert calls == [(event_id, 'feedback_file'), (event_id, 'adaptive_learning')]
+    event = ValidationEventRepository(db).find_by_id(event_id)
+    assert event['status'] == 'done' and event['attempts'] == 2
+    assert pipeline.retried == 1
+
+
+def test_event_fails_after_max_attempts(db, template_id, document_id, steps_run):
+    _, failures = steps_run
+    failures['adaptive_learning'] = 10
+    event_id = publish(db, document_id, template_id, 'a')
+    pipeline = ValidationEventPipeline(db)
+
+    pipeline.process_pending()
+
+    event = ValidationEventRepository(db).find_by_id(event_id)
+    assert event['status'] == 'failed' and event['attempts'] == pipeline.max_attempts
+    assert event['last_error'] == 'adaptive_learning failed'
+    assert pipeline.failed == 1
@@ -0,0 +1,96 @@
+"""
+Tests for the persistent PDF word cache
+
+A cache hit must return exactly the word dicts a miss returns (every key,
+value and type), including page_number on each word.
+"""
+from pathlib import Path
+
+import pdfplumber.page
+
+from core.extraction import word_cache
+from core.extraction.word_cache import PDFWordCache
+from tests.pdf_documents import write_pdf
+
+
+def assert_identical(pages_a, pages_b):
+    assert pages_a == pages_b
+    for words_a, words_b in zip(pages_a, pages_b):
+        for word_a, word_b in zip(words_a, words_b):
+            for key in word_a:
+                assert type(word_a[key]) is type(word_b[key]), key
+
+
+def test_cache_hit_returns_same_words_as_miss(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["Nama Budi Santoso", "", "Kota Jakarta"])
+    cache = PDFWordCache(cache_dir=str(tmp_path / "cache"), enabled=True)
+
+    miss = cache.get_words_by_page(str(pdf_path))
+    hit = cache.get_words_by_page(str(pdf_path))
+
+    assert cache.get_stats()["hits"] == 1
+    assert_identical(miss, hit)
+    assert [len(page) for page in hit] == [3, 0, 2]
+    assert {word["page_number"] for word in hit[2]} == {2}
+
+
+def test_uncached_words_match_cached_words(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["Tanggal 12-05-2024"])
+
+    uncached = PDFWordCache(cache_dir=str(tmp_path / "unused"), enabled=False)
+    cache = PDFWordCache(cache_dir=str(tmp_path / "cache"), enabled=True)
+    cache.get_words_by_page(str(pdf_path), x_tolerance=1, use_text_flow=True)
+
+    assert_identical(
+        uncached.get_words_by_page(str(pdf_path), x_tolerance=1, use_text_flow=True),
+        cache.get_words_by_page(str(pdf_path), x_tolerance=1, use_text_flow=True),
+    )
+
+
+def test_default_cache_dir_does_not_depend_on_cwd(tmp_path, monkeypatch):
+    monkeypatch.delenv('PDF_WORD_CACHE_DIR', raising=False)
+    default_dir = PDFWordCache().cache_dir
+    monkeypatch.chdir(tmp_path)
+
+    assert PDFWordCache().cache_dir == default_dir
+    assert default_dir == str(Path(__file__).resolve().parents[1] / 'data' / 'word_cache')
+
+
+def test_failed_page_is_not_cached(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["Nama Budi", "Kota Jakarta"])
+    cache = PDFWordCache(cache_dir=str(tmp_path / "cache"), enabled=True)
+    extract_words = pdfplumber.page.Page.extract_words
+
+    def flaky_extract_words(page, **params):
+        if page.page_number == 2:
+            raise ValueError("broken content stream")
+        return extract_words(page, **params)
+
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_words", flaky_extract_words)
+    assert [len(page) for page in cache.get_words_by_page(str(pdf_path))] == [2, 0]
+    assert not list((tmp_path / "cache").rglob("meta.json"))
+
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_words", extract_words)
+    assert [len(page) for page in cache.get_words_by_page(str(pdf_path))] == [2, 2]
+    assert cache.get_stats()["hits"] == 0
+    assert [len(page) for page in cache.get_words_by_page(str(pdf_path))] == [2, 2]
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_hash_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(word_cache, "HASH_MEMO_SIZE", 2)
+    cache = PDFWordCache(cache_dir=str(tmp_path / "cache"), enabled=True)
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"doc_{i}.pdf")
+        paths[-1].write_bytes(b"%PDF-1.4 " + bytes([i]))
+
+    cache._file_hash(str(paths[0]))
+    cache._file_hash(str(paths[1]))
+    cache._file_hash(str(paths[0]))  # most recently used again
+    cache._file_hash(str(paths[2]))
+
+    assert [key[0] for key in cache._hash_memo] == [str(paths[0]), str(paths[2])]
@@ -0,0 +1,101 @@
+"""
+Tests for the single SQLite writer
+
+Queued operations must be applied in group commits, a failing operation
+must roll back alone, and run_write must give the same results with the
+writer enabled or disabled.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from database.write_queue import SQLiteWriter, get_sqlite_writer, run_write
+
+
+@pytest.fixture
+def items(db):
+    db.execute_update('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)')
+    return db
+
+
+@pytest.fixture
+def writer(items):
+    writer = SQLiteWriter(items, max_batch=64, max_delay_ms=0)
+    yield writer
+    writer.shutdown()
+
+
+def names(db):
+    return [row['name'] for row in db.execute_query('SELECT name FROM items ORDER BY id')]
+
+
+def insert(name):
+    return lambda conn: conn.execute('INSERT INTO items (name) VALUES (?)', (name,)).lastrowid
+
+
+def test_queued_operations_share_one_commit(items, writer):
+    started, release = threading.Event(), threading.Event()
+
+    def blocker(conn):
+        started.set()
+        release.wait(5)
+
+    first = writer.submit(blocker)
+    started.wait(5)
+    futures = [writer.submit(insert(name)) for name in ('a', 'b', 'c')]
+    release.set()
+
+    first.result(5)
+    assert [future.result(5) for future in futures] == [1, 2, 3]
+    assert names(items) == ['a', 'b', 'c']
+    assert writer.get_stats()['batches'] == 2
+
+
+def test_failing_operation_is_rolled_back_alone(items, writer):
+    started, release = threading.Event(), threading.Event()
+
+    def blocker(conn):
+        started.set()
+        release.wait(5)
+
+    def insert_then_fail(conn):
+        insert('b')(conn)
+        insert('a')(conn)  # UNIQUE violation
+
+    writer.submit(blocker)
+    started.wait(5)
+    futures = [writer.submit(op) for op in (insert('a'), insert_then_fail, insert('c'))]
+    release.set()
+
+    assert futures[0].result(5) == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[1].result(5)
+    assert futures[2].result(5) is not None
+    assert names(items) == ['a', 'c']
+
+
+def test_nested_submit_joins_current_batch(items, writer):
+    def outer(conn):
+        insert('a')(conn)
+        return writer.submit(insert('b')).result(0)
+
+    assert writer.submit(outer).result(5) == 2
+    assert names(items) == ['a', 'b']
+
+
+def test_run_write_without_writer_uses_transaction(items, monkeypatch):
+    monkeypatch.setenv('DB_WRITER_ENABLED', 'false')
+    assert run_write(items, insert('a')) == 1
+    assert names(items) == ['a']
+
+
+def test_run_write_with_writer_returns_after_commit(items, monkeypatch):
+    monkeypatch.setenv('DB_WRITER_ENABLED', 'true')
+    writer = get_sqlite_writer(items)
+    try:
+        assert run_write(items, insert('a')) == 1
+        assert names(items) == ['a']
+        assert writer.get_stats()['completed'] == 1
+    finally:
+        writer.shutdown()
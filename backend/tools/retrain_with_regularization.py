@@ -287,54 +287,51 @@ class ImprovedModelTrainer:
         print("\n🔍 GRID SEARCH FOR BEST REGULARIZATION")
         print("=" * 100)
         
-        best_score = 0
-        best_params = None
-        best_model = None
+        # ⚡ Candidates are trained concurrently (TRAINING_WORKERS processes)
+        from core.learning.parallel_training import make_param_grid, run_training_tasks
+        
+        candidates = make_param_grid(c1_values, c2_values)
+        n_train = len(X_train)
+        search = run_training_tasks(
+            X_train + X_val, y_train + y_val,
+            candidates,
+            splits=[(list(range(n_train)), list(range(n_train, n_train + len(X_val))))],
+            max_iterations=100,
+            score_train=True,
+            return_models=True,
+            # crfsuite defaults otherwise (no num_memories), as before
+            crf_params={
+                'algorithm': 'lbfgs',
+                'all_possible_transitions': True,
+                'verbose': False,
+            },
+        )
+        
         results = []
+        for fit in search['folds']:
+            c1, c2 = fit['params']['c1'], fit['params']['c2']
+            train_score, val_score = fit['train_accuracy'], fit['accuracy']
+            print(f"\n🧪 c1={c1}, c2={c2} ({fit['seconds']:.1f}s)")
+            print(f"   Train accuracy: {train_score:.4f}")
+            print(f"   Val accuracy: {val_score:.4f}")
+            print(f"   Overfitting gap: {(train_score - val_score):.4f}")
+            
+            results.append({
+                'c1': c1,
+                'c2': c2,
+                'train_acc': train_score,
+                'val_acc': val_score,
+                'gap': train_score - val_score
+            })
         
-        for c1 in c1_values:
-            for c2 in c2_values:
-                print(f"\n🧪 Testing c1={c1}, c2={c2}...")
-                
-                # Train with these parameters
-                import sklearn_crfsuite
-                crf = sklearn_crfsuite.CRF(
-                    algorithm='lbfgs',
-                    c1=c1,  # L1 regularization
-                    c2=c2,  # L2 regularization
-                    max_iterations=100,
-                    all_possible_transitions=True,
-                    verbose=False
-                )
-                
-                crf.fit(X_train, y_train)
-                
-                # Evaluate on validation set
-                y_pred = crf.predict(X_val)
-                
-                # Calculate accuracy
-                from sklearn_crfsuite import metrics
-                train_score = crf.score(X_train, y_train)
-                val_score = metrics.flat_accuracy_score(y_val, y_pred)
-                
-                print(f"   Train accuracy: {train_score:.4f}")
-                print(f"   Val accuracy: {val_score:.4f}")
-                print(f"   Overfitting gap: {(train_score - val_score):.4f}")
-                
-                results.append({
-                    'c1': c1,
-                    'c2': c2,
-                    'train_acc': train_score,
-                    'val_acc': val_score,
-                    'gap': train_score - val_score
-                })
-                
-                # Track best model (highest validation accuracy)
-                if val_score > best_score:
-                    best_score = val_score
-                    best_params = {'c1': c1, 'c2': c2}
-                    best_model = crf
-                    print(f"   ✅ NEW BEST MODEL!")
+        # Best model: highest validation accuracy (first candidate on ties)
+        best_fit = search['folds'][search['results'].index(search['best'])]
+        best_score = best_fit['accuracy']
+        best_params = dict(best_fit['params'])
+        best_model = best_fit['model']
+        
+        print(f"\n⏱️  {len(candidates)} candidates in {search['wall_seconds']:.1f}s "
+              f"({search['speedup']:.1f}x speedup on {search['workers']} workers)")
         
         # Print results summary
         print("\n" + "=" * 100)